@@ -13,6 +13,7 @@
 #    under the License.
 #
 
+import collections
 import functools
 
 import eventlet
@@ -56,6 +57,7 @@ from neutron.agent.linux import pd
 from neutron.agent.linux import utils as linux_utils
 from neutron.agent.metadata import driver as metadata_driver
 from neutron.agent import rpc as agent_rpc
+from neutron.common import _constants as n_const
 from neutron.common import utils
 from neutron import manager
 
@@ -84,6 +86,8 @@ RELATED_ACTION_MAP = {DELETE_ROUTER: DELETE_RELATED_ROUTER,
 
 ROUTER_PROCESS_GREENLET_MAX = 32
 ROUTER_PROCESS_GREENLET_MIN = 8
+# Period over which the router processing throughput is reported, in seconds.
+ROUTER_PROCESSED_PERIOD = 60
 
 
 def log_verbose_exc(message, router_payload):
@@ -116,6 +120,7 @@ class L3PluginApi(object):
         1.11 Added get_host_ha_router_count
         1.12 Added get_networks
         1.13 Removed get_external_network_id
+        1.14 Added router_revisions to sync_routers
     """
 
     def __init__(self, topic, host):
@@ -124,11 +129,40 @@ class L3PluginApi(object):
         self.client = n_rpc.get_client(target)
 
     @utils.timecost
-    def get_routers(self, context, router_ids=None):
-        """Make a remote process call to retrieve the sync data for routers."""
-        cctxt = self.client.prepare()
-        return cctxt.call(context, 'sync_routers', host=self.host,
-                          router_ids=router_ids)
+    def get_routers(self, context, router_ids=None, known_routers=None):
+        """Make a remote process call to retrieve the sync data for routers.
+
+        known_routers is an optional dict of router ID to the router sync
+        data already held by the agent. If the server supports it, the
+        routers which did not change, or whose floating IPs only changed,
+        are not sent again but completed from known_routers.
+        """
+        router_revisions = {
+            router_id: router[n_const.ROUTER_SYNC_REVISION]
+            for router_id, router in (known_routers or {}).items()
+            if router.get(n_const.ROUTER_SYNC_REVISION)}
+        if not router_revisions or not self.client.can_send_version('1.14'):
+            cctxt = self.client.prepare()
+            return cctxt.call(context, 'sync_routers', host=self.host,
+                              router_ids=router_ids)
+        cctxt = self.client.prepare(version='1.14')
+        routers = cctxt.call(context, 'sync_routers', host=self.host,
+                             router_ids=router_ids,
+                             router_revisions=router_revisions)
+        return [self._apply_router_sync_delta(known_routers, router)
+                for router in routers]
+
+    @staticmethod
+    def _apply_router_sync_delta(known_routers, router):
+        delta = router.pop(n_const.ROUTER_SYNC_DELTA, None)
+        if not delta:
+            return router
+        merged = dict(known_routers[router['id']])
+        merged[n_const.ROUTER_SYNC_REVISION] = (
+            router[n_const.ROUTER_SYNC_REVISION])
+        if delta == n_const.ROUTER_SYNC_FLOATINGIPS:
+            merged[lib_const.FLOATINGIP_KEY] = router[lib_const.FLOATINGIP_KEY]
+        return merged
 
     @utils.timecost
     def update_all_ha_network_port_statuses(self, context):
@@ -326,9 +360,14 @@ class L3NATAgent(ha.AgentMixin,
             self.metadata_driver)
 
         # L3 agent router processing green pool
-        self._pool_size = ROUTER_PROCESS_GREENLET_MIN
+        self._pool_size = self._get_pool_min_size()
         self._pool = eventlet.GreenPool(size=self._pool_size)
+        # Completion times of the last router updates, used to report the
+        # number of routers processed per minute
+        self._routers_processed = collections.deque()
         self._queue = queue.ResourceProcessingQueue()
+        # Dispatcher of the router updates to the router processing workers
+        self._router_dispatcher = None
         super(L3NATAgent, self).__init__(host=self.conf.host)
 
         self.target_ex_net_id = None
@@ -469,10 +508,28 @@ class L3NATAgent(ha.AgentMixin,
 
         return self.router_factory.create(features, **kwargs)
 
+    def dispatch_router_updates(self, dispatcher):
+        """Dispatch the router updates to router processing workers.
+
+        The router updates are added to the dispatcher instead of the router
+        processing queue of the agent, which does not process any router.
+        It must be called before the agent is started.
+
+        :param dispatcher: a router_workers.RouterUpdateDispatcher
+        """
+        self._router_dispatcher = self._queue = dispatcher
+
+    def _get_pool_min_size(self):
+        return self.conf.router_processing_pool_min_size
+
+    def _get_pool_max_size(self):
+        return max(self.conf.router_processing_pool_min_size,
+                   self.conf.router_processing_pool_max_size)
+
     @lockutils.synchronized('resize_greenpool')
     def _resize_process_pool(self):
-        pool_size = max([ROUTER_PROCESS_GREENLET_MIN,
-                         min([ROUTER_PROCESS_GREENLET_MAX,
+        pool_size = max([self._get_pool_min_size(),
+                         min([self._get_pool_max_size(),
                               len(self.router_info)])])
         if pool_size == self._pool_size:
             return
@@ -702,8 +759,9 @@ class L3NATAgent(ha.AgentMixin,
             if not_delete_no_routers or related_action:
                 try:
                     update.timestamp = timeutils.utcnow()
-                    routers = self.plugin_rpc.get_routers(self.context,
-                                                          [update.id])
+                    routers = self.plugin_rpc.get_routers(
+                        self.context, [update.id],
+                        known_routers=self._get_known_routers([update.id]))
                 except Exception:
                     msg = "Failed to fetch router information for '%s'"
                     LOG.exception(msg, update.id)
@@ -726,6 +784,7 @@ class L3NATAgent(ha.AgentMixin,
                     # processing queue (like events from fullsync) in order to
                     # prevent deleted router re-creation
                     rp.fetched_and_processed(update.timestamp)
+                    self._router_processed(update.id)
                 LOG.info("Finished a router update for %s, update_id %s. "
                          "Time elapsed: %.3f",
                          update.id, update.update_id,
@@ -737,11 +796,58 @@ class L3NATAgent(ha.AgentMixin,
                 continue
 
             rp.fetched_and_processed(update.timestamp)
+            self._router_processed(update.id)
             LOG.info("Finished a router update for %s, update_id %s. "
                      "Time elapsed: %.3f",
                      update.id, update.update_id,
                      update.time_elapsed_since_start)
 
+    def _expire_routers_processed(self, now):
+        threshold = now - ROUTER_PROCESSED_PERIOD
+        while (self._routers_processed and
+               self._routers_processed[0] < threshold):
+            self._routers_processed.popleft()
+
+    def _router_processed(self, router_id):
+        now = timeutils.utcnow_ts(microsecond=True)
+        self._expire_routers_processed(now)
+        self._routers_processed.append(now)
+
+    def get_routers_processed_per_minute(self):
+        """Return the number of router updates completed in the last minute.
+        """
+        self._expire_routers_processed(
+            timeutils.utcnow_ts(microsecond=True))
+        return len(self._routers_processed)
+
+    @staticmethod
+    def _get_router_stats(ri):
+        """Return the gateway port, interface and floating IP counts."""
+        return (1 if ri.get_ex_gw_port() else 0,
+                len(ri.router.get(lib_const.INTERFACE_KEY, [])),
+                len(ri.router.get(lib_const.FLOATINGIP_KEY, [])))
+
+    def get_routers_stats(self):
+        """Return the stats of the routers processed, by router ID.
+
+        The stats are the gateway port, interface and floating IP counts of
+        the routers, processed by this agent or by its router processing
+        workers.
+        """
+        if self._router_dispatcher:
+            return dict(self._router_dispatcher.routers_stats)
+        return {router_id: self._get_router_stats(ri)
+                for router_id, ri in self.router_info.items()}
+
+    def _get_known_routers(self, router_ids):
+        """Return the sync data of the routers of router_ids held here."""
+        known_routers = {}
+        for router_id in router_ids:
+            ri = self.router_info.get(router_id)
+            if ri and ri.router:
+                known_routers[router_id] = ri.router
+        return known_routers
+
     def _process_routers_if_compatible(self, routers, update):
         process_result = True
         for router in routers:
@@ -816,7 +922,10 @@ class L3NATAgent(ha.AgentMixin,
             self.fullsync = True
 
     def fetch_and_sync_all_routers(self, context, ns_manager):
-        prev_router_ids = set(self.router_info)
+        if self._router_dispatcher:
+            prev_router_ids = set(self._router_dispatcher.routers_stats)
+        else:
+            prev_router_ids = set(self.router_info)
         curr_router_ids = set()
         timestamp = timeutils.utcnow()
         router_ids = []
@@ -829,7 +938,9 @@ class L3NATAgent(ha.AgentMixin,
             # start router processing earlier
             for i in range(0, len(router_ids), self.sync_routers_chunk_size):
                 chunk = router_ids[i:i + self.sync_routers_chunk_size]
-                routers = self.plugin_rpc.get_routers(context, chunk)
+                routers = self.plugin_rpc.get_routers(
+                    context, chunk,
+                    known_routers=self._get_known_routers(chunk))
                 LOG.debug('Processing :%r', routers)
                 for r in routers:
                     curr_router_ids.add(r['id'])
@@ -900,9 +1011,22 @@ class L3NATAgent(ha.AgentMixin,
         # vArmourL3NATAgent. We need to find out whether vArmourL3NATAgent
         # can have L3NATAgentWithStateReport as its base class instead of
         # L3NATAgent.
-        eventlet.spawn_n(self._process_routers_loop)
+        self._start_router_processing()
         LOG.info("L3 agent started")
 
+    def _start_router_processing(self):
+        if self._router_dispatcher:
+            self._router_dispatcher.start()
+        else:
+            eventlet.spawn_n(self._process_routers_loop)
+
+    def enqueue_state_change(self, router_id, state):
+        if self._router_dispatcher:
+            # The router is processed by a router processing worker
+            self._router_dispatcher.ha_state_change(router_id, state)
+            return
+        super(L3NATAgent, self).enqueue_state_change(router_id, state)
+
     def stop(self):
         LOG.info("Stopping L3 agent")
         if self.conf.cleanup_on_shutdown:
@@ -948,21 +1072,19 @@ class L3NATAgentWithStateReport(L3NATAgent):
         num_ex_gw_ports = 0
         num_interfaces = 0
         num_floating_ips = 0
-        router_infos = self.router_info.values()
-        num_routers = len(router_infos)
-        for ri in router_infos:
-            ex_gw_port = ri.get_ex_gw_port()
-            if ex_gw_port:
-                num_ex_gw_ports += 1
-            num_interfaces += len(ri.router.get(lib_const.INTERFACE_KEY,
-                                                []))
-            num_floating_ips += len(ri.router.get(lib_const.FLOATINGIP_KEY,
-                                                  []))
+        routers_stats = self.get_routers_stats()
+        num_routers = len(routers_stats)
+        for ex_gw_ports, interfaces, floating_ips in routers_stats.values():
+            num_ex_gw_ports += ex_gw_ports
+            num_interfaces += interfaces
+            num_floating_ips += floating_ips
         configurations = self.agent_state['configurations']
         configurations['routers'] = num_routers
         configurations['ex_gw_ports'] = num_ex_gw_ports
         configurations['interfaces'] = num_interfaces
         configurations['floating_ips'] = num_floating_ips
+        configurations['routers_processed_per_minute'] = (
+            self.get_routers_processed_per_minute())
         try:
             agent_status = self.state_rpc.report_state(self.context,
                                                        self.agent_state,
@@ -987,7 +1109,7 @@ class L3NATAgentWithStateReport(L3NATAgent):
             LOG.info("Successfully reported state after a previous failure.")
 
     def after_start(self):
-        eventlet.spawn_n(self._process_routers_loop)
+        self._start_router_processing()
         LOG.info("L3 agent started")
         # Do the report state before we do the first full sync.
         self._report_state()
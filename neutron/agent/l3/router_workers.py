@@ -0,0 +1,331 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Router processing workers of the L3 agent.
+
+When router_processing_workers is set, the L3 agent service runs in a process
+which receives the notifications and synchronizes the routers, but does not
+process them: it dispatches the router updates to the router processing
+worker processes. Every router is processed by the worker picked by its ID,
+so that its updates are processed one at a time and in order by the
+ExclusiveResourceProcessor of that worker.
+
+The processes are forked by a process launcher, which restarts them when they
+die, and exchange JSON messages, one per line, over socket pairs created
+before forking them.
+"""
+
+import socket
+import threading
+import zlib
+
+import eventlet
+from neutron_lib.agent import topics
+from neutron_lib import constants as lib_const
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_service import service
+from oslo_utils import timeutils
+
+from neutron.agent.common import resource_processing_queue as queue
+from neutron.agent.l3 import agent as l3_agent
+from neutron.common import config
+from neutron import service as neutron_service
+from neutron import worker as neutron_worker
+
+LOG = logging.getLogger(__name__)
+
+
+def get_worker_index(router_id, workers):
+    """Return the index of the worker processing a router."""
+    return zlib.crc32(router_id.encode('utf-8')) % workers
+
+
+class RouterWorkerEndpoint(object):
+    """End of the channel between the L3 agent and a worker."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._send_lock = threading.Lock()
+
+    def send(self, op, **kwargs):
+        kwargs['op'] = op
+        data = jsonutils.dump_as_bytes(kwargs) + b'\n'
+        # Do not interleave the messages sent by several green threads
+        with self._send_lock:
+            self._sock.sendall(data)
+
+    def send_update(self, update):
+        self.send('update', id=update.id, priority=update.priority,
+                  action=update.action, resource=update.resource,
+                  timestamp=update.timestamp.strftime(
+                      timeutils.PERFECT_TIME_FORMAT),
+                  tries=update.tries)
+
+    def receive(self):
+        """Yield the messages received, forever."""
+        for line in self._sock.makefile('rb'):
+            try:
+                yield jsonutils.loads(line)
+            except ValueError:
+                # The message was cut by the death of the process sending it
+                LOG.warning("Ignoring malformed message: %s", line)
+
+
+def update_from_message(message):
+    return queue.ResourceUpdate(
+        message['id'], message['priority'], action=message['action'],
+        resource=message['resource'],
+        timestamp=timeutils.parse_strtime(message['timestamp']),
+        tries=message['tries'])
+
+
+class RouterWorkerChannel(object):
+    """Channel between the L3 agent and a router processing worker."""
+
+    def __init__(self):
+        agent_sock, worker_sock = socket.socketpair()
+        self.agent = RouterWorkerEndpoint(agent_sock)
+        self.worker = RouterWorkerEndpoint(worker_sock)
+
+
+class RouterUpdateDispatcher(object):
+    """Dispatcher of the router updates of the L3 agent to its workers.
+
+    It replaces the router processing queue of the agent, the updates added
+    to it are sent to the workers processing their routers. The workers send
+    back the stats of the routers they process and the updates of the
+    routers processed by other workers.
+    """
+
+    def __init__(self, agent, channels):
+        self._agent = agent
+        self._endpoints = [channel.agent for channel in channels]
+        # The gateway port, interface and floating IP counts of the routers
+        # processed by the workers, by router ID
+        self.routers_stats = {}
+
+    def start(self):
+        for endpoint in self._endpoints:
+            eventlet.spawn_n(self._receive, endpoint)
+
+    def _get_endpoint(self, router_id):
+        return self._endpoints[get_worker_index(router_id,
+                                                len(self._endpoints))]
+
+    def add(self, update):
+        if update.id is None:
+            # The prefix delegation updates are for all the routers
+            for endpoint in self._endpoints:
+                endpoint.send_update(update)
+        else:
+            self._get_endpoint(update.id).send_update(update)
+
+    def ha_state_change(self, router_id, state):
+        self._get_endpoint(router_id).send('ha_state_change',
+                                           router_id=router_id, state=state)
+
+    def _receive(self, endpoint):
+        for message in endpoint.receive():
+            try:
+                self._handle_message(message)
+            except Exception:
+                LOG.exception("Failed to handle the message of a router "
+                              "processing worker: %s", message)
+
+    def _handle_message(self, message):
+        if message['op'] == 'started':
+            # The routers of a restarted worker are not known to it anymore
+            LOG.info("Router processing worker started, doing a full sync")
+            self._agent.fullsync = True
+        elif message['op'] == 'router':
+            router_id = message['router_id']
+            if message['stats'] is None:
+                self.routers_stats.pop(router_id, None)
+            else:
+                self.routers_stats[router_id] = message['stats']
+            if message['processed']:
+                self._agent._router_processed(router_id)
+        elif message['op'] == 'update':
+            self.add(update_from_message(message))
+
+
+class RouterWorkerQueue(queue.ResourceProcessingQueue):
+    """Router processing queue of a router processing worker.
+
+    The updates of the routers processed by other workers, e.g. of the
+    routers related to a router processed by this worker, are sent to the
+    agent which dispatches them.
+    """
+
+    def __init__(self, endpoint, index, workers):
+        super(RouterWorkerQueue, self).__init__()
+        self._endpoint = endpoint
+        self._index = index
+        self._workers = workers
+
+    def add(self, update):
+        if (update.id is None or
+                get_worker_index(update.id, self._workers) == self._index):
+            super(RouterWorkerQueue, self).add(update)
+        else:
+            self._endpoint.send_update(update)
+
+
+class RouterProcessingAgent(l3_agent.L3NATAgent):
+    """L3 agent processing the routers of a router processing worker.
+
+    It receives the router updates and the HA state changes of its routers
+    from the L3 agent service instead of the RPC notifications, does not
+    synchronize the routers and sends the stats of its routers to the L3
+    agent service.
+    """
+
+    def __init__(self, host, conf, endpoint, index, workers):
+        self._endpoint = endpoint
+        super(RouterProcessingAgent, self).__init__(host, conf)
+        self._queue = RouterWorkerQueue(endpoint, index, workers)
+
+    def _check_ha_router_process_status(self):
+        # Checked by the L3 agent service for all the routers
+        pass
+
+    def _start_keepalived_notifications_server(self):
+        # The L3 agent service receives the HA state changes and sends them
+        # to the worker processing the router
+        pass
+
+    def _send_router_stats(self, router_id, processed):
+        ri = self.router_info.get(router_id)
+        stats = self._get_router_stats(ri) if ri and ri.router else None
+        self._endpoint.send('router', router_id=router_id, stats=stats,
+                            processed=processed)
+
+    def _router_processed(self, router_id):
+        super(RouterProcessingAgent, self)._router_processed(router_id)
+        self._send_router_stats(router_id, True)
+
+    def _safe_router_removed(self, router_id):
+        removed = super(RouterProcessingAgent, self)._safe_router_removed(
+            router_id)
+        if removed:
+            self._send_router_stats(router_id, False)
+        return removed
+
+    def after_start(self):
+        super(RouterProcessingAgent, self).after_start()
+        self.pd.after_start()
+        eventlet.spawn_n(self._receive)
+        self._endpoint.send('started')
+
+    def _receive(self):
+        for message in self._endpoint.receive():
+            try:
+                if message['op'] == 'update':
+                    self._queue.add(update_from_message(message))
+                elif message['op'] == 'ha_state_change':
+                    self.enqueue_state_change(message['router_id'],
+                                              message['state'])
+            except Exception:
+                LOG.exception("Failed to handle the message of the L3 "
+                              "agent: %s", message)
+
+
+class RouterProcessingWorker(neutron_worker.NeutronBaseWorker):
+    """Process processing the routers picked by their ID."""
+
+    def __init__(self, conf, channel, index, workers):
+        super(RouterProcessingWorker, self).__init__(worker_process_count=1)
+        self._conf = conf
+        self._channel = channel
+        self._index = index
+        self._workers = workers
+        self._agent = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        super(RouterProcessingWorker, self).start(
+            name='neutron-l3-agent',
+            desc='router processing worker %d' % self._index)
+        self._agent = RouterProcessingAgent(
+            self._conf.host, self._conf, self._channel.worker, self._index,
+            self._workers)
+        self._agent.after_start()
+
+    def wait(self):
+        self._stopped.wait()
+
+    def stop(self):
+        if self._agent:
+            self._agent.stop()
+        self._stopped.set()
+
+    @staticmethod
+    def reset():
+        config.reset_service()
+
+
+class L3AgentServiceWorker(neutron_worker.NeutronBaseWorker):
+    """Process running the L3 agent service, dispatching the routers."""
+
+    def __init__(self, manager, channels):
+        super(L3AgentServiceWorker, self).__init__(worker_process_count=1)
+        self._manager = manager
+        self._channels = channels
+        self._server = None
+
+    def start(self):
+        super(L3AgentServiceWorker, self).start(name='neutron-l3-agent',
+                                                desc='agent service')
+        self._server = neutron_service.Service.create(
+            binary='neutron-l3-agent',
+            topic=topics.L3_AGENT,
+            report_interval=cfg.CONF.AGENT.report_interval,
+            manager=self._manager)
+        agent = self._server.manager
+        agent.dispatch_router_updates(
+            RouterUpdateDispatcher(agent, self._channels))
+        self._server.start()
+
+    def wait(self):
+        self._server.wait()
+
+    def stop(self):
+        if self._server:
+            self._server.stop()
+
+    def reset(self):
+        self._server.reset()
+
+
+def launch(conf, manager):
+    """Launch the L3 agent service and its router processing workers.
+
+    :param conf: the L3 agent configuration
+    :param manager: the class name of the L3 agent service manager
+    :returns: the launcher of the processes
+    """
+    if conf.agent_mode != lib_const.L3_AGENT_MODE_LEGACY:
+        LOG.error("Router processing workers are only supported in the %s "
+                  "agent mode", lib_const.L3_AGENT_MODE_LEGACY)
+        raise SystemExit(1)
+    workers = conf.router_processing_workers
+    channels = [RouterWorkerChannel() for _ in range(workers)]
+    launcher = service.ProcessLauncher(conf, wait_interval=1.0,
+                                       restart_method='mutate')
+    for index, channel in enumerate(channels):
+        launcher.launch_service(
+            RouterProcessingWorker(conf, channel, index, workers), workers=1)
+    launcher.launch_service(L3AgentServiceWorker(manager, channels),
+                            workers=1)
+    return launcher
@@ -20,6 +20,7 @@ from neutron_lib.agent import topics
 from oslo_config import cfg
 from oslo_service import service
 
+from neutron.agent.l3 import router_workers
 from neutron.common import config as common_config
 from neutron.conf.agent import common as config
 from neutron.conf.agent.l3 import config as l3_config
@@ -48,6 +49,9 @@ def main(manager='neutron.agent.l3.agent.L3NATAgentWithStateReport'):
     common_config.init(sys.argv[1:])
     config.setup_logging()
     config.setup_privsep()
+    if cfg.CONF.router_processing_workers:
+        router_workers.launch(cfg.CONF, manager).wait()
+        return
     server = neutron_service.Service.create(
         binary='neutron-l3-agent',
         topic=topics.L3_AGENT,
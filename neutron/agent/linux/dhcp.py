@@ -16,6 +16,7 @@
 import abc
 import collections
 import copy
+import hashlib
 import itertools
 import os
 import re
@@ -160,6 +161,48 @@ class NetModel(DictModel):
         return self._ns_name
 
 
+class DnsmasqHostTable(object):
+    """Index of the dnsmasq host entries of a network, by port.
+
+    The entries of a port are rendered again only when the port changes, so
+    that a port update does not require rendering the entries of every port
+    of the network. The digests of the configuration files last written are
+    kept too, so that unchanged files are not rewritten.
+    """
+
+    def __init__(self, signature):
+        self.signature = signature
+        self._entries = {}
+        self._file_digests = {}
+
+    def get(self, port_id, fingerprint):
+        entry = self._entries.get(port_id)
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+
+    def set(self, port_id, fingerprint, entries):
+        self._entries[port_id] = (fingerprint, entries)
+
+    def prune(self, port_ids):
+        for port_id in set(self._entries) - set(port_ids):
+            del self._entries[port_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _get_digest(contents):
+        return hashlib.sha1(contents.encode('utf-8')).hexdigest()
+
+    def is_file_changed(self, filename, contents):
+        return (self._file_digests.get(filename) !=
+                self._get_digest(contents) or
+                not os.path.exists(filename))
+
+    def file_written(self, filename, contents):
+        self._file_digests[filename] = self._get_digest(contents)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class DhcpBase(object):
 
@@ -705,35 +748,114 @@ class Dnsmasq(DhcpLocalProcess):
             no_opts,  # A flag indication that options shouldn't be written
         )
         """
-        v6_nets = dict((subnet.id, subnet) for subnet in
-                       self._get_all_subnets(self.network)
-                       if subnet.ip_version == 6)
-
+        v6_nets = self._get_v6_nets()
+        for port in self.network.ports:
+            for host_tuple in self._iter_port_hosts(port, v6_nets,
+                                                    merge_addr6_list):
+                yield host_tuple
+
+    def _get_v6_nets(self):
+        return dict((subnet.id, subnet) for subnet in
+                    self._get_all_subnets(self.network)
+                    if subnet.ip_version == 6)
+
+    def _iter_port_hosts(self, port, v6_nets, merge_addr6_list=False):
+        """Iterate over the hosts of a port, see `_iter_hosts`."""
+        fixed_ips = self._sort_fixed_ips_for_dnsmasq(port.fixed_ips, v6_nets)
+        # TODO(hjensas): Drop this conditional and option once distros
+        #  generally have dnsmasq supporting addr6 list and range.
+        if self.conf.dnsmasq_enable_addr6_list and merge_addr6_list:
+            fixed_ips = self._merge_alloc_addr6_list(fixed_ips, v6_nets)
+        # Confirm whether Neutron server supports dns_name attribute in the
+        # ports API
+        dns_assignment = getattr(port, 'dns_assignment', None)
+        for alloc in fixed_ips:
+            no_dhcp = False
+            no_opts = False
+            if alloc.subnet_id in v6_nets:
+                addr_mode = v6_nets[alloc.subnet_id].ipv6_address_mode
+                no_dhcp = addr_mode in (constants.IPV6_SLAAC,
+                                        constants.DHCPV6_STATELESS)
+                # we don't setup anything for SLAAC. It doesn't make sense
+                # to provide options for a client that won't use DHCP
+                no_opts = addr_mode == constants.IPV6_SLAAC
+
+            hostname, fqdn = self._get_dns_assignment(alloc.ip_address,
+                                                      dns_assignment)
+
+            yield (port, alloc, hostname, fqdn, no_dhcp, no_opts)
+
+    def _get_host_table_signature(self):
+        """Return what the entries of every port of the network depend on."""
+        subnets = tuple(
+            (subnet.id, subnet.ip_version, subnet.enable_dhcp,
+             getattr(subnet, 'ipv6_address_mode', None))
+            for subnet in self._get_all_subnets(self.network))
+        return (subnets, self.conf.dns_domain,
+                self.conf.dnsmasq_enable_addr6_list)
+
+    def _get_port_fingerprint(self, port):
+        """Return what the entries of a port depend on."""
+        dns_assignment = getattr(port, 'dns_assignment', None) or []
+        extra_dhcp_opts = self._get_port_extra_dhcp_opts(port) or []
+        return (port.mac_address,
+                tuple((ip.subnet_id, ip.ip_address) for ip in port.fixed_ips),
+                tuple((dns.ip_address, dns.hostname, dns.fqdn)
+                      for dns in dns_assignment),
+                tuple((opt.opt_name, opt.opt_value,
+                       getattr(opt, 'ip_version', None))
+                      for opt in extra_dhcp_opts))
+
+    def _get_host_table(self):
+        """Return the host table of the network.
+
+        The table is kept along with the network in the DHCP agent cache, so
+        that it lives as long as the network is not refreshed from the
+        server, and it is rebuilt when the subnets of the network change.
+        """
+        signature = self._get_host_table_signature()
+        host_table = getattr(self.network, '_dnsmasq_host_table', None)
+        if host_table is None or host_table.signature != signature:
+            host_table = DnsmasqHostTable(signature)
+            self.network._dnsmasq_host_table = host_table
+        return host_table
+
+    def _get_hosts_entries(self):
+        """Return the (host, additional host) entries of the network ports.
+
+        Only the entries of the ports which changed since the host table of
+        the network was last updated are rendered.
+        """
+        host_table = self._get_host_table()
+        v6_nets = self._get_v6_nets()
+        dhcp_enabled_subnet_ids = set(
+            s.id for s in self._get_all_subnets(self.network)
+            if s.enable_dhcp)
+        all_entries = []
+        port_ids = []
         for port in self.network.ports:
-            fixed_ips = self._sort_fixed_ips_for_dnsmasq(port.fixed_ips,
-                                                         v6_nets)
-            # TODO(hjensas): Drop this conditional and option once distros
-            #  generally have dnsmasq supporting addr6 list and range.
-            if self.conf.dnsmasq_enable_addr6_list and merge_addr6_list:
-                fixed_ips = self._merge_alloc_addr6_list(fixed_ips, v6_nets)
-            # Confirm whether Neutron server supports dns_name attribute in the
-            # ports API
-            dns_assignment = getattr(port, 'dns_assignment', None)
-            for alloc in fixed_ips:
-                no_dhcp = False
-                no_opts = False
-                if alloc.subnet_id in v6_nets:
-                    addr_mode = v6_nets[alloc.subnet_id].ipv6_address_mode
-                    no_dhcp = addr_mode in (constants.IPV6_SLAAC,
-                                            constants.DHCPV6_STATELESS)
-                    # we don't setup anything for SLAAC. It doesn't make sense
-                    # to provide options for a client that won't use DHCP
-                    no_opts = addr_mode == constants.IPV6_SLAAC
-
-                hostname, fqdn = self._get_dns_assignment(alloc.ip_address,
-                                                          dns_assignment)
-
-                yield (port, alloc, hostname, fqdn, no_dhcp, no_opts)
+            fingerprint = self._get_port_fingerprint(port)
+            entries = host_table.get(port.id, fingerprint)
+            if entries is None:
+                entries = (
+                    self._get_port_hosts_entries(port, v6_nets,
+                                                 dhcp_enabled_subnet_ids),
+                    self._get_port_addn_hosts_entries(port, v6_nets))
+                host_table.set(port.id, fingerprint, entries)
+            all_entries.append(entries)
+            port_ids.append(port.id)
+        host_table.prune(port_ids)
+        return all_entries
+
+    def _replace_config_file(self, filename, contents):
+        """Atomically replace a configuration file if its content changed."""
+        host_table = self._get_host_table()
+        if not host_table.is_file_changed(filename, contents):
+            LOG.debug('Configuration file %s is unchanged', filename)
+            return False
+        file_utils.replace_file(filename, contents)
+        host_table.file_written(filename, contents)
+        return True
 
     def _get_port_extra_dhcp_opts(self, port):
         return getattr(port, edo_ext.EXTRADHCPOPTS, False)
@@ -808,16 +930,22 @@ class Dnsmasq(DhcpLocalProcess):
         should receive a dhcp lease, the hosts resolution in itself is
         defined by the `_output_addn_hosts_file` method.
         """
-        buf = six.StringIO()
         filename = self.get_conf_file_name('host')
 
         LOG.debug('Building host file: %s', filename)
-        dhcp_enabled_subnet_ids = [s.id for s in
-                                   self._get_all_subnets(self.network)
-                                   if s.enable_dhcp]
+        contents = ''.join(hosts for hosts, addn_hosts in
+                           self._get_hosts_entries())
+        self._replace_config_file(filename, contents)
+        LOG.debug('Done building host file %s', filename)
+        return filename
+
+    def _get_port_hosts_entries(self, port, v6_nets, dhcp_enabled_subnet_ids):
+        """Return the dhcp hosts file entries of a port."""
+        buf = six.StringIO()
         # NOTE(ihrachyshka): the loop should not log anything inside it, to
         # avoid potential performance drop when lots of hosts are dumped
-        for host_tuple in self._iter_hosts(merge_addr6_list=True):
+        for host_tuple in self._iter_port_hosts(port, v6_nets,
+                                                merge_addr6_list=True):
             port, alloc, hostname, name, no_dhcp, no_opts = host_tuple
             if no_dhcp:
                 if not no_opts and self._get_port_extra_dhcp_opts(port):
@@ -850,10 +978,7 @@ class Dnsmasq(DhcpLocalProcess):
             else:
                 buf.write('%s,%s,%s\n' %
                           (port.mac_address, name, ip_address))
-
-        file_utils.replace_file(filename, buf.getvalue())
-        LOG.debug('Done building host file %s', filename)
-        return filename
+        return buf.getvalue()
 
     def _get_client_id(self, port):
         if self._get_port_extra_dhcp_opts(port):
@@ -1043,16 +1168,22 @@ class Dnsmasq(DhcpLocalProcess):
         Each line in this file is in the same form as a standard /etc/hosts
         file.
         """
+        contents = ''.join(addn_hosts for hosts, addn_hosts in
+                           self._get_hosts_entries())
+        addn_hosts = self.get_conf_file_name('addn_hosts')
+        self._replace_config_file(addn_hosts, contents)
+        return addn_hosts
+
+    def _get_port_addn_hosts_entries(self, port, v6_nets):
+        """Return the additional hosts file entries of a port."""
         buf = six.StringIO()
-        for host_tuple in self._iter_hosts():
+        for host_tuple in self._iter_port_hosts(port, v6_nets):
             port, alloc, hostname, fqdn, no_dhcp, no_opts = host_tuple
             # It is compulsory to write the `fqdn` before the `hostname` in
             # order to obtain it in PTR responses.
             if alloc:
                 buf.write('%s\t%s %s\n' % (alloc.ip_address, fqdn, hostname))
-        addn_hosts = self.get_conf_file_name('addn_hosts')
-        file_utils.replace_file(addn_hosts, buf.getvalue())
-        return addn_hosts
+        return buf.getvalue()
 
     def _output_opts_file(self):
         """Write a dnsmasq compatible options file."""
@@ -1060,7 +1191,7 @@ class Dnsmasq(DhcpLocalProcess):
         options += self._generate_opts_per_port(subnet_index_map)
 
         name = self.get_conf_file_name('opts')
-        file_utils.replace_file(name, '\n'.join(options))
+        self._replace_config_file(name, '\n'.join(options))
         return name
 
     def _generate_opts_per_subnet(self):
@@ -11,6 +11,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import contextlib
 import copy
 
 import netaddr
@@ -29,12 +30,37 @@ class IpsetManager(object):
 
        Keeps track of ip addresses per set, using bulk
        or single ip add/remove for smaller changes.
+
+       Set updates can be deferred, in which case they are queued and
+       applied with a single ipset restore call on defer_apply_off.
     """
 
     def __init__(self, execute=None, namespace=None):
         self.execute = execute or linux_utils.execute
         self.namespace = namespace
         self.ipset_sets = {}
+        self.ipset_apply_deferred = False
+        # set name -> (ethertype, members applied before the deferral or
+        # None if the set did not exist yet)
+        self._deferred_sets = {}
+
+    @contextlib.contextmanager
+    def defer_apply(self):
+        """Defer apply context."""
+        self.defer_apply_on()
+        try:
+            yield
+        finally:
+            self.defer_apply_off()
+
+    def defer_apply_on(self):
+        self.ipset_apply_deferred = True
+
+    def defer_apply_off(self):
+        self.ipset_apply_deferred = False
+        with lockutils.lock('neutron-ipset-%s' % self.namespace,
+                            external=True):
+            self._apply_deferred_sets()
 
     def _sanitize_addresses(self, addresses):
         """This method converts any address to ipset format.
@@ -84,6 +110,9 @@ class IpsetManager(object):
         return add_ips, del_ips
 
     def set_members_mutate(self, set_name, ethertype, member_ips):
+        if self.ipset_apply_deferred:
+            self._defer_set_members(set_name, ethertype, member_ips)
+            return
         with lockutils.lock('neutron-ipset-%s' % self.namespace,
                             external=True):
             if not self.set_name_exists(set_name):
@@ -106,10 +135,71 @@ class IpsetManager(object):
                 else:
                     self._refresh_set(set_name, member_ips, ethertype)
 
+    def _defer_set_members(self, set_name, ethertype, member_ips):
+        if set_name not in self._deferred_sets:
+            applied_ips = self.ipset_sets.get(set_name)
+            if applied_ips is not None:
+                applied_ips = set(applied_ips)
+            self._deferred_sets[set_name] = (ethertype, applied_ips)
+        self.ipset_sets[set_name] = copy.copy(member_ips)
+
+    def _apply_deferred_sets(self):
+        """Apply all the deferred set updates in one ipset restore call.
+
+        Only the difference between the members applied before the
+        deferral and the latest requested members is sent, so adding and
+        then removing a member while deferred is a no-op.
+        """
+        deferred_sets, self._deferred_sets = self._deferred_sets, {}
+        process_input = []
+        for set_name, (ethertype, applied_ips) in sorted(
+                deferred_sets.items()):
+            member_ips = self.ipset_sets.get(set_name)
+            if member_ips is None:
+                # destroyed while deferred
+                continue
+            set_type = self._get_ipset_set_type(ethertype)
+            if applied_ips is None:
+                # The set may be left over from a previous run, so it is
+                # created if needed and then swapped with the new content.
+                process_input.append("create %s hash:net family %s" %
+                                     (set_name, set_type))
+                add_ips = del_ips = None
+            else:
+                add_ips = sorted(set(member_ips) - applied_ips)
+                del_ips = sorted(applied_ips - set(member_ips))
+            if (add_ips is not None and
+                    len(add_ips) + len(del_ips) < IPSET_ADD_BULK_THRESHOLD):
+                process_input.extend("add %s %s" % (set_name, ip)
+                                     for ip in add_ips)
+                process_input.extend("del %s %s" % (set_name, ip)
+                                     for ip in del_ips)
+            else:
+                new_set_name = set_name + SWAP_SUFFIX
+                process_input.append("create %s hash:net family %s" %
+                                     (new_set_name, set_type))
+                process_input.append("flush %s" % new_set_name)
+                process_input.extend("add %s %s" % (new_set_name, ip)
+                                     for ip in member_ips)
+                process_input.append("swap %s %s" % (new_set_name,
+                                                     set_name))
+                process_input.append("destroy %s" % new_set_name)
+        if not process_input:
+            return
+        try:
+            self._restore_sets(process_input)
+        except Exception:
+            # The kernel state of these sets is unknown now, forget about
+            # them so they are fully refreshed on the next update.
+            for set_name in deferred_sets:
+                self.ipset_sets.pop(set_name, None)
+            raise
+
     def destroy(self, id, ethertype, forced=False):
         with lockutils.lock('neutron-ipset-%s' % self.namespace,
                             external=True):
             set_name = self.get_name(id, ethertype)
+            self._deferred_sets.pop(set_name, None)
             self._destroy(set_name, forced)
 
     def _add_member_to_set(self, set_name, member_ip):
@@ -835,6 +835,8 @@ class IptablesFirewallDriver(firewall.FirewallDriver):
     def filter_defer_apply_on(self):
         if not self._defer_apply:
             self.iptables.defer_apply_on()
+            if self.enable_ipset:
+                self.ipset.defer_apply_on()
             self._pre_defer_filtered_ports = dict(self.filtered_ports)
             self._pre_defer_unfiltered_ports = dict(self.unfiltered_ports)
             self.pre_sg_members = dict(self.sg_members)
@@ -998,6 +1000,10 @@ class IptablesFirewallDriver(firewall.FirewallDriver):
                                       self._pre_defer_unfiltered_ports)
             self._setup_chains_apply(self.filtered_ports,
                                      self.unfiltered_ports)
+            if self.enable_ipset:
+                # the sets must exist before the iptables rules using them
+                # are applied
+                self.ipset.defer_apply_off()
             self.iptables.defer_apply_off()
             self._remove_conntrack_entries_from_sg_updates()
             self._remove_unused_security_group_info()
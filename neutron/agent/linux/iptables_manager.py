@@ -24,6 +24,7 @@ import difflib
 import os
 import re
 import sys
+import time
 
 from neutron_lib import constants
 from neutron_lib import exceptions
@@ -140,6 +141,9 @@ class IptablesTable(object):
         self.unwrapped_chains = set()
         self.remove_chains = set()
         self.wrap_name = binary_name[:16]
+        # Set whenever the in-memory content of the table changes, so the
+        # incremental apply mode can skip tables that were not touched.
+        self.dirty = True
 
     def add_chain(self, name, wrap=True):
         """Adds a named chain to the table.
@@ -154,10 +158,10 @@ class IptablesTable(object):
 
         """
         name = get_chain_name(name, wrap)
-        if wrap:
-            self.chains.add(name)
-        else:
-            self.unwrapped_chains.add(name)
+        chain_set = self._select_chain_set(wrap)
+        if name not in chain_set:
+            chain_set.add(name)
+            self.dirty = True
 
     def _select_chain_set(self, wrap):
         if wrap:
@@ -183,6 +187,7 @@ class IptablesTable(object):
             return
 
         chain_set.remove(name)
+        self.dirty = True
 
         if not wrap:
             # non-wrapped chains and rules need to be dealt with specially,
@@ -224,6 +229,7 @@ class IptablesTable(object):
 
         self.rules.append(IptablesRule(chain, rule, wrap, top, self.wrap_name,
                                        tag, comment))
+        self.dirty = True
 
     def _wrap_target_chain(self, s, wrap):
         if s.startswith('$'):
@@ -248,6 +254,7 @@ class IptablesTable(object):
             self.rules.remove(IptablesRule(chain, rule, wrap, top,
                                            self.wrap_name,
                                            comment=comment))
+            self.dirty = True
             if not wrap:
                 self.remove_rules.append(str(IptablesRule(chain, rule, wrap,
                                                           top, self.wrap_name,
@@ -268,6 +275,8 @@ class IptablesTable(object):
         chained_rules = self._get_chain_rules(chain, wrap)
         for rule in chained_rules:
             self.rules.remove(rule)
+        if chained_rules:
+            self.dirty = True
 
     def clear_rules_by_tag(self, tag):
         if not tag:
@@ -275,6 +284,8 @@ class IptablesTable(object):
         rules = [rule for rule in self.rules if rule.tag == tag]
         for rule in rules:
             self.rules.remove(rule)
+        if rules:
+            self.dirty = True
 
 
 class IptablesManager(object):
@@ -318,6 +329,10 @@ class IptablesManager(object):
         self.namespace = namespace
         self.iptables_apply_deferred = False
         self.wrap_name = binary_name[:16]
+        # Last applied state of every table, per iptables command, used as
+        # the reference for the diff when iptables_incremental_apply is set.
+        self._shadow = {}
+        self._next_full_sync = 0
 
         self.ipv4 = {'filter': IptablesTable(binary_name=self.wrap_name)}
         self.ipv6 = {'filter': IptablesTable(binary_name=self.wrap_name)}
@@ -465,6 +480,8 @@ class IptablesManager(object):
             if not cfg.CONF.AGENT.debug_iptables_rules:
                 return first
             LOG.debug('List of IPTables Rules applied: %s', '\n'.join(first))
+            # make sure the second run compares against the real state
+            self.invalidate_shadow()
             second = self._apply_synchronized()
             if second:
                 msg = (_("IPTables Rules did not converge. Diff: %s") %
@@ -553,6 +570,60 @@ class IptablesManager(object):
                   "following set of iptables rules:\n%s",
                   '\n'.join(log_lines))
 
+    def invalidate_shadow(self):
+        """Force the next apply to resync from iptables-save."""
+        self._shadow = {}
+
+    def _get_shadow(self, cmd):
+        if not cfg.CONF.AGENT.iptables_incremental_apply:
+            return None
+        interval = cfg.CONF.AGENT.iptables_full_sync_interval
+        now = time.time()
+        if interval and now >= self._next_full_sync:
+            if self._shadow:
+                LOG.debug("Periodic iptables audit, resyncing from "
+                          "iptables-save")
+            self._shadow = {}
+            self._next_full_sync = now + interval
+        return self._shadow.get(cmd)
+
+    def _get_current_tables(self, cmd, tables):
+        """Return the current lines of every table, or None if unavailable.
+
+        When iptables_incremental_apply is enabled and a previous apply
+        succeeded, the shadow copy of the tables is returned instead of
+        parsing the output of iptables-save.
+        """
+        shadow = self._get_shadow(cmd)
+        if shadow is not None:
+            return shadow, True
+
+        args = ['%s-save' % (cmd,)]
+        if self.namespace:
+            args = ['ip', 'netns', 'exec', self.namespace] + args
+        try:
+            save_output = self.execute(args, run_as_root=True)
+        except RuntimeError:
+            # We could be racing with a cron job deleting namespaces.
+            # It is useless to try to apply iptables rules over and
+            # over again in a endless loop if the namespace does not
+            # exist.
+            with excutils.save_and_reraise_exception() as ctx:
+                if (self.namespace and not
+                        ip_lib.network_namespace_exists(self.namespace)):
+                    ctx.reraise = False
+                    LOG.error("Namespace %s was deleted during IPTables "
+                              "operations.", self.namespace)
+                    self.invalidate_shadow()
+                    return None, False
+        all_lines = save_output.split('\n')
+        current = {}
+        for table_name in tables:
+            # isolate the lines of the table we are modifying
+            start, end = self._find_table(all_lines, table_name)
+            current[table_name] = all_lines[start:end]
+        return current, False
+
     def _apply_synchronized(self):
         """Apply the current in-memory set of iptables rules.
 
@@ -567,46 +638,41 @@ class IptablesManager(object):
             s += [('ip6tables', self.ipv6)]
         all_commands = []  # variable to keep track all commands for return val
         for cmd, tables in s:
-            args = ['%s-save' % (cmd,)]
-            if self.namespace:
-                args = ['ip', 'netns', 'exec', self.namespace] + args
+            # Clear the dirty flags before generating the commands, the
+            # restore yields to the other greenthreads and the tables they
+            # modify meanwhile must be applied again by the next run
+            dirty_tables = {name for name, table in tables.items()
+                            if table.dirty}
+            for table in tables.values():
+                table.dirty = False
             try:
-                save_output = self.execute(args, run_as_root=True)
-            except RuntimeError:
-                # We could be racing with a cron job deleting namespaces.
-                # It is useless to try to apply iptables rules over and
-                # over again in a endless loop if the namespace does not
-                # exist.
-                with excutils.save_and_reraise_exception() as ctx:
-                    if (self.namespace and not
-                            ip_lib.network_namespace_exists(self.namespace)):
-                        ctx.reraise = False
-                        LOG.error("Namespace %s was deleted during IPTables "
-                                  "operations.", self.namespace)
-                        return []
-            all_lines = save_output.split('\n')
-            commands = []
-            # Traverse tables in sorted order for predictable dump output
-            for table_name in sorted(tables):
-                table = tables[table_name]
-                # isolate the lines of the table we are modifying
-                start, end = self._find_table(all_lines, table_name)
-                old_rules = all_lines[start:end]
-                # generate the new table state we want
-                new_rules = self._modify_rules(old_rules, table, table_name)
-                # generate the iptables commands to get between the old state
-                # and the new state
-                changes = _generate_path_between_rules(old_rules, new_rules)
-                if changes:
-                    # if there are changes to the table, we put on the header
-                    # and footer that iptables-save needs
-                    commands += (['# Generated by iptables_manager'] +
-                                 ['*%s' % table_name] + changes +
-                                 ['COMMIT', '# Completed by iptables_manager'])
-            if not commands:
-                continue
+                commands = self._apply_tables(cmd, tables, dirty_tables)
+            except Exception:
+                for name in dirty_tables:
+                    tables[name].dirty = True
+                raise
+            if commands is None:
+                for name in dirty_tables:
+                    tables[name].dirty = True
+                return []
             all_commands += commands
 
+        LOG.debug("IPTablesManager.apply completed with success. %d iptables "
+                  "commands were issued", len(all_commands))
+        return all_commands
+
+    def _apply_tables(self, cmd, tables, dirty_tables):
+        """Apply the tables of one of the iptables commands.
+
+        Returns the commands which were sent to the restore command, or None
+        if the namespace was deleted meanwhile.
+        """
+        current, incremental = self._get_current_tables(cmd, tables)
+        if current is None:
+            return None
+        commands, new_state = self._generate_commands(
+            tables, current, incremental, dirty_tables)
+        if commands:
             # always end with a new line
             commands.append('')
 
@@ -615,13 +681,63 @@ class IptablesManager(object):
                 args = ['ip', 'netns', 'exec', self.namespace] + args
 
             err = self._run_restore(args, commands)
+            if err and incremental:
+                # The kernel state does not match our copy of it,
+                # resync from iptables-save and try again.
+                LOG.warning("Incremental iptables apply failed, "
+                            "resyncing from %s-save", cmd)
+                self._shadow.pop(cmd, None)
+                current, incremental = self._get_current_tables(
+                    cmd, tables)
+                if current is None:
+                    return None
+                commands, new_state = self._generate_commands(
+                    tables, current, incremental, dirty_tables)
+                commands.append('')
+                err = (self._run_restore(args, commands)
+                       if len(commands) > 1 else None)
             if err:
+                self._shadow.pop(cmd, None)
                 self._log_restore_err(err, commands)
                 raise err
+            # drop the trailing new line from the returned commands
+            commands = commands[:-1]
 
-        LOG.debug("IPTablesManager.apply completed with success. %d iptables "
-                  "commands were issued", len(all_commands))
-        return all_commands
+        if cfg.CONF.AGENT.iptables_incremental_apply:
+            self._shadow[cmd] = new_state
+        return commands
+
+    def _generate_commands(self, tables, current, incremental,
+                           dirty_tables):
+        """Generate the iptables-restore input to get to the desired state.
+
+        Returns the commands and the resulting state of every table. When
+        incremental is set, the tables not in dirty_tables, which were not
+        modified since the last apply, are assumed to be in sync and are
+        skipped.
+        """
+        commands = []
+        new_state = {}
+        # Traverse tables in sorted order for predictable dump output
+        for table_name in sorted(tables):
+            table = tables[table_name]
+            old_rules = current.get(table_name, [])
+            if incremental and table_name not in dirty_tables:
+                new_state[table_name] = old_rules
+                continue
+            # generate the new table state we want
+            new_rules = self._modify_rules(old_rules, table, table_name)
+            new_state[table_name] = new_rules
+            # generate the iptables commands to get between the old state
+            # and the new state
+            changes = _generate_path_between_rules(old_rules, new_rules)
+            if changes:
+                # if there are changes to the table, we put on the header
+                # and footer that iptables-save needs
+                commands += (['# Generated by iptables_manager'] +
+                             ['*%s' % table_name] + changes +
+                             ['COMMIT', '# Completed by iptables_manager'])
+        return commands, new_state
 
     def _find_table(self, lines, table_name):
         if len(lines) < 3:
@@ -814,6 +930,9 @@ def _generate_path_between_rules(old_rules, new_rules):
             other_chains.append(chain)
 
     for chain in other_chains + sg_chains:
+        if old_by_chain[chain] == new_by_chain[chain]:
+            # nothing to do for unchanged chains, skip the costly diff
+            continue
         statements += _generate_chain_diff_iptables_commands(
             chain, old_by_chain[chain], new_by_chain[chain])
     # unreferenced chains get the axe
@@ -346,19 +346,31 @@ class ConjIPFlowManager(object):
         return addr_to_conj
 
     def _update_flows_for_vlan_subr(self, direction, ethertype, vlan_tag,
-                                    flow_state, addr_to_conj):
-        """Do the actual flow updates for given direction and ethertype."""
-        current_ips = set(flow_state.keys())
+                                    flow_state, prefix_to_conj):
+        """Do the actual flow updates for given direction and ethertype.
+
+        Both flow_state and prefix_to_conj are maps of merged ip prefix ->
+        conj_ids, and all the flows needed to go from the former to the
+        latter are compiled at once and sent to the bridge in bulk.
+        """
+        removed = set(flow_state.keys()) - set(prefix_to_conj.keys())
         self.driver.delete_flows_for_ip_addresses(
-            current_ips - set(addr_to_conj.keys()),
-            direction, ethertype, vlan_tag)
-        for addr, conj_ids in addr_to_conj.items():
-            conj_ids.sort()
-            if flow_state.get(addr) == conj_ids:
-                continue
-            for flow in rules.create_flows_for_ip_address(
-                    addr, direction, ethertype, vlan_tag, conj_ids):
-                self.driver._add_flow(**flow)
+            removed, direction, ethertype, vlan_tag)
+        if removed:
+            # Deletions are not strict and would also remove the flows of
+            # the remaining prefixes contained in a removed one.
+            removed_set = netaddr.IPSet(removed)
+            changed = {
+                prefix: conj_ids for prefix, conj_ids in prefix_to_conj.items()
+                if (flow_state.get(prefix) != conj_ids or
+                    netaddr.IPNetwork(prefix) in removed_set)}
+        else:
+            changed = {
+                prefix: conj_ids for prefix, conj_ids in prefix_to_conj.items()
+                if flow_state.get(prefix) != conj_ids}
+        if changed:
+            self.driver._add_flows(rules.create_flows_for_ip_addresses(
+                changed, direction, ethertype, vlan_tag))
 
     def update_flows_for_vlan(self, vlan_tag):
         """Install action=conjunction(conj_id, 1/2) flows,
@@ -370,11 +382,13 @@ class ConjIPFlowManager(object):
             # no address overlaps.
             addr_to_conj = self._build_addr_conj_id_map(
                 ethertype, sg_conj_id_map)
+            prefix_to_conj = rules.merge_ip_addresses_by_conj_ids(
+                addr_to_conj)
             self._update_flows_for_vlan_subr(
                 direction, ethertype, vlan_tag,
                 self.flow_state[vlan_tag][(direction, ethertype)],
-                addr_to_conj)
-            self.flow_state[vlan_tag][(direction, ethertype)] = addr_to_conj
+                prefix_to_conj)
+            self.flow_state[vlan_tag][(direction, ethertype)] = prefix_to_conj
 
     def add(self, vlan_tag, sg_id, remote_sg_id, direction, ethertype,
             priority_offset):
@@ -498,6 +512,36 @@ class OVSFirewallDriver(firewall.FirewallDriver):
         else:
             self.int_br.br.add_flow(**kwargs)
 
+    def _add_flows(self, flows):
+        """Add a list of flows, in a single bundle when not deferred."""
+        for kwargs in flows:
+            dl_type = kwargs.get('dl_type')
+            create_reg_numbers(kwargs)
+            if isinstance(dl_type, int):
+                kwargs['dl_type'] = "0x{:04x}".format(dl_type)
+            if self._update_cookie:
+                kwargs['cookie'] = self._update_cookie
+        self._do_action_flows('add', flows)
+
+    def _delete_flows_bulk(self, flows):
+        """Delete a list of flows, in a single bundle when not deferred."""
+        for kwargs in flows:
+            create_reg_numbers(kwargs)
+        self._do_action_flows('del', flows)
+
+    def _do_action_flows(self, action, flows):
+        if not flows:
+            return
+        if self._deferred:
+            # The deferred bridge sends all its flows in large bundles
+            # when applied.
+            action_flow = (self.int_br.add_flow if action == 'add'
+                           else self.int_br.delete_flows)
+            for kwargs in flows:
+                action_flow(**kwargs)
+        else:
+            self.int_br.br.do_action_flows(action, flows, use_bundle=True)
+
     def _delete_flows(self, **kwargs):
         create_reg_numbers(kwargs)
         if self._deferred:
@@ -1422,15 +1466,15 @@ class OVSFirewallDriver(firewall.FirewallDriver):
         if not cfg.CONF.AGENT.explicitly_egress_direct:
             return
 
-        for ip_addr in ip_addresses:
-            # Generate deletion template with bogus conj_id.
-            flows = rules.create_flows_for_ip_address(
-                ip_addr, direction, ethertype, vlan_tag, [0])
-            for f in flows:
-                # The following del statements are partly for
-                # complying the OpenFlow spec. It forbids the use of
-                # these field in non-strict delete flow messages, and
-                # the actions field is bogus anyway.
-                del f['actions']
-                del f['priority']
-                self._delete_flows(**f)
+        # Generate deletion templates with bogus conj_id.
+        flows = rules.create_flows_for_ip_addresses(
+            {ip_addr: [0] for ip_addr in ip_addresses},
+            direction, ethertype, vlan_tag)
+        for f in flows:
+            # The following del statements are partly for
+            # complying the OpenFlow spec. It forbids the use of
+            # these field in non-strict delete flow messages, and
+            # the actions field is bogus anyway.
+            del f['actions']
+            del f['priority']
+        self._delete_flows_bulk(flows)
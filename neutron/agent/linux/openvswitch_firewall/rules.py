@@ -331,6 +331,81 @@ def create_flows_for_ip_address(ip_address, direction, ethertype,
     return result
 
 
+def merge_ip_addresses_by_conj_ids(addr_to_conj):
+    """Merge addresses sharing the same conj_ids into CIDR ranges
+
+    :param addr_to_conj: dict of ip address -> list of conj_ids, as built
+                         from the members of the remote groups
+    :returns: dict of ip prefix -> sorted list of conj_ids, where adjacent
+              or overlapping addresses referenced by the exact same set of
+              conj_ids are collapsed into the smallest list of prefixes.
+    """
+    addrs_by_conj_ids = collections.defaultdict(list)
+    for addr, conj_ids in addr_to_conj.items():
+        addrs_by_conj_ids[frozenset(conj_ids)].append(addr)
+
+    prefix_to_conj = collections.defaultdict(set)
+    for conj_ids, addrs in addrs_by_conj_ids.items():
+        for cidr in netaddr.cidr_merge(addrs):
+            prefix_to_conj[str(cidr)].update(conj_ids)
+    return {prefix: sorted(conj_ids)
+            for prefix, conj_ids in prefix_to_conj.items()}
+
+
+def create_flows_for_ip_addresses(prefix_to_conj, direction, ethertype,
+                                  vlan_tag):
+    """Create flows for a whole set of ip prefixes derived from
+    remote_group_id
+
+    This is the batched counterpart of create_flows_for_ip_address: the
+    flow template is computed once and the conjunction actions are
+    computed once per distinct list of conj_ids, so that the flows of
+    remote groups with thousands of members can be compiled in one pass.
+    """
+    base_template = {
+        'dl_type': ovsfw_consts.ethertype_to_dl_type_map[ethertype],
+        'reg_net': vlan_tag,  # needed for project separation
+    }
+    if direction == n_consts.EGRESS_DIRECTION:
+        base_template['table'] = ovs_consts.RULES_EGRESS_TABLE
+    elif direction == n_consts.INGRESS_DIRECTION:
+        base_template['table'] = ovs_consts.RULES_INGRESS_TABLE
+    # The addresses are already filtered per ethertype.
+    ip_ver = (n_consts.IP_VERSION_4 if ethertype == n_consts.IPv4
+              else n_consts.IP_VERSION_6)
+    field = FLOW_FIELD_FOR_IPVER_AND_DIRECTION[(ip_ver, direction)]
+
+    # conj_ids tuple -> list of (priority, [conjunction actions])
+    actions_cache = {}
+    result = []
+    for ip_prefix, conj_ids in prefix_to_conj.items():
+        key = tuple(conj_ids)
+        actions = actions_cache.get(key)
+        if actions is None:
+            conj_id_lists = [[] for i in range(4)]
+            for conj_id in conj_ids:
+                conj_id_lists[
+                    _flow_priority_offset_from_conj_id(conj_id)].append(
+                        conj_id)
+            actions = []
+            for offset, conj_id_list in enumerate(conj_id_lists):
+                if not conj_id_list:
+                    continue
+                flows = substitute_conjunction_actions(
+                    [{}], 1, conj_id_list)
+                actions.append((70 + offset, flows))
+            actions_cache[key] = actions
+
+        for priority, flows in actions:
+            for flow in flows:
+                new_flow = dict(base_template)
+                new_flow[field] = ip_prefix
+                new_flow['priority'] = priority
+                new_flow.update(flow)
+                result.append(new_flow)
+    return result
+
+
 def create_accept_flows(flow):
     flow['ct_state'] = CT_STATES[0]
     result = [flow.copy()]
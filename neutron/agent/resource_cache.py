@@ -61,6 +61,25 @@ class RemoteResourceCache(object):
                                     agent_restarted=agent_restarted)
         return self._type_cache(rtype).get(obj_id)
 
+    def get_resources_by_ids(self, rtype, obj_ids, agent_restarted=False):
+        """Returns a dict of obj_id to resource, None if it doesn't exist.
+
+        The resources which are not cached yet are fetched from the server
+        with a single query.
+        """
+        deleted_ids = self._deleted_ids_by_type[rtype]
+        type_cache = self._type_cache(rtype)
+        missing = tuple(obj_id for obj_id in obj_ids
+                        if obj_id not in deleted_ids and
+                        not type_cache.get(obj_id))
+        if missing:
+            # try server in case objects existed before agent start
+            self._flood_cache_for_query(rtype, id=missing,
+                                        agent_restarted=agent_restarted)
+        return {obj_id: (None if obj_id in deleted_ids
+                         else type_cache.get(obj_id))
+                for obj_id in obj_ids}
+
     def _flood_cache_for_query(self, rtype, agent_restarted=False,
                                **filter_kwargs):
         """Load info from server for first query.
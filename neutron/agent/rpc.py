@@ -301,6 +301,7 @@ class CacheBackedPluginApi(PluginApi):
                                                     agent_id, host=None,
                                                     agent_restarted=False):
         result = {'devices': [], 'failed_devices': []}
+        self._prefetch_devices_resources(devices, agent_restarted)
         for device in devices:
             try:
                 result['devices'].append(
@@ -311,6 +312,24 @@ class CacheBackedPluginApi(PluginApi):
                 result['failed_devices'].append(device)
         return result
 
+    def _prefetch_devices_resources(self, devices, agent_restarted=False):
+        """Load the ports of devices and their networks in the cache.
+
+        The resources missing from the cache are fetched from the server
+        with one query per resource type instead of one query per device.
+        """
+        try:
+            ports = self.remote_resource_cache.get_resources_by_ids(
+                resources.PORT, devices, agent_restarted)
+            self.remote_resource_cache.get_resources_by_ids(
+                resources.NETWORK,
+                {port.network_id for port in ports.values() if port})
+        except Exception:
+            # Devices are fetched one by one, and failures reported per
+            # device, by get_device_details.
+            LOG.warning("Failed to prefetch details of devices %s", devices,
+                        exc_info=True)
+
     def get_device_details(self, context, device, agent_id, host=None,
                            agent_restarted=False):
         port_obj = self.remote_resource_cache.get_resource_by_id(
@@ -371,6 +390,7 @@ class CacheBackedPluginApi(PluginApi):
         return entry
 
     def get_devices_details_list(self, context, devices, agent_id, host=None):
+        self._prefetch_devices_resources(devices)
         return [self.get_device_details(context, device, agent_id, host)
                 for device in devices]
 
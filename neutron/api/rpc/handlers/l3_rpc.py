@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+
 from neutron_lib.api.definitions import portbindings
 from neutron_lib.api import extensions
 from neutron_lib import constants
@@ -25,6 +27,9 @@ from neutron_lib.plugins import directory
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
+from oslo_serialization import jsonutils
+
+from neutron.common import _constants as n_const
 
 
 LOG = logging.getLogger(__name__)
@@ -47,7 +52,9 @@ class L3RpcCallback(object):
     # 1.10 Added update_all_ha_network_port_statuses
     # 1.11 Added get_host_ha_router_count
     # 1.12 Added get_networks
-    target = oslo_messaging.Target(version='1.12')
+    # 1.13 Not used, kept in sync with the L3PluginApi history
+    # 1.14 Added router_revisions to sync_routers
+    target = oslo_messaging.Target(version='1.14')
 
     @property
     def plugin(self):
@@ -109,12 +116,18 @@ class L3RpcCallback(object):
         """Sync routers according to filters to a specific agent.
 
         @param context: contain user information
-        @param kwargs: host, router_ids
+        @param kwargs: host, router_ids, router_revisions
         @return: a list of routers
                  with their interfaces and floating_ips
+
+        router_revisions is an optional dict of router ID to the sync
+        revision of the router held by the agent. The routers whose sync
+        revision did not change, or whose floating IPs only changed, are
+        returned partially, see _get_router_sync_delta.
         """
         router_ids = kwargs.get('router_ids')
         host = kwargs.get('host')
+        router_revisions = kwargs.get('router_revisions') or {}
         context = neutron_context.get_admin_context()
         LOG.debug('Sync routers for ids %(router_ids)s in %(host)s',
                   {'router_ids': router_ids,
@@ -128,12 +141,55 @@ class L3RpcCallback(object):
         pf_plugin = directory.get_plugin(plugin_constants.PORTFORWARDING)
         if pf_plugin:
             pf_plugin.sync_port_forwarding_fip(context, routers)
+        routers = [self._get_router_sync_delta(router, router_revisions)
+                   for router in routers]
         LOG.debug('The sync data for ids %(router_ids)s in %(host)s is: '
                   '%(routers)s', {'router_ids': router_ids,
                                   'host': host,
                                   'routers': routers})
         return routers
 
+    @staticmethod
+    def _get_digest(data):
+        return hashlib.sha1(
+            jsonutils.dump_as_bytes(data, sort_keys=True)).hexdigest()
+
+    def _get_router_sync_delta(self, router, router_revisions):
+        """Set the sync revision of router and return what the agent needs
+
+        The sync revision of a router is made of a digest of the router
+        without its floating IPs and of a digest of its floating IPs. The
+        router revision number alone does not change when its floating IPs,
+        the subnets of its interfaces or its HA state change, hence the
+        digests of the whole sync data.
+
+        If the agent holds the current sync revision, only the router ID and
+        its sync revision are returned. If only the floating IPs changed,
+        they are returned without the rest of the router. Otherwise the full
+        router is returned.
+        """
+        floatingips = router.get(constants.FLOATINGIP_KEY, [])
+        base = self._get_digest(
+            {k: v for k, v in router.items()
+             if k not in (constants.FLOATINGIP_KEY,
+                          n_const.ROUTER_SYNC_REVISION)})
+        revision = '%s:%s' % (base, self._get_digest(floatingips))
+        router[n_const.ROUTER_SYNC_REVISION] = revision
+        known_revision = router_revisions.get(router['id'])
+        if not known_revision:
+            return router
+        delta = {'id': router['id'],
+                 n_const.ROUTER_SYNC_REVISION: revision}
+        if known_revision == revision:
+            delta[n_const.ROUTER_SYNC_DELTA] = n_const.ROUTER_SYNC_UNCHANGED
+        elif known_revision.split(':')[0] == base:
+            delta[n_const.ROUTER_SYNC_DELTA] = (
+                n_const.ROUTER_SYNC_FLOATINGIPS)
+            delta[constants.FLOATINGIP_KEY] = floatingips
+        else:
+            return router
+        return delta
+
     def _routers_to_sync(self, context, router_ids, host=None):
         if extensions.is_extension_supported(
                 self.l3plugin, constants.L3_AGENT_SCHEDULER_EXT_ALIAS):
@@ -310,12 +310,12 @@ class Controller(object):
             # other resources. Must check authZ on them too.
             # Omit items from list that should not be visible
             tmp_list = []
+            checker = policy.RequestPolicyChecker(
+                request.context, pluralized=self._collection)
             for obj in obj_list:
                 self._set_parent_id_into_ext_resources_request(
                     request, obj, parent_id, is_get=True)
-                if policy.check(
-                        request.context, self._plugin_handlers[self.SHOW],
-                        obj, plugin=self._plugin, pluralized=self._collection):
+                if checker.check(self._plugin_handlers[self.SHOW], obj):
                     tmp_list.append(obj)
             obj_list = tmp_list
         # Use the first element in the list for discriminating which attributes
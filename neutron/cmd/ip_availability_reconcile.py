@@ -0,0 +1,44 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""Script to recompute the IP address counters of the IPAM subnets.
+
+The counters used by the network IP availability API are maintained by the
+neutron DB IPAM driver. This script creates the counters of the subnets
+created before they existed and fixes the ones which drifted.
+"""
+
+import sys
+
+from neutron_lib import context
+from oslo_config import cfg
+
+from neutron.common import config
+from neutron.ipam.drivers.neutrondb_ipam import db_api as ipam_db_api
+
+cli_opts = [
+    cfg.BoolOpt('dry-run', default=False,
+                help='Only report the counters which are missing or wrong.'),
+]
+
+
+def main():
+    cfg.CONF.register_cli_opts(cli_opts)
+    config.init(sys.argv[1:])
+    config.setup_logging()
+
+    fixed = ipam_db_api.reconcile_counters(context.get_admin_context(),
+                                           dry_run=cfg.CONF.dry_run)
+    for ipam_subnet_id, old, new in fixed:
+        print('IPAM subnet %s: counters %s -> %s' % (ipam_subnet_id, old,
+                                                     new))
+    print('%d IPAM subnet(s) %s' % (
+        len(fixed), 'to reconcile' if cfg.CONF.dry_run else 'reconciled'))
@@ -0,0 +1,33 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""Script to rebuild the RBAC visibility index from the RBAC policies.
+
+The index is maintained along with the RBAC policies, except when they are
+deleted by the database cascades of the objects they share. This script
+removes the rows left over and adds the missing ones.
+"""
+
+import sys
+
+from neutron_lib import context
+
+from neutron.common import config
+from neutron.db import rbac_db_mixin
+
+
+def main():
+    config.init(sys.argv[1:])
+    config.setup_logging()
+
+    removed, added = rbac_db_mixin.rebuild_rbac_visibility(
+        context.get_admin_context())
+    print('%d RBAC visibility row(s) removed, %d added' % (removed, added))
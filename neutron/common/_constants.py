@@ -64,3 +64,13 @@ RPC_RES_PROCESSING_STEP = 20
 # IPtables version to support --random-fully option.
 # Do not move this constant to neutron-lib, since it is temporary
 IPTABLES_RANDOM_FULLY_VERSION = '1.6.2'
+
+# Keys and values of the router sync data sent to the L3 agents. The sync
+# revision identifies the sync data of a router, a router whose sync revision
+# held by the agent is current is sent with the ROUTER_SYNC_UNCHANGED delta
+# and a router whose floating IPs only changed is sent with its floating IPs
+# and the ROUTER_SYNC_FLOATINGIPS delta.
+ROUTER_SYNC_REVISION = 'sync_revision'
+ROUTER_SYNC_DELTA = 'sync_delta'
+ROUTER_SYNC_UNCHANGED = 'unchanged'
+ROUTER_SYNC_FLOATINGIPS = 'floatingips'
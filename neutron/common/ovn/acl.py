@@ -339,11 +339,26 @@ def _acl_columns_name_severity_supported(nb_idl):
     return ('name' in columns) and ('severity' in columns)
 
 
+def _add_sg_rules_acls_for_port_group(ovn, security_group_id, rules,
+                                      keep_name_severity=True):
+    port_group = utils.ovn_port_group_name(security_group_id)
+    acls = []
+    for r in rules:
+        acl = _add_sg_rule_acl_for_port_group(port_group, r, ovn)
+        # Remove ACL log name and severity if not supported
+        if not keep_name_severity:
+            acl.pop('name')
+            acl.pop('severity')
+        acls.append(acl)
+    return acls
+
+
 def add_acls_for_sg_port_group(ovn, security_group, txn):
-    for r in security_group['security_group_rules']:
-        acl = _add_sg_rule_acl_for_port_group(
-            utils.ovn_port_group_name(security_group['id']), r, ovn)
-        txn.add(ovn.pg_acl_add(**acl))
+    acls = _add_sg_rules_acls_for_port_group(
+        ovn, security_group['id'], security_group['security_group_rules'])
+    if acls:
+        txn.add(ovn.update_port_group_acls(
+            utils.ovn_port_group_name(security_group['id']), acls_add=acls))
 
 
 def update_acls_for_security_group(plugin,
@@ -353,7 +368,23 @@ def update_acls_for_security_group(plugin,
                                    security_group_rule,
                                    sg_ports_cache=None,
                                    is_add_acl=True):
-
+    update_acls_for_security_group_rules(
+        plugin, admin_context, ovn, security_group_id,
+        [security_group_rule], sg_ports_cache=sg_ports_cache,
+        is_add_acl=is_add_acl)
+
+
+def update_acls_for_security_group_rules(plugin,
+                                         admin_context,
+                                         ovn,
+                                         security_group_id,
+                                         security_group_rules,
+                                         sg_ports_cache=None,
+                                         is_add_acl=True):
+    """Add or delete the ACLs of rules of a security group at once.
+
+    The ACLs of all the rules are committed in a single OVN NB transaction.
+    """
     # Skip ACLs if security groups aren't enabled
     if not is_sg_enabled():
         return
@@ -365,19 +396,18 @@ def update_acls_for_security_group(plugin,
     # Otherwise, keep the old behavior.
     if (ovn.is_port_groups_supported() and
             not ovn.get_address_set(security_group_id)):
-        acl = _add_sg_rule_acl_for_port_group(
-            utils.ovn_port_group_name(security_group_id),
-            security_group_rule, ovn)
-        # Remove ACL log name and severity if not supported
+        acls = _add_sg_rules_acls_for_port_group(
+            ovn, security_group_id, security_group_rules,
+            keep_name_severity=keep_name_severity)
         if is_add_acl:
-            if not keep_name_severity:
-                acl.pop('name')
-                acl.pop('severity')
-            ovn.pg_acl_add(**acl).execute(check_error=True)
+            cmd = ovn.update_port_group_acls(
+                utils.ovn_port_group_name(security_group_id),
+                acls_add=acls, if_exists=False)
         else:
-            ovn.pg_acl_del(acl['port_group'], acl['direction'],
-                           acl['priority'], acl['match']).execute(
-                check_error=True)
+            cmd = ovn.update_port_group_acls(
+                utils.ovn_port_group_name(security_group_id),
+                acls_del=acls, if_exists=False)
+        cmd.execute(check_error=True)
         return
 
     # Get the security group ports.
@@ -395,36 +425,35 @@ def update_acls_for_security_group(plugin,
     if not port_list:
         return
 
-    acl_new_values_dict = {}
-    update_port_list = []
-
-    # NOTE(lizk): We can directly locate the affected acl records,
-    # so no need to compare new acl values with existing acl objects.
-    for port in port_list:
-        # Skip trusted port
-        if utils.is_lsp_trusted(port):
-            continue
-
-        update_port_list.append(port)
-        acl = _add_sg_rule_acl_for_port(port, security_group_rule)
-        # Remove lport and lswitch since we don't need them
-        acl.pop('lport')
-        acl.pop('lswitch')
-        # Remove ACL log name and severity if not supported,
-        if not keep_name_severity:
-            acl.pop('name')
-            acl.pop('severity')
-        acl_new_values_dict[port['id']] = acl
-
+    # Skip trusted port
+    update_port_list = [port for port in port_list
+                        if not utils.is_lsp_trusted(port)]
     if not update_port_list:
         return
     lswitch_names = {p['network_id'] for p in update_port_list}
 
-    ovn.update_acls(list(lswitch_names),
-                    iter(update_port_list),
-                    acl_new_values_dict,
-                    need_compare=False,
-                    is_add_acl=is_add_acl).execute(check_error=True)
+    with ovn.transaction(check_error=True) as txn:
+        for security_group_rule in security_group_rules:
+            acl_new_values_dict = {}
+            # NOTE(lizk): We can directly locate the affected acl records,
+            # so no need to compare new acl values with existing acl
+            # objects.
+            for port in update_port_list:
+                acl = _add_sg_rule_acl_for_port(port, security_group_rule)
+                # Remove lport and lswitch since we don't need them
+                acl.pop('lport')
+                acl.pop('lswitch')
+                # Remove ACL log name and severity if not supported,
+                if not keep_name_severity:
+                    acl.pop('name')
+                    acl.pop('severity')
+                acl_new_values_dict[port['id']] = acl
+
+            txn.add(ovn.update_acls(list(lswitch_names),
+                                    iter(update_port_list),
+                                    acl_new_values_dict,
+                                    need_compare=False,
+                                    is_add_acl=is_add_acl))
 
 
 def add_acls(plugin, admin_context, port, sg_cache, subnet_cache, ovn):
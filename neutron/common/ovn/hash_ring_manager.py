@@ -13,9 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import datetime
+import weakref
 
 from oslo_log import log
+from oslo_reports import guru_meditation_report as gmr
+from oslo_reports.models import with_default_views as mwdv
 from oslo_utils import timeutils
 import six
 from tooz import hashring
@@ -27,15 +31,23 @@ from neutron_lib import context
 
 LOG = log.getLogger(__name__)
 
+_managers = weakref.WeakSet()
+
 
 class HashRingManager(object):
 
     def __init__(self, group_name):
         self._hash_ring = None
         self._last_time_loaded = None
+        self._generation = None
         self._cache_startup_timeout = True
         self._group = group_name
         self.admin_ctx = context.get_admin_context()
+        self._loads = 0
+        self._generation_checks = 0
+        # Number of keys hashed to each node of the ring by this worker
+        self._distribution = collections.Counter()
+        _managers.add(self)
 
     @property
     def _wait_startup_before_caching(self):
@@ -61,25 +73,42 @@ class HashRingManager(object):
 
         return dont_cache
 
+    def _build_hash_ring(self):
+        # Read the generation first, a change of the nodes while they are
+        # loaded is then picked up by the next check
+        self._generation = db_hash_ring.get_generation(
+            self.admin_ctx, self._group)
+        nodes = db_hash_ring.get_active_nodes(
+            self.admin_ctx,
+            constants.HASH_RING_NODES_TIMEOUT, self._group)
+        self._hash_ring = hashring.HashRing({node.node_uuid
+                                             for node in nodes})
+        self._loads += 1
+        for node_uuid in set(self._distribution) - set(self._hash_ring.nodes):
+            del self._distribution[node_uuid]
+
     def _load_hash_ring(self, refresh=False):
         cache_timeout = timeutils.utcnow() - datetime.timedelta(
             seconds=constants.HASH_RING_CACHE_TIMEOUT)
 
-        # Refresh the cache if:
+        # Rebuild the hash ring if:
         # - Refreshed is forced (refresh=True)
-        # - Service just started (_wait_startup_before_caching)
         # - Hash Ring is not yet instantiated
-        # - Cache has timed out
         if (refresh or
-                self._wait_startup_before_caching or
                 self._hash_ring is None or
-                not self._hash_ring.nodes or
+                not self._hash_ring.nodes):
+            self._build_hash_ring()
+            self._last_time_loaded = timeutils.utcnow()
+        # Otherwise, only rebuild it if the generation of the group changed
+        # and check it if:
+        # - Service just started (_wait_startup_before_caching)
+        # - Cache has timed out
+        elif (self._wait_startup_before_caching or
                 cache_timeout >= self._last_time_loaded):
-            nodes = db_hash_ring.get_active_nodes(
-                self.admin_ctx,
-                constants.HASH_RING_NODES_TIMEOUT, self._group)
-            self._hash_ring = hashring.HashRing({node.node_uuid
-                                                 for node in nodes})
+            self._generation_checks += 1
+            if self._generation != db_hash_ring.get_generation(
+                    self.admin_ctx, self._group):
+                self._build_hash_ring()
             self._last_time_loaded = timeutils.utcnow()
 
     def refresh(self):
@@ -95,6 +124,37 @@ class HashRingManager(object):
         try:
             # We need to pop the value from the set. If empty,
             # KeyError is raised
-            return self._hash_ring[key].pop()
+            node_uuid = self._hash_ring[key].pop()
         except KeyError:
             raise exceptions.HashRingIsEmpty(key=key)
+        self._distribution[node_uuid] += 1
+        return node_uuid
+
+    def get_stats(self):
+        """Return the state of the ring and how the keys are distributed."""
+        distribution = dict(self._distribution)
+        nodes = len(self._hash_ring.nodes) if self._hash_ring else 0
+        mean = float(sum(distribution.values())) / nodes if nodes else 0.0
+        return {'generation': self._generation,
+                'nodes': nodes,
+                'loads': self._loads,
+                'generation_checks': self._generation_checks,
+                'distribution': distribution,
+                # Ratio of the busiest node to an even distribution
+                'imbalance': (max(distribution.values()) / mean
+                              if distribution and mean else 0.0)}
+
+
+def get_stats():
+    """Return the stats of each hash ring of this worker."""
+    stats = {}
+    for index, manager in enumerate(list(_managers)):
+        stats['%s-%d' % (manager._group, index)] = manager.get_stats()
+    return stats
+
+
+def _stats_report():
+    return mwdv.ModelWithDefaultViews(get_stats())
+
+
+gmr.TextGuruMeditation.register_section('Hash Ring', _stats_report)
@@ -139,6 +139,21 @@ IPTABLES_OPTS = [
                        "of iptables-save. This option should not be turned "
                        "on for production systems because it imposes a "
                        "performance penalty.")),
+    cfg.BoolOpt('iptables_incremental_apply', default=False,
+                help=_("Keep an in-memory copy of the iptables state last "
+                       "applied by the agent and compute changes against it "
+                       "instead of running iptables-save on every apply. "
+                       "Only tables with modified chains are sent to "
+                       "iptables-restore. A full resync from iptables-save "
+                       "is done on a restore failure and every "
+                       "iptables_full_sync_interval seconds. This option "
+                       "should only be enabled when no other tool modifies "
+                       "the chains managed by the agent.")),
+    cfg.IntOpt('iptables_full_sync_interval', default=600, min=0,
+               help=_("Interval in seconds between full resyncs of the "
+                      "iptables state from iptables-save when "
+                      "iptables_incremental_apply is enabled. Use 0 to only "
+                      "resync when a mismatch is detected.")),
 ]
 
 PROCESS_MONITOR_OPTS = [
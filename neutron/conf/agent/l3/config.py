@@ -106,6 +106,30 @@ OPTS = [
                        'the state change monitor. NOTE: Setting to True '
                        'could affect the data plane when stopping or '
                        'restarting the L3 agent.')),
+    cfg.IntOpt('router_processing_pool_min_size', default=8, min=1,
+               help=_('Minimum number of routers the L3 agent processes '
+                      'concurrently. The router processing pool grows with '
+                      'the number of routers hosted by the agent, between '
+                      'this value and router_processing_pool_max_size. '
+                      'Updates of a given router are always processed one '
+                      'at a time and in order.')),
+    cfg.IntOpt('router_processing_pool_max_size', default=32, min=1,
+               help=_('Maximum number of routers the L3 agent processes '
+                      'concurrently. Most of the router processing time is '
+                      'spent waiting for external commands, so hosts with '
+                      'many CPU cores can raise this value to process more '
+                      'routers in parallel during a full sync.')),
+    cfg.IntOpt('router_processing_workers', default=0, min=0,
+               help=_('Number of worker processes processing the routers, '
+                      'to spread the router processing over the CPU cores. '
+                      'The L3 agent process then only receives the '
+                      'notifications and synchronizes the routers, and '
+                      'every router is processed by the same worker, in its '
+                      'router processing pool, so that the updates of a '
+                      'router are still processed one at a time and in '
+                      'order. The default 0 processes the routers in the L3 '
+                      'agent process. Only supported in the legacy agent '
+                      'mode.')),
 ]
 
 
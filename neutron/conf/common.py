@@ -51,6 +51,14 @@ core_opts = [
                help=_("The maximum number of items returned in a single "
                       "response, value was 'infinite' or negative integer "
                       "means no limit")),
+    cfg.IntOpt('list_streaming_chunk_size', default=0, min=0,
+               help=_("Number of items fetched from the database at a time "
+                      "when streaming the response of a GET request on a "
+                      "collection which is neither limited nor paginated. "
+                      "The items are filtered and serialized chunk by chunk, "
+                      "which bounds the memory used by large responses. "
+                      "This is only used by plugins supporting native "
+                      "pagination. 0 disables the streaming of responses.")),
     cfg.ListOpt('default_availability_zones', default=[],
                 help=_("Default value of availability zone hints. The "
                        "availability zone aware schedulers use this when "
@@ -121,6 +129,29 @@ core_opts = [
                help=_("Neutron IPAM (IP address management) driver to use. "
                       "By default, the reference implementation of the "
                       "Neutron IPAM driver is used.")),
+    cfg.IntOpt('ipam_allocation_windows', default=16, min=1,
+               help=_("Number of windows the free addresses of a subnet are "
+                      "split into by the reference IPAM driver. Each API "
+                      "worker draws the random addresses it allocates from "
+                      "a different window, so that concurrent allocations "
+                      "on a subnet seldom pick the same address and have to "
+                      "be retried. Set to 1 to draw from all the free "
+                      "addresses.")),
+    cfg.BoolOpt('enable_baked_queries', default=True,
+                help=_("If True, the queries of the hottest read paths of "
+                       "the core and ML2 plugins, such as the lookups of "
+                       "ports, networks and port bindings, are cached along "
+                       "with their compiled SQL statements, instead of "
+                       "being built and compiled on every call. The hit "
+                       "ratios of their caches are reported in the Guru "
+                       "Meditation Reports.")),
+    cfg.BoolOpt('rbac_visibility_index', default=False,
+                help=_("If True, the networks, subnets, security groups and "
+                       "QoS policies shared with a project through RBAC "
+                       "policies are looked up in the RBAC visibility index "
+                       "when the project lists them, instead of being "
+                       "matched against all the RBAC entries of the "
+                       "objects.")),
     cfg.BoolOpt('vlan_transparent', default=False,
                 help=_('If True, then allow plugins that support it to '
                        'create VLAN transparent networks.')),
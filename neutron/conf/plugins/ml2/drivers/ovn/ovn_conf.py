@@ -83,6 +83,13 @@ ovn_opts = [
                       'connection keepalive feature. If non-zero the value '
                       'will be forced to at least 1000 milliseconds. Defaults '
                       'to 60 seconds.')),
+    cfg.BoolOpt('ovn_sb_monitor_all_columns',
+                default=False,
+                help=_('Replicate all the columns of the OVN Southbound '
+                       'tables monitored by the Neutron server workers. By '
+                       'default, only the tables and columns read by the '
+                       'ML2/OVN mechanism driver and the OVN L3 plugin are '
+                       'replicated in the memory of each worker.')),
     cfg.StrOpt('neutron_sync_mode',
                default='log',
                choices=('off', 'log', 'repair'),
@@ -98,6 +105,19 @@ ovn_opts = [
                       ' create resources found in Neutron but not in OVN.'
                       ' Also remove resources from OVN'
                       ' that are no longer in Neutron.')),
+    cfg.IntOpt('neutron_sync_chunk_size',
+               default=500,
+               min=1,
+               help=_('The number of Neutron ports fetched and compared with '
+                      'the OVN_Northbound OVSDB at a time by the '
+                      'synchronization.')),
+    cfg.StrOpt('neutron_sync_checkpoint_file',
+               help=_('The file in which the synchronization of '
+                      'OVN_Northbound OVSDB with Neutron DB saves its '
+                      'progress. When set, an interrupted synchronization '
+                      'resumes from the last completed stage and chunk of '
+                      'ports instead of starting over. The file is removed '
+                      'once the synchronization completes.')),
     cfg.BoolOpt('ovn_l3_mode',
                 default=True,
                 deprecated_for_removal=True,
@@ -248,10 +268,22 @@ def get_ovn_ovsdb_probe_interval():
     return cfg.CONF.ovn.ovsdb_probe_interval
 
 
+def is_ovn_sb_monitor_all_columns():
+    return cfg.CONF.ovn.ovn_sb_monitor_all_columns
+
+
 def get_ovn_neutron_sync_mode():
     return cfg.CONF.ovn.neutron_sync_mode
 
 
+def get_ovn_neutron_sync_chunk_size():
+    return cfg.CONF.ovn.neutron_sync_chunk_size
+
+
+def get_ovn_neutron_sync_checkpoint_file():
+    return cfg.CONF.ovn.neutron_sync_checkpoint_file
+
+
 def is_ovn_l3():
     return cfg.CONF.ovn.ovn_l3_mode
 
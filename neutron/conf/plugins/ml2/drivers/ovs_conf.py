@@ -166,6 +166,14 @@ agent_opts = [
     cfg.BoolOpt('drop_flows_on_start', default=False,
                 help=_("Reset flow table on start. Setting this to True will "
                        "cause brief traffic interruption.")),
+    cfg.BoolOpt('reconcile_flows_on_start', default=False,
+                help=_("Reconcile the flows installed by the agent on start "
+                       "instead of reinstalling all of them with a new "
+                       "cookie. The flows are installed with a cookie "
+                       "stored in the bridge external_ids, and on restart "
+                       "the agent only installs and deletes the flows that "
+                       "differ from the ones on the bridges. Ignored when "
+                       "drop_flows_on_start is set.")),
     cfg.BoolOpt('tunnel_csum', default=False,
                 help=_("Set or un-set the tunnel header checksum on "
                        "outgoing IP packet carrying GRE/VXLAN tunnel.")),
@@ -20,6 +20,8 @@ from neutron._i18n import _
 
 QUOTA_DB_MODULE = 'neutron.db.quota.driver'
 QUOTA_DB_DRIVER = '%s.DbQuotaDriver' % QUOTA_DB_MODULE
+QUOTA_DB_COUNTER_MODULE = 'neutron.db.quota.driver_counter'
+QUOTA_DB_COUNTER_DRIVER = '%s.DbQuotaCounterDriver' % QUOTA_DB_COUNTER_MODULE
 QUOTA_CONF_DRIVER = 'neutron.quota.ConfDriver'
 QUOTAS_CFG_GROUP = 'QUOTAS'
 
@@ -61,6 +63,14 @@ core_quota_opts = [
                 help=_('Keep in track in the database of current resource '
                        'quota usage. Plugins which do not leverage the '
                        'neutron database should set this flag to False.')),
+    cfg.IntOpt('quota_usage_reconcile_interval',
+               default=600, min=0,
+               help=_('Interval, in seconds, between the reconciliations of '
+                      'the resource usage counters with the resources in '
+                      'the database, and the removals of the expired '
+                      'reservations, when the quota driver is %s. 0 '
+                      'disables the reconciliation.') %
+               QUOTA_DB_COUNTER_DRIVER),
 ]
 
 # security_group_quota_opts from neutron/extensions/securitygroup.py
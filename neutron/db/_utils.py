@@ -18,7 +18,9 @@ NOTE: This module shall not be used by external projects. It will be moved
 import contextlib
 
 from neutron_lib.db import api as db_api
+from neutron_lib.db import model_query as lib_model_query
 from neutron_lib.db import utils as db_utils
+from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_log import log as logging
 from oslo_utils import excutils
 
@@ -82,3 +84,71 @@ def model_query(context, model):
     if query_filter is not None:
         query = query.filter(query_filter)
     return query
+
+
+class KeysetMarker(object):
+    """The sort key values of a pagination marker.
+
+    It stands for the marker row when paginating a collection query: the
+    keyset criteria of the next page, ``(sort_key, id) > (:sort_key, :id)``,
+    only compare the values of the sort keys and of the unique keys appended
+    to them, so the rest of the row and its relationships are never loaded.
+    """
+
+    def __init__(self, values):
+        self._values = values
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_values'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def get_keyset_marker(context, model, sorts, marker):
+    """Fetch the keyset values of a pagination marker.
+
+    :param context: The request context.
+    :param model: The model of the paginated collection.
+    :param sorts: A list of (key, direction) tuples.
+    :param marker: The id of the marker row.
+    :returns: A KeysetMarker holding the values of the sort keys and of the
+        first set of unique keys of the marker row, or None if the row does
+        not exist or is not visible in the context.
+    """
+    keys = [key for key, _direction in sorts or []]
+    unique_keys = sa_utils.get_unique_keys(model)
+    for key in (unique_keys[0] if unique_keys else ['id']):
+        if key not in keys:
+            keys.append(key)
+    query = lib_model_query.query_with_hooks(context, model)
+    query = query.with_entities(*[getattr(model, key) for key in keys])
+    row = query.filter(model.id == marker).first()
+    if row is None:
+        return None
+    return KeysetMarker(dict(zip(keys, row)))
+
+
+def get_marker_obj(plugin, context, resource, model, sorts, limit, marker):
+    """Retrieve the keyset values of a resource marker.
+
+    It is the keyset counterpart of the neutron-lib get_marker_obj: only the
+    columns compared by the pagination criteria are loaded.
+
+    :param plugin: The plugin processing the request.
+    :param context: The request context.
+    :param resource: The resource name.
+    :param model: The model of the resource.
+    :param sorts: A list of (key, direction) tuples.
+    :param limit: Indicates if pagination is in effect.
+    :param marker: The id of the marker object.
+    :returns: The KeysetMarker of the marker if limit and marker are given.
+    """
+    if not (limit and marker):
+        return None
+    marker_obj = get_keyset_marker(context, model, sorts, marker)
+    if marker_obj is None:
+        # Let the plugin raise the not found error of the resource
+        return db_utils.get_marker_obj(plugin, context, resource, limit,
+                                       marker)
+    return marker_obj
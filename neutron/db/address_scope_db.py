@@ -37,10 +37,11 @@ class AddressScopeDbMixin(ext_address_scope.AddressScopePluginBase):
     @staticmethod
     def _make_address_scope_dict(address_scope, fields=None):
         res = {'id': address_scope['id'],
-               'name': address_scope['name'],
-               'tenant_id': address_scope['tenant_id'],
-               'shared': address_scope['shared'],
-               'ip_version': address_scope['ip_version']}
+               'tenant_id': address_scope['tenant_id']}
+        # only read the requested fields, the others may not be loaded
+        for key in ('name', 'shared', 'ip_version'):
+            if not fields or key in fields:
+                res[key] = address_scope[key]
         return db_utils.resource_fields(res, fields)
 
     def _get_address_scope(self, context, id):
@@ -102,7 +103,7 @@ class AddressScopeDbMixin(ext_address_scope.AddressScopePluginBase):
                            page_reverse=False):
         pager = base_obj.Pager(sorts, limit, page_reverse, marker)
         address_scopes = obj_addr_scope.AddressScope.get_objects(
-            context, _pager=pager, **filters)
+            context, _pager=pager, fields=fields, **filters)
 
         return [
             self._make_address_scope_dict(addr_scope, fields)
@@ -0,0 +1,189 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Baked queries of the hottest read paths of the plugins.
+
+Building a SQLAlchemy query and compiling it to SQL costs more than running
+it for the lookups done on every API and RPC call. These queries are built
+with the SQLAlchemy baked query extension: the query and its SQL are cached
+for each shape of the query, and only the values of its parameters change
+from one call to another.
+"""
+
+from neutron_lib.db import model_query
+from neutron_lib.db import utils as db_utils
+from oslo_config import cfg
+from oslo_reports import guru_meditation_report as gmr
+from oslo_reports.models import with_default_views as mwdv
+import sqlalchemy as sa
+from sqlalchemy.ext import baked
+from sqlalchemy import util as sa_util
+
+# Number of shapes of a query, and of their compiled statements, cached
+CACHE_SIZE = 100
+
+_baked_queries = {}
+
+
+class _QueryCache(sa_util.LRUCache):
+    """Cache of a baked query counting its hits and misses."""
+
+    def __init__(self, size):
+        super(_QueryCache, self).__init__(size)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        # NOTE: the baked queries, their compiled statements and the
+        # queries of their subquery loaders are all looked up with get(),
+        # the hits and misses count the lookups of all of them.
+        item = super(_QueryCache, self).get(key, default)
+        if item is default:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+
+class BakedQuery(object):
+    """A baked query reporting the hit ratio of its cache.
+
+    :param name: the name the hit ratio of the query is reported with
+    :param initial_fn: a callable building the query from a session, its
+        criteria must use bind parameters rather than literal values
+    """
+
+    def __init__(self, name, initial_fn):
+        self.name = name
+        self._cache = _QueryCache(CACHE_SIZE)
+        self._query = baked.BakedQuery(self._cache, initial_fn)
+        _baked_queries[name] = self
+
+    def __call__(self, session, criteria=()):
+        """Return the query for a session.
+
+        :param session: the session to run the query with
+        :param criteria: (fn, key) tuples of the criteria to add to the
+            query, the keys identifying their shape in the cache
+        :returns: a baked query result, or None if the baked queries are
+            disabled, in which case the caller builds the query itself
+        """
+        if not cfg.CONF.enable_baked_queries:
+            return None
+        query = self._query
+        for fn, key in criteria:
+            query = query.with_criteria(fn, key)
+        return query(session)
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+
+def get_stats():
+    """Return the hits, misses and hit ratio of each baked query."""
+    stats = {}
+    for name, query in _baked_queries.items():
+        lookups = query.hits + query.misses
+        stats[name] = {'hits': query.hits,
+                       'misses': query.misses,
+                       'hit_ratio': (float(query.hits) / lookups
+                                     if lookups else 0.0)}
+    return stats
+
+
+def _stats_report():
+    return mwdv.ModelWithDefaultViews(get_stats())
+
+
+gmr.TextGuruMeditation.register_section('Baked Queries', _stats_report)
+
+
+def _get_by_id_query(model):
+    name = 'get_%s_by_id' % model.__tablename__
+    if name not in _baked_queries:
+        BakedQuery(name, lambda s: s.query(model).filter(
+            model.id == sa.bindparam('id')))
+    return _baked_queries[name]
+
+
+def get_by_id(context, model, object_id):
+    """Query a model for a specific object.
+
+    It is model_query.get_by_id with the query baked for the contexts which
+    are not scoped to a project, for which the model query hooks leave the
+    query unchanged.
+
+    :param context: The context to use in the query.
+    :param model: The model to query.
+    :param object_id: The ID of the object to query for.
+    :returns: The object with the given object_id for the said model.
+    """
+    query = None
+    if not db_utils.model_query_scope_is_project(context, model):
+        query = _get_by_id_query(model)(context.session)
+    if query is None:
+        return model_query.get_by_id(context, model, object_id)
+    return query.params(id=object_id).one()
+
+
+def _get_column_filter_criteria(model, filters, custom_filters):
+    criteria = []
+    columns = sa.inspect(model).columns
+    for key in sorted(filters):
+        values = filters[key]
+        # only the IN clauses of apply_filters can be baked
+        if (key in custom_filters or key not in columns or
+                not isinstance(values, (list, set, tuple))):
+            return None
+        if not values or None in values:
+            return None
+        criteria.append(
+            (lambda q, key=key: q.filter(getattr(model, key).in_(
+                sa.bindparam(key, expanding=True))), key))
+    return criteria
+
+
+def get_collection_query(context, name, model, filters, custom_filters=()):
+    """Get the baked query of a collection filtered on its columns.
+
+    It is the baked counterpart of model_query.get_collection_query for the
+    contexts which are not scoped to a project and for the filters matching
+    the columns of the model with lists of values, the queries being cached
+    for each set of filtered columns.
+
+    :param context: The context to use for the DB session.
+    :param name: The name of the baked query.
+    :param model: The model to use.
+    :param filters: The filters to apply in the query.
+    :param custom_filters: The filters the caller applies itself rather than
+        with model_query.apply_filters, the queries using them are not baked.
+    :returns: The baked query, or None if the query can not be baked or the
+        baked queries are disabled, in which case the caller is to build the
+        query with model_query.get_collection_query.
+    """
+    if db_utils.model_query_scope_is_project(context, model):
+        return None
+    filters = filters or {}
+    criteria = _get_column_filter_criteria(model, filters, custom_filters)
+    if criteria is None:
+        return None
+    if name not in _baked_queries:
+        BakedQuery(name, lambda s: s.query(model))
+    query = _baked_queries[name](context.session, criteria)
+    if query is None:
+        return None
+    return query.params(**{key: list(filters[key]) for key in filters})
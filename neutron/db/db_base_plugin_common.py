@@ -34,6 +34,7 @@ from oslo_config import cfg
 from oslo_log import log as logging
 from sqlalchemy.orm import exc
 
+from neutron.db import baked_queries
 from neutron.db import models_v2
 from neutron.objects import base as base_obj
 from neutron.objects import ports as port_obj
@@ -246,7 +247,7 @@ class DbBasePluginCommon(object):
 
     def _get_network(self, context, id):
         try:
-            network = model_query.get_by_id(context, models_v2.Network, id)
+            network = baked_queries.get_by_id(context, models_v2.Network, id)
         except exc.NoResultFound:
             raise exceptions.NetworkNotFound(net_id=id)
         return network
@@ -275,7 +276,7 @@ class DbBasePluginCommon(object):
 
     def _get_port(self, context, id):
         try:
-            port = model_query.get_by_id(context, models_v2.Port, id)
+            port = baked_queries.get_by_id(context, models_v2.Port, id)
         except exc.NoResultFound:
             raise exceptions.PortNotFound(port_id=id)
         return port
@@ -291,7 +292,14 @@ class DbBasePluginCommon(object):
 
     @db_api.CONTEXT_READER
     def _get_subnets_by_network(self, context, network_id):
-        return subnet_obj.Subnet.get_objects(context, network_id=network_id)
+        query = baked_queries.get_collection_query(
+            context, 'get_subnets_by_network', models_v2.Subnet,
+            {'network_id': [network_id]})
+        if query is None:
+            return subnet_obj.Subnet.get_objects(context,
+                                                 network_id=network_id)
+        return [subnet_obj.Subnet._load_object(context, db_obj)
+                for db_obj in query]
 
     @db_api.CONTEXT_READER
     def _get_subnets_by_subnetpool(self, context, subnetpool_id):
@@ -49,6 +49,8 @@ from neutron._i18n import _
 from neutron.api.rpc.agentnotifiers import l3_rpc_agent_api
 from neutron.common import ipv6_utils
 from neutron.common import utils
+from neutron.db import _utils as db_utils
+from neutron.db import baked_queries
 from neutron.db import db_base_plugin_common
 from neutron.db import ipam_pluggable_backend
 from neutron.db import models_v2
@@ -77,6 +79,11 @@ LOG = logging.getLogger(__name__)
 # IP allocations being cleaned up by cascade.
 AUTO_DELETE_PORT_OWNERS = [constants.DEVICE_OWNER_DHCP]
 
+# The port filters applied by _get_ports_query rather than by the model query,
+# the queries using them are not baked.
+_PORTS_QUERY_CUSTOM_FILTERS = ('fixed_ips', 'mac_address',
+                               portbindings_def.VIF_TYPE)
+
 
 def _check_subnet_not_used(context, subnet_id):
     try:
@@ -156,10 +163,12 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
             query_hook=None,
             filter_hook=_port_filter_hook,
             result_filters=None)
+        rbac_mixin.register_rbac_visibility_hooks()
         return super(NeutronDbPluginV2, cls).__new__(cls, *args, **kwargs)
 
     def __init__(self):
         self.set_ipam_backend()
+        rbac_mixin.register_rbac_visibility_events()
         if (cfg.CONF.notify_nova_on_port_status_changes or
                 cfg.CONF.notify_nova_on_port_data_changes):
             # Import nova conditionally to support the use case of Neutron
@@ -521,8 +530,9 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
     def _get_networks(self, context, filters=None, fields=None,
                       sorts=None, limit=None, marker=None,
                       page_reverse=False):
-        marker_obj = ndb_utils.get_marker_obj(self, context, 'network',
-                                              limit, marker)
+        marker_obj = db_utils.get_marker_obj(self, context, 'network',
+                                             models_v2.Network, sorts,
+                                             limit, marker)
         return model_query.get_collection(
             context, models_v2.Network,
             # if caller needs postprocessing, it should implement it explicitly
@@ -1570,12 +1580,21 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
     def get_ports(self, context, filters=None, fields=None,
                   sorts=None, limit=None, marker=None,
                   page_reverse=False):
-        marker_obj = ndb_utils.get_marker_obj(self, context, 'port',
-                                              limit, marker)
-        query = self._get_ports_query(context, filters=filters,
-                                      sorts=sorts, limit=limit,
-                                      marker_obj=marker_obj,
-                                      page_reverse=page_reverse)
+        query = None
+        if not (sorts or limit or marker):
+            # NOTE: the queries only filtering on the columns of the ports
+            # are baked, the other filters are handled by _get_ports_query
+            query = baked_queries.get_collection_query(
+                context, 'get_ports', models_v2.Port, filters,
+                custom_filters=_PORTS_QUERY_CUSTOM_FILTERS)
+        if query is None:
+            marker_obj = db_utils.get_marker_obj(self, context, 'port',
+                                                 models_v2.Port, sorts,
+                                                 limit, marker)
+            query = self._get_ports_query(context, filters=filters,
+                                          sorts=sorts, limit=limit,
+                                          marker_obj=marker_obj,
+                                          page_reverse=page_reverse)
         items = [self._make_port_dict(c, fields) for c in query]
         if limit and page_reverse:
             items.reverse()
@@ -1583,7 +1602,12 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
 
     @db_api.retry_if_session_inactive()
     def get_ports_count(self, context, filters=None):
-        return self._get_ports_query(context, filters).count()
+        query = baked_queries.get_collection_query(
+            context, 'get_ports', models_v2.Port, filters,
+            custom_filters=_PORTS_QUERY_CUSTOM_FILTERS)
+        if query is None:
+            query = self._get_ports_query(context, filters)
+        return query.count()
 
     def _enforce_device_owner_not_router_intf_or_device_id(self, context,
                                                            device_owner,
@@ -528,8 +528,8 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
     def get_routers(self, context, filters=None, fields=None,
                     sorts=None, limit=None, marker=None,
                     page_reverse=False):
-        marker_obj = lib_db_utils.get_marker_obj(
-            self, context, 'router', limit, marker)
+        marker_obj = db_utils.get_marker_obj(
+            self, context, 'router', l3_models.Router, sorts, limit, marker)
         return model_query.get_collection(context, l3_models.Router,
                                           self._make_router_dict,
                                           filters=filters, fields=fields,
@@ -0,0 +1,37 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from alembic import op
+import sqlalchemy as sa
+
+"""add pending to ovn revision numbers
+
+Revision ID: 8e1f4b6c2a9d
+Revises: f399b54ed708
+Create Date: 2020-04-16 10:12:43.518630
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '8e1f4b6c2a9d'
+down_revision = 'f399b54ed708'
+
+
+def upgrade():
+    op.add_column('ovn_revision_numbers',
+                  sa.Column('pending', sa.Boolean(),
+                            server_default=sa.sql.false(), nullable=False))
+    op.create_index(op.f('ix_ovn_revision_numbers_pending'),
+                    'ovn_revision_numbers', ['pending'], unique=False)
+    op.create_index('ix_standardattributes_updated_at',
+                    'standardattributes', ['updated_at'], unique=False)
@@ -0,0 +1,37 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from alembic import op
+import sqlalchemy as sa
+
+"""add ovn hash ring generations
+
+Revision ID: b2e7c4d91f3a
+Revises: 8e1f4b6c2a9d
+Create Date: 2020-04-21 15:36:08.241187
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b2e7c4d91f3a'
+down_revision = '8e1f4b6c2a9d'
+
+
+def upgrade():
+    op.create_table(
+        'ovn_hash_ring_generations',
+        sa.Column('group_name', sa.String(length=256), nullable=False),
+        sa.Column('generation', sa.BigInteger, nullable=False,
+                  server_default='0'),
+        sa.PrimaryKeyConstraint('group_name'),
+    )
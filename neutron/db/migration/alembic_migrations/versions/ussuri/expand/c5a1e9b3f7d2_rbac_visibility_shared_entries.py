@@ -0,0 +1,57 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from alembic import op
+import sqlalchemy as sa
+
+"""rbac visibility of the shared entries
+
+Revision ID: c5a1e9b3f7d2
+Revises: b2e7c4d91f3a
+Create Date: 2020-04-28 10:12:47.516390
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'c5a1e9b3f7d2'
+down_revision = 'b2e7c4d91f3a'
+
+
+RBAC_TABLES = {'network': 'networkrbacs',
+               'qos_policy': 'qospolicyrbacs',
+               'security_group': 'securitygrouprbacs'}
+
+
+def upgrade():
+    # The index only holds the objects shared with the tenants, remove the
+    # rows added for the other actions of the rbac entries.
+    visibility = sa.Table(
+        'rbacvisibility', sa.MetaData(),
+        sa.Column('object_type', sa.String(length=255)),
+        sa.Column('target_tenant', sa.String(length=255)),
+        sa.Column('object_id', sa.String(length=36)))
+    for object_type, table_name in RBAC_TABLES.items():
+        rbac_table = sa.Table(
+            table_name, sa.MetaData(),
+            sa.Column('target_tenant', sa.String(length=255)),
+            sa.Column('object_id', sa.String(length=36)),
+            sa.Column('action', sa.String(length=255)))
+        op.execute(visibility.delete().where(
+            sa.and_(visibility.c.object_type == object_type,
+                    ~sa.exists().where(
+                        sa.and_(rbac_table.c.object_id ==
+                                visibility.c.object_id,
+                                rbac_table.c.target_tenant ==
+                                visibility.c.target_tenant,
+                                rbac_table.c.action ==
+                                'access_as_shared')))))
@@ -0,0 +1,41 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from alembic import op
+import sqlalchemy as sa
+
+"""add ipam subnet counters
+
+Revision ID: d8bdf05313f4
+Revises: 18a7e90ae768
+Create Date: 2020-04-02 10:12:37.418519
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'd8bdf05313f4'
+down_revision = '18a7e90ae768'
+
+
+def upgrade():
+    op.create_table(
+        'ipamsubnetcounters',
+        sa.Column('ipam_subnet_id', sa.String(length=36), nullable=False),
+        sa.Column('used_ips', sa.BigInteger(), nullable=False,
+                  server_default='0'),
+        sa.Column('total_ips', sa.String(length=40), nullable=False,
+                  server_default='0'),
+        sa.ForeignKeyConstraint(['ipam_subnet_id'], ['ipamsubnets.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ipam_subnet_id')
+    )
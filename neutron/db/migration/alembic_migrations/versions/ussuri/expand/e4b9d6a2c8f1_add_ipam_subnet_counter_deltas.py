@@ -0,0 +1,40 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from alembic import op
+import sqlalchemy as sa
+
+"""add ipam subnet counter deltas
+
+Revision ID: e4b9d6a2c8f1
+Revises: c5a1e9b3f7d2
+Create Date: 2020-05-04 16:27:03.184629
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9d6a2c8f1'
+down_revision = 'c5a1e9b3f7d2'
+
+
+def upgrade():
+    op.create_table(
+        'ipamsubnetcounterdeltas',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'),
+                  primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('ipam_subnet_id', sa.String(length=36), nullable=False,
+                  index=True),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ipam_subnet_id'], ['ipamsubnets.id'],
+                                ondelete='CASCADE'),
+    )
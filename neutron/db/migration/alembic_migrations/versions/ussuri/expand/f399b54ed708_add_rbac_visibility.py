@@ -0,0 +1,51 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from alembic import op
+import sqlalchemy as sa
+
+"""add rbac visibility
+
+Revision ID: f399b54ed708
+Revises: d8bdf05313f4
+Create Date: 2020-04-09 14:21:05.836217
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'f399b54ed708'
+down_revision = 'd8bdf05313f4'
+
+
+RBAC_TABLES = {'network': 'networkrbacs',
+               'qos_policy': 'qospolicyrbacs',
+               'security_group': 'securitygrouprbacs'}
+
+
+def upgrade():
+    visibility = op.create_table(
+        'rbacvisibility',
+        sa.Column('object_type', sa.String(length=255), nullable=False),
+        sa.Column('target_tenant', sa.String(length=255), nullable=False),
+        sa.Column('object_id', sa.String(length=36), nullable=False),
+        sa.PrimaryKeyConstraint('object_type', 'target_tenant', 'object_id')
+    )
+    for object_type, table_name in RBAC_TABLES.items():
+        rbac_table = sa.Table(
+            table_name, sa.MetaData(),
+            sa.Column('target_tenant', sa.String(length=255)),
+            sa.Column('object_id', sa.String(length=36)))
+        op.execute(visibility.insert().from_select(
+            ['object_type', 'target_tenant', 'object_id'],
+            sa.select([sa.literal(object_type), rbac_table.c.target_tenant,
+                       rbac_table.c.object_id]).distinct()))
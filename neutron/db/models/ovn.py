@@ -14,6 +14,7 @@
 #    under the License.
 
 from neutron_lib.db import model_base
+from neutron_lib.db import standard_attr
 import sqlalchemy as sa
 from sqlalchemy.dialects import sqlite
 
@@ -36,6 +37,11 @@ class OVNRevisionNumbers(model_base.BASEV2):
         default=sa.func.now(), nullable=False)
     updated_at = sa.Column(sa.TIMESTAMP, default=sa.func.now(),
                            onupdate=sa.func.now(), nullable=True)
+    # Set until the revision number is bumped once the resource is written
+    # to OVN, so the maintenance task only checks these rows and the
+    # resources updated since its previous run.
+    pending = sa.Column(sa.Boolean(), server_default=sa.sql.false(),
+                        default=True, nullable=False, index=True)
 
     __table_args__ = (
         sa.PrimaryKeyConstraint(
@@ -45,6 +51,11 @@ class OVNRevisionNumbers(model_base.BASEV2):
     )
 
 
+# The maintenance task looks up the resources updated since its previous run
+sa.Index('ix_standardattributes_updated_at',
+         standard_attr.StandardAttribute.updated_at)
+
+
 class OVNHashRing(model_base.BASEV2):
     __tablename__ = 'ovn_hash_ring'
 
@@ -61,3 +72,13 @@ class OVNHashRing(model_base.BASEV2):
             name='ovn_hash_ring0node_uuid0group_name'),
         model_base.BASEV2.__table_args__
     )
+
+
+class OVNHashRingGeneration(model_base.BASEV2):
+    __tablename__ = 'ovn_hash_ring_generations'
+
+    group_name = sa.Column(sa.String(256), primary_key=True)
+    # Bumped whenever the set of active nodes of the group changes, so the
+    # workers only rebuild their hash ring when it does
+    generation = sa.Column(sa.BigInteger, server_default='0',
+                           nullable=False)
@@ -19,6 +19,7 @@ import six
 from sqlalchemy import func
 
 import neutron.db.models_v2 as mod
+from neutron.ipam.drivers.neutrondb_ipam import db_models as ipam_mod
 
 NETWORK_ID = 'network_id'
 NETWORK_NAME = 'network_name'
@@ -68,6 +69,16 @@ class IpAvailabilityMixin(object):
         of subnet summaries. The used_ip and total_ip counts are returned at
         both levels.
         """
+        # Read the counters of the subnets when all of them have some, that
+        # is when they are managed by the neutron DB IPAM driver and were
+        # created or reconciled since the counters exist
+        rows = cls._build_network_counters_query(context, filters).all()
+        if all(row.used_ips is not None for row in rows if row.subnet_id):
+            result_dict = {}
+            for row in rows:
+                cls._add_result(row, result_dict,
+                                int(row.total_ips) if row.subnet_id else 0)
+            return list(six.viewvalues(result_dict))
 
         # Fetch total_ips by subnet
         subnet_total_ips_dict = cls._generate_subnet_total_ips_dict(context,
@@ -102,6 +113,35 @@ class IpAvailabilityMixin(object):
 
         return cls._adjust_query_for_filters(query, filters)
 
+    @classmethod
+    @db_api.CONTEXT_READER
+    def _build_network_counters_query(cls, context, filters):
+        # Generate a query to gather network/subnet/counters, the counters
+        # are None for the subnets without any. The used_ips counters are
+        # added the deltas recorded by the allocations since their last fold
+        deltas = context.session.query(
+            ipam_mod.IpamSubnetCounterDelta.ipam_subnet_id,
+            func.sum(ipam_mod.IpamSubnetCounterDelta.delta).label('delta')
+        ).group_by(ipam_mod.IpamSubnetCounterDelta.ipam_subnet_id).subquery()
+        query = context.session.query()
+        query = query.add_columns(*cls.network_used_ips_columns)
+        query = query.add_columns(
+            (ipam_mod.IpamSubnetCounter.used_ips +
+             func.coalesce(deltas.c.delta, 0)).label('used_ips'),
+            ipam_mod.IpamSubnetCounter.total_ips)
+        query = query.outerjoin(mod.Subnet,
+                                mod.Network.id == mod.Subnet.network_id)
+        query = query.outerjoin(
+            ipam_mod.IpamSubnet,
+            mod.Subnet.id == ipam_mod.IpamSubnet.neutron_subnet_id)
+        query = query.outerjoin(
+            ipam_mod.IpamSubnetCounter,
+            ipam_mod.IpamSubnet.id ==
+            ipam_mod.IpamSubnetCounter.ipam_subnet_id)
+        query = query.outerjoin(
+            deltas, ipam_mod.IpamSubnet.id == deltas.c.ipam_subnet_id)
+        return cls._adjust_query_for_filters(query, filters)
+
     @classmethod
     @db_api.CONTEXT_READER
     def _build_total_ips_query(cls, context, filters):
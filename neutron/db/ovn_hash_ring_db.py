@@ -34,14 +34,17 @@ def add_node(context, group_name, node_uuid=None):
     with db_api.CONTEXT_WRITER.using(context):
         context.session.add(ovn_models.OVNHashRing(
             node_uuid=node_uuid, hostname=CONF.host, group_name=group_name))
+    bump_generation(context, group_name)
     return node_uuid
 
 
 def remove_nodes_from_host(context, group_name):
     with db_api.CONTEXT_WRITER.using(context):
-        context.session.query(ovn_models.OVNHashRing).filter(
+        removed = context.session.query(ovn_models.OVNHashRing).filter(
             ovn_models.OVNHashRing.hostname == CONF.host,
             ovn_models.OVNHashRing.group_name == group_name).delete()
+    if removed:
+        bump_generation(context, group_name)
 
 
 def _touch(context, **filter_args):
@@ -67,3 +70,25 @@ def get_active_nodes(context, interval, group_name, from_host=False):
         if from_host:
             query = query.filter_by(hostname=CONF.host)
         return query.all()
+
+
+@db_api.retry_if_session_inactive()
+def bump_generation(context, group_name):
+    """Signal the workers that the active nodes of the group changed."""
+    # Bumped in its own transaction, so it is retried if another worker
+    # concurrently inserts the first row of the group
+    with db_api.CONTEXT_WRITER.using(context):
+        model = ovn_models.OVNHashRingGeneration
+        if not context.session.query(model).filter_by(
+                group_name=group_name).update(
+                {'generation': model.generation + 1},
+                synchronize_session=False):
+            context.session.add(model(group_name=group_name, generation=1))
+
+
+def get_generation(context, group_name):
+    with db_api.CONTEXT_READER.using(context):
+        row = context.session.query(
+            ovn_models.OVNHashRingGeneration.generation).filter_by(
+            group_name=group_name).one_or_none()
+    return row.generation if row else 0
@@ -109,7 +109,8 @@ def create_initial_revision(context, resource_uuid, resource_type,
             context, resource_uuid, resource_type)
         row = ovn_models.OVNRevisionNumbers(
             resource_uuid=resource_uuid, resource_type=resource_type,
-            standard_attr_id=std_attr_id, revision_number=revision_number)
+            standard_attr_id=std_attr_id, revision_number=revision_number,
+            pending=True)
         db_func(row)
 
 
@@ -178,6 +179,7 @@ def bump_revision(context, resource, resource_type):
                  'rev_num': revision_number, 'new_rev': row.revision_number})
             return
         row.revision_number = revision_number
+        row.pending = False
         context.session.merge(row)
     LOG.info('Successfully bumped revision number for resource '
              '%(res_uuid)s (type: %(res_type)s) to %(rev_num)d',
@@ -185,9 +187,29 @@ def bump_revision(context, resource, resource_type):
               'rev_num': revision_number})
 
 
-def get_inconsistent_resources(context):
+@db_api.retry_if_session_inactive()
+def mark_pending(context, rows):
+    """Mark the revision bump of the given rows as pending.
+
+    The rows are then checked by every run of the maintenance task until
+    their revision number is bumped.
+    """
+    resource_uuids = [row.resource_uuid for row in rows]
+    if not resource_uuids:
+        return
+    with context.session.begin(subtransactions=True):
+        context.session.query(ovn_models.OVNRevisionNumbers).filter(
+            ovn_models.OVNRevisionNumbers.resource_uuid.in_(resource_uuids),
+            ovn_models.OVNRevisionNumbers.pending == sa.false()).update(
+            {'pending': True}, synchronize_session=False)
+
+
+def get_inconsistent_resources(context, updated_since=None):
     """Get a list of inconsistent resources.
 
+    :param updated_since: if set, only the rows pending a revision bump and
+                          the resources updated since then are checked
+                          instead of the whole table.
     :returns: A list of objects which the revision number from the
               ovn_revision_number and standardattributes tables differs.
     """
@@ -207,6 +229,12 @@ def get_inconsistent_resources(context):
         query = query.filter(
             ovn_models.OVNRevisionNumbers.revision_number !=
             standard_attr.StandardAttribute.revision_number)
+        if updated_since is not None:
+            # Two queries, so each one can use the index of its column
+            query = query.filter(
+                ovn_models.OVNRevisionNumbers.pending == sa.true()).union(
+                query.filter(standard_attr.StandardAttribute.updated_at >=
+                             updated_since))
         return query.order_by(sort_order).all()
 
 
@@ -144,6 +144,63 @@ def provisioning_complete(context, object_id, object_type, entity):
                              context, resource_id=object_id))
 
 
+@db_api.retry_if_session_inactive()
+def provisioning_complete_bulk(context, object_ids, object_type, entity):
+    """Mark that the provisioning for object_ids has been completed by entity.
+
+    Bulk version of provisioning_complete: the provisioning components of all
+    the objects are removed and the remaining ones are looked up with a
+    constant number of queries. A PROVISIONING_COMPLETE event is still
+    published for every object without remaining provisioning components,
+    with the IDs of all of them in the 'batch' key of the payload metadata so
+    that subscribers can process them at once.
+
+    :param context: neutron api request context
+    :param object_ids: IDs of the objects that have been provisioned
+    :param object_type: callback resource type of the objects
+    :param entity: The entity that has provisioned the objects
+    :return: the list of IDs of the objects whose provisioning is complete
+    """
+    # this can't be called in a transaction to avoid REPEATABLE READ
+    # tricking us into thinking there are remaining provisioning components
+    if context.session.is_active:
+        raise RuntimeError(_("Must not be called in a transaction"))
+    standard_attr_ids = _get_standard_attr_ids(context, object_ids,
+                                               object_type)
+    if not standard_attr_ids:
+        return []
+    pb_obj.ProvisioningBlock.delete_objects(
+        context, standard_attr_id=list(standard_attr_ids), entity=entity)
+    blocked = _get_blocked_standard_attr_ids(context, standard_attr_ids)
+    completed = [object_id for standard_attr_id, object_id in
+                 standard_attr_ids.items() if standard_attr_id not in blocked]
+    LOG.debug("Provisioning complete for %(otype)s %(oids)s triggered by "
+              "entity %(entity)s.", {'otype': object_type, 'oids': completed,
+                                     'entity': entity})
+    for object_id in completed:
+        registry.publish(object_type, PROVISIONING_COMPLETE,
+                         'neutron.db.provisioning_blocks',
+                         payload=events.DBEventPayload(
+                             context, resource_id=object_id,
+                             metadata={'batch': completed}))
+    return completed
+
+
+@db_api.retry_if_session_inactive()
+def get_blocked_object_ids(context, object_ids, object_type):
+    """Return the set of IDs of the objects that have a provisioning block.
+
+    :param context: neutron api request context
+    :param object_ids: IDs of the objects to check
+    :param object_type: callback resource type of the objects
+    """
+    standard_attr_ids = _get_standard_attr_ids(context, object_ids,
+                                               object_type)
+    blocked = _get_blocked_standard_attr_ids(context, standard_attr_ids)
+    return {standard_attr_ids[standard_attr_id]
+            for standard_attr_id in blocked}
+
+
 @db_api.retry_if_session_inactive()
 def is_object_blocked(context, object_id, object_type):
     """Return boolean indicating if object has a provisioning block.
@@ -161,13 +218,18 @@ def is_object_blocked(context, object_id, object_type):
         context, standard_attr_id=standard_attr_id)
 
 
-def _get_standard_attr_id(context, object_id, object_type):
+def _get_model(object_type):
     model = _RESOURCE_TO_MODEL_MAP.get(object_type)
     if not model:
         raise RuntimeError(_("Could not find model for %s. If you are "
                              "adding provisioning blocks for a new resource "
                              "you must call add_model_for_resource during "
                              "initialization for your type.") % object_type)
+    return model
+
+
+def _get_standard_attr_id(context, object_id, object_type):
+    model = _get_model(object_type)
     obj = (context.session.query(model.standard_attr_id).
            enable_eagerloads(False).
            filter_by(id=object_id).first())
@@ -176,3 +238,22 @@ def _get_standard_attr_id(context, object_id, object_type):
         LOG.debug("Could not find standard attr ID for object %s.", object_id)
         return
     return obj.standard_attr_id
+
+
+def _get_standard_attr_ids(context, object_ids, object_type):
+    """Return a dict of standard attr ID to object ID of existing objects."""
+    if not object_ids:
+        return {}
+    model = _get_model(object_type)
+    query = (context.session.query(model.id, model.standard_attr_id).
+             enable_eagerloads(False).
+             filter(model.id.in_(object_ids)))
+    return {obj.standard_attr_id: obj.id for obj in query}
+
+
+def _get_blocked_standard_attr_ids(context, standard_attr_ids):
+    if not standard_attr_ids:
+        return set()
+    return set(pb_obj.ProvisioningBlock.get_values(
+        context, 'standard_attr_id',
+        standard_attr_id=list(standard_attr_ids)))
@@ -16,7 +16,9 @@ import collections
 import datetime
 
 from neutron_lib.db import api as db_api
+import sqlalchemy as sa
 
+from neutron.db.quota import models as quota_models
 from neutron.objects import quota as quota_obj
 
 
@@ -37,17 +39,24 @@ class ReservationInfo(collections.namedtuple(
 
 
 @db_api.retry_if_session_inactive()
-def get_quota_usage_by_resource_and_tenant(context, resource, tenant_id):
+def get_quota_usage_by_resource_and_tenant(context, resource, tenant_id,
+                                           lock=True):
     """Return usage info for a given resource and tenant.
 
     :param context: Request context
     :param resource: Name of the resource
     :param tenant_id: Tenant identifier
+    :param lock: Protect the dirty bit of the usage with a write lock
+                 (defaults to True)
     :returns: a QuotaUsageInfo instance
     """
 
-    result = quota_obj.QuotaUsage.get_object_dirty_protected(
-        context, resource=resource, project_id=tenant_id)
+    if lock:
+        result = quota_obj.QuotaUsage.get_object_dirty_protected(
+            context, resource=resource, project_id=tenant_id)
+    else:
+        result = quota_obj.QuotaUsage.get_object(
+            context, resource=resource, project_id=tenant_id)
     if not result:
         return
     return QuotaUsageInfo(result.resource, result.project_id, result.in_use,
@@ -106,6 +115,46 @@ def set_quota_usage(context, resource, tenant_id,
                           usage_data.in_use, usage_data.dirty)
 
 
+def increment_quota_usage(connection, resource, tenant_id, delta):
+    """Atomically add delta to the resource quota usage.
+
+    The usage is incremented by the database, with the connection of the
+    transaction which creates or deletes the resources, so that it is
+    committed or rolled back along with them.
+
+    :param connection: the connection of the current transaction
+    :param resource: name of the resource for which usage is being updated
+    :param tenant_id: identifier of the tenant for which quota usage is
+                      being updated
+    :param delta: the number of created (or deleted if negative) resources
+    :returns: 1 if the quota usage was updated, 0 if it does not exist.
+    """
+    usages = quota_models.QuotaUsage.__table__
+    return connection.execute(
+        usages.update().where(sa.and_(
+            usages.c.project_id == tenant_id,
+            usages.c.resource == resource)).values(
+            in_use=usages.c.in_use + delta)).rowcount
+
+
+@db_api.retry_if_session_inactive()
+@db_api.CONTEXT_WRITER
+def reset_quota_usage(context, resource, tenant_id, in_use, expected):
+    """Set the resource quota usage unless it changed since it was read.
+
+    :param resource: name of the resource for which usage is being set
+    :param tenant_id: identifier of the tenant for which quota usage is
+                      being set
+    :param in_use: the new quantity of used resources
+    :param expected: the quantity of used resources read before counting
+                     them
+    :returns: 1 if the quota usage was set, 0 otherwise.
+    """
+    return context.session.query(quota_models.QuotaUsage).filter_by(
+        project_id=tenant_id, resource=resource, in_use=expected).update(
+        {'in_use': in_use, 'dirty': False}, synchronize_session=False)
+
+
 @db_api.retry_if_session_inactive()
 @db_api.CONTEXT_WRITER
 def set_quota_usage_dirty(context, resource, tenant_id, dirty=True):
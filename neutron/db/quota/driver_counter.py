@@ -0,0 +1,131 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+
+from neutron_lib import context as n_ctx
+from neutron_lib.db import api as db_api
+from neutron_lib import exceptions
+from oslo_config import cfg
+from oslo_log import log
+
+from neutron.db.quota import api as quota_api
+from neutron.db.quota import driver
+from neutron.quota import resource as res
+from neutron.quota import resource_registry
+from neutron import worker as neutron_worker
+
+LOG = log.getLogger(__name__)
+
+
+class DbQuotaCounterDriver(driver.DbQuotaDriver):
+    """Driver enforcing quotas with usage counters and without locks.
+
+    The usage of the tracked resources is kept by CountedResource instances,
+    which increment it in the transactions creating or deleting the
+    resources. Reservations therefore only read the usage counters and the
+    active reservations, they neither count the resources nor lock the
+    usages. As with any lock free check, concurrent reservations can exceed
+    the quota of a tenant by the resources they request together.
+
+    A periodic task removes the expired reservations and fixes the usage
+    counters which do not match the resources in the database, for instance
+    after the database was modified by hand.
+    """
+
+    def __init__(self):
+        # Usages found out of sync by the last reconciliation, only the
+        # usages found out of sync in the same way twice in a row are fixed,
+        # the others being likely updated by transactions in progress.
+        self._out_of_sync_usages = {}
+
+    def get_workers(self):
+        interval = cfg.CONF.QUOTAS.quota_usage_reconcile_interval
+        if not interval:
+            return []
+        # splay the reconciliations of multiple servers
+        initial_delay = random.randint(0, interval)
+        return [neutron_worker.PeriodicWorker(self._reconcile, interval,
+                                              initial_delay)]
+
+    def _reconcile(self):
+        try:
+            self._reconcile_usages()
+        except Exception:
+            # Keep the periodic task running, the next run will retry
+            LOG.exception("Failed to reconcile the quota usages")
+
+    def _reconcile_usages(self):
+        context = n_ctx.get_admin_context()
+        quota_api.remove_expired_reservations(context)
+        out_of_sync_usages = {}
+        for resource in resource_registry.get_all_resources().values():
+            if not isinstance(resource, res.CountedResource):
+                continue
+            for tenant_id, in_use, count in resource.get_out_of_sync_usages(
+                    context):
+                key = (resource.name, tenant_id)
+                if self._out_of_sync_usages.get(key) != (in_use, count):
+                    out_of_sync_usages[key] = (in_use, count)
+                    continue
+                LOG.warning("Fixing usage of resource %(resource)s for "
+                            "tenant %(tenant_id)s: %(in_use)d in use "
+                            "instead of %(count)d",
+                            {'resource': resource.name,
+                             'tenant_id': tenant_id, 'in_use': in_use,
+                             'count': count})
+                quota_api.reset_quota_usage(context, resource.name,
+                                            tenant_id, count, in_use)
+        self._out_of_sync_usages = out_of_sync_usages
+
+    @db_api.retry_if_session_inactive()
+    def make_reservation(self, context, tenant_id, resources, deltas, plugin):
+        with db_api.CONTEXT_WRITER.using(context):
+            current_limits = self.get_tenant_quotas(
+                context, resources, tenant_id)
+            # Do not even bother reading the usage of the resources with
+            # unlimited quota
+            requested_resources = [resource for resource in deltas
+                                   if current_limits[resource] >= 0]
+            reserved = quota_api.get_reservations_for_resources(
+                context, tenant_id, requested_resources) or {}
+            resources_over_limit = []
+            for resource in requested_resources:
+                if isinstance(resources[resource], res.TrackedResource):
+                    total_usage = resources[resource].count_used(
+                        context, tenant_id, resync_usage=False)
+                    total_usage += reserved.get(resource, 0)
+                else:
+                    total_usage = resources[resource].count(
+                        context, plugin, tenant_id, resync_usage=False)
+                res_headroom = current_limits[resource] - total_usage
+                LOG.debug(("Attempting to reserve %(delta)d items for "
+                           "resource %(resource)s. Total usage: %(total)d; "
+                           "quota limit: %(limit)d; headroom:%(headroom)d"),
+                          {'resource': resource,
+                           'delta': deltas[resource],
+                           'total': total_usage,
+                           'limit': current_limits[resource],
+                           'headroom': res_headroom})
+                if res_headroom < deltas[resource]:
+                    resources_over_limit.append(resource)
+
+            if resources_over_limit:
+                raise exceptions.OverQuota(overs=sorted(resources_over_limit))
+            return quota_api.create_reservation(
+                context, tenant_id, deltas)
+
+    def cancel_reservation(self, context, reservation_id):
+        # The usage counters were not incremented, as the resources were
+        # not created, there is no need to count them again
+        quota_api.remove_reservation(context, reservation_id,
+                                     set_dirty=False)
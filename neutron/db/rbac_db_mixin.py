@@ -18,15 +18,221 @@ from neutron_lib.callbacks import exceptions as c_exc
 from neutron_lib.callbacks import registry
 from neutron_lib.callbacks import resources
 from neutron_lib.db import api as db_api
+from neutron_lib.db import model_query
 from neutron_lib.db import utils as db_utils
 from neutron_lib import exceptions as n_exc
 from neutron_lib.objects import exceptions as o_exc
+from oslo_config import cfg
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import session as se
 
+from neutron.db.models import securitygroup as sg_models
+from neutron.db import models_v2
+from neutron.db.qos import models as qos_models
+from neutron.db import rbac_db_models
 from neutron.extensions import rbac as ext_rbac
 from neutron.objects import base as base_obj
 from neutron.objects import rbac as rbac_obj
 
 
+def _insert_ignoring_duplicates(connection, table):
+    # The same row can be inserted concurrently for another rbac entry of the
+    # object targeting the tenant, the duplicates are ignored by the database
+    # rather than failing the transaction.
+    if connection.dialect.name == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return table.insert().prefix_with(
+        'IGNORE', dialect='mysql').prefix_with('OR IGNORE', dialect='sqlite')
+
+
+def _shared_entries_clause(rbac_table, object_id, target_tenant):
+    return sa.and_(rbac_table.c.object_id == object_id,
+                   rbac_table.c.target_tenant == target_tenant,
+                   rbac_table.c.action == rbac_db_models.ACCESS_SHARED)
+
+
+def _visible_objects_select(rbac_model, *whereclauses):
+    rbac_table = rbac_model.__table__
+    return sa.select([sa.literal(rbac_model.object_type),
+                      rbac_table.c.target_tenant,
+                      rbac_table.c.object_id]).where(
+        sa.and_(rbac_table.c.action == rbac_db_models.ACCESS_SHARED,
+                *whereclauses)).distinct()
+
+
+def _add_visibility(connection, object_type, object_id, target_tenant):
+    visibility = rbac_db_models.RBACVisibility.__table__
+    connection.execute(_insert_ignoring_duplicates(
+        connection, visibility).values(
+        object_type=object_type, target_tenant=target_tenant,
+        object_id=object_id))
+
+
+def _remove_visibility(connection, rbac_model, object_id, target_tenant):
+    # The row is recomputed from the rbac entries rather than only deleted:
+    # the object remains visible to the tenant if it still has a shared entry
+    # targeting it, e.g. an entry inserted concurrently.
+    rbac_table = rbac_model.__table__
+    visibility = rbac_db_models.RBACVisibility.__table__
+    connection.execute(visibility.delete().where(
+        sa.and_(visibility.c.object_type == rbac_model.object_type,
+                visibility.c.target_tenant == target_tenant,
+                visibility.c.object_id == object_id)))
+    connection.execute(_insert_ignoring_duplicates(
+        connection, visibility).from_select(
+        ['object_type', 'target_tenant', 'object_id'],
+        _visible_objects_select(rbac_model,
+                                rbac_table.c.object_id == object_id,
+                                rbac_table.c.target_tenant == target_tenant)))
+
+
+def _rbac_after_insert(mapper, connection, target):
+    if target.action != rbac_db_models.ACCESS_SHARED:
+        return
+    _add_visibility(connection, target.object_type, target.object_id,
+                    target.target_tenant)
+
+
+def _rbac_after_update(mapper, connection, target):
+    state = sa.inspect(target)
+    old_values = []
+    for attr in ('object_id', 'target_tenant', 'action'):
+        history = state.attrs[attr].history
+        old_values.append(history.deleted[0] if history.deleted
+                          else getattr(target, attr))
+    old_object_id, old_target_tenant, old_action = old_values
+    if old_values == [target.object_id, target.target_tenant, target.action]:
+        return
+    if old_action == rbac_db_models.ACCESS_SHARED:
+        _remove_visibility(connection, mapper.class_, old_object_id,
+                           old_target_tenant)
+    _rbac_after_insert(mapper, connection, target)
+
+
+def _rbac_after_delete(mapper, connection, target):
+    if target.action != rbac_db_models.ACCESS_SHARED:
+        return
+    _remove_visibility(connection, mapper.class_, target.object_id,
+                       target.target_tenant)
+
+
+def _rbac_after_bulk_delete(delete_context):
+    rbac_model = delete_context.mapper.class_
+    if not issubclass(rbac_model, rbac_db_models.RBACColumns):
+        return
+    # The deleted entries are unknown once deleted, remove the rows of the
+    # objects which no more have shared entries targeting the tenants
+    rbac_table = rbac_model.__table__
+    visibility = rbac_db_models.RBACVisibility.__table__
+    delete_context.session.execute(visibility.delete().where(
+        sa.and_(visibility.c.object_type == rbac_model.object_type,
+                ~sa.exists().where(_shared_entries_clause(
+                    rbac_table, visibility.c.object_id,
+                    visibility.c.target_tenant)))))
+
+
+def _rbac_visibility_enabled(context, model):
+    return (cfg.CONF.rbac_visibility_index and
+            db_utils.model_query_scope_is_project(context, model))
+
+
+def _rbac_object_id_column(model):
+    # subnets are joined to the rbac entries of their network
+    return list(model.rbac_entries.property.local_columns)[0]
+
+
+def _rbac_visibility_query_hook(context, model, query):
+    if not _rbac_visibility_enabled(context, model):
+        return query
+    # NOTE: the query is joined to all the rbac entries of the objects.
+    # Rebuild it with a join restricted to the entries targeting the tenant,
+    # which is found with the unique key of the rbac tables and is still
+    # needed by the filters on the 'shared' attribute and on the external
+    # networks.
+    rbac_model = model.rbac_entries.property.mapper.class_
+    query = query.session.query(
+        *[column['expr'] for column in query.column_descriptions])
+    return query.outerjoin(rbac_model, sa.and_(
+        rbac_model.object_id == _rbac_object_id_column(model),
+        rbac_model.target_tenant.in_(('*', context.tenant_id))))
+
+
+def _rbac_visibility_filter_hook(context, model, conditions):
+    if not _rbac_visibility_enabled(context, model):
+        return conditions
+    # NOTE: the core plugin registers this hook before the hooks of its
+    # extensions, the conditions are then the default filter matching the
+    # objects owned by the tenant or shared with it by an rbac entry. It is
+    # replaced by a semi-join on the visibility index. The networks made
+    # external to the tenant are still matched by the filter hook of the
+    # external networks on the rbac entries joined by the query hook.
+    object_type = model.rbac_entries.property.mapper.class_.object_type
+    visibility = rbac_db_models.RBACVisibility
+    visible_ids = context.session.query(visibility.object_id).filter(
+        visibility.object_type == object_type,
+        visibility.target_tenant.in_(('*', context.tenant_id)))
+    return ((model.tenant_id == context.tenant_id) |
+            _rbac_object_id_column(model).in_(visible_ids))
+
+
+def register_rbac_visibility_hooks():
+    """Register the model query hooks using the RBAC visibility index."""
+    for model in (models_v2.Network, models_v2.Subnet,
+                  sg_models.SecurityGroup, qos_models.QosPolicy):
+        model_query.register_hook(
+            model,
+            "rbac_visibility",
+            query_hook=_rbac_visibility_query_hook,
+            filter_hook=_rbac_visibility_filter_hook,
+            result_filters=None)
+
+
+def register_rbac_visibility_events():
+    """Maintain the RBAC visibility index along with the RBAC entries."""
+    for rbac_model in rbac_db_models.get_type_model_map().values():
+        db_api.sqla_listen(rbac_model, 'after_insert', _rbac_after_insert)
+        db_api.sqla_listen(rbac_model, 'after_update', _rbac_after_update)
+        db_api.sqla_listen(rbac_model, 'after_delete', _rbac_after_delete)
+    db_api.sqla_listen(se.Session, 'after_bulk_delete',
+                       _rbac_after_bulk_delete)
+
+
+def rebuild_rbac_visibility(context):
+    """Rebuild the RBAC visibility index from the RBAC entries.
+
+    The rows of the objects without shared rbac entries targeting the
+    tenants are removed, e.g. the rows of the objects whose entries were
+    deleted by the database cascades, and the missing rows are added.
+
+    :param context: neutron admin context
+    :returns: the numbers of rows removed and added
+    """
+    visibility = rbac_db_models.RBACVisibility.__table__
+    removed = added = 0
+    for object_type, rbac_model in rbac_db_models.get_type_model_map().items():
+        rbac_table = rbac_model.__table__
+        with db_api.CONTEXT_WRITER.using(context):
+            connection = context.session.connection()
+            removed += connection.execute(visibility.delete().where(
+                sa.and_(visibility.c.object_type == object_type,
+                        ~sa.exists().where(_shared_entries_clause(
+                            rbac_table, visibility.c.object_id,
+                            visibility.c.target_tenant))))).rowcount
+            added += connection.execute(_insert_ignoring_duplicates(
+                connection, visibility).from_select(
+                ['object_type', 'target_tenant', 'object_id'],
+                _visible_objects_select(
+                    rbac_model,
+                    ~sa.exists().where(
+                        sa.and_(visibility.c.object_type == object_type,
+                                visibility.c.object_id ==
+                                rbac_table.c.object_id,
+                                visibility.c.target_tenant ==
+                                rbac_table.c.target_tenant))))).rowcount
+    return removed, added
+
+
 class RbacPluginMixin(object):
     """Plugin mixin that implements the RBAC DB operations."""
 
@@ -80,6 +80,23 @@ class RBACColumns(model_base.HasId, model_base.HasProject):
         pass
 
 
+class RBACVisibility(model_base.BASEV2):
+    """Projects the objects are visible to through their RBAC entries.
+
+    There is one row per object and target tenant of its access_as_shared
+    RBAC entries, so that the objects shared with a project are looked up
+    with the primary key instead of joining all the RBAC entries. The rows
+    are maintained along with the RBAC entries by the listeners registered in
+    neutron.db.rbac_db_mixin.
+    """
+
+    __tablename__ = 'rbacvisibility'
+    object_type = sa.Column(sa.String(255), primary_key=True)
+    target_tenant = sa.Column(sa.String(db_const.PROJECT_ID_FIELD_SIZE),
+                              primary_key=True)
+    object_id = sa.Column(sa.String(36), primary_key=True)
+
+
 def get_type_model_map():
     return {table.object_type: table for table in RBACColumns.__subclasses__()}
 
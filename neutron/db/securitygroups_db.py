@@ -318,10 +318,11 @@ class SecurityGroupDbMixin(ext_sg.SecurityGroupPluginBase,
 
     def _make_security_group_dict(self, security_group, fields=None):
         res = {'id': security_group['id'],
-               'name': security_group['name'],
-               'stateful': security_group['stateful'],
-               'tenant_id': security_group['tenant_id'],
-               'description': security_group['description']}
+               'tenant_id': security_group['tenant_id']}
+        # only read the requested fields, the others may not be loaded
+        for key in ('name', 'stateful', 'description'):
+            if not fields or key in fields:
+                res[key] = security_group[key]
         if security_group.rules:
             res['security_group_rules'] = [
                 self._make_security_group_rule_dict(r.db_obj)
@@ -383,10 +384,13 @@ class SecurityGroupDbMixin(ext_sg.SecurityGroupPluginBase,
                 res_rule_dict = self._create_security_group_rule(
                     context, rule_dict, validate=False)
                 ret.append(res_rule_dict)
+        # The rules created together are passed along with each rule, for
+        # the subscribers to process them at once
         for rdict in ret:
             registry.notify(
                 resources.SECURITY_GROUP_RULE, events.AFTER_CREATE, self,
-                context=context, security_group_rule=rdict)
+                context=context, security_group_rule=rdict,
+                security_group_rules=ret)
         return ret
 
     @db_api.retry_if_session_inactive()
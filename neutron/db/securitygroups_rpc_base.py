@@ -19,6 +19,8 @@ from neutron_lib.callbacks import registry
 from neutron_lib.callbacks import resources
 from neutron_lib import constants as const
 from neutron_lib.db import api as db_api
+from neutron_lib.db import standard_attr
+from neutron_lib.plugins import directory
 from neutron_lib.utils import helpers
 
 from neutron._i18n import _
@@ -35,6 +37,10 @@ DIRECTION_IP_PREFIX = {'ingress': 'source_ip_prefix',
 
 DHCP_RULE_PORT = {4: (67, 68, const.IPv4), 6: (547, 546, const.IPv6)}
 
+SG_RULE_INFO_KEYS = ('security_group_id', 'direction', 'ethertype',
+                     'protocol', 'port_range_min', 'port_range_max',
+                     'remote_ip_prefix', 'remote_group_id')
+
 
 @registry.has_registry_receivers
 class SecurityGroupServerNotifierRpcMixin(sg_db.SecurityGroupDbMixin):
@@ -168,6 +174,7 @@ class SecurityGroupInfoAPIMixin(object):
                    'sg_member_ips': {}}
         rules_in_db = self._select_rules_for_ports(context, ports)
         remote_security_group_info = {}
+        stateful_by_sg = {}
         for (port_id, rule_in_db) in rules_in_db:
             remote_gid = rule_in_db.get('remote_group_id')
             security_group_id = rule_in_db.get('security_group_id')
@@ -190,8 +197,11 @@ class SecurityGroupInfoAPIMixin(object):
                     remote_security_group_info[remote_gid][ethertype] = set()
 
             direction = rule_in_db['direction']
-            stateful = self._is_security_group_stateful(context,
-                                                        security_group_id)
+            stateful = stateful_by_sg.get(security_group_id)
+            if stateful is None:
+                stateful = self._is_security_group_stateful(
+                    context, security_group_id)
+                stateful_by_sg[security_group_id] = stateful
             rule_dict = {
                 'direction': direction,
                 'ethertype': ethertype,
@@ -368,6 +378,13 @@ class SecurityGroupServerRpcMixin(SecurityGroupInfoAPIMixin,
                                   SecurityGroupServerNotifierRpcMixin):
     """Server-side RPC mixin using DB for SG notifications and responses."""
 
+    # The rules and the stateful flag of the security groups, keyed by their
+    # ID. The rules are only reused while the revision number of their group,
+    # which is bumped by the revision plugin on every change of the group and
+    # of its rules, is unchanged, so that the changes made through the other
+    # server processes are seen.
+    _sg_rules_cache = {}
+
     @db_api.retry_if_session_inactive()
     def _select_sg_ids_for_ports(self, context, ports):
         if not ports:
@@ -385,14 +402,75 @@ class SecurityGroupServerRpcMixin(SecurityGroupInfoAPIMixin,
         sg_binding_port = sg_models.SecurityGroupPortBinding.port_id
         sg_binding_sgid = sg_models.SecurityGroupPortBinding.security_group_id
 
+        sg_db = sg_models.SecurityGroup
+        sg_attrs = standard_attr.StandardAttribute
+
+        # Get the rules of every security group once, instead of once per
+        # port bound to it, and fan them out to the ports in memory
+        with db_api.CONTEXT_READER.using(context):
+            query = context.session.query(sg_binding_port, sg_binding_sgid,
+                                          sg_db.stateful,
+                                          sg_attrs.revision_number)
+            query = query.join(sg_db, sg_db.id == sg_binding_sgid)
+            query = query.join(sg_attrs,
+                               sg_attrs.id == sg_db.standard_attr_id)
+            query = query.filter(sg_binding_port.in_(ports.keys()))
+            ports_by_sg = {}
+            sg_revisions = {}
+            for port_id, sg_id, stateful, revision_number in query:
+                ports_by_sg.setdefault(sg_id, []).append(port_id)
+                sg_revisions[sg_id] = (revision_number, stateful)
+            rules_by_sg = self._get_security_groups_rules(context,
+                                                          sg_revisions)
+        # Return the rules in the order they were created in, whatever their
+        # group
+        rules = sorted(((rule_order, sg_id, rule)
+                        for sg_id, sg_rules in rules_by_sg.items()
+                        for rule_order, rule in sg_rules),
+                       key=lambda item: item[0])
+        return [(port_id, rule) for _rule_order, sg_id, rule in rules
+                for port_id in ports_by_sg[sg_id]]
+
+    def _get_security_groups_rules(self, context, sg_revisions):
+        """Get the rules of security groups, from the cache if up to date.
+
+        :param sg_revisions: the revision numbers and stateful flags of the
+            security groups, keyed by their ID
+        :returns: the lists of rules of the security groups, keyed by their
+            ID, the rules being (standard attribute ID, dict of their
+            SG_RULE_INFO_KEYS) tuples
+        """
+        # Without the revision plugin, the revision numbers are not bumped
+        # and the cached rules can not be validated
+        use_cache = bool(directory.get_plugin('revision_plugin'))
+        rules_by_sg = {}
+        for sg_id, (revision_number, stateful) in sg_revisions.items():
+            cached = self._sg_rules_cache.get(sg_id) if use_cache else None
+            if cached and cached[0] == revision_number:
+                rules_by_sg[sg_id] = cached[2]
+                self._sg_rules_cache[sg_id] = (
+                    revision_number, stateful, cached[2])
+        stale_sg_ids = [sg_id for sg_id in sg_revisions
+                        if sg_id not in rules_by_sg]
+        if not stale_sg_ids:
+            return rules_by_sg
+        for sg_id in stale_sg_ids:
+            rules_by_sg[sg_id] = []
         sgr_sgid = sg_models.SecurityGroupRule.security_group_id
-
-        query = context.session.query(sg_binding_port,
-                                      sg_models.SecurityGroupRule)
-        query = query.join(sg_models.SecurityGroupRule,
-                           sgr_sgid == sg_binding_sgid)
-        query = query.filter(sg_binding_port.in_(ports.keys()))
-        return query.all()
+        query = context.session.query(sg_models.SecurityGroupRule)
+        query = query.filter(sgr_sgid.in_(stale_sg_ids))
+        for rule in query:
+            rules_by_sg[rule.security_group_id].append(
+                (rule.standard_attr_id,
+                 {key: rule[key] for key in SG_RULE_INFO_KEYS}))
+        if use_cache:
+            # The rules were read after the revision numbers, they can only
+            # be newer than the revision they are cached with
+            for sg_id in stale_sg_ids:
+                revision_number, stateful = sg_revisions[sg_id]
+                self._sg_rules_cache[sg_id] = (
+                    revision_number, stateful, rules_by_sg[sg_id])
+        return rules_by_sg
 
     @db_api.retry_if_session_inactive()
     def _select_ips_for_remote_group(self, context, remote_group_ids):
@@ -430,4 +508,9 @@ class SecurityGroupServerRpcMixin(SecurityGroupInfoAPIMixin,
 
     @db_api.retry_if_session_inactive()
     def _is_security_group_stateful(self, context, sg_id):
+        # The flag cached along with the rules was read from the database
+        # when the rules were selected for the ports
+        cached = self._sg_rules_cache.get(sg_id)
+        if cached:
+            return cached[1]
         return sg_obj.SecurityGroup.get_sg_by_id(context, sg_id).stateful
@@ -37,6 +37,7 @@ RESOURCE_NAME = 'quota'
 RESOURCE_COLLECTION = RESOURCE_NAME + "s"
 QUOTAS = quota.QUOTAS
 DB_QUOTA_DRIVER = 'neutron.db.quota.driver.DbQuotaDriver'
+DB_QUOTA_COUNTER_DRIVER = quota.QUOTA_DB_COUNTER_DRIVER
 EXTENDED_ATTRIBUTES_2_0 = {
     RESOURCE_COLLECTION: {}
 }
@@ -142,7 +143,8 @@ class Quotasv2(api_extensions.ExtensionDescriptor):
     @classmethod
     def get_description(cls):
         description = 'Expose functions for quotas management'
-        if cfg.CONF.QUOTAS.quota_driver == DB_QUOTA_DRIVER:
+        if cfg.CONF.QUOTAS.quota_driver in (DB_QUOTA_DRIVER,
+                                            DB_QUOTA_COUNTER_DRIVER):
             description += ' per tenant'
         return description
 
@@ -33,6 +33,7 @@ ALIAS = RESOURCE_NAME + '_' + DETAIL_QUOTAS_ACTION
 QUOTA_DRIVER = cfg.CONF.QUOTAS.quota_driver
 RESOURCE_COLLECTION = RESOURCE_NAME + "s"
 DB_QUOTA_DRIVER = 'neutron.db.quota.driver.DbQuotaDriver'
+DB_QUOTA_DRIVERS = (DB_QUOTA_DRIVER, quotasv2.DB_QUOTA_COUNTER_DRIVER)
 EXTENDED_ATTRIBUTES_2_0 = {
     RESOURCE_COLLECTION: {}
 }
@@ -61,7 +62,7 @@ class Quotasv2_detail(api_extensions.ExtensionDescriptor):
 
     # Ensure new extension is not loaded with old conf driver.
     extensions.register_custom_supported_check(
-        ALIAS, lambda: QUOTA_DRIVER == DB_QUOTA_DRIVER,
+        ALIAS, lambda: QUOTA_DRIVER in DB_QUOTA_DRIVERS,
         plugin_agnostic=True)
 
     @classmethod
@@ -13,9 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import netaddr
 from neutron_lib import constants as const
+from neutron_lib.db import api as db_api
 from oslo_utils import uuidutils
+from sqlalchemy import func
 
+from neutron.db import models_v2
+from neutron.ipam.drivers.neutrondb_ipam import db_models
 from neutron.objects import ipam as ipam_objs
 
 # Database operations for Neutron's DB-backed IPAM driver
@@ -114,6 +119,21 @@ class IpamSubnetManager(object):
         return ipam_objs.IpamAllocation.get_objects(
             context, ipam_subnet_id=self._ipam_subnet_id, status=status)
 
+    def list_allocated_ips(self, context):
+        """Return the addresses allocated on the subnet.
+
+        Only the addresses are loaded, without building an IpamAllocation
+        OVO object per allocation.
+
+        :param context: neutron api request context
+        :returns: a list of IP addresses, as strings
+        """
+        query = context.session.query(
+            db_models.IpamAllocation.ip_address).filter_by(
+            ipam_subnet_id=self._ipam_subnet_id,
+            status=const.IPAM_ALLOCATION_STATUS_ALLOCATED)
+        return [ip_address for ip_address, in query]
+
     def create_allocation(self, context, ip_address,
                           status=const.IPAM_ALLOCATION_STATUS_ALLOCATED):
         """Create an IP allocation entry.
@@ -126,6 +146,43 @@ class IpamSubnetManager(object):
             context, ip_address=ip_address, status=status,
             ipam_subnet_id=self._ipam_subnet_id).create()
 
+    def _counters_query(self, context):
+        return context.session.query(db_models.IpamSubnetCounter).filter_by(
+            ipam_subnet_id=self._ipam_subnet_id)
+
+    def create_counters(self, context, total_ips):
+        """Create the IP address counters of the subnet.
+
+        :param context: neutron api request context
+        :param total_ips: the number of addresses of the allocation pools
+        """
+        context.session.add(db_models.IpamSubnetCounter(
+            ipam_subnet_id=self._ipam_subnet_id, used_ips=0,
+            total_ips=str(total_ips)))
+
+    def update_total_ips(self, context, total_ips):
+        """Set the number of addresses of the allocation pools.
+
+        :param context: neutron api request context
+        :param total_ips: the number of addresses of the allocation pools
+        """
+        self._counters_query(context).update(
+            {'total_ips': str(total_ips)}, synchronize_session=False)
+
+    def add_used_ips(self, context, delta):
+        """Record a change of the number of allocated addresses.
+
+        The change is inserted as a new row, concurrent allocations on the
+        subnet neither update nor lock a common row. The rows are folded into
+        the used_ips counter by fold_counter_deltas.
+
+        :param context: neutron api request context
+        :param delta: the number of allocated (or deallocated if negative)
+            addresses
+        """
+        context.session.add(db_models.IpamSubnetCounterDelta(
+            ipam_subnet_id=self._ipam_subnet_id, delta=delta))
+
     def delete_allocation(self, context, ip_address):
         """Remove an IP allocation for this subnet.
 
@@ -138,3 +195,127 @@ class IpamSubnetManager(object):
             context,
             ipam_subnet_id=self._ipam_subnet_id,
             ip_address=ip_address)
+
+
+def get_total_ips(pools, cidr):
+    """Return the number of addresses of allocation pools.
+
+    A subnet without pools is accounted with all the addresses of its cidr,
+    as the IP availability API always did.
+
+    :param pools: the allocation pools, as netaddr.IPRange objects
+    :param cidr: the cidr of the subnet
+    """
+    if not pools:
+        return netaddr.IPNetwork(cidr).size
+    return sum(pool.size for pool in pools)
+
+
+@db_api.retry_db_errors
+def _fold_subnet_counter_deltas(context, ipam_subnet_id):
+    with db_api.CONTEXT_WRITER.using(context):
+        # Lock the counters before reading the deltas, so that the deltas
+        # removed by a concurrent fold or reconciliation are not read
+        counter = context.session.query(
+            db_models.IpamSubnetCounter).filter_by(
+            ipam_subnet_id=ipam_subnet_id).with_for_update().first()
+        deltas = context.session.query(
+            db_models.IpamSubnetCounterDelta.id,
+            db_models.IpamSubnetCounterDelta.delta).filter_by(
+            ipam_subnet_id=ipam_subnet_id).all()
+        if not deltas:
+            return 0
+        # The deltas of a subnet without counters are dropped, the
+        # reconciliation counts its allocations when creating them
+        if counter is not None:
+            counter.used_ips += sum(delta for _id, delta in deltas)
+        context.session.query(db_models.IpamSubnetCounterDelta).filter(
+            db_models.IpamSubnetCounterDelta.id.in_(
+                [delta_id for delta_id, _delta in deltas])).delete(
+            synchronize_session=False)
+        return len(deltas)
+
+
+def fold_counter_deltas(context):
+    """Fold the changes of the allocated addresses into the counters.
+
+    Every subnet is folded in its own transaction, which locks its counters
+    row for the time of the update only. The allocations, which do not lock
+    it, are not blocked.
+
+    :param context: neutron admin context
+    :returns: the number of folded deltas
+    """
+    with db_api.CONTEXT_READER.using(context):
+        ipam_subnet_ids = [ipam_subnet_id for ipam_subnet_id, in
+                           context.session.query(
+                               db_models.IpamSubnetCounterDelta.ipam_subnet_id
+                           ).distinct()]
+    return sum(_fold_subnet_counter_deltas(context, ipam_subnet_id)
+               for ipam_subnet_id in ipam_subnet_ids)
+
+
+def reconcile_counters(context, dry_run=False):
+    """Recompute the IP address counters of all the IPAM subnets.
+
+    Every subnet is reconciled in its own transaction, which locks its
+    counters row before counting, so that it can run while addresses are
+    allocated. The used addresses are counted from the IP allocations of
+    the ports, as the IP availability API did before the counters, and the
+    deltas not folded yet are dropped.
+
+    :param context: neutron admin context
+    :param dry_run: only report the counters which are missing or wrong
+    :returns: a list of (ipam_subnet_id, old counters, new counters) for
+        the counters which were missing or wrong, the counters being
+        (used_ips, total_ips) tuples and the old ones None when missing
+    """
+    with db_api.CONTEXT_READER.using(context):
+        ipam_subnets = context.session.query(
+            db_models.IpamSubnet.id,
+            db_models.IpamSubnet.neutron_subnet_id).all()
+    fixed = []
+    for ipam_subnet_id, neutron_subnet_id in ipam_subnets:
+        with db_api.CONTEXT_WRITER.using(context):
+            cidr = context.session.query(models_v2.Subnet.cidr).filter_by(
+                id=neutron_subnet_id).scalar()
+            if cidr is None:
+                # the subnet is being deleted
+                continue
+            counter = context.session.query(
+                db_models.IpamSubnetCounter).filter_by(
+                ipam_subnet_id=ipam_subnet_id).with_for_update().first()
+            deltas = context.session.query(
+                db_models.IpamSubnetCounterDelta.id,
+                db_models.IpamSubnetCounterDelta.delta).filter_by(
+                ipam_subnet_id=ipam_subnet_id).all()
+            used_ips = context.session.query(
+                func.count(models_v2.IPAllocation.ip_address)).filter_by(
+                subnet_id=neutron_subnet_id).scalar()
+            pools = [netaddr.IPRange(pool.first_ip, pool.last_ip)
+                     for pool in context.session.query(
+                         db_models.IpamAllocationPool).filter_by(
+                         ipam_subnet_id=ipam_subnet_id)]
+            new = (used_ips, str(get_total_ips(pools, cidr)))
+            old = None
+            if counter is not None:
+                old = (counter.used_ips + sum(delta for _id, delta in deltas),
+                       counter.total_ips)
+            if old == new:
+                continue
+            fixed.append((ipam_subnet_id, old, new))
+            if dry_run:
+                continue
+            if deltas:
+                context.session.query(
+                    db_models.IpamSubnetCounterDelta).filter(
+                    db_models.IpamSubnetCounterDelta.id.in_(
+                        [delta_id for delta_id, _delta in deltas])).delete(
+                    synchronize_session=False)
+            if counter is None:
+                context.session.add(db_models.IpamSubnetCounter(
+                    ipam_subnet_id=ipam_subnet_id, used_ips=new[0],
+                    total_ips=new[1]))
+            else:
+                counter.used_ips, counter.total_ips = new
+    return fixed
@@ -69,3 +69,40 @@ class IpamAllocation(model_base.BASEV2):
                                              ondelete="CASCADE"),
                                primary_key=True,
                                nullable=False)
+
+
+class IpamSubnetCounter(model_base.BASEV2):
+    """Counters of the IP addresses of an IPAM subnet.
+
+    The number of addresses of the allocation pools is maintained by the
+    driver when the pools change, so that the IP availability of the subnets
+    is read without summing their pools. The allocations and deallocations
+    do not update used_ips, which would serialize them on this row, they
+    insert IpamSubnetCounterDelta rows which are periodically folded into
+    it.
+    """
+    ipam_subnet_id = sa.Column(sa.String(36),
+                               sa.ForeignKey('ipamsubnets.id',
+                                             ondelete="CASCADE"),
+                               primary_key=True,
+                               nullable=False)
+    used_ips = sa.Column(sa.BigInteger, nullable=False, server_default='0')
+    # NOTE: the pools of an IPv6 subnet can hold more addresses than a
+    # BIGINT can count, the total is stored as a decimal string.
+    total_ips = sa.Column(sa.String(40), nullable=False, server_default='0')
+
+
+class IpamSubnetCounterDelta(model_base.BASEV2):
+    """Change of the number of allocated addresses of an IPAM subnet.
+
+    A row is inserted by every allocation and deallocation, the number of
+    allocated addresses of the subnet being its used_ips counter plus the
+    deltas not folded into it yet.
+    """
+    id = sa.Column(sa.BigInteger().with_variant(sa.Integer(), 'sqlite'),
+                   primary_key=True, autoincrement=True)
+    ipam_subnet_id = sa.Column(sa.String(36),
+                               sa.ForeignKey('ipamsubnets.id',
+                                             ondelete="CASCADE"),
+                               nullable=False, index=True)
+    delta = sa.Column(sa.Integer, nullable=False)
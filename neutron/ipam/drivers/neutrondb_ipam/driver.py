@@ -14,11 +14,13 @@
 #    under the License.
 
 import itertools
-import random
+import os
+import zlib
 
 import netaddr
 from neutron_lib import exceptions as n_exc
 from neutron_lib.plugins import directory
+from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_log import log
 from oslo_utils import uuidutils
@@ -26,6 +28,7 @@ from oslo_utils import uuidutils
 from neutron._i18n import _
 from neutron.ipam import driver as ipam_base
 from neutron.ipam.drivers.neutrondb_ipam import db_api as ipam_db_api
+from neutron.ipam.drivers.neutrondb_ipam import ip_index
 from neutron.ipam import exceptions as ipam_exc
 from neutron.ipam import requests as ipam_req
 from neutron.ipam import subnet_alloc
@@ -33,9 +36,32 @@ from neutron.ipam import utils as ipam_utils
 
 
 LOG = log.getLogger(__name__)
-MAX_WIN = 1000
-MULTIPLIER = 100
-MAX_WIN_MULTI = MAX_WIN * MULTIPLIER
+
+
+class _CandidateWindows(object):
+    """Rotation of the windows of free addresses of an API worker.
+
+    The rotation of every worker starts from a window derived from its host
+    and its pid, so that workers started together draw their candidates from
+    different windows, and moves to the next window at every allocation, so
+    that the concurrent requests of a worker do not share a window either.
+    """
+
+    def __init__(self):
+        self._pid = None
+        self._windows = None
+
+    def next(self, num_windows):
+        pid = os.getpid()
+        if pid != self._pid:
+            # NOTE: API workers are forked after this module is loaded
+            self._pid = pid
+            self._windows = itertools.count(
+                zlib.crc32(cfg.CONF.host.encode()) + pid)
+        return next(self._windows) % num_windows
+
+
+_candidate_windows = _CandidateWindows()
 
 
 class NeutronDbSubnet(ipam_base.Subnet):
@@ -75,6 +101,8 @@ class NeutronDbSubnet(ipam_base.Subnet):
         # Create IPAM allocation pools
         cls.create_allocation_pools(subnet_manager, ctx, pools,
                                     subnet_request.subnet_cidr)
+        subnet_manager.create_counters(
+            ctx, ipam_db_api.get_total_ips(pools, subnet_request.subnet_cidr))
 
         return cls(ipam_subnet_id,
                    ctx,
@@ -159,74 +187,24 @@ class NeutronDbSubnet(ipam_base.Subnet):
 
     def _generate_ips(self, context, prefer_next=False, num_addresses=1):
         """Generate a set of IPs from the set of available addresses."""
-        allocated_ips = []
-        requested_num_addresses = num_addresses
-
-        allocations = self.subnet_manager.list_allocations(context)
-        # It is better not to use 'netaddr.IPSet.add',
-        # because _compact_single_network in 'IPSet.add'
-        # is quite time consuming.
-        ip_allocations = netaddr.IPSet(
-            [netaddr.IPAddress(allocation.ip_address)
-             for allocation in allocations])
-
-        for ip_pool in self.subnet_manager.list_pools(context):
-            ip_set = netaddr.IPSet()
-            ip_set.add(netaddr.IPRange(ip_pool.first_ip, ip_pool.last_ip))
-            av_set = ip_set.difference(ip_allocations)
-            if av_set.size == 0:
-                continue
-
-            if av_set.size < requested_num_addresses:
-                # All addresses of the address pool are allocated
-                # for the first time and the remaining addresses
-                # will be allocated in the next address pools.
-                allocated_num_addresses = av_set.size
-            else:
-                # All expected addresses can be assigned in this loop.
-                allocated_num_addresses = requested_num_addresses
-
-            if prefer_next:
-                allocated_ip_pool = list(itertools.islice(
-                    av_set, allocated_num_addresses))
-                allocated_ips.extend([str(allocated_ip)
-                                      for allocated_ip in allocated_ip_pool])
-
-                requested_num_addresses -= allocated_num_addresses
-                if requested_num_addresses:
-                    # More addresses need to be allocated in the next loop.
-                    continue
-                return allocated_ips
-
-            window = min(av_set.size, MAX_WIN)
-
-            # NOTE(gryf): If there is more than one address, make the window
-            # bigger, so that are chances to fulfill demanded amount of IPs.
-            if allocated_num_addresses > 1:
-                window = min(av_set.size,
-                             allocated_num_addresses * MULTIPLIER,
-                             MAX_WIN_MULTI)
-
-            if window < allocated_num_addresses:
-                continue
-            else:
-                # Maximize randomness by using the random module's built in
-                # sampling function
-                av_ips = list(itertools.islice(av_set, 0, window))
-                allocated_ip_pool = random.sample(av_ips,
-                                                  allocated_num_addresses)
-                allocated_ips.extend([str(allocated_ip)
-                                      for allocated_ip in allocated_ip_pool])
-
-            requested_num_addresses -= allocated_num_addresses
-            if requested_num_addresses:
-                # More addresses need to be allocated in the next loop.
-                continue
-
-            return allocated_ips
-
-        raise ipam_exc.IpAddressGenerationFailure(
-                  subnet_id=self.subnet_manager.neutron_id)
+        pools = [netaddr.IPRange(pool.first_ip, pool.last_ip)
+                 for pool in self.subnet_manager.list_pools(context)]
+        free_ips = ip_index.FreeIpIndex(
+            pools, self.subnet_manager.list_allocated_ips(context),
+            netaddr.IPNetwork(self._cidr).version)
+        if free_ips.size < num_addresses:
+            raise ipam_exc.IpAddressGenerationFailure(
+                subnet_id=self.subnet_manager.neutron_id)
+        num_windows = cfg.CONF.ipam_allocation_windows
+        if not prefer_next and num_windows > 1:
+            # Draw the candidates from the window of this worker, unless it
+            # has not enough free addresses left
+            window = _candidate_windows.next(num_windows)
+            start = free_ips.size * window // num_windows
+            stop = free_ips.size * (window + 1) // num_windows
+            if stop - start >= num_addresses:
+                return free_ips.pick(num_addresses, start=start, stop=stop)
+        return free_ips.pick(num_addresses, prefer_next)
 
     def allocate(self, address_request):
         # NOTE(pbondar): Ipam driver is always called in context of already
@@ -259,6 +237,7 @@ class NeutronDbSubnet(ipam_base.Subnet):
                 # later on final commit)
                 self.subnet_manager.create_allocation(self._context,
                                                       ip_address)
+                self.subnet_manager.add_used_ips(self._context, 1)
         except db_exc.DBReferenceError:
             raise n_exc.SubnetNotFound(
                 subnet_id=self.subnet_manager.neutron_id)
@@ -279,6 +258,8 @@ class NeutronDbSubnet(ipam_base.Subnet):
                 for ip_address in allocated_ip_pool:
                     self.subnet_manager.create_allocation(self._context,
                                                           ip_address)
+                self.subnet_manager.add_used_ips(
+                    self._context, len(allocated_ip_pool))
         except db_exc.DBReferenceError:
             raise n_exc.SubnetNotFound(
                 subnet_id=self.subnet_manager.neutron_id)
@@ -295,6 +276,7 @@ class NeutronDbSubnet(ipam_base.Subnet):
             raise ipam_exc.IpAddressAllocationNotFound(
                 subnet_id=self.subnet_manager.neutron_id,
                 ip_address=address)
+        self.subnet_manager.add_used_ips(self._context, -count)
 
     def _no_pool_changes(self, context, pools):
         """Check if pool updates in db are required."""
@@ -312,6 +294,8 @@ class NeutronDbSubnet(ipam_base.Subnet):
         self.subnet_manager.delete_allocation_pools(self._context)
         self.create_allocation_pools(self.subnet_manager, self._context, pools,
                                      cidr)
+        self.subnet_manager.update_total_ips(
+            self._context, ipam_db_api.get_total_ips(pools, cidr))
         self._pools = pools
 
     def get_details(self):
@@ -0,0 +1,108 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import random
+import socket
+
+import netaddr
+from neutron_lib import constants
+
+_FAMILIES = {constants.IP_VERSION_4: socket.AF_INET,
+             constants.IP_VERSION_6: socket.AF_INET6}
+
+
+class FreeIpIndex(object):
+    """Index of the free addresses of the allocation pools of a subnet.
+
+    The free addresses are stored as a sorted list of ranges of integers,
+    along with the number of free addresses preceding each range. The n-th
+    free address is therefore found with a binary search, whatever the size
+    of the pools and the number of allocations, and the index takes memory
+    in proportion to the number of holes between the allocations rather than
+    to the number of addresses.
+
+    The index is built from the IpamAllocation rows read in the transaction
+    which will create the new allocations, the database remains the only
+    source of truth.
+    """
+
+    def __init__(self, pools, allocated_ips, ip_version):
+        """Build the index.
+
+        :param pools: the allocation pools, as netaddr.IPRange objects
+        :param allocated_ips: the allocated addresses, as strings
+        :param ip_version: the IP version of the subnet
+        """
+        self._ip_version = ip_version
+        # NOTE: inet_pton is several times faster than netaddr to parse the
+        # tens of thousands of addresses of the large subnets
+        family = _FAMILIES[ip_version]
+        allocated = sorted(int.from_bytes(socket.inet_pton(family, ip), 'big')
+                           for ip in allocated_ips)
+        # first and last address of each free range, and number of free
+        # addresses in the ranges before it
+        self._firsts = []
+        self._lasts = []
+        self._offsets = []
+        self.size = 0
+        for pool in sorted(pools, key=lambda p: p.first):
+            first = pool.first
+            index = bisect.bisect_left(allocated, first)
+            while index < len(allocated) and allocated[index] <= pool.last:
+                if allocated[index] > first:
+                    self._add_range(first, allocated[index] - 1)
+                first = allocated[index] + 1
+                index += 1
+            if first <= pool.last:
+                self._add_range(first, pool.last)
+
+    def _add_range(self, first, last):
+        self._firsts.append(first)
+        self._lasts.append(last)
+        self._offsets.append(self.size)
+        self.size += last - first + 1
+
+    def __getitem__(self, index):
+        """Return the index-th free address, as a string."""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        free_range = bisect.bisect_right(self._offsets, index) - 1
+        value = self._firsts[free_range] + index - self._offsets[free_range]
+        return str(netaddr.IPAddress(value, self._ip_version))
+
+    def pick(self, num_addresses, prefer_next=False, start=0, stop=None):
+        """Pick free addresses.
+
+        The addresses are drawn at random among the free ones, or are the
+        lowest free ones if prefer_next is set.
+
+        :param num_addresses: the number of addresses to pick
+        :param prefer_next: pick the lowest free addresses
+        :param start: the index of the first free address to pick from
+        :param stop: the index after the last free address to pick from,
+            defaults to the number of free addresses
+        :returns: a list of addresses, as strings, shorter than
+            num_addresses if there are not enough free addresses
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        start = max(0, min(start, stop))
+        num_addresses = min(num_addresses, stop - start)
+        if prefer_next:
+            return [self[index]
+                    for index in range(start, start + num_addresses)]
+        # NOTE: random.sample can not be used on the free addresses of IPv6
+        # pools, their number does not fit in a Py_ssize_t.
+        indexes = set()
+        while len(indexes) < num_addresses:
+            indexes.add(random.randrange(start, stop))
+        return [self[index] for index in indexes]
@@ -35,6 +35,8 @@ class AddressScope(base.NeutronDbObject):
         'ip_version': common_types.IPVersionEnumField(),
     }
 
+    column_projection = True
+
     @classmethod
     def get_network_address_scope(cls, context, network_id, ip_version):
         query = context.session.query(cls.db_model)
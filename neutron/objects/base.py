@@ -30,6 +30,7 @@ from oslo_versionedobjects import base as obj_base
 from oslo_versionedobjects import exception as obj_exception
 from oslo_versionedobjects import fields as obj_fields
 import six
+import sqlalchemy as sa
 from sqlalchemy import orm
 
 from neutron._i18n import _
@@ -103,8 +104,10 @@ class Pager(object):
             if getattr(self, attr) is not None
         }
         if self.marker and self.limit:
-            res['marker_obj'] = obj_db_api.get_object(
-                obj_cls, context, id=self.marker)
+            # Only the sort key values of the marker are needed to build the
+            # keyset criteria of the page
+            res['marker_obj'] = obj_db_api.get_keyset_marker(
+                obj_cls, context, self.sorts, self.marker)
         return res
 
     def __str__(self):
@@ -114,6 +117,34 @@ class Pager(object):
         return self.__dict__ == other.__dict__
 
 
+class _DbObjectProjection(object):
+    '''Projection of a database object
+
+    This class exposes the attributes of a database object that were loaded
+    for the fields requested to get_objects, the other ones are reported as
+    missing instead of being loaded from the database one row at a time.
+    '''
+    def __init__(self, db_obj, attrs):
+        self._db_obj = db_obj
+        self._attrs = attrs
+
+    def get(self, key, default=None):
+        if key not in self._attrs:
+            return default
+        return self._db_obj.get(key, default)
+
+    def __getitem__(self, key):
+        if key not in self._attrs:
+            raise KeyError(key)
+        return self._db_obj[key]
+
+    def __contains__(self, key):
+        return key in self._attrs and key in self._db_obj
+
+    def __getattr__(self, name):
+        return getattr(self._db_obj, name)
+
+
 class NeutronObjectRegistry(obj_base.VersionedObjectRegistry):
 
     _registry = None
@@ -443,9 +474,15 @@ class NeutronDbObject(NeutronObject):
     # in to_dict()
     # obj_extra_fields = []
 
+    # whether get_objects can load only the columns of the requested fields.
+    # It requires from_db_object and the callers to only use the requested
+    # fields, any other field is loaded on first access one object at a time.
+    column_projection = False
+
     def __init__(self, *args, **kwargs):
         super(NeutronDbObject, self).__init__(*args, **kwargs)
         self._captured_db_model = None
+        self._db_projection = None
 
     @property
     def db_obj(self):
@@ -458,7 +495,17 @@ class NeutronDbObject(NeutronObject):
                 fields[field].context = context
 
     def from_db_object(self, db_obj):
-        fields = self.modify_fields_from_db(db_obj)
+        if self._db_projection is not None:
+            fields = self.modify_fields_from_db(
+                _DbObjectProjection(db_obj, self._db_projection))
+            # the default values of the fields left out of the projection
+            # are not their values, unset them to load them on first access
+            for field in self.fields:
+                if (field not in fields and not self.is_synthetic(field) and
+                        self.obj_attr_is_set(field)):
+                    delattr(self, field)
+        else:
+            fields = self.modify_fields_from_db(db_obj)
         if self.lazy_fields:
             self._set_lazy_contexts(fields, self.obj_context)
         for field in self.fields:
@@ -537,16 +584,59 @@ class NeutronDbObject(NeutronObject):
         return result
 
     @classmethod
-    def _load_object(cls, context, db_obj, fields=None):
+    def _get_db_projection(cls, fields):
+        """Return the model attributes needed to load the given fields
+
+        :param fields: the names of the requested fields
+        :return: the names of the model attributes, or None if the whole row
+                 must be loaded: when the object doesn't support projections,
+                 when no field is requested or when a synthetic field or a
+                 field not mapped to a model attribute is requested
+        """
+        if not cls.column_projection or not fields:
+            return None
+        descriptors = sa.inspect(cls.db_model).all_orm_descriptors
+        projection = set(cls.primary_keys)
+        if 'project_id' in cls.fields:
+            projection.add('project_id')
+        for field in fields:
+            if field == 'tenant_id':
+                field = 'project_id'
+            if field not in cls.fields:
+                # attribute of the API resource built by the caller
+                continue
+            if cls.is_synthetic(field):
+                return None
+            projection.add(cls.fields_need_translation.get(field, field))
+        if not projection.issubset(descriptors.keys()):
+            return None
+        if cls.has_standard_attributes():
+            # the resource extenders read the standard attributes of the
+            # db object, whatever the requested fields
+            projection.add('standard_attr')
+        return projection
+
+    @classmethod
+    def _load_object(cls, context, db_obj, fields=None, projection=None):
         obj = cls(context)
 
         if fields is not None and len(fields) != 0:
             if len(set(fields).intersection(set(cls.synthetic_fields))) == 0:
                 obj._load_synthetic_fields = False
 
+        obj._db_projection = projection
         obj.from_db_object(db_obj)
         return obj
 
+    def _load_projected_out_fields(self):
+        db_fields = self.modify_fields_from_db(self._captured_db_model)
+        self._db_projection = None
+        for field, value in db_fields.items():
+            if (field in self.fields and not self.is_synthetic(field) and
+                    not self.obj_attr_is_set(field)):
+                setattr(self, field, value)
+                self.obj_reset_changes([field])
+
     def obj_load_attr(self, attrname):
         """Set None for nullable fields that has unknown value.
 
@@ -554,6 +644,12 @@ class NeutronDbObject(NeutronObject):
         ``attrname'' field will be unknown. In such cases if the field
         ``attrname'' is a nullable Field return None
         """
+        if (self._db_projection is not None and
+                attrname in self.fields and not self.is_synthetic(attrname)):
+            # the field was not requested when the object was loaded
+            self._load_projected_out_fields()
+            if self.obj_attr_is_set(attrname):
+                return
         try:
             is_attr_nullable = self.fields[attrname].nullable
         except KeyError:
@@ -626,20 +722,26 @@ class NeutronDbObject(NeutronObject):
         :param validate_filters: Raises an error in case of passing an unknown
                                  filter
         :param fields: indicate which fields the caller is interested in
-                       using. Note that currently this is limited to
-                       avoid loading synthetic fields when possible, and
-                       does not affect db queries. Default is None, which
-                       is the same as []. Example: ['id', 'name']
+                       using. It avoids loading synthetic fields when
+                       possible and, for objects supporting column
+                       projection, restricts the db queries to the columns
+                       and relationships of those fields. Default is None,
+                       which is the same as []. Example: ['id', 'name']
         :param kwargs: multiple keys defined by key=value pairs
         :return: list of objects of NeutronDbObject class or empty list
         """
         if validate_filters:
             cls.validate_filters(**kwargs)
+        filters = cls.modify_fields_to_db(kwargs)
+        projection = cls._get_db_projection(fields)
+        if projection is not None:
+            filters['_projection'] = projection
         with cls.db_context_reader(context):
             db_objs = obj_db_api.get_objects(
-                cls, context, _pager=_pager, **cls.modify_fields_to_db(kwargs))
+                cls, context, _pager=_pager, **filters)
 
-            return [cls._load_object(context, db_obj, fields=fields)
+            return [cls._load_object(context, db_obj, fields=fields,
+                                     projection=projection)
                     for db_obj in db_objs]
 
     @classmethod
@@ -17,6 +17,11 @@ from neutron_lib.db import model_query
 from neutron_lib import exceptions as n_exc
 from neutron_lib.objects import utils as obj_utils
 from oslo_utils import uuidutils
+import sqlalchemy as sa
+from sqlalchemy.ext import associationproxy
+from sqlalchemy import orm
+
+from neutron.db import _utils as db_utils
 
 
 # Common database operation implementations
@@ -32,6 +37,12 @@ def get_object(obj_cls, context, **kwargs):
     return _get_filter_query(obj_cls, context, **kwargs).first()
 
 
+def get_keyset_marker(obj_cls, context, sorts, marker):
+    with obj_cls.db_context_reader(context):
+        return db_utils.get_keyset_marker(
+            context, obj_cls.db_model, sorts, marker)
+
+
 def count(obj_cls, context, **kwargs):
     return _get_filter_query(obj_cls, context, **kwargs).count()
 
@@ -42,14 +53,39 @@ def _kwargs_to_filters(**kwargs):
             for k, v in kwargs.items()}
 
 
-def get_objects(obj_cls, context, _pager=None, **kwargs):
+def _get_projection_options(model, attrs):
+    mapper = sa.inspect(model)
+    descriptors = mapper.all_orm_descriptors
+    loaded = set(attrs)
+    for attr in attrs:
+        # association proxies are loaded with the relationship they proxy
+        if isinstance(descriptors[attr], associationproxy.AssociationProxy):
+            loaded.add(descriptors[attr].target_collection)
+    columns = [col.key for col in mapper.column_attrs if col.key in loaded]
+    options = [orm.load_only(*columns)]
+    options.extend(orm.lazyload(rel.key) for rel in mapper.relationships
+                   if rel.key not in loaded)
+    return options
+
+
+def get_objects(obj_cls, context, _pager=None, _projection=None, **kwargs):
     with obj_cls.db_context_reader(context):
         filters = _kwargs_to_filters(**kwargs)
-        return model_query.get_collection(
-            context, obj_cls.db_model,
-            dict_func=None,  # return all the data
-            filters=filters,
-            **(_pager.to_kwargs(context, obj_cls) if _pager else {}))
+        pager_kwargs = _pager.to_kwargs(context, obj_cls) if _pager else {}
+        if _projection is None:
+            return model_query.get_collection(
+                context, obj_cls.db_model,
+                dict_func=None,  # return all the data
+                filters=filters, **pager_kwargs)
+        # only load the columns and the relationships of the projection
+        query = model_query.get_collection_query(
+            context, obj_cls.db_model, filters=filters, **pager_kwargs)
+        query = query.options(
+            *_get_projection_options(obj_cls.db_model, _projection))
+        db_objs = query.all()
+        if pager_kwargs.get('limit') and pager_kwargs.get('page_reverse'):
+            db_objs.reverse()
+        return db_objs
 
 
 def get_values(obj_cls, context, field, **kwargs):
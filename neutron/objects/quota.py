@@ -89,7 +89,6 @@ class Reservation(base.NeutronDbObject):
             return
         resv_query = context.session.query(
             models.ResourceDelta.resource,
-            models.Reservation.expiration,
             sql.func.sum(models.ResourceDelta.amount)).join(
             models.Reservation)
         if expired:
@@ -100,10 +99,9 @@ class Reservation(base.NeutronDbObject):
             models.Reservation.project_id == project_id,
             models.ResourceDelta.resource.in_(resources),
             exp_expr)).group_by(
-            models.ResourceDelta.resource,
-            models.Reservation.expiration)
+            models.ResourceDelta.resource)
         return dict((resource, total_reserved)
-                    for (resource, exp, total_reserved) in resv_query)
+                    for (resource, total_reserved) in resv_query)
 
 
 @base.NeutronObjectRegistry.register
@@ -66,6 +66,8 @@ class SecurityGroup(rbac_db.NeutronRbacObject):
 
     lazy_fields = set(['rules'])
 
+    column_projection = True
+
     def create(self):
         # save is_default before super() resets it to False
         is_default = self.is_default
@@ -16,3 +16,8 @@ ACTION_MAP = {'POST': 'create',
               'PUT': 'update',
               'GET': 'get',
               'DELETE': 'delete'}
+
+# Request context key of the iterator over the chunks of items of a streamed
+# collection response. The hooks processing the items of a response wrap it
+# with their own per chunk processing.
+ITEM_CHUNKS = 'item_chunks'
@@ -12,13 +12,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+
+from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 import pecan
 from pecan import request
 import webob
 
 from neutron._i18n import _
 from neutron import manager
+from neutron.pecan_wsgi import constants as pecan_constants
 from neutron.pecan_wsgi.controllers import utils
 
 
@@ -141,9 +146,81 @@ class CollectionsController(utils.NeutronPecanController):
         lister_args = [neutron_context]
         if 'parent_id' in request.context:
             lister_args.append(request.context['parent_id'])
+        chunk_size = self._get_streaming_chunk_size(query_params)
+        if chunk_size:
+            return self._stream(lister_args, query_params, chunk_size)
         return {self.collection: self.plugin_lister(*lister_args,
                 **query_params)}
 
+    def _get_streaming_chunk_size(self, query_params):
+        """Return the size of the chunks to stream the response by, if any.
+
+        Only the responses which are neither limited nor paginated are
+        streamed, as the items are fetched from the plugin with the native
+        pagination, by chunks. The responses filtered by the plugin on the
+        items fetched from the database are not streamed either: the chunks
+        can then be short, or even empty, before the end of the list.
+        """
+        chunk_size = cfg.CONF.list_streaming_chunk_size
+        if (not chunk_size or not self.allow_pagination or
+                not self.native_pagination or query_params.get('limit') or
+                query_params.get('marker') or
+                query_params.get('page_reverse')):
+            return 0
+        post_query_filters = getattr(
+            self.plugin, 'post_query_filters', {}).get(self.collection, ())
+        if set(post_query_filters) & set(query_params.get('filters') or ()):
+            return 0
+        return chunk_size
+
+    def _iter_chunks(self, lister_args, query_params, chunk_size):
+        query_params = dict(query_params, limit=chunk_size)
+        while True:
+            items = self.plugin_lister(*lister_args, **query_params)
+            if items:
+                yield items
+            if len(items) < chunk_size:
+                return
+            query_params['marker'] = items[-1][self.primary_key]
+
+    def _stream(self, lister_args, query_params, chunk_size):
+        """Stream the response, fetching the items from the plugin by chunks.
+
+        The iterator over the chunks of items is stored in the request
+        context, so that the hooks can process the items of each chunk
+        before it is serialized. The first chunk is fetched before the
+        response is returned, so that the errors of the plugin are still
+        reported with their status rather than as a truncated response.
+        """
+        context = request.context
+        chunks = self._iter_chunks(lister_args, query_params, chunk_size)
+        first_items = next(chunks, None)
+        context[pecan_constants.ITEM_CHUNKS] = (
+            itertools.chain([first_items], chunks) if first_items else
+            iter([]))
+        collection = self.collection
+
+        def serialize():
+            yield b'{%s: [' % jsonutils.dump_as_bytes(collection)
+            separator = b''
+            try:
+                for items in context[pecan_constants.ITEM_CHUNKS]:
+                    if not items:
+                        continue
+                    yield separator + b', '.join(
+                        jsonutils.dump_as_bytes(item) for item in items)
+                    separator = b', '
+            except Exception:
+                # The status of the response was already sent, the client
+                # can only notice the response is truncated
+                LOG.exception("Failed to stream the %s list", collection)
+                raise
+            yield b']}'
+
+        pecan.response.content_type = 'application/json'
+        pecan.response.app_iter = serialize()
+        return pecan.response
+
     @utils.when(index, method='HEAD')
     @utils.when(index, method='PATCH')
     @utils.when(index, method='PUT')
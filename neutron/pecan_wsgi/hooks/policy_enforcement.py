@@ -14,6 +14,7 @@
 #    under the License.
 
 import copy
+import functools
 
 from neutron_lib import constants as const
 from oslo_log import log as logging
@@ -158,6 +159,13 @@ class PolicyHook(hooks.PecanHook):
         # NOTE(kevinbenton): extension listing isn't controlled by policy
         if resource == 'extension':
             return
+        item_chunks = state.request.context.get(pecan_constants.ITEM_CHUNKS)
+        if item_chunks is not None:
+            policy.init()
+            state.request.context[pecan_constants.ITEM_CHUNKS] = (
+                self._filter_item_chunks(state.request, controller, resource,
+                                         collection, item_chunks))
+            return
         try:
             data = state.response.json
         except ValueError:
@@ -176,17 +184,25 @@ class PolicyHook(hooks.PecanHook):
         key = resource if is_single else collection
         to_process = [data[resource]] if is_single else data[collection]
         # in the single case, we enforce which raises on violation
-        # in the plural case, we just check so violating items are hidden
-        policy_method = policy.enforce if is_single else policy.check
-        plugin = manager.NeutronManager.get_plugin_for_resource(collection)
+        # in the plural case, we just check so violating items are hidden,
+        # compiling the policies once for all the items
+        checker = policy.RequestPolicyChecker(neutron_context,
+                                              pluralized=collection)
+        if is_single:
+            plugin = manager.NeutronManager.get_plugin_for_resource(
+                collection)
+            policy_method = functools.partial(
+                policy.enforce, neutron_context, plugin=plugin,
+                pluralized=collection)
+        else:
+            policy_method = checker.check
         try:
             resp = [self._get_filtered_item(state.request, controller,
-                                            resource, collection, item)
+                                            resource, collection, item,
+                                            checker=checker)
                     for item in to_process
                     if (state.request.method != 'GET' or
-                        policy_method(neutron_context, action, item,
-                                      plugin=plugin,
-                                      pluralized=collection))]
+                        policy_method(action, item))]
         except oslo_policy.PolicyNotAuthorized:
             # This exception must be explicitly caught as the exception
             # translation hook won't be called if an error occurs in the
@@ -200,11 +216,23 @@ class PolicyHook(hooks.PecanHook):
             resp = resp[0]
         state.response.json = {key: resp}
 
+    def _filter_item_chunks(self, request, controller, resource, collection,
+                            item_chunks):
+        neutron_context = request.context.get('neutron_context')
+        action = controller.plugin_handlers[controller.SHOW]
+        checker = policy.RequestPolicyChecker(neutron_context,
+                                              pluralized=collection)
+        for items in item_chunks:
+            yield [self._get_filtered_item(request, controller, resource,
+                                           collection, item, checker=checker)
+                   for item in items if checker.check(action, item)]
+
     def _get_filtered_item(self, request, controller, resource, collection,
-                           data):
+                           data, checker=None):
         neutron_context = request.context.get('neutron_context')
         to_exclude = self._exclude_attributes_by_policy(
-            neutron_context, controller, resource, collection, data)
+            neutron_context, controller, resource, collection, data,
+            checker=checker)
         return self._filter_attributes(request, data, to_exclude)
 
     def _filter_attributes(self, request, data, fields_to_strip):
@@ -215,13 +243,15 @@ class PolicyHook(hooks.PecanHook):
                     if item[0] not in fields_to_strip)
 
     def _exclude_attributes_by_policy(self, context, controller, resource,
-                                      collection, data):
+                                      collection, data, checker=None):
         """Identifies attributes to exclude according to authZ policies.
 
         Return a list of attribute names which should be stripped from the
         response returned to the user because the user is not authorized
         to see them.
         """
+        checker = checker or policy.RequestPolicyChecker(
+            context, pluralized=collection)
         attributes_to_exclude = []
         for attr_name in list(data):
             # TODO(amotoki): All attribute maps have tenant_id and
@@ -233,14 +263,12 @@ class PolicyHook(hooks.PecanHook):
                 continue
             attr_data = controller.resource_info.get(attr_name)
             if attr_data and attr_data['is_visible']:
-                if policy.check(
-                        context,
+                if checker.check(
                         # NOTE(kevinbenton): this used to reference a
                         # _plugin_handlers dict, why?
                         'get_%s:%s' % (resource, attr_name),
                         data,
-                        might_not_exist=True,
-                        pluralized=collection):
+                        might_not_exist=True):
                     # this attribute is visible, check next one
                     continue
             # if the code reaches this point then either the policy check
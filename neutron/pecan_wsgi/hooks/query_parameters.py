@@ -14,6 +14,7 @@ from pecan import hooks
 
 from neutron.api import api_common
 from neutron import manager
+from neutron.pecan_wsgi import constants as pecan_constants
 from neutron.pecan_wsgi.hooks import policy_enforcement
 from neutron.pecan_wsgi.hooks import utils
 
@@ -129,6 +130,10 @@ class QueryParametersHook(hooks.PecanHook):
         if (not resource or resource == 'extension' or
                 state.request.method != 'GET'):
             return
+        # NOTE: streamed responses are neither limited nor paginated, and
+        # their items are sorted by the plugin
+        if pecan_constants.ITEM_CHUNKS in state.request.context:
+            return
         try:
             data = state.response.json
         except ValueError:
@@ -14,6 +14,8 @@
 
 from pecan import hooks
 
+from neutron.pecan_wsgi import constants as pecan_constants
+
 
 class UserFilterHook(hooks.PecanHook):
 
@@ -25,6 +27,12 @@ class UserFilterHook(hooks.PecanHook):
         user_fields = state.request.params.getall('fields')
         if not user_fields:
             return
+        item_chunks = state.request.context.get(pecan_constants.ITEM_CHUNKS)
+        if item_chunks is not None:
+            state.request.context[pecan_constants.ITEM_CHUNKS] = (
+                [self._filter_item(i, user_fields) for i in items]
+                for items in item_chunks)
+            return
         try:
             data = state.response.json
         except ValueError:
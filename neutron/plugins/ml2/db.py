@@ -24,10 +24,12 @@ from oslo_db import exception as db_exc
 from oslo_log import log
 from oslo_utils import uuidutils
 import six
+import sqlalchemy as sa
 from sqlalchemy import or_
 from sqlalchemy.orm import exc
 
 from neutron._i18n import _
+from neutron.db import baked_queries
 from neutron.db.models import securitygroup as sg_models
 from neutron.db import models_v2
 from neutron.objects import base as objects_base
@@ -41,6 +43,25 @@ LOG = log.getLogger(__name__)
 MAX_PORTS_PER_QUERY = 500
 
 
+def _port_binding_host_query(session):
+    return session.query(models.PortBinding.host).filter(
+        models.PortBinding.port_id.startswith(sa.bindparam('port_id')),
+        models.PortBinding.status == n_const.ACTIVE)
+
+
+def _distributed_port_bindings_query(session):
+    return session.query(models.DistributedPortBinding).filter(
+        models.DistributedPortBinding.port_id.startswith(
+            sa.bindparam('port_id')))
+
+
+_PORT_BINDING_HOST_QUERY = baked_queries.BakedQuery(
+    'get_port_binding_host', _port_binding_host_query)
+
+_DISTRIBUTED_PORT_BINDINGS_QUERY = baked_queries.BakedQuery(
+    'get_distributed_port_bindings', _distributed_port_bindings_query)
+
+
 @db_api.CONTEXT_WRITER
 def add_port_binding(context, port_id):
     record = models.PortBinding(
@@ -213,10 +234,10 @@ def make_port_dict_with_security_groups(port, sec_groups):
 def get_port_binding_host(context, port_id):
     try:
         with db_api.CONTEXT_READER.using(context):
-            query = (context.session.query(models.PortBinding.host).
-                     filter(models.PortBinding.port_id.startswith(port_id)))
-            query = query.filter(
-                models.PortBinding.status == n_const.ACTIVE).one()
+            query = _PORT_BINDING_HOST_QUERY(context.session)
+            if query is None:
+                query = _port_binding_host_query(context.session)
+            query = query.params(port_id=port_id).one()
     except exc.NoResultFound:
         LOG.debug("No active binding found for port %(port_id)s",
                   {'port_id': port_id})
@@ -254,11 +275,24 @@ def get_distributed_port_binding_by_host(context, port_id, host):
     return binding
 
 
+def get_distributed_port_bindings_by_host(context, port_ids, host):
+    """Return a dict of port_id to distributed binding of ports on host."""
+    if not port_ids:
+        return {}
+    with db_api.CONTEXT_READER.using(context):
+        bindings = (
+            context.session.query(models.DistributedPortBinding).
+            filter(models.DistributedPortBinding.port_id.in_(port_ids),
+                   models.DistributedPortBinding.host == host).all())
+    return {binding.port_id: binding for binding in bindings}
+
+
 def get_distributed_port_bindings(context, port_id):
     with db_api.CONTEXT_READER.using(context):
-        bindings = (context.session.query(models.DistributedPortBinding).
-                    filter(models.DistributedPortBinding.port_id.startswith(
-                           port_id)).all())
+        query = _DISTRIBUTED_PORT_BINDINGS_QUERY(context.session)
+        if query is None:
+            query = _distributed_port_bindings_query(context.session)
+        bindings = query.params(port_id=port_id).all()
     if not bindings:
         LOG.debug("No bindings for distributed port %s", port_id)
     return bindings
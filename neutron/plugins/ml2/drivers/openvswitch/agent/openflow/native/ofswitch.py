@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
 import random
 
@@ -38,12 +39,98 @@ LOG = logging.getLogger(__name__)
 
 BUNDLE_ID_WIDTH = 1 << 32
 COOKIE_DEFAULT = object()
+# Bridge external_ids key where the cookie of the flows installed by the
+# agent is persisted when reconciling flows on start.
+FLOW_COOKIE_EXTERNAL_ID = 'neutron-flow-cookie'
 
 
 class ActiveBundleRunning(exceptions.NeutronException):
     message = _("Another active bundle 0x%(bundle_id)x is running")
 
 
+def _hashable(value):
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _match_fields(ofpp, match):
+    """Return the fields of an OFPMatch in a normalized, comparable form.
+
+    The match is serialized and parsed back so that the fields of the
+    matches built by the agent and of the ones dumped from the switch
+    share the same representation.
+    """
+    buf = bytearray()
+    match.serialize(buf, 0)
+    parsed = ofpp.OFPMatch.parser(six.binary_type(buf), 0)
+    return tuple(sorted((k, _hashable(v)) for k, v in parsed._fields2))
+
+
+def _instructions_bytes(instructions):
+    buf = bytearray()
+    for instruction in instructions:
+        instruction.serialize(buf, len(buf))
+    return six.binary_type(buf)
+
+
+class FlowRecorder(object):
+    """Desired flows of a bridge, recorded while its flows are reconciled.
+
+    Flows are indexed by (table_id, priority, match fields), which
+    identifies a flow in a switch, and by match field so that the non
+    strict removals issued by the agent can be applied efficiently.
+    """
+
+    def __init__(self):
+        self.active = True
+        self.flows = {}
+        self._by_table = collections.defaultdict(set)
+        self._by_field = collections.defaultdict(set)
+
+    def add(self, key, msg):
+        self.flows[key] = msg
+        self._by_table[key[0]].add(key)
+        for field in key[2]:
+            self._by_field[field].add(key)
+
+    def _discard(self, key):
+        del self.flows[key]
+        self._by_table[key[0]].discard(key)
+        for field in key[2]:
+            self._by_field[field].discard(key)
+
+    def remove(self, table_id, strict, priority, cookie, cookie_mask,
+               fields):
+        """Remove the recorded flows an OFPFC_DELETE(_STRICT) would remove.
+
+        :param table_id: table of the flows, None for all tables
+        """
+        if strict:
+            if table_id is None:
+                candidates = [k for k in self.flows
+                              if k[1:] == (priority, fields)]
+            else:
+                candidates = [(table_id, priority, fields)]
+        elif fields:
+            candidates = min((self._by_field[f] for f in fields), key=len)
+        elif table_id is not None:
+            candidates = self._by_table[table_id]
+        else:
+            candidates = self.flows
+        for key in list(candidates):
+            msg = self.flows.get(key)
+            if msg is None:
+                continue
+            if table_id is not None and key[0] != table_id:
+                continue
+            if (msg.cookie ^ cookie) & cookie_mask:
+                continue
+            if not strict and not set(fields).issubset(key[2]):
+                continue
+            self._discard(key)
+
+
 class OpenFlowSwitchMixin(object):
     """Mixin to provide common convenient routines for an openflow switch.
 
@@ -61,8 +148,53 @@ class OpenFlowSwitchMixin(object):
     def __init__(self, *args, **kwargs):
         self._app = kwargs.pop('os_ken_app')
         self.active_bundles = set()
+        self._flow_cookie = None
+        self._flow_recorder = None
         super(OpenFlowSwitchMixin, self).__init__(*args, **kwargs)
 
+    @property
+    def default_cookie(self):
+        if self._flow_cookie is not None:
+            return self._flow_cookie
+        return super(OpenFlowSwitchMixin, self).default_cookie
+
+    def set_agent_uuid_stamp(self, val):
+        # A bridge with its own cookie (see OVSCookieBridge) does not use
+        # the persistent cookie of the bridge it was cloned from.
+        self._flow_cookie = None
+        super(OpenFlowSwitchMixin, self).set_agent_uuid_stamp(val)
+
+    def setup_flow_reconcile(self, record=True):
+        """Use a persistent cookie for the flows installed by the agent.
+
+        The cookie is stored in the bridge external_ids so that the flows
+        installed by a previous run of the agent can be recognized.  With
+        record=True, and if such a cookie was found, the flows installed and
+        uninstalled afterwards are only recorded; the next call to
+        cleanup_flows dumps the flows of the switch once and applies the
+        difference with the recorded flows in a single bundle, instead of
+        reinstalling every flow with a new cookie.
+        """
+        if self._flow_cookie is None:
+            cookie = self.ovsdb.br_get_external_id(
+                self.br_name, FLOW_COOKIE_EXTERNAL_ID).execute()
+            if cookie:
+                self._flow_cookie = int(cookie)
+            else:
+                record = False
+                self._flow_cookie = ovs_lib.generate_random_cookie()
+                self.ovsdb.br_set_external_id(
+                    self.br_name, FLOW_COOKIE_EXTERNAL_ID,
+                    str(self._flow_cookie)).execute(check_error=True)
+            self._reserved_cookies.add(self._flow_cookie)
+        if record and not self._is_recording_flows():
+            LOG.info("Recording %s flows until they are reconciled",
+                     self.br_name)
+            self._flow_recorder = FlowRecorder()
+
+    def _is_recording_flows(self):
+        return self._flow_recorder is not None and self._flow_recorder.active
+
     def _get_dp_by_dpid(self, dpid_int):
         """Get os-ken datapath object for the switch."""
         timeout_sec = cfg.CONF.OVS.of_connect_timeout
@@ -134,10 +266,16 @@ class OpenFlowSwitchMixin(object):
                                   "%s") %
                                 cookie_mask)
         elif cookie == COOKIE_DEFAULT:
-            cookie = self._default_cookie
+            cookie = self.default_cookie
             cookie_mask = ovs_lib.UINT64_BITMASK
 
         match = self._match(ofp, ofpp, match, **match_kwargs)
+        if self._is_recording_flows():
+            self._flow_recorder.remove(
+                None if table_id == ofp.OFPTT_ALL else table_id,
+                strict, priority, cookie, cookie_mask,
+                _match_fields(ofpp, match))
+            return
         if strict:
             cmd = ofp.OFPFC_DELETE_STRICT
         else:
@@ -175,12 +313,76 @@ class OpenFlowSwitchMixin(object):
             self.uninstall_flows(cookie=c, cookie_mask=ovs_lib.UINT64_BITMASK)
 
     def cleanup_flows(self):
+        if self._is_recording_flows():
+            self._reconcile_flows()
+            return
+
         LOG.info("Reserved cookies for %s: %s", self.br_name,
                  self.reserved_cookies)
 
         for table_id in self.of_tables:
             self._dump_and_clean(table_id)
 
+    def _reconcile_flows(self):
+        """Apply the difference between the recorded and installed flows.
+
+        Installed flows which are not recorded are deleted if they belong
+        to a previous run of the agent, that is if they have the persistent
+        cookie or a cookie not reserved by this run.  Flows installed by
+        other means during this run (e.g. by the firewall driver) and
+        learned flows are left alone.  Recorded flows which are missing or
+        differ are (re)installed.
+        """
+        recorder = self._flow_recorder
+        recorder.active = False
+        self._flow_recorder = None
+        (dp, ofp, ofpp) = self._get_dp()
+        reserved_cookies = self.reserved_cookies
+        unchanged = set()
+        deleted = []
+        for table_id in self.of_tables:
+            for flow in self.dump_flows(table_id):
+                key = (flow.table_id, flow.priority,
+                       tuple(sorted((k, _hashable(v))
+                                    for k, v in flow.match._fields2)))
+                msg = recorder.flows.get(key)
+                if msg is not None:
+                    if (msg.cookie == flow.cookie and
+                            _instructions_bytes(msg.instructions) ==
+                            _instructions_bytes(flow.instructions)):
+                        unchanged.add(key)
+                    continue
+                if flow.idle_timeout or flow.hard_timeout:
+                    continue
+                if (flow.cookie in reserved_cookies and
+                        flow.cookie != self._flow_cookie):
+                    continue
+                deleted.append(ofpp.OFPFlowMod(
+                    dp,
+                    command=ofp.OFPFC_DELETE_STRICT,
+                    cookie=flow.cookie,
+                    cookie_mask=ovs_lib.UINT64_BITMASK,
+                    table_id=flow.table_id,
+                    match=flow.match,
+                    priority=flow.priority,
+                    out_group=ofp.OFPG_ANY,
+                    out_port=ofp.OFPP_ANY))
+        added = [msg for key, msg in recorder.flows.items()
+                 if key not in unchanged]
+        LOG.info("Reconciling %(br)s flows: %(added)d to install, "
+                 "%(deleted)d to delete, %(unchanged)d unchanged",
+                 {'br': self.br_name, 'added': len(added),
+                  'deleted': len(deleted), 'unchanged': len(unchanged)})
+        if not added and not deleted:
+            return
+        # Deletions go first so that a flow deleted because its match is
+        # represented differently is installed again by the additions.
+        with self.bundled(ordered=True) as br:
+            active_bundle = dict(id=br.active_bundle,
+                                 bundle_flags=br.bundle_flags)
+            for msg in deleted + added:
+                self._send_msg(msg, active_bundle=active_bundle)
+
     def install_goto_next(self, table_id, active_bundle=None):
         self.install_goto(table_id=table_id, dest_table_id=table_id + 1,
                           active_bundle=active_bundle)
@@ -232,6 +434,10 @@ class OpenFlowSwitchMixin(object):
                               match=match,
                               priority=priority,
                               instructions=instructions)
+        if self._is_recording_flows():
+            self._flow_recorder.add(
+                (table_id, priority, _match_fields(ofpp, match)), msg)
+            return
         self._send_msg(msg, active_bundle=active_bundle)
 
     def install_apply_actions(self, actions,
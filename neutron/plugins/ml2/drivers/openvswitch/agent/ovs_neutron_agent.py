@@ -62,6 +62,7 @@ from neutron.agent import securitygroups_rpc as agent_sg_rpc
 from neutron.api.rpc.callbacks import resources
 from neutron.api.rpc.handlers import dvr_rpc
 from neutron.api.rpc.handlers import securitygroups_rpc as sg_rpc
+from neutron.common import _constants as common_constants
 from neutron.common import config
 from neutron.common import utils as n_utils
 from neutron.conf.agent import common as agent_config
@@ -196,6 +197,10 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         # Keep track of int_br's device count for use by _report_state()
         self.int_br_device_count = 0
 
+        # Whether the flows installed before the first cleanup_stale_flows
+        # are recorded and reconciled with the ones of the bridges.
+        self.reconcile_flows = (agent_conf.reconcile_flows_on_start and
+                                not agent_conf.drop_flows_on_start)
         self.int_br = self.br_int_cls(ovs_conf.integration_bridge)
         self.setup_integration_br()
         # Stores port update notifications for processing in main rpc loop
@@ -1288,6 +1293,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         #   ovs-vsctl -- --may-exist add-br BRIDGE_NAME
         # which does nothing if bridge already exists.
         self.int_br.create()
+        self._setup_flow_reconcile(self.int_br)
         self.int_br.set_secure_mode()
         self.int_br.setup_controllers(self.conf)
         self.int_br.set_igmp_snooping_state(self.conf.OVS.igmp_snooping_enable)
@@ -1341,6 +1347,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         # tun_br.create() won't recreate bridge if it exists, but will handle
         # cases where something like datapath_type has changed
         self.tun_br.create(secure_mode=True)
+        self._setup_flow_reconcile(self.tun_br)
         self.tun_br.setup_controllers(self.conf)
         if (not self.int_br.port_exists(self.conf.OVS.int_peer_patch_port) or
                 self.patch_tun_ofport == ovs_lib.INVALID_OFPORT):
@@ -1451,6 +1458,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             # The bridge already exists, so create won't recreate it, but will
             # handle things like changing the datapath_type
             br.create()
+            self._setup_flow_reconcile(br)
             br.set_secure_mode()
             br.setup_controllers(self.conf)
             if cfg.CONF.AGENT.drop_flows_on_start:
@@ -1857,22 +1865,44 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                     br.cleanup_tunnel_port(ofport)
                     self.tun_br_ofports[tunnel_type].pop(remote_ip, None)
 
+    def _get_devices_details_in_chunks(self, devices, agent_restarted):
+        """Yield the details of devices, retrieved by chunks.
+
+        Each chunk is retrieved with a single request so that the devices
+        of the first chunks can be processed while the details of the
+        following ones are not retrieved yet.
+        """
+        devices = list(devices)
+        step = common_constants.AGENT_RES_PROCESSING_STEP
+        for i in range(0, max(len(devices), 1), step):
+            yield self.plugin_rpc.get_devices_details_list_and_failed_devices(
+                self.context,
+                devices[i:i + step],
+                self.agent_id,
+                self.conf.host,
+                agent_restarted)
+
     def treat_devices_added_or_updated(self, devices, provisioning_needed,
                                        re_added):
         skipped_devices = []
         need_binding_devices = []
         binding_no_activated_devices = set()
+        failed_devices = set()
         agent_restarted = self.iter_num == 0
-        devices_details_list = (
-            self.plugin_rpc.get_devices_details_list_and_failed_devices(
-                self.context,
-                devices,
-                self.agent_id,
-                self.conf.host,
-                agent_restarted))
-        failed_devices = set(devices_details_list.get('failed_devices'))
+        for devices_details_list in self._get_devices_details_in_chunks(
+                devices, agent_restarted):
+            failed_devices.update(
+                devices_details_list.get('failed_devices'))
+            self._treat_devices_details(
+                devices_details_list.get('devices'), provisioning_needed,
+                re_added, skipped_devices, binding_no_activated_devices,
+                need_binding_devices)
+        return (skipped_devices, binding_no_activated_devices,
+                need_binding_devices, failed_devices)
 
-        devices = devices_details_list.get('devices')
+    def _treat_devices_details(self, devices, provisioning_needed, re_added,
+                               skipped_devices, binding_no_activated_devices,
+                               need_binding_devices):
         vif_by_id = self.int_br.get_vifs_by_ids(
             [vif['device'] for vif in devices])
         for details in devices:
@@ -1921,8 +1951,6 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                         device)
                 if (port and port.ofport != -1):
                     self.port_dead(port)
-        return (skipped_devices, binding_no_activated_devices,
-                need_binding_devices, failed_devices)
 
     def _update_port_network(self, port_id, network_id):
         self._clean_network_ports(port_id)
@@ -2294,6 +2322,11 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                 'removed': len(ancillary_port_info.get('removed', []))}
         return port_stats
 
+    def _setup_flow_reconcile(self, br):
+        if self.conf.AGENT.reconcile_flows_on_start and (
+                not self.conf.AGENT.drop_flows_on_start):
+            br.setup_flow_reconcile(record=self.reconcile_flows)
+
     def cleanup_stale_flows(self):
         LOG.info("Cleaning stale %s flows", self.int_br.br_name)
         self.int_br.cleanup_flows()
@@ -2304,6 +2337,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         if self.enable_tunneling:
             LOG.info("Cleaning stale %s flows", self.tun_br.br_name)
             self.tun_br.cleanup_flows()
+        self.reconcile_flows = False
 
     def process_port_info(self, start, polling_manager, sync, ovs_restarted,
                           ports, ancillary_ports, updated_ports_copy,
@@ -289,8 +289,15 @@ class OVNMechanismDriver(api.MechanismDriver):
     def _process_sg_rule_notification(
             self, resource, event, trigger, **kwargs):
         if event == events.AFTER_CREATE:
-            self._ovn_client.create_security_group_rule(
-                kwargs.get('security_group_rule'))
+            sg_rule = kwargs.get('security_group_rule')
+            sg_rules = kwargs.get('security_group_rules')
+            if not sg_rules:
+                self._ovn_client.create_security_group_rule(sg_rule)
+            elif sg_rule['id'] == sg_rules[0]['id']:
+                # The rules created in bulk are notified one by one, along
+                # with all of them: the ACLs of all of them are created
+                # when the first one is notified.
+                self._ovn_client.create_security_group_rules(sg_rules)
         elif event == events.BEFORE_DELETE:
             sg_rule = self._plugin.get_security_group_rule(
                 kwargs['context'], kwargs.get('security_group_rule_id'))
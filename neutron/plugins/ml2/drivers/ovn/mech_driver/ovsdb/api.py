@@ -221,6 +221,27 @@ class API(api.API):
         :type is_add_acl:             bool
         """
 
+    @abc.abstractmethod
+    def update_port_group_acls(self, port_group, acls_add=None, acls_del=None,
+                               if_exists=True):
+        """Add and delete ACLs of a port group in a single command.
+
+        The ACLs already present are not added again and the ACLs absent
+        are not deleted, the ACLs being matched on their direction,
+        priority and match.
+
+        :param port_group:            The name of the port group
+        :type port_group:             string
+        :param acls_add:              The ACLs to add
+        :type acls_add:               list of dicts
+        :param acls_del:              The ACLs to delete
+        :type acls_del:               list of dicts
+        :param if_exists:             Do not fail if the port group does not
+                                      exist
+        :type if_exists:              bool
+        :returns:                     :class:`Command` with no result
+        """
+
     @abc.abstractmethod
     def get_acl_by_id(self, acl_id):
         """Get an ACL by its ID.
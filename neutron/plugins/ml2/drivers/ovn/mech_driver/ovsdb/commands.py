@@ -627,6 +627,85 @@ class UpdateACLsCommand(command.BaseCommand):
                                   old_values=acl_del_objs)
 
 
+class UpdatePortGroupACLsCommand(command.BaseCommand):
+    def __init__(self, api, port_group, acls_add, acls_del, if_exists):
+        """This command adds and deletes ACLs of a port group at once
+
+        @param port_group: Name of the Port Group
+        @type port_group: string
+        @param acls_add: ACLs to add, as built by the pg_acl_add callers
+        @type acls_add: [{}]
+        @param acls_del: ACLs to delete, matched on their direction,
+                         priority and match
+        @type acls_del: [{}]
+        @param if_exists: Do not fail if the Port Group does not exist
+        @type if_exists: Boolean.
+
+        """
+        super(UpdatePortGroupACLsCommand, self).__init__(api)
+        self.port_group = port_group
+        self.acls_add = acls_add or []
+        self.acls_del = acls_del or []
+        self.if_exists = if_exists
+
+    @staticmethod
+    def _acl_key(acl):
+        if isinstance(acl, dict):
+            return acl['direction'], acl['priority'], acl['match']
+        return acl.direction, acl.priority, acl.match
+
+    def _insert_acl(self, txn, acl):
+        row = txn.insert(self.api._tables['ACL'])
+        external_ids = {}
+        for col, val in acl.items():
+            if col == 'port_group':
+                continue
+            if col in ('direction', 'priority', 'match', 'action', 'log'):
+                setattr(row, col, val)
+            elif col in ('name', 'severity'):
+                # Both are optional columns left empty by default
+                if val:
+                    setattr(row, col, val)
+            else:
+                external_ids[col] = val
+        row.external_ids = external_ids
+        return row
+
+    def run_idl(self, txn):
+        try:
+            port_group = idlutils.row_by_value(self.api.idl, 'Port_Group',
+                                               'name', self.port_group)
+        except idlutils.RowNotFound:
+            if self.if_exists:
+                return
+            msg = _("Port group %s does not exist. "
+                    "Can't update ACLs") % self.port_group
+            raise RuntimeError(msg)
+
+        # Index the ACLs of the Port Group once instead of looking them up
+        # for each ACL added or deleted, which makes the cost of the command
+        # linear in the number of ACLs.
+        acls = {self._acl_key(acl): acl for acl in port_group.acls}
+        acl_del_objs = []
+        for acl in self.acls_del:
+            acl_obj = acls.pop(self._acl_key(acl), None)
+            if acl_obj is not None:
+                acl_del_objs.append(acl_obj)
+        acl_add_objs = []
+        for acl in self.acls_add:
+            key = self._acl_key(acl)
+            if key in acls:
+                continue
+            acls[key] = self._insert_acl(txn, acl)
+            acl_add_objs.append(acls[key].uuid)
+
+        _updatevalues_in_list(port_group, 'acls',
+                              new_values=acl_add_objs,
+                              old_values=acl_del_objs)
+        for acl_del_obj in acl_del_objs:
+            acl_del_obj.delete()
+
+
 class AddStaticRouteCommand(command.BaseCommand):
     def __init__(self, api, lrouter, **columns):
         super(AddStaticRouteCommand, self).__init__(api)
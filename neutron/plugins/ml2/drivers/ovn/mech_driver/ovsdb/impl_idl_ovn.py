@@ -12,10 +12,13 @@
 
 import contextlib
 import uuid
+import weakref
 
 from neutron_lib import exceptions as n_exc
 from neutron_lib.utils import helpers
 from oslo_log import log
+from oslo_reports import guru_meditation_report as gmr
+from oslo_reports.models import with_default_views as mwdv
 from oslo_utils import uuidutils
 from ovsdbapp.backend import ovs_idl
 from ovsdbapp.backend.ovs_idl import connection
@@ -37,6 +40,8 @@ from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovsdb_monitor
 
 LOG = log.getLogger(__name__)
 
+_backends = weakref.WeakSet()
+
 
 class OvnNbTransaction(idl_trans.Transaction):
 
@@ -60,6 +65,7 @@ class Backend(ovs_idl.Backend):
     def __init__(self, connection):
         self.ovsdb_connection = connection
         super(Backend, self).__init__(connection)
+        _backends.add(self)
 
     def start_connection(self, connection):
         try:
@@ -87,6 +93,12 @@ class Backend(ovs_idl.Backend):
         return self.is_table_present(table_name) and (
             col_name in self._tables[table_name].columns)
 
+    def get_replica_size(self):
+        """Return the rows and columns replicated of each table."""
+        return {name: {'rows': len(table.rows),
+                       'columns': len(table.columns)}
+                for name, table in self.tables.items()}
+
     def create_transaction(self, check_error=False, log_errors=True):
         return idl_trans.Transaction(
             self, self.ovsdb_connection, self.ovsdb_connection.timeout,
@@ -111,6 +123,28 @@ class Backend(ovs_idl.Backend):
             raise RuntimeError(msg)
 
 
+def get_replica_stats():
+    """Return the size of each OVSDB replica kept by this worker."""
+    idls = {}
+    for backend in list(_backends):
+        idls.setdefault(id(backend.idl), backend)
+    stats = {}
+    for index, backend in enumerate(idls.values()):
+        tables = backend.get_replica_size()
+        stats['%s-%d' % (backend.schema, index)] = {
+            'rows': sum(table['rows'] for table in tables.values()),
+            'tables': tables}
+    return stats
+
+
+def _replica_stats_report():
+    return mwdv.ModelWithDefaultViews(get_replica_stats())
+
+
+gmr.TextGuruMeditation.register_section('OVSDB Replicas',
+                                        _replica_stats_report)
+
+
 class OvsdbConnectionUnavailable(n_exc.ServiceUnavailable):
     message = _("OVS database connection to %(db_schema)s failed with error: "
                 "'%(error)s'. Verify that the OVS and OVN services are "
@@ -365,6 +399,11 @@ class OvsdbNbOvnIdl(nb_impl_idl.OvnNbApiIdlImpl, Backend):
                                      need_compare=need_compare,
                                      is_add_acl=is_add_acl)
 
+    def update_port_group_acls(self, port_group, acls_add=None, acls_del=None,
+                               if_exists=True):
+        return cmd.UpdatePortGroupACLsCommand(self, port_group, acls_add,
+                                              acls_del, if_exists)
+
     def add_static_route(self, lrouter, **columns):
         return cmd.AddStaticRouteCommand(self, lrouter, **columns)
 
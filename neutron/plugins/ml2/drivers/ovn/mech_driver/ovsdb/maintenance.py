@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import inspect
 import threading
 
@@ -79,6 +80,20 @@ class DBInconsistenciesPeriodics(object):
         self._idl = self._nb_idl.idl
         self._idl.set_lock('ovn_db_inconsistencies_periodics')
         self._sync_timer = timeutils.StopWatch()
+        # Start time of the last scan for inconsistencies, the next one
+        # only checks the rows pending a revision bump and the resources
+        # updated since then. None forces a scan of the whole table.
+        self._last_scan_at = None
+        self._stats = {
+            'runs': 0,
+            'full_scans': 0,
+            'last_scan_duration': 0.0,
+            'last_sync_duration': 0.0,
+            'create_update_backlog': 0,
+            'delete_backlog': 0,
+            'fixed': 0,
+            'failed': 0,
+        }
 
         self._resources_func_map = {
             ovn_const.TYPE_NETWORKS: {
@@ -140,6 +155,10 @@ class DBInconsistenciesPeriodics(object):
     def has_lock(self):
         return not self._idl.is_lock_contended
 
+    def get_stats(self):
+        """Return the timing and backlog of the inconsistencies checks."""
+        return dict(self._stats)
+
     def _fix_create_update(self, context, row):
         res_map = self._resources_func_map[row.resource_type]
         try:
@@ -260,15 +279,45 @@ class DBInconsistenciesPeriodics(object):
         # Only the worker holding a valid lock within OVSDB will run
         # this periodic
         if not self.has_lock:
+            # Scan the whole table once the lock is taken back, the worker
+            # holding it meanwhile may have left inconsistencies behind
+            self._last_scan_at = None
             return
 
         admin_context = n_context.get_admin_context()
+        scan_started_at = timeutils.utcnow()
+        updated_since = None
+        if self._last_scan_at is not None:
+            # Leave a margin for the clock skew between the API workers
+            # and for the transactions still in flight at the last scan
+            updated_since = self._last_scan_at - datetime.timedelta(
+                seconds=revision_numbers_db.INCONSISTENCIES_OLDER_THAN)
+        self._sync_timer.restart()
         create_update_inconsistencies = (
-            revision_numbers_db.get_inconsistent_resources(admin_context))
+            revision_numbers_db.get_inconsistent_resources(
+                admin_context, updated_since=updated_since))
         delete_inconsistencies = (
             revision_numbers_db.get_deleted_resources(admin_context))
+        # Keep checking the resources found until they are fixed, even if
+        # they are not updated anymore
+        revision_numbers_db.mark_pending(admin_context,
+                                         create_update_inconsistencies)
+        self._sync_timer.stop()
+        self._last_scan_at = scan_started_at
+        self._stats['runs'] += 1
+        if updated_since is None:
+            self._stats['full_scans'] += 1
+        self._stats['last_scan_duration'] = self._sync_timer.elapsed()
+        self._stats['last_sync_duration'] = 0.0
+        self._stats['create_update_backlog'] = len(
+            create_update_inconsistencies)
+        self._stats['delete_backlog'] = len(delete_inconsistencies)
         if not any([create_update_inconsistencies, delete_inconsistencies]):
-            LOG.debug('Maintenance task: No inconsistencies found. Skipping')
+            LOG.debug('Maintenance task: No inconsistencies found '
+                      '(%(scan)s scan took %(time).2f seconds). Skipping',
+                      {'scan': 'full' if updated_since is None else
+                       'incremental',
+                       'time': self._stats['last_scan_duration']})
             return
 
         LOG.debug('Maintenance task: Synchronizing Neutron '
@@ -276,6 +325,7 @@ class DBInconsistenciesPeriodics(object):
         self._log_maintenance_inconsistencies(create_update_inconsistencies,
                                               delete_inconsistencies)
         self._sync_timer.restart()
+        fixed = failed = 0
 
         dbg_log_msg = ('Maintenance task: Fixing resource %(res_uuid)s '
                        '(type: %(res_type)s) at %(type_)s')
@@ -295,7 +345,9 @@ class DBInconsistenciesPeriodics(object):
                     self._fix_create_update_subnet(admin_context, row)
                 else:
                     self._fix_create_update(admin_context, row)
+                fixed += 1
             except Exception:
+                failed += 1
                 LOG.exception('Maintenance task: Failed to fix resource '
                               '%(res_uuid)s (type: %(res_type)s)',
                               {'res_uuid': row.resource_uuid,
@@ -311,15 +363,30 @@ class DBInconsistenciesPeriodics(object):
                     self._ovn_client.delete_subnet(row.resource_uuid)
                 else:
                     self._fix_delete(admin_context, row)
+                fixed += 1
             except Exception:
+                failed += 1
                 LOG.exception('Maintenance task: Failed to fix deleted '
                               'resource %(res_uuid)s (type: %(res_type)s)',
                               {'res_uuid': row.resource_uuid,
                                'res_type': row.resource_type})
 
         self._sync_timer.stop()
+        self._stats['last_sync_duration'] = self._sync_timer.elapsed()
+        self._stats['fixed'] += fixed
+        self._stats['failed'] += failed
         LOG.info('Maintenance task: Synchronization finished '
-                 '(took %.2f seconds)', self._sync_timer.elapsed())
+                 '(took %(sync_time).2f seconds, %(scan)s scan took '
+                 '%(scan_time).2f seconds). Fixed %(fixed)d and failed to '
+                 'fix %(failed)d of %(create_update)d create/update and '
+                 '%(delete)d delete inconsistencies',
+                 {'sync_time': self._stats['last_sync_duration'],
+                  'scan': 'full' if updated_since is None else
+                  'incremental',
+                  'scan_time': self._stats['last_scan_duration'],
+                  'fixed': fixed, 'failed': failed,
+                  'create_update': len(create_update_inconsistencies),
+                  'delete': len(delete_inconsistencies)})
 
     def _create_lrouter_port(self, port):
         admin_context = n_context.get_admin_context()
@@ -486,6 +553,7 @@ class HashRingHealthCheckPeriodics(object):
     def __init__(self, group):
         self._group = group
         self.ctx = n_context.get_admin_context()
+        self._active_nodes = None
 
     @periodics.periodic(spacing=ovn_const.HASH_RING_TOUCH_INTERVAL)
     def touch_hash_ring_nodes(self):
@@ -493,3 +561,14 @@ class HashRingHealthCheckPeriodics(object):
         # here because we want the maintenance tasks from each instance to
         # execute this task.
         hash_ring_db.touch_nodes_from_host(self.ctx, self._group)
+
+        # Nodes expire or come back without any other write to the
+        # database, bump the generation of the ring so the workers rebuild
+        # theirs when the set of active nodes changed
+        active_nodes = {node.node_uuid for node in
+                        hash_ring_db.get_active_nodes(
+                            self.ctx, ovn_const.HASH_RING_NODES_TIMEOUT,
+                            self._group)}
+        if active_nodes != self._active_nodes:
+            hash_ring_db.bump_generation(self.ctx, self._group)
+            self._active_nodes = active_nodes
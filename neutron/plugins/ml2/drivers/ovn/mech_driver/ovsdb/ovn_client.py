@@ -2219,6 +2219,24 @@ class OVNClient(object):
         db_rev.bump_revision(
             admin_context, rule, ovn_const.TYPE_SECURITY_GROUP_RULES)
 
+    def create_security_group_rules(self, rules):
+        """Create the ACLs of rules created together.
+
+        The ACLs of the rules of each security group are added in a single
+        OVN NB transaction instead of one transaction per rule.
+        """
+        admin_context = n_context.get_admin_context()
+        sg_rules = {}
+        for rule in rules:
+            sg_rules.setdefault(rule['security_group_id'], []).append(rule)
+        for sg_id, sg_rule_list in sg_rules.items():
+            ovn_acl.update_acls_for_security_group_rules(
+                self._plugin, admin_context, self._nb_idl, sg_id,
+                sg_rule_list)
+        for rule in rules:
+            db_rev.bump_revision(
+                admin_context, rule, ovn_const.TYPE_SECURITY_GROUP_RULES)
+
     def delete_security_group_rule(self, context, rule):
         self._process_security_group_rule(rule, is_add_acl=False)
         db_rev.delete_revision(
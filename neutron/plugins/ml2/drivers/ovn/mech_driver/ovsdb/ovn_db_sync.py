@@ -11,8 +11,10 @@
 #    under the License.
 
 import abc
+import copy
 from datetime import datetime
 import itertools
+import os
 
 from eventlet import greenthread
 from neutron_lib.api.definitions import l3
@@ -22,13 +24,16 @@ from neutron_lib import context
 from neutron_lib import exceptions as n_exc
 from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
+from neutron_lib.utils import file as file_utils
 from neutron_lib.utils import helpers
 from oslo_log import log
+from oslo_serialization import jsonutils
 import six
 
 from neutron.common.ovn import acl as acl_utils
 from neutron.common.ovn import constants as ovn_const
 from neutron.common.ovn import utils
+from neutron.common import utils as common_utils
 from neutron.conf.plugins.ml2.drivers.ovn import ovn_conf
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovn_client
 from neutron.services.segments import db as segments_db
@@ -40,6 +45,72 @@ SYNC_MODE_OFF = 'off'
 SYNC_MODE_LOG = 'log'
 SYNC_MODE_REPAIR = 'repair'
 
+# The resource types synced concurrently by each stage of the OVN NB DB
+# sync. A stage only starts once the previous ones are completed.
+SYNC_STAGE_SECURITY_GROUPS = 'security_groups'
+SYNC_STAGE_NETWORKS_AND_PORTS = 'networks_and_ports'
+SYNC_STAGE_ACLS_AND_ROUTERS = 'acls_and_routers'
+
+
+class SyncCheckpoint(object):
+    """Progress of the OVN NB DB sync.
+
+    The completed stages, the last port synced by the current stage and the
+    differences found by the completed stages are saved in a file, if any,
+    so that an interrupted sync resumes where it stopped. A checkpoint saved
+    by a sync run in another mode is ignored.
+    """
+
+    def __init__(self, path, mode):
+        self.path = path
+        self._data = {'mode': mode, 'stages': [], 'markers': {},
+                      'diff_counts': {}}
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                data = jsonutils.loads(f.read())
+        except (IOError, ValueError) as e:
+            LOG.warning('Ignoring the OVN NB DB sync checkpoint %(path)s: '
+                        '%(error)s', {'path': path, 'error': e})
+            return
+        if data.get('mode') != mode:
+            LOG.info('Ignoring the OVN NB DB sync checkpoint %(path)s saved '
+                     'in %(mode)s mode', {'path': path,
+                                          'mode': data.get('mode')})
+            return
+        self._data.update(data)
+        LOG.info('Resuming the OVN NB DB sync from the checkpoint %(path)s, '
+                 'completed stages: %(stages)s',
+                 {'path': path, 'stages': self._data['stages']})
+
+    def _save(self):
+        if self.path:
+            file_utils.replace_file(self.path, jsonutils.dumps(self._data))
+
+    def is_stage_completed(self, stage):
+        return stage in self._data['stages']
+
+    def complete_stage(self, stage, diff_counts):
+        self._data['stages'].append(stage)
+        self._data['markers'] = {}
+        self._data['diff_counts'] = copy.deepcopy(diff_counts)
+        self._save()
+
+    def get_diff_counts(self):
+        return copy.deepcopy(self._data['diff_counts'])
+
+    def get_marker(self, resource_type):
+        return self._data['markers'].get(resource_type)
+
+    def set_marker(self, resource_type, marker):
+        self._data['markers'][resource_type] = marker
+        self._save()
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class OvnDbSynchronizer(object):
@@ -73,6 +144,8 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         self.mode = mode
         self.l3_plugin = directory.get_plugin(plugin_constants.L3)
         self._ovn_client = ovn_client.OVNClient(ovn_api, sb_ovn)
+        self._checkpoint = SyncCheckpoint(None, mode)
+        self.diff_counts = {}
 
     def stop(self):
         if utils.is_ovn_l3(self.l3_plugin):
@@ -86,14 +159,72 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
             return
         LOG.debug("Starting OVN-Northbound DB sync process")
 
-        ctx = context.get_admin_context()
+        self._checkpoint = SyncCheckpoint(
+            ovn_conf.get_ovn_neutron_sync_checkpoint_file(), self.mode)
+        self.diff_counts = self._checkpoint.get_diff_counts()
+
+        self._sync_stage(SYNC_STAGE_SECURITY_GROUPS,
+                         [self.sync_address_sets, self.sync_port_groups])
+        self._sync_stage(SYNC_STAGE_NETWORKS_AND_PORTS,
+                         [self.sync_networks_ports_and_dhcp_opts])
+        self._sync_stage(SYNC_STAGE_ACLS_AND_ROUTERS,
+                         [self.sync_port_dns_records, self.sync_acls,
+                          self.sync_routers_and_rports])
+
+        self._checkpoint.clear()
+        for resource_type, counts in sorted(self.diff_counts.items()):
+            LOG.info('OVN-NB Sync (%(mode)s mode) %(type)s: %(add)d to add, '
+                     '%(remove)d to remove, %(update)d to update',
+                     dict(counts, mode=self.mode, type=resource_type))
+
+    def _sync_stage(self, stage, sync_methods):
+        """Run the sync methods of a stage concurrently.
+
+        Each method runs in its own greenthread with its own admin context.
+        The stage is recorded in the checkpoint once all of them succeeded,
+        otherwise the first error is raised.
+        """
+        if self._checkpoint.is_stage_completed(stage):
+            LOG.info('OVN-NB Sync stage %s already completed, skipping it',
+                     stage)
+            return
+        threads = [common_utils.spawn(method, context.get_admin_context())
+                   for method in sync_methods]
+        errors = []
+        for thread in threads:
+            try:
+                thread.wait()
+            except Exception as e:
+                LOG.exception('OVN-NB Sync stage %s failed', stage)
+                errors.append(e)
+        if errors:
+            raise errors[0]
+        self._checkpoint.complete_stage(stage, self.diff_counts)
+
+    def _count_diff(self, resource_type, add=0, remove=0, update=0):
+        counts = self.diff_counts.setdefault(
+            resource_type, {'add': 0, 'remove': 0, 'update': 0})
+        counts['add'] += add
+        counts['remove'] += remove
+        counts['update'] += update
+
+    def _get_ports_in_chunks(self, ctx, marker=None):
+        """Yield the Neutron ports sorted by ID, a chunk at a time.
 
-        self.sync_address_sets(ctx)
-        self.sync_port_groups(ctx)
-        self.sync_networks_ports_and_dhcp_opts(ctx)
-        self.sync_port_dns_records(ctx)
-        self.sync_acls(ctx)
-        self.sync_routers_and_rports(ctx)
+        @param ctx: neutron_lib.context
+        @type  ctx: object of type neutron_lib.context.Context
+        @param marker: ID of the port after which the chunks start
+        @type  marker: string
+        """
+        chunk_size = ovn_conf.get_ovn_neutron_sync_chunk_size()
+        while True:
+            ports = self.core_plugin.get_ports(
+                ctx, sorts=[('id', True)], limit=chunk_size, marker=marker)
+            if ports:
+                yield ports
+            if len(ports) < chunk_size:
+                return
+            marker = ports[-1]['id']
 
     def _create_port_in_ovn(self, ctx, port):
         # Remove any old ACLs for the port to avoid creating duplicate ACLs.
@@ -196,41 +327,45 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
 
         LOG.debug('Port Groups added %d, removed %d',
                   len(add_pgs), len(remove_pgs))
+        self._count_diff('port_groups', add=len(add_pgs),
+                         remove=len(remove_pgs))
 
         if self.mode == SYNC_MODE_REPAIR:
             LOG.debug('Port-Group-SYNC: transaction started @ %s',
                       str(datetime.now()))
             if add_pgs:
-                db_ports = self.core_plugin.get_ports(ctx)
                 ovn_ports = set(p.name for p in
                                 self.ovn_api.lsp_list().execute())
             with self.ovn_api.transaction(check_error=True) as txn:
-                pg = ovn_const.OVN_DROP_PORT_GROUP_NAME
+                drop_pg = ovn_const.OVN_DROP_PORT_GROUP_NAME
                 # Process default drop port group first
-                if pg in add_pgs:
-                    txn.add(self.ovn_api.pg_add(name=pg, acls=[]))
-                    add_pgs.remove(pg)
-                    # Add ports to the drop port group. Only add those that
-                    # already exists in OVN. The rest will be added during the
-                    # ports sync operation later.
-                    for n_port in db_ports:
-                        if ((n_port['security_groups'] or
-                                n_port['port_security_enabled']) and
-                                n_port['id'] in ovn_ports):
-                            txn.add(self.ovn_api.pg_add_ports(
-                                pg, n_port['id']))
-
-                for pg in add_pgs:
+                if drop_pg in add_pgs:
+                    txn.add(self.ovn_api.pg_add(name=drop_pg, acls=[]))
+                for pg in add_pgs - {drop_pg}:
                     # If it's a security group PG, add the ext id
                     ext_ids = {ovn_const.OVN_SG_EXT_ID_KEY: neutron_sgs[pg]}
                     txn.add(self.ovn_api.pg_add(name=pg, acls=[],
                                                 external_ids=ext_ids))
-                    # Add the ports belonging to the SG to this port group
+
+                # Add the ports to the port groups created. Only add those
+                # that already exist in OVN. The rest will be added during
+                # the ports sync operation later.
+                for db_ports in (self._get_ports_in_chunks(ctx)
+                                 if add_pgs else []):
                     for n_port in db_ports:
-                        if (neutron_sgs[pg] in n_port['security_groups'] and
-                                n_port['id'] in ovn_ports):
+                        if n_port['id'] not in ovn_ports:
+                            continue
+                        if (drop_pg in add_pgs and
+                                (n_port['security_groups'] or
+                                 n_port['port_security_enabled'])):
                             txn.add(self.ovn_api.pg_add_ports(
-                                pg, n_port['id']))
+                                drop_pg, n_port['id']))
+                        # Add the port to the port groups of its SGs
+                        for sg_id in n_port['security_groups']:
+                            pg = utils.ovn_port_group_name(sg_id)
+                            if pg in add_pgs:
+                                txn.add(self.ovn_api.pg_add_ports(
+                                    pg, n_port['id']))
                 for pg in remove_pgs:
                     txn.add(self.ovn_api.pg_del(pg))
             LOG.debug('Port-Group-SYNC: transaction finished @ %s',
@@ -257,25 +392,27 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
             neutron_sgs = {}
             with ctx.session.begin(subtransactions=True):
                 db_sgs = self.core_plugin.get_security_groups(ctx)
-                db_ports = self.core_plugin.get_ports(ctx)
-
-            for sg in db_sgs:
-                for ip_version in ['ip4', 'ip6']:
-                    name = utils.ovn_addrset_name(sg['id'], ip_version)
-                    neutron_sgs[name] = {
-                        'name': name, 'addresses': [],
-                        'external_ids': {
-                            ovn_const.OVN_SG_EXT_ID_KEY: sg['id']}}
 
-            for port in db_ports:
-                sg_ids = utils.get_lsp_security_groups(port)
-                if port.get('fixed_ips') and sg_ids:
-                    addresses = acl_utils.acl_port_ips(port)
-                    for sg_id in sg_ids:
-                        for ip_version in addresses:
-                            name = utils.ovn_addrset_name(sg_id, ip_version)
-                            neutron_sgs[name]['addresses'].extend(
-                                addresses[ip_version])
+                for sg in db_sgs:
+                    for ip_version in ['ip4', 'ip6']:
+                        name = utils.ovn_addrset_name(sg['id'], ip_version)
+                        neutron_sgs[name] = {
+                            'name': name, 'addresses': [],
+                            'external_ids': {
+                                ovn_const.OVN_SG_EXT_ID_KEY: sg['id']}}
+
+                for db_ports in self._get_ports_in_chunks(ctx):
+                    for port in db_ports:
+                        sg_ids = utils.get_lsp_security_groups(port)
+                        if not (port.get('fixed_ips') and sg_ids):
+                            continue
+                        addresses = acl_utils.acl_port_ips(port)
+                        for sg_id in sg_ids:
+                            for ip_version in addresses:
+                                name = utils.ovn_addrset_name(sg_id,
+                                                              ip_version)
+                                neutron_sgs[name]['addresses'].extend(
+                                    addresses[ip_version])
 
             sgnames_to_add, sgnames_to_delete, sgs_to_update = (
                 self.compute_address_set_difference(neutron_sgs, nb_sgs))
@@ -283,6 +420,9 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         LOG.debug('Address_Sets added %d, removed %d, updated %d',
                   len(sgnames_to_add), len(sgnames_to_delete),
                   len(sgs_to_update))
+        self._count_diff('address_sets', add=len(sgnames_to_add),
+                         remove=len(sgnames_to_delete),
+                         update=len(sgs_to_update))
 
         if self.mode == SYNC_MODE_REPAIR:
             LOG.debug('Address-Set-SYNC: transaction started @ %s',
@@ -345,6 +485,8 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
 
         num_acls_to_add = len(neutron_acls)
         num_acls_to_remove = len(ovn_acls) + num_acls_to_remove_from_ls
+        self._count_diff('acls', add=num_acls_to_add,
+                         remove=num_acls_to_remove)
         if 0 != num_acls_to_add or 0 != num_acls_to_remove:
             LOG.warning('ACLs-to-be-added %(add)d '
                         'ACLs-to-be-removed %(remove)d',
@@ -388,25 +530,23 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         @var   subnet_cache: cache for subnets
         @return: Nothing
         """
-        db_ports = {}
-        for port in self.core_plugin.get_ports(ctx):
-            db_ports[port['id']] = port
-
         sg_cache = {}
         subnet_cache = {}
         neutron_acls = {}
-        for port_id, port in db_ports.items():
-            if utils.get_lsp_security_groups(port):
+        for db_ports in self._get_ports_in_chunks(ctx):
+            for port in db_ports:
+                if not utils.get_lsp_security_groups(port):
+                    continue
                 acl_list = acl_utils.add_acls(self.core_plugin,
                                               ctx,
                                               port,
                                               sg_cache,
                                               subnet_cache,
                                               self.ovn_api)
-                if port_id in neutron_acls:
-                    neutron_acls[port_id].extend(acl_list)
+                if port['id'] in neutron_acls:
+                    neutron_acls[port['id']].extend(acl_list)
                 else:
-                    neutron_acls[port_id] = acl_list
+                    neutron_acls[port['id']] = acl_list
 
         nb_acls = self.get_acls(ctx)
 
@@ -414,6 +554,8 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
 
         num_acls_to_add = len(list(itertools.chain(*neutron_acls.values())))
         num_acls_to_remove = len(list(itertools.chain(*nb_acls.values())))
+        self._count_diff('acls', add=num_acls_to_add,
+                         remove=num_acls_to_remove)
         if 0 != num_acls_to_add or 0 != num_acls_to_remove:
             LOG.warning('ACLs-to-be-added %(add)d '
                         'ACLs-to-be-removed %(remove)d',
@@ -602,6 +744,18 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
             else:
                 del_lrouters_list.append(lrouter)
 
+        self._count_diff('routers', add=len(db_routers),
+                         remove=len(del_lrouters_list))
+        self._count_diff('router_ports', add=len(db_router_ports),
+                         remove=len(del_lrouter_ports_list),
+                         update=len(update_lrport_list))
+        for resource_type, updates in (('static_routes', update_sroutes_list),
+                                       ('floating_ips', update_fips_list),
+                                       ('snats', update_snats_list)):
+            self._count_diff(resource_type,
+                             add=sum(len(u['add']) for u in updates),
+                             remove=sum(len(u['del']) for u in updates))
+
         for r_id, router in db_routers.items():
             LOG.warning("Router found in Neutron but not in "
                         "OVN DB, router id=%s", router['id'])
@@ -791,6 +945,13 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
             else:
                 del_subnet_dhcp_opts_list.append(ovn_dhcp_opts)
 
+        num_updates = len([subnet for subnet in db_subnets.values()
+                           if 'ovn_dhcp_options' in subnet])
+        self._count_diff('subnet_dhcp_options',
+                         add=len(db_subnets) - num_updates,
+                         remove=len(del_subnet_dhcp_opts_list),
+                         update=num_updates)
+
         for subnet_id, subnet in db_subnets.items():
             LOG.warning('DHCP options for subnet %s is present in '
                         'Neutron but out of sync for OVN', subnet_id)
@@ -826,7 +987,15 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         LOG.debug('OVN-NB Sync DHCP options for Neutron subnets finished')
 
     def _sync_port_dhcp_options(self, ctx, ports_need_sync_dhcp_opts,
-                                ovn_port_dhcpv4_opts, ovn_port_dhcpv6_opts):
+                                ovn_port_dhcpv4_opts, ovn_port_dhcpv6_opts,
+                                delete_stale=True):
+        """Sync the DHCP options of the ports with extra DHCP options.
+
+        The port DHCP options synced are taken out of ovn_port_dhcpv4_opts
+        and ovn_port_dhcpv6_opts. Unless delete_stale is False, the ones left
+        are then deleted from OVN, so the ports can be synced a chunk at a
+        time before the stale options are deleted.
+        """
         LOG.debug('OVN-NB Sync DHCP options for Neutron ports with extra '
                   'dhcp options assigned started')
 
@@ -865,7 +1034,11 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                     txn_commands.append(self.ovn_api.set_lswitch_port(
                         lport_name=port['id'], **set_lsp))
 
-        for ip_v in [constants.IP_VERSION_4, constants.IP_VERSION_6]:
+        stale_ip_versions = ([constants.IP_VERSION_4, constants.IP_VERSION_6]
+                             if delete_stale else [])
+        for ip_v in stale_ip_versions:
+            self._count_diff('port_dhcp_options',
+                             remove=len(ovn_port_dhcp_opts[ip_v]))
             for port_id, dhcp_opt in ovn_port_dhcp_opts[ip_v].items():
                 LOG.warning(
                     'Out of sync port DHCPv%(ip_version)d options for '
@@ -889,14 +1062,18 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         LOG.debug('OVN-NB Sync DHCP options for Neutron ports with extra '
                   'dhcp options assigned finished')
 
-    def _sync_metadata_ports(self, ctx, db_ports):
+    def _sync_metadata_ports(self, ctx, ovn_lports):
         """Ensure metadata ports in all Neutron networks.
 
         This method will ensure that all networks have one and only one
         metadata port.
+
+        @param ovn_lports: names of the logical switch ports found in OVN
+        @return: IDs of the DHCP ports synced, which the ports sync skips
         """
+        synced_ports = set()
         if not ovn_conf.is_ovn_metadata_enabled():
-            return
+            return synced_ports
         LOG.debug('OVN sync metadata ports started')
         for net in self.core_plugin.get_networks(ctx):
             dhcp_ports = self.core_plugin.get_ports(ctx, filters=dict(
@@ -932,9 +1109,9 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                         LOG.warning('Deleting unnecessary DHCP port %s for '
                                     'network %s', port['id'], net['id'])
                         self.core_plugin.delete_port(ctx, port['id'])
-                    db_ports.pop(port['id'], None)
+                    synced_ports.add(port['id'])
                 port = dhcp_ports[0]
-                if port['id'] in db_ports.keys():
+                if port['id'] not in ovn_lports:
                     LOG.warning('Metadata port %s for network %s found in '
                                 'Neutron but not in OVN',
                                 port['id'], net['id'])
@@ -943,12 +1120,77 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                                     '%s in OVN',
                                     port['id'], net['id'])
                         self._create_port_in_ovn(ctx, port)
-                    db_ports.pop(port['id'])
+                    synced_ports.add(port['id'])
 
             if self.mode == SYNC_MODE_REPAIR:
                 # Make sure that this port has an IP address in all the subnets
                 self._ovn_client.update_metadata_port(ctx, net['id'])
         LOG.debug('OVN sync metadata ports finished')
+        return synced_ports
+
+    def _get_resume_marker(self, ctx, resource_type):
+        """Return the ID of the last port synced by an interrupted sync."""
+        marker = self._checkpoint.get_marker(resource_type)
+        if marker and not self.core_plugin.get_ports(
+                ctx, filters={'id': [marker]}, fields=['id']):
+            # The ports are paginated after the marker, which must exist
+            LOG.warning('Port %s of the OVN NB DB sync checkpoint no longer '
+                        'exists, syncing all the ports again', marker)
+            marker = None
+        if marker:
+            LOG.info('Resuming the OVN NB DB sync of the %(type)s after '
+                     'port %(marker)s', {'type': resource_type,
+                                         'marker': marker})
+        return marker
+
+    def _delete_stale_lports(self, ctx, ovn_lports, ovn_all_dhcp_options,
+                             last_port_id=None):
+        """Delete the OVN ports and port DHCP options not in Neutron.
+
+        The ports left in ovn_lports and the port DHCP options left in
+        ovn_all_dhcp_options with an ID up to last_port_id, or all of them
+        if it is None, are taken out and deleted from OVN.
+        """
+        def _stale(port_ids):
+            return sorted(port_id for port_id in port_ids
+                          if last_port_id is None or port_id <= last_port_id)
+
+        del_lports_list = [{'port': lport, 'lswitch': ovn_lports.pop(lport)}
+                           for lport in _stale(ovn_lports)]
+        self._count_diff('ports', remove=len(del_lports_list))
+        if del_lports_list:
+            with self.ovn_api.transaction(check_error=True) as txn:
+                for lport_info in del_lports_list:
+                    LOG.warning("Port found in OVN but not in "
+                                "Neutron, port_id=%s", lport_info['port'])
+                    if self.mode != SYNC_MODE_REPAIR:
+                        continue
+                    LOG.debug('Deleting the port %s from OVN NB DB',
+                              lport_info['port'])
+                    txn.add(self.ovn_api.delete_lswitch_port(
+                        lport_name=lport_info['port'],
+                        lswitch_name=lport_info['lswitch']))
+                    if lport_info['port'] in ovn_all_dhcp_options['ports_v4']:
+                        LOG.debug('Deleting port DHCPv4 options for (port %s)',
+                                  lport_info['port'])
+                        txn.add(self.ovn_api.delete_dhcp_options(
+                                ovn_all_dhcp_options['ports_v4'].pop(
+                                    lport_info['port'])['uuid']))
+                    if lport_info['port'] in ovn_all_dhcp_options['ports_v6']:
+                        LOG.debug('Deleting port DHCPv6 options for (port %s)',
+                                  lport_info['port'])
+                        txn.add(self.ovn_api.delete_dhcp_options(
+                                ovn_all_dhcp_options['ports_v6'].pop(
+                                    lport_info['port'])['uuid']))
+
+        # Delete the DHCP options of the ports left over
+        stale_dhcp_options = {
+            key: {port_id: ovn_all_dhcp_options[key].pop(port_id)
+                  for port_id in _stale(ovn_all_dhcp_options[key])}
+            for key in ('ports_v4', 'ports_v6')}
+        self._sync_port_dhcp_options(ctx, [],
+                                     stale_dhcp_options['ports_v4'],
+                                     stale_dhcp_options['ports_v6'])
 
     def sync_networks_ports_and_dhcp_opts(self, ctx):
         LOG.debug('OVN-NB Sync networks, ports and DHCP options started')
@@ -956,30 +1198,20 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
         for net in self.core_plugin.get_networks(ctx):
             db_networks[utils.ovn_name(net['id'])] = net
 
-        # Ignore the floating ip ports with device_owner set to
-        # constants.DEVICE_OWNER_FLOATINGIP
-        db_ports = {port['id']: port for port in
-                    self.core_plugin.get_ports(ctx) if not
-                    utils.is_lsp_ignored(port)}
-
         ovn_all_dhcp_options = self.ovn_api.get_all_dhcp_options()
         db_network_cache = dict(db_networks)
 
-        ports_need_sync_dhcp_opts = []
         lswitches = self.ovn_api.get_all_logical_switches_with_ports()
         del_lswitchs_list = []
-        del_lports_list = []
         add_provnet_ports_list = []
+        # The logical switch of the ports found in OVN. The Neutron ports are
+        # compared with them a chunk at a time, the ports left over are the
+        # ones to delete from OVN.
+        ovn_lports = {}
         for lswitch in lswitches:
             if lswitch['name'] in db_networks:
                 for lport in lswitch['ports']:
-                    if lport in db_ports:
-                        port = db_ports.pop(lport)
-                        if not utils.is_network_device_port(port):
-                            ports_need_sync_dhcp_opts.append(port)
-                    else:
-                        del_lports_list.append({'port': lport,
-                                                'lswitch': lswitch['name']})
+                    ovn_lports[lport] = lswitch['name']
                 db_network = db_networks[lswitch['name']]
                 physnet = db_network.get(pnet.PHYSICAL_NETWORK)
                 # Updating provider attributes is forbidden by neutron, thus
@@ -993,6 +1225,9 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
             else:
                 del_lswitchs_list.append(lswitch)
 
+        self._count_diff('networks', add=len(db_networks),
+                         remove=len(del_lswitchs_list))
+        self._count_diff('provnet_ports', add=len(add_provnet_ports_list))
         for net_id, network in db_networks.items():
             LOG.warning("Network found in Neutron but not in "
                         "OVN DB, network_id=%s", network['id'])
@@ -1005,32 +1240,71 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                     LOG.warning("Create network in OVN NB failed for "
                                 "network %s", network['id'])
 
-        self._sync_metadata_ports(ctx, db_ports)
+        synced_ports = self._sync_metadata_ports(ctx, ovn_lports)
 
         self._sync_subnet_dhcp_options(
             ctx, db_network_cache, ovn_all_dhcp_options['subnets'])
 
-        for port_id, port in db_ports.items():
-            LOG.warning("Port found in Neutron but not in OVN "
-                        "DB, port_id=%s", port['id'])
-            if self.mode == SYNC_MODE_REPAIR:
-                try:
-                    LOG.debug('Creating the port %s in OVN NB DB',
-                              port['id'])
-                    self._create_port_in_ovn(ctx, port)
-                    if port_id in ovn_all_dhcp_options['ports_v4']:
-                        dhcp_disable, lsp_opts = utils.get_lsp_dhcp_opts(
-                            port, constants.IP_VERSION_4)
-                        if lsp_opts:
-                            ovn_all_dhcp_options['ports_v4'].pop(port_id)
-                    if port_id in ovn_all_dhcp_options['ports_v6']:
-                        dhcp_disable, lsp_opts = utils.get_lsp_dhcp_opts(
-                            port, constants.IP_VERSION_6)
-                        if lsp_opts:
-                            ovn_all_dhcp_options['ports_v6'].pop(port_id)
-                except RuntimeError:
-                    LOG.warning("Create port in OVN NB failed for"
-                                " port %s", port['id'])
+        marker = self._get_resume_marker(ctx, 'ports')
+        if marker:
+            # The ports up to the marker were synced by the interrupted sync,
+            # including the deletion of the stale ones
+            ovn_lports = {lport: lswitch for lport, lswitch in
+                          ovn_lports.items() if lport > marker}
+            for key in ('ports_v4', 'ports_v6'):
+                ovn_all_dhcp_options[key] = {
+                    port_id: dhcp_opt for port_id, dhcp_opt in
+                    ovn_all_dhcp_options[key].items() if port_id > marker}
+
+        for db_ports in self._get_ports_in_chunks(ctx, marker):
+            ports_need_sync_dhcp_opts = []
+            for port in db_ports:
+                # Ignore the floating ip ports with device_owner set to
+                # constants.DEVICE_OWNER_FLOATINGIP
+                if utils.is_lsp_ignored(port):
+                    continue
+                port_id = port['id']
+                if ovn_lports.pop(port_id, None):
+                    if not utils.is_network_device_port(port):
+                        ports_need_sync_dhcp_opts.append(port)
+                    continue
+                if port_id in synced_ports:
+                    continue
+
+                self._count_diff('ports', add=1)
+                LOG.warning("Port found in Neutron but not in OVN "
+                            "DB, port_id=%s", port_id)
+                if self.mode == SYNC_MODE_REPAIR:
+                    try:
+                        LOG.debug('Creating the port %s in OVN NB DB',
+                                  port_id)
+                        self._create_port_in_ovn(ctx, port)
+                        if port_id in ovn_all_dhcp_options['ports_v4']:
+                            dhcp_disable, lsp_opts = utils.get_lsp_dhcp_opts(
+                                port, constants.IP_VERSION_4)
+                            if lsp_opts:
+                                ovn_all_dhcp_options['ports_v4'].pop(port_id)
+                        if port_id in ovn_all_dhcp_options['ports_v6']:
+                            dhcp_disable, lsp_opts = utils.get_lsp_dhcp_opts(
+                                port, constants.IP_VERSION_6)
+                            if lsp_opts:
+                                ovn_all_dhcp_options['ports_v6'].pop(port_id)
+                    except RuntimeError:
+                        LOG.warning("Create port in OVN NB failed for"
+                                    " port %s", port_id)
+
+            self._sync_port_dhcp_options(ctx, ports_need_sync_dhcp_opts,
+                                         ovn_all_dhcp_options['ports_v4'],
+                                         ovn_all_dhcp_options['ports_v6'],
+                                         delete_stale=False)
+            # The ports are sorted by ID, the OVN ports and port DHCP options
+            # left up to the last port of the chunk are not in Neutron
+            self._delete_stale_lports(ctx, ovn_lports, ovn_all_dhcp_options,
+                                      db_ports[-1]['id'])
+            self._checkpoint.set_marker('ports', db_ports[-1]['id'])
+
+        # Delete the ports left over, after the last Neutron port
+        self._delete_stale_lports(ctx, ovn_lports, ovn_all_dhcp_options)
 
         with self.ovn_api.transaction(check_error=True) as txn:
             for lswitch in del_lswitchs_list:
@@ -1053,46 +1327,22 @@ class OvnNbSynchronizer(OvnDbSynchronizer):
                         txn, network, network.get(pnet.PHYSICAL_NETWORK),
                         network.get(pnet.SEGMENTATION_ID))
 
-            for lport_info in del_lports_list:
-                LOG.warning("Port found in OVN but not in "
-                            "Neutron, port_id=%s", lport_info['port'])
-                if self.mode == SYNC_MODE_REPAIR:
-                    LOG.debug('Deleting the port %s from OVN NB DB',
-                              lport_info['port'])
-                    txn.add(self.ovn_api.delete_lswitch_port(
-                        lport_name=lport_info['port'],
-                        lswitch_name=lport_info['lswitch']))
-                    if lport_info['port'] in ovn_all_dhcp_options['ports_v4']:
-                        LOG.debug('Deleting port DHCPv4 options for (port %s)',
-                                  lport_info['port'])
-                        txn.add(self.ovn_api.delete_dhcp_options(
-                                ovn_all_dhcp_options['ports_v4'].pop(
-                                    lport_info['port'])['uuid']))
-                    if lport_info['port'] in ovn_all_dhcp_options['ports_v6']:
-                        LOG.debug('Deleting port DHCPv6 options for (port %s)',
-                                  lport_info['port'])
-                        txn.add(self.ovn_api.delete_dhcp_options(
-                                ovn_all_dhcp_options['ports_v6'].pop(
-                                    lport_info['port'])['uuid']))
-
-        self._sync_port_dhcp_options(ctx, ports_need_sync_dhcp_opts,
-                                     ovn_all_dhcp_options['ports_v4'],
-                                     ovn_all_dhcp_options['ports_v6'])
         LOG.debug('OVN-NB Sync networks, ports and DHCP options finished')
 
     def sync_port_dns_records(self, ctx):
         if self.mode != SYNC_MODE_REPAIR:
             return
         LOG.debug('OVN-NB Sync port dns records')
-        # Ignore the floating ip ports with device_owner set to
-        # constants.DEVICE_OWNER_FLOATINGIP
-        db_ports = [port for port in
-                    self.core_plugin.get_ports(ctx) if not
-                    port.get('device_owner', '').startswith(
-                        constants.DEVICE_OWNER_FLOATINGIP)]
         dns_records = {}
-        for port in db_ports:
-            if self._ovn_client.is_dns_required_for_port(port):
+        for db_ports in self._get_ports_in_chunks(ctx):
+            for port in db_ports:
+                # Ignore the floating ip ports with device_owner set to
+                # constants.DEVICE_OWNER_FLOATINGIP
+                if port.get('device_owner', '').startswith(
+                        constants.DEVICE_OWNER_FLOATINGIP):
+                    continue
+                if not self._ovn_client.is_dns_required_for_port(port):
+                    continue
                 port_dns_records = self._ovn_client.get_port_dns_records(port)
                 if port['network_id'] not in dns_records:
                     dns_records[port['network_id']] = {}
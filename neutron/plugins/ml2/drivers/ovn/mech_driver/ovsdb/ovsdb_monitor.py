@@ -39,6 +39,16 @@ from neutron.db import ovn_hash_ring_db
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
+# Columns of the OVN Southbound tables read by the Neutron server, plus the
+# columns of their single column indexes
+OVN_SB_MONITORED_COLUMNS = {
+    'Chassis': ['name', 'hostname', 'external_ids', 'nb_cfg'],
+    'Datapath_Binding': ['tunnel_key', 'external_ids'],
+    'Port_Binding': ['logical_port', 'type', 'chassis', 'datapath',
+                     'virtual_parent'],
+    'MAC_Binding': ['ip'],
+}
+
 
 class BaseEvent(row_event.RowEvent):
     table = None
@@ -281,10 +291,8 @@ class BaseOvnSbIdl(connection.OvsdbIdl):
     def from_server(cls, connection_string, schema_name):
         _check_and_set_ssl_files(schema_name)
         helper = idlutils.get_schema_helper(connection_string, schema_name)
-        helper.register_table('Chassis')
-        helper.register_table('Encap')
-        helper.register_table('Port_Binding')
-        helper.register_table('Datapath_Binding')
+        _register_sb_tables(helper, ['Chassis', 'Encap', 'Port_Binding',
+                                     'Datapath_Binding'])
         return cls(connection_string, helper)
 
 
@@ -423,11 +431,8 @@ class OvnSbIdl(OvnIdlDistributedLock):
     def from_server(cls, connection_string, schema_name, driver):
         _check_and_set_ssl_files(schema_name)
         helper = idlutils.get_schema_helper(connection_string, schema_name)
-        helper.register_table('Chassis')
-        helper.register_table('Encap')
-        helper.register_table('Port_Binding')
-        helper.register_table('Datapath_Binding')
-        helper.register_table('MAC_Binding')
+        _register_sb_tables(helper, ['Chassis', 'Encap', 'Port_Binding',
+                                     'Datapath_Binding', 'MAC_Binding'])
         return cls(driver, connection_string, helper)
 
     def post_connect(self):
@@ -445,6 +450,27 @@ class OvnSbIdl(OvnIdlDistributedLock):
              PortBindingChassisUpdateEvent(self.driver)])
 
 
+def _register_sb_tables(helper, tables):
+    """Register the OVN Southbound tables replicated by the workers.
+
+    Unless all the columns are configured to be monitored, only the columns
+    read by the Neutron server are registered. The tables which none of
+    them is read from, like Encap, are not monitored at all.
+    """
+    monitor_all = ovn_conf.is_ovn_sb_monitor_all_columns()
+    for table in tables:
+        if monitor_all:
+            helper.register_table(table)
+            continue
+        if table not in OVN_SB_MONITORED_COLUMNS:
+            continue
+        # Skip the columns missing in the schema of older OVN versions
+        schema_columns = helper.schema_json['tables'][table]['columns']
+        helper.register_columns(
+            table, [column for column in OVN_SB_MONITORED_COLUMNS[table]
+                    if column in schema_columns])
+
+
 def _check_and_set_ssl_files(schema_name):
     if schema_name == 'OVN_Southbound':
         priv_key_file = ovn_conf.get_ovn_sb_private_key()
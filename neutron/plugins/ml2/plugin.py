@@ -176,6 +176,9 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
     # filter validations. Name mangling is used in
     # order to ensure it is qualified by class
     __filter_validation_support = True
+    # The filters of the collections applied to the items fetched from the
+    # database rather than by the database query
+    post_query_filters = {net_def.COLLECTION_NAME: provider_net.ATTRIBUTES}
 
     # List of supported extensions
     _supported_extension_aliases = [provider_net.ALIAS,
@@ -287,37 +290,64 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
     @registry.receives(resources.PORT,
                        [provisioning_blocks.PROVISIONING_COMPLETE])
     def _port_provisioned(self, rtype, event, trigger, payload=None):
+        batch = payload.metadata.get('batch')
+        if batch:
+            # NOTE: the ports whose provisioning was completed together are
+            # all activated when the event of the first one is received
+            if payload.resource_id == batch[0]:
+                self._ports_provisioned(payload.context, batch)
+            return
         port_id = payload.resource_id
         port = db.get_port(payload.context, port_id)
+        if self._is_port_provisioned(payload.context, port_id, port):
+            self.update_port_status(
+                payload.context, port_id, const.PORT_STATUS_ACTIVE)
+
+    def _ports_provisioned(self, context, port_ids):
+        ports_by_id = db.get_port_db_objects(context, port_ids)
+        blocked_port_ids = provisioning_blocks.get_blocked_object_ids(
+            context, port_ids, resources.PORT)
+        port_id_to_status = {
+            port_id: const.PORT_STATUS_ACTIVE for port_id in port_ids
+            if self._is_port_provisioned(context, port_id,
+                                         ports_by_id.get(port_id),
+                                         blocked_port_ids)}
+        if port_id_to_status:
+            self.update_port_statuses(context, port_id_to_status)
+
+    def _is_port_provisioned(self, context, port_id, port,
+                             blocked_port_ids=None):
         port_binding = p_utils.get_port_binding_by_status_and_host(
             getattr(port, 'port_bindings', []), const.ACTIVE)
         if not port or not port_binding:
             LOG.debug("Port %s was deleted so its status cannot be updated.",
                       port_id)
-            return
+            return False
         if port_binding.vif_type in (portbindings.VIF_TYPE_BINDING_FAILED,
                                      portbindings.VIF_TYPE_UNBOUND):
             # NOTE(kevinbenton): we hit here when a port is created without
             # a host ID and the dhcp agent notifies that its wiring is done
             LOG.debug("Port %s cannot update to ACTIVE because it "
                       "is not bound.", port_id)
-            return
+            return False
+        # port is bound, but we have to check for new provisioning blocks
+        # one last time to detect the case where we were triggered by an
+        # unbound port and the port became bound with new provisioning
+        # blocks before 'get_port' was called above
+        if blocked_port_ids is None:
+            blocked = provisioning_blocks.is_object_blocked(
+                context, port_id, resources.PORT)
         else:
-            # port is bound, but we have to check for new provisioning blocks
-            # one last time to detect the case where we were triggered by an
-            # unbound port and the port became bound with new provisioning
-            # blocks before 'get_port' was called above
-            if provisioning_blocks.is_object_blocked(payload.context, port_id,
-                                                     resources.PORT):
-                LOG.debug("Port %s had new provisioning blocks added so it "
-                          "will not transition to active.", port_id)
-                return
+            blocked = port_id in blocked_port_ids
+        if blocked:
+            LOG.debug("Port %s had new provisioning blocks added so it "
+                      "will not transition to active.", port_id)
+            return False
         if not port.admin_state_up:
             LOG.debug("Port %s is administratively disabled so it will "
                       "not transition to active.", port_id)
-            return
-        self.update_port_status(
-            payload.context, port_id, const.PORT_STATUS_ACTIVE)
+            return False
+        return True
 
     @log_helpers.log_method_call
     def _start_rpc_notifiers(self):
@@ -2007,7 +2037,13 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             # get all networks for PortContext construction
             netctxs_by_netid = self.get_network_contexts(
                 plugin_context,
-                {p.network_id for p in port_dbs_by_id.values()})
+                {p.network_id for p in port_dbs_by_id.values() if p})
+            # get the bindings of all distributed ports on the host
+            dvr_bindings_by_id = db.get_distributed_port_bindings_by_host(
+                plugin_context,
+                [p.id for p in port_dbs_by_id.values() if p and
+                 p.device_owner == const.DEVICE_OWNER_DVR_INTERFACE],
+                host)
             for dev_id in dev_ids:
                 port_id = dev_to_full_pids.get(dev_id)
                 port_db = port_dbs_by_id.get(port_id)
@@ -2017,8 +2053,7 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                     continue
                 port = self._make_port_dict(port_db)
                 if port['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
-                    binding = db.get_distributed_port_binding_by_host(
-                        plugin_context, port['id'], host)
+                    binding = dvr_bindings_by_id.get(port['id'])
                     bindlevelhost_match = host
                 else:
                     binding = p_utils.get_port_binding_by_status_and_host(
@@ -2062,16 +2097,99 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         result = {}
         port_ids = port_id_to_status.keys()
         port_dbs_by_id = db.get_port_db_objects(context, port_ids)
+        bulk_ports = []
         for port_id, status in port_id_to_status.items():
-            if not port_dbs_by_id.get(port_id):
+            port = port_dbs_by_id.get(port_id)
+            if not port:
                 LOG.debug("Port %(port)s update to %(val)s by agent not found",
                           {'port': port_id, 'val': status})
                 result[port_id] = None
                 continue
-            result[port_id] = self._safe_update_individual_port_db_status(
-                context, port_dbs_by_id[port_id], status, host)
+            if port['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
+                result[port_id] = self._safe_update_individual_port_db_status(
+                    context, port, status, host)
+            elif port.status == status:
+                result[port_id] = port_id
+            else:
+                bulk_ports.append(port)
+        if len(bulk_ports) == 1:
+            port = bulk_ports[0]
+            result[port.id] = self._safe_update_individual_port_db_status(
+                context, port, port_id_to_status[port.id], host)
+        elif bulk_ports:
+            result.update(self._safe_update_ports_db_status(
+                context, bulk_ports, port_id_to_status, host))
         return result
 
+    def _safe_update_ports_db_status(self, context, ports, port_id_to_status,
+                                     host):
+        try:
+            return self._update_ports_db_status(
+                context, ports, port_id_to_status, host)
+        except Exception:
+            # a port may have been deleted or unbound concurrently, fall back
+            # to updating the ports one by one to isolate it
+            LOG.debug("Failed to update the status of ports %s in a single "
+                      "transaction, updating them one by one",
+                      [port.id for port in ports], exc_info=True)
+            return {port.id: self._safe_update_individual_port_db_status(
+                        context, port, port_id_to_status[port.id], host)
+                    for port in ports}
+
+    def _update_ports_db_status(self, context, ports, port_id_to_status,
+                                host):
+        """Update the status of non distributed ports in one transaction.
+
+        The ports are grouped per network so that the network context is
+        built once for all the ports of a network.
+        """
+        ports = sorted(ports, key=lambda port: port.network_id)
+        for port in ports:
+            attr = {
+                'id': port.id,
+                portbindings.HOST_ID: host,
+                'status': port_id_to_status[port.id]
+            }
+            registry.notify(resources.PORT, events.BEFORE_UPDATE, self,
+                            original_port=port,
+                            context=context, port=attr)
+        network_contexts = {}
+        mech_contexts = []
+        with db_api.CONTEXT_WRITER.using(context):
+            for port in ports:
+                context.session.add(port)  # bring port into writer session
+                original_port = self._make_port_dict(port)
+                port.status = port_id_to_status[port.id]
+                # explicit flush before _make_port_dict to ensure extensions
+                # listening for db events can modify the port if necessary
+                context.session.flush()
+                updated_port = self._make_port_dict(port)
+                binding = p_utils.get_port_binding_by_status_and_host(
+                    port.port_bindings, const.ACTIVE, raise_if_not_found=True,
+                    port_id=port.id)
+                levels = db.get_binding_level_objs(
+                    context, port.id, binding.host)
+                network = network_contexts.get(port.network_id)
+                if not network:
+                    network = driver_context.NetworkContext(
+                        self, context,
+                        self.get_network(context, port.network_id))
+                    network_contexts[port.network_id] = network
+                mech_context = driver_context.PortContext(
+                    self, context, updated_port, network, binding, levels,
+                    original_port=original_port)
+                self.mechanism_manager.update_port_precommit(mech_context)
+                mech_contexts.append(mech_context)
+
+        for mech_context in mech_contexts:
+            self.mechanism_manager.update_port_postcommit(mech_context)
+            kwargs = {'context': context, 'port': mech_context.current,
+                      'original_port': mech_context.original}
+            registry.notify(resources.PORT, events.AFTER_UPDATE, self,
+                            **kwargs)
+        return {mech_context.current['id']: mech_context.current['id']
+                for mech_context in mech_contexts}
+
     def _safe_update_individual_port_db_status(self, context, port,
                                                status, host):
         port_id = port.id
@@ -2179,6 +2297,43 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             port_host = db.get_port_binding_host(context, port_id)
             return port if (port_host == host) else None
 
+    @db_api.retry_if_session_inactive()
+    def get_ports_bound_to_host(self, context, port_ids, host):
+        """Return the ports bound to host, keyed by the requested port IDs.
+
+        Bulk version of port_bound_to_host, port_ids may be truncated.
+        """
+        if not host or not port_ids:
+            return {}
+        full_ids = {port_id: port_id for port_id in port_ids
+                    if uuidutils.is_uuid_like(port_id)}
+        partial_ids = [port_id for port_id in port_ids
+                       if port_id not in full_ids]
+        if partial_ids:
+            full_ids.update(
+                db.partial_port_ids_to_full_ids(context, partial_ids))
+        ports = db.get_port_db_objects(context, list(full_ids.values()))
+        dvr_bindings = db.get_distributed_port_bindings_by_host(
+            context,
+            [port_id for port_id, port in ports.items() if port and
+             port['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE],
+            host)
+        result = {}
+        for port_id, full_id in full_ids.items():
+            port = ports.get(full_id)
+            if not port:
+                LOG.debug("No Port match for: %s", port_id)
+                continue
+            if port['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
+                bound = full_id in dvr_bindings
+            else:
+                binding = p_utils.get_port_binding_by_status_and_host(
+                    port.port_bindings, const.ACTIVE)
+                bound = bool(binding) and binding.host == host
+            if bound:
+                result[port_id] = port
+        return result
+
     @db_api.retry_if_session_inactive()
     def get_ports_from_devices(self, context, devices):
         port_ids_to_devices = dict(
@@ -375,13 +375,108 @@ class RpcCallbacks(type_tunnel.TunnelRpcCallbackMixin):
         else:
             l2pop_driver.obj.update_port_down(port_context)
 
+    def _get_ports_bound_to_host(self, rpc_context, devices, host):
+        """Return the non distributed ports of devices bound to host.
+
+        DVR ports have a specific status update logic which depends on the
+        host and are not returned.
+        """
+        plugin = directory.get_plugin()
+        device_to_port_id = {
+            device: plugin._device_to_port_id(rpc_context, device)
+            for device in devices}
+        ports = plugin.get_ports_bound_to_host(
+            rpc_context, list(device_to_port_id.values()), host)
+        return {device: ports[port_id]
+                for device, port_id in device_to_port_id.items()
+                if port_id in ports and ports[port_id]['device_owner'] !=
+                n_const.DEVICE_OWNER_DVR_INTERFACE}
+
+    def _update_devices_up_bulk(self, rpc_context, devices, host,
+                                refresh_tunnels):
+        """Update the devices bound to host up at once.
+
+        Return the lists of devices updated, of devices failed and of the
+        remaining devices which need to be updated one by one.
+        """
+        devices_up = []
+        failed_devices_up = []
+        try:
+            ports = self._get_ports_bound_to_host(rpc_context, devices, host)
+            if ports:
+                provisioning_blocks.provisioning_complete_bulk(
+                    rpc_context, [port['id'] for port in ports.values()],
+                    resources.PORT, provisioning_blocks.L2_AGENT_ENTITY)
+        except Exception:
+            LOG.warning("Failed to update devices %s up at once, updating "
+                        "them one by one", devices, exc_info=True)
+            return devices_up, failed_devices_up, devices
+        for device, port in ports.items():
+            try:
+                self.notify_l2pop_port_wiring(
+                    port['id'], rpc_context, n_const.PORT_STATUS_ACTIVE,
+                    host, refresh_tunnels)
+            except Exception:
+                failed_devices_up.append(device)
+                LOG.error("Failed to update device %s up", device)
+            else:
+                devices_up.append(device)
+        return (devices_up, failed_devices_up,
+                [device for device in devices if device not in ports])
+
+    def _update_devices_down_bulk(self, rpc_context, devices, host):
+        """Update the devices bound to host down at once.
+
+        Return the lists of devices updated, of devices failed and of the
+        remaining devices which need to be updated one by one.
+        """
+        devices_down = []
+        failed_devices_down = []
+        try:
+            ports = self._get_ports_bound_to_host(rpc_context, devices, host)
+            statuses = {}
+            if ports:
+                plugin = directory.get_plugin()
+                statuses = plugin.update_port_statuses(
+                    rpc_context,
+                    {port['id']: n_const.PORT_STATUS_DOWN
+                     for port in ports.values()},
+                    host)
+        except Exception:
+            LOG.warning("Failed to update devices %s down at once, updating "
+                        "them one by one", devices, exc_info=True)
+            return devices_down, failed_devices_down, devices
+        for device, port in ports.items():
+            try:
+                self.notify_l2pop_port_wiring(
+                    port['id'], rpc_context, n_const.PORT_STATUS_DOWN, host)
+            except Exception:
+                failed_devices_down.append(device)
+                LOG.error("Failed to update device %s down", device)
+            else:
+                devices_down.append(
+                    {'device': device,
+                     'exists': bool(statuses.get(port['id']))})
+        return (devices_down, failed_devices_down,
+                [device for device in devices if device not in ports])
+
     @profiler.trace("rpc")
     def update_device_list(self, rpc_context, **kwargs):
         devices_up = []
         failed_devices_up = []
         devices_down = []
         failed_devices_down = []
+        host = kwargs.get('host')
+        refresh_tunnels = (kwargs.get('refresh_tunnels') or
+                           kwargs.get('agent_restarted', False))
         devices = kwargs.get('devices_up')
+        if devices and host:
+            # NOTE: the devices bound to the host, which are the vast
+            # majority, are updated at once, the remaining ones go through
+            # the per device logic below
+            devices_up, failed_devices_up, devices = (
+                self._update_devices_up_bulk(
+                    rpc_context, devices, host, refresh_tunnels))
         if devices:
             for device in devices:
                 try:
@@ -396,6 +491,9 @@ class RpcCallbacks(type_tunnel.TunnelRpcCallbackMixin):
                     devices_up.append(device)
 
         devices = kwargs.get('devices_down')
+        if devices and host:
+            devices_down, failed_devices_down, devices = (
+                self._update_devices_down_bulk(rpc_context, devices, host))
         if devices:
             for device in devices:
                 try:
@@ -484,6 +484,128 @@ def enforce(context, action, target, plugin=None, pluralized=None):
     return result
 
 
+class _TargetAccessed(Exception):
+    """Raised when a check being compiled accesses the target."""
+
+
+class _UnavailableTarget(collections.abc.Mapping):
+    """Target used to find out the checks which don't depend on the target."""
+
+    def __getitem__(self, key):
+        raise _TargetAccessed()
+
+    def __iter__(self):
+        raise _TargetAccessed()
+
+    def __len__(self):
+        raise _TargetAccessed()
+
+    def __contains__(self, key):
+        raise _TargetAccessed()
+
+
+def _compile_check(check, credentials, enforcer, rules_being_compiled=()):
+    """Partially evaluate a check for the given credentials.
+
+    Return True or False if the result of the check doesn't depend on the
+    target, otherwise return the check, simplified, to be evaluated against
+    every target.
+    """
+    if isinstance(check, policy.RuleCheck):
+        if check.match in rules_being_compiled:
+            # Recursive rule, leave it to the policy engine
+            return check
+        try:
+            rule = enforcer.rules[check.match]
+        except KeyError:
+            # We don't have any matching rule; fail closed
+            return False
+        return _compile_check(rule, credentials, enforcer,
+                              rules_being_compiled + (check.match,))
+    if isinstance(check, policy.NotCheck):
+        compiled = _compile_check(check.rule, credentials, enforcer,
+                                  rules_being_compiled)
+        if isinstance(compiled, bool):
+            return not compiled
+        return policy.NotCheck(compiled)
+    if isinstance(check, (policy.AndCheck, policy.OrCheck)):
+        # A True child decides an "or" check, a False child an "and" check
+        decisive = isinstance(check, policy.OrCheck)
+        rules = []
+        for rule in check.rules:
+            compiled = _compile_check(rule, credentials, enforcer,
+                                      rules_being_compiled)
+            if compiled is decisive:
+                return decisive
+            if not isinstance(compiled, bool):
+                rules.append(compiled)
+        if not rules:
+            return not decisive
+        if len(rules) == 1:
+            return rules[0]
+        return type(check)(rules)
+    try:
+        return bool(check(_UnavailableTarget(), credentials, enforcer))
+    except Exception:
+        # The check depends on the target (or failed without one)
+        return check
+
+
+class RequestPolicyChecker(object):
+    """Policy checker for the many items returned by a single request.
+
+    Every rule is compiled once for the credentials of the request: the
+    parts of the rule which only depend on the credentials, like roles, are
+    evaluated at that time, and only the remaining parts, like ownership or
+    field checks, are evaluated against each item.
+    Attribute based checks are only compiled for the "get" and "delete"
+    actions, the other actions fall back to the ``check`` function.
+    """
+
+    def __init__(self, context, pluralized=None):
+        self._context = context
+        self._pluralized = pluralized
+        self._compiled = {}
+        self._credentials = None
+        if not context.is_admin:
+            _ENFORCER.load_rules()
+            self._credentials = context.to_policy_values()
+            if self._credentials.get('system_scope'):
+                self._credentials['system'] = (
+                    self._credentials.get('system_scope'))
+
+    def _compile(self, action):
+        try:
+            return self._compiled[action]
+        except KeyError:
+            compiled = _compile_check(policy.RuleCheck('rule', action),
+                                      self._credentials, _ENFORCER)
+            self._compiled[action] = compiled
+            return compiled
+
+    def check(self, action, target, might_not_exist=False):
+        """Verifies that the action is valid on the target.
+
+        See the ``check`` function for the meaning of the parameters.
+        """
+        if self._context.is_admin:
+            return True
+        if might_not_exist and not (_ENFORCER.rules and
+                                    action in _ENFORCER.rules):
+            return True
+        resource, enforce_attr_based_check = get_resource_and_action(
+            action, self._pluralized)
+        if enforce_attr_based_check:
+            return check(self._context, action, target,
+                         might_not_exist=might_not_exist,
+                         pluralized=self._pluralized)
+        compiled = self._compile(action)
+        if isinstance(compiled, bool):
+            return compiled
+        return compiled(target if target is not None else {},
+                        self._credentials, _ENFORCER)
+
+
 def get_enforcer():
     # NOTE(amotoki): This was borrowed from nova/policy.py.
     # This method is for use by oslo.policy CLI scripts. Those scripts need the
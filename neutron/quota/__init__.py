@@ -32,6 +32,7 @@ from neutron.quota import resource_registry
 LOG = logging.getLogger(__name__)
 QUOTA_DB_MODULE = quota.QUOTA_DB_MODULE
 QUOTA_DB_DRIVER = quota.QUOTA_DB_DRIVER
+QUOTA_DB_COUNTER_DRIVER = quota.QUOTA_DB_COUNTER_DRIVER
 QUOTA_CONF_DRIVER = quota.QUOTA_CONF_DRIVER
 
 
@@ -186,6 +187,13 @@ class QuotaEngine(object):
             LOG.info('Loaded quota_driver: %s.', _driver_class)
         return self._driver
 
+    def get_workers(self):
+        """Return the workers of the quota driver, if it has any."""
+        driver = self.get_driver()
+        if not hasattr(driver, 'get_workers'):
+            return []
+        return driver.get_workers()
+
     def count(self, context, resource_name, *args, **kwargs):
         """Count a resource.
 
@@ -19,6 +19,7 @@ from oslo_config import cfg
 from oslo_log import log
 from oslo_utils import excutils
 from sqlalchemy import exc as sql_exc
+from sqlalchemy import func
 from sqlalchemy.orm import session as se
 
 from neutron._i18n import _
@@ -247,6 +248,11 @@ class TrackedResource(BaseResource):
         # Update quota usage
         return self._resync(context, tenant_id, in_use)
 
+    def _get_usage_info(self, context, tenant_id):
+        # Load current usage data, setting a row-level lock on the DB
+        return quota_api.get_quota_usage_by_resource_and_tenant(
+            context, self.name, tenant_id)
+
     def count_used(self, context, tenant_id, resync_usage=True):
         """Returns the current usage count for the resource.
 
@@ -255,9 +261,7 @@ class TrackedResource(BaseResource):
         :param resync_usage: Default value is set to True. Syncs
             with in_use usage.
         """
-        # Load current usage data, setting a row-level lock on the DB
-        usage_info = quota_api.get_quota_usage_by_resource_and_tenant(
-            context, self.name, tenant_id)
+        usage_info = self._get_usage_info(context, tenant_id)
 
         # If dirty or missing, calculate actual resource usage querying
         # the database and set/create usage info data
@@ -337,3 +341,71 @@ class TrackedResource(BaseResource):
         except sql_exc.InvalidRequestError:
             LOG.warning("No sqlalchemy event for resource %s found",
                         self.name)
+
+
+class CountedResource(TrackedResource):
+    """Resource whose usage is counted in its own transactions.
+
+    Rather than being marked dirty and counted again by the next quota
+    check, the usage of the tenant is atomically incremented or decremented
+    by the database as soon as a record of the model class is inserted or
+    deleted, with the connection of the transaction which inserts or
+    deletes it. The usage is therefore always in sync with the records
+    once committed and is read without any lock.
+
+    The usage of a tenant is only counted when it does not exist yet, or
+    when it was marked dirty by hand.
+    """
+
+    def _get_usage_info(self, context, tenant_id):
+        return quota_api.get_quota_usage_by_resource_and_tenant(
+            context, self.name, tenant_id, lock=False)
+
+    def get_out_of_sync_usages(self, context):
+        """Return the usages which do not match the records of the tenants.
+
+        :param context: an admin context
+        :returns: a list of (tenant_id, used, count) tuples, count being the
+                  number of records of the tenant
+        """
+        with db_api.CONTEXT_READER.using(context):
+            counts = dict(context.session.query(
+                self._model_class.tenant_id, func.count()).group_by(
+                self._model_class.tenant_id))
+            usages = quota_api.get_quota_usage_by_resource(context,
+                                                           self.name)
+        return [(usage.tenant_id, usage.used, counts.get(usage.tenant_id, 0))
+                for usage in usages
+                if usage.used != counts.get(usage.tenant_id, 0)]
+
+    def _increment_usage(self, connection, target, delta):
+        tenant_id = target['tenant_id']
+        if not quota_api.increment_quota_usage(connection, self.name,
+                                               tenant_id, delta):
+            # The usage does not exist yet, it will be counted and created
+            # by the next quota check
+            self._dirty_tenants.add(tenant_id)
+
+    def _db_insert_handler(self, mapper, connection, target):
+        self._increment_usage(connection, target, 1)
+
+    def _db_delete_handler(self, mapper, connection, target):
+        self._increment_usage(connection, target, -1)
+
+    def register_events(self):
+        listen = db_api.sqla_listen
+        listen(self._model_class, 'after_insert', self._db_insert_handler)
+        listen(self._model_class, 'after_delete', self._db_delete_handler)
+        listen(se.Session, 'after_bulk_delete', self._except_bulk_delete)
+
+    def unregister_events(self):
+        try:
+            db_api.sqla_remove(self._model_class, 'after_insert',
+                               self._db_insert_handler)
+            db_api.sqla_remove(self._model_class, 'after_delete',
+                               self._db_delete_handler)
+            db_api.sqla_remove(se.Session, 'after_bulk_delete',
+                               self._except_bulk_delete)
+        except sql_exc.InvalidRequestError:
+            LOG.warning("No sqlalchemy event for resource %s found",
+                        self.name)
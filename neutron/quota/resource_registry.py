@@ -16,6 +16,7 @@ from oslo_log import log
 import six
 
 from neutron._i18n import _
+from neutron.conf import quota
 from neutron.quota import resource
 
 LOG = log.getLogger(__name__)
@@ -162,7 +163,8 @@ class ResourceRegistry(object):
 
         If QUOTAS.track_quota_usage is True, and there is a model mapping for
         the current resource, this function will return an instance of
-        AccountedResource; otherwise an instance of CountableResource.
+        TrackedResource, or of CountedResource when the quota driver is the
+        counter driver; otherwise an instance of CountableResource.
         """
 
         if (not cfg.CONF.QUOTAS.track_quota_usage or
@@ -172,6 +174,13 @@ class ResourceRegistry(object):
             return resource.CountableResource(
                 resource_name, resource._count_resource,
                 'quota_%s' % resource_name)
+        elif cfg.CONF.QUOTAS.quota_driver == quota.QUOTA_DB_COUNTER_DRIVER:
+            LOG.info("Creating instance of CountedResource for "
+                     "resource:%s", resource_name)
+            return resource.CountedResource(
+                resource_name,
+                self._tracked_resource_mappings[resource_name],
+                'quota_%s' % resource_name)
         else:
             LOG.info("Creating instance of TrackedResource for "
                      "resource:%s", resource_name)
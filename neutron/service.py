@@ -37,6 +37,7 @@ import psutil
 from neutron.common import config
 from neutron.common import profiler
 from neutron.conf import service
+from neutron import quota
 from neutron import worker as neutron_worker
 from neutron import wsgi
 
@@ -218,7 +219,7 @@ def _get_plugins_workers():
         plugin_worker
         for plugin in plugins if hasattr(plugin, 'get_workers')
         for plugin_worker in plugin.get_workers()
-    ]
+    ] + quota.QUOTAS.get_workers()
 
 
 class AllServicesNeutronWorker(neutron_worker.NeutronBaseWorker):
@@ -13,12 +13,21 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import random
+
 from neutron_lib.api.definitions import network_ip_availability
+from neutron_lib import context as n_ctx
 from neutron_lib.db import utils as db_utils
 from neutron_lib import exceptions
+from oslo_config import cfg
+from oslo_log import log as logging
 
 import neutron.db.db_base_plugin_v2 as db_base_plugin_v2
 import neutron.db.network_ip_availability_db as ip_availability_db
+from neutron.ipam.drivers.neutrondb_ipam import db_api as ipam_db_api
+from neutron import worker as neutron_worker
+
+LOG = logging.getLogger(__name__)
 
 
 class NetworkIPAvailabilityPlugin(ip_availability_db.IpAvailabilityMixin,
@@ -30,6 +39,30 @@ class NetworkIPAvailabilityPlugin(ip_availability_db.IpAvailabilityMixin,
 
     __filter_validation_support = True
 
+    def __init__(self):
+        super(NetworkIPAvailabilityPlugin, self).__init__()
+        if cfg.CONF.ipam_driver == 'internal':
+            self._start_counters_fold()
+
+    def _start_counters_fold(self):
+        """Starts the periodic job folding the used IPs of the subnets.
+
+        The neutron DB IPAM driver records every allocation as a delta of
+        the used IPs of the subnet, the job adds them to the counters so that
+        the API only sums the deltas of the last interval.
+        """
+        interval = 60
+        initial_delay = random.randint(0, interval)  # splay multiple servers
+        self.add_worker(neutron_worker.PeriodicWorker(
+            self._fold_counter_deltas, interval, initial_delay))
+
+    def _fold_counter_deltas(self):
+        try:
+            ipam_db_api.fold_counter_deltas(n_ctx.get_admin_context())
+        except Exception:
+            # Keep the periodic job running, the next run will retry
+            LOG.exception("Failed to fold the used IPs of the IPAM subnets")
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
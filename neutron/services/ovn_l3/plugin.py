@@ -90,8 +90,21 @@ class OVNL3RouterPlugin(service_base.ServicePluginBase,
                                                          self._sb_ovn)
         return self._ovn_client_inst
 
+    def _get_mech_driver_idl(self, idl_attr):
+        # Share the IDLs of the ML2/OVN mechanism driver of this worker, so
+        # a single replica of each OVN database is kept in its memory
+        mech_manager = getattr(self._plugin, 'mechanism_manager', None)
+        if mech_manager is None:
+            return
+        for driver in mech_manager.ordered_mech_drivers:
+            idl = getattr(driver.obj, idl_attr, None)
+            if isinstance(idl, impl_idl_ovn.Backend):
+                return idl
+
     @property
     def _ovn(self):
+        if self._nb_ovn_idl is None:
+            self._nb_ovn_idl = self._get_mech_driver_idl('_nb_ovn')
         if self._nb_ovn_idl is None:
             LOG.info("Getting OvsdbNbOvnIdl")
             conn = impl_idl_ovn.get_connection(impl_idl_ovn.OvsdbNbOvnIdl)
@@ -100,6 +113,8 @@ class OVNL3RouterPlugin(service_base.ServicePluginBase,
 
     @property
     def _sb_ovn(self):
+        if self._sb_ovn_idl is None:
+            self._sb_ovn_idl = self._get_mech_driver_idl('_sb_ovn')
         if self._sb_ovn_idl is None:
             LOG.info("Getting OvsdbSbOvnIdl")
             conn = impl_idl_ovn.get_connection(impl_idl_ovn.OvsdbSbOvnIdl)
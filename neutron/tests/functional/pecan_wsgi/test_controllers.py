@@ -707,6 +707,69 @@ class TestPaginationAndSorting(test_functional.PecanFunctionalTest):
                                                   sort_key='name',
                                                   sort_dir='asc')
 
+    def _test_get_collection_streamed(self, expected_ids, **kwargs):
+        cfg.CONF.set_override('list_streaming_chunk_size', 4)
+        with mock.patch.object(self.plugin, 'get_networks',
+                               wraps=self.plugin.get_networks) as get_nets:
+            self._test_get_collection_with_pagination(expected_ids, **kwargs)
+        # The 6 networks are fetched by chunks of 4
+        self.assertEqual(
+            [(4, None), (4, expected_ids[3])],
+            [(call[2]['limit'], call[2]['marker'])
+             for call in get_nets.mock_calls])
+
+    def test_get_collection_streamed(self):
+        expected_ids = [network['id'] for network in self.networks]
+        self._test_get_collection_streamed(expected_ids)
+        streamed_networks = self._get_collection()['networks']
+        self.assertEqual(self.networks, streamed_networks)
+
+    def test_get_collection_streamed_with_fields(self):
+        expected_ids = [network['id'] for network in self.networks]
+        self._test_get_collection_streamed(expected_ids, fields=['id'])
+        streamed_networks = self._get_collection(fields=['name'])['networks']
+        self.assertEqual([{'name': network['name']}
+                          for network in self.networks], streamed_networks)
+
+    def test_get_collection_streamed_with_sorting(self):
+        nets = sorted(self.networks, key=lambda net: net['name'],
+                      reverse=True)
+        expected_ids = [network['id'] for network in nets]
+        self._test_get_collection_streamed(expected_ids, sort_key='name',
+                                           sort_dir='desc')
+
+    def test_get_collection_not_streamed_with_provider_filter(self):
+        cfg.CONF.set_override('list_streaming_chunk_size', 4)
+        flat_ids = set()
+        for index in range(3):
+            network = {'name': 'pecanflat-%d' % index, 'tenant_id': 'tenid',
+                       'shared': False, 'admin_state_up': True,
+                       'provider:network_type': 'flat',
+                       'provider:physical_network': 'physnet%d' % index}
+            flat_ids.add(self.plugin.create_network(
+                self.ctx, {'network': network})['id'])
+        # The networks are filtered by ML2 after they are fetched from the
+        # database, the chunks can not be told apart from the end of the list
+        with mock.patch.object(self.plugin, 'get_networks',
+                               wraps=self.plugin.get_networks) as get_nets:
+            list_resp = self.app.get(
+                '/v2.0/networks.json?provider:network_type=flat',
+                headers={'X-Project-Id': 'tenid', 'X-Roles': 'admin'})
+        self.assertEqual(flat_ids, {network['id'] for network
+                                    in list_resp.json['networks']})
+        self.assertEqual([None], [call[2].get('limit')
+                                  for call in get_nets.mock_calls])
+
+    def test_get_collection_streamed_plugin_error(self):
+        cfg.CONF.set_override('list_streaming_chunk_size', 4)
+        with mock.patch.object(self.plugin, 'get_networks',
+                               side_effect=db_exc.DBError()):
+            list_resp = self.app.get('/v2.0/networks.json',
+                                     headers={'X-Project-Id': 'tenid'},
+                                     expect_errors=True)
+        self.assertEqual(500, list_resp.status_int)
+        self.assertIn('NeutronError', list_resp.json)
+
 
 class TestRequestProcessing(TestRootController):
 
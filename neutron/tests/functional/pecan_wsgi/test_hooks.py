@@ -158,7 +158,7 @@ class TestPolicyEnforcementHook(test_functional.PecanFunctionalTest):
         # or the default policies there won't be any risk of breaking these
         # tests, or at least I hope so)
         super(TestPolicyEnforcementHook, self).setUp()
-        self.mock_plugin = mock.Mock()
+        self.mock_plugin = mock.Mock(post_query_filters={})
         attributes.RESOURCES.update(self.FAKE_RESOURCE)
         manager.NeutronManager.set_plugin_for_resource('mehs',
                                                        self.mock_plugin)
@@ -285,6 +285,28 @@ class TestPolicyEnforcementHook(test_functional.PecanFunctionalTest):
         json_response = jsonutils.loads(response.body)
         self.assertNotIn('restricted_attr', json_response['mehs'][0])
 
+    def test_after_on_streamed_list_excludes_admin_attribute(self):
+        cfg.CONF.set_override('list_streaming_chunk_size', 2)
+        self.mock_plugin.get_mehs.side_effect = [
+            [{'id': 'xxx',
+              'attr': 'meh',
+              'restricted_attr': '',
+              'tenant_id': 'tenid'},
+             {'id': 'yyy',
+              'attr': 'meh',
+              'restricted_attr': '',
+              'tenant_id': 'tenid'}],
+            []]
+        response = self.app.get('/v2.0/mehs',
+                                headers={'X-Project-Id': 'tenid'})
+        self.assertEqual(200, response.status_int)
+        json_response = jsonutils.loads(response.body)
+        # The second meh is not visible, the second chunk is empty
+        self.assertEqual(['xxx'],
+                         [meh['id'] for meh in json_response['mehs']])
+        self.assertNotIn('restricted_attr', json_response['mehs'][0])
+        self.assertEqual(2, self.mock_plugin.get_mehs.call_count)
+
     def test_after_inits_policy(self):
         self.mock_plugin.get_mehs.return_value = [{
             'id': 'xxx',
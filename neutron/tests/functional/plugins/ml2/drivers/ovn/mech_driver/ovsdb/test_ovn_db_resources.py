@@ -999,6 +999,50 @@ class TestPortSecurity(base.TestOVNFunctionalBase):
         self._verify_port_acls(port_id, expected_acls_with_sg_ps_enabled)
 
 
+class TestSecurityGroupRulesBulk(base.TestOVNFunctionalBase):
+
+    def _get_pg_acl_matches(self, pg_name):
+        pg = self.nb_api.lookup('Port_Group', pg_name)
+        return {acl.match for acl in pg.acls}
+
+    def test_create_security_group_rules_bulk(self):
+        if not self.nb_api.is_port_groups_supported():
+            self.skipTest('Port groups is not supported')
+
+        data = {'security_group': {'name': 'sg1',
+                                   'tenant_id': self._tenant_id}}
+        sg_req = self.new_create_request('security-groups', data)
+        sg = self.deserialize(self.fmt, sg_req.get_response(self.api))
+        sg_id = sg['security_group']['id']
+        pg_name = utils.ovn_port_group_name(sg_id)
+        default_matches = self._get_pg_acl_matches(pg_name)
+
+        rules = [{'security_group_id': sg_id,
+                  'direction': 'ingress',
+                  'ethertype': 'IPv4',
+                  'protocol': 'tcp',
+                  'port_range_min': port,
+                  'port_range_max': port,
+                  'tenant_id': self._tenant_id}
+                 for port in range(1000, 1200)]
+        data = {'security_group_rules': [{'security_group_rule': rule}
+                                         for rule in rules]}
+        with mock.patch.object(
+                self.nb_api, 'update_port_group_acls',
+                wraps=self.nb_api.update_port_group_acls) as update_acls:
+            rules_req = self.new_create_request('security-group-rules', data)
+            res = rules_req.get_response(self.api)
+        self.assertEqual(201, res.status_int)
+        # The ACLs of all the rules are added by a single command
+        update_acls.assert_called_once_with(
+            pg_name, acls_add=mock.ANY, if_exists=False)
+
+        expected_matches = default_matches | {
+            'outport == @%s && ip4 && tcp && tcp.dst == %d' % (pg_name, port)
+            for port in range(1000, 1200)}
+        self.assertEqual(expected_matches, self._get_pg_acl_matches(pg_name))
+
+
 class TestDNSRecords(base.TestOVNFunctionalBase):
     _extension_drivers = ['port_security', 'dns']
 
@@ -57,6 +57,7 @@ from neutron.agent.linux import pd
 from neutron.agent.linux import ra
 from neutron.agent.metadata import driver as metadata_driver
 from neutron.agent import rpc as agent_rpc
+from neutron.common import _constants as n_const
 from neutron.conf.agent import common as agent_config
 from neutron.conf.agent.l3 import config as l3_config
 from neutron.conf.agent.l3 import ha as ha_conf
@@ -439,6 +440,68 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
             agent._report_state()
             self.assertFalse(agent.fullsync)
 
+    def test_report_state_routers_processed_per_minute(self):
+        with mock.patch.object(agent_rpc.PluginReportStateAPI,
+                               'report_state') as report_state:
+            agent = l3_agent.L3NATAgentWithStateReport(host=HOSTNAME,
+                                                       conf=self.conf)
+            with mock.patch.object(timeutils, 'utcnow_ts',
+                                   side_effect=[100, 130, 150, 185]):
+                agent._router_processed(_uuid())
+                agent._router_processed(_uuid())
+                agent._router_processed(_uuid())
+                agent._report_state()
+            # The router processed at 100 is older than a minute at 185
+            report_state.assert_called_once_with(
+                agent.context, agent.agent_state, True)
+            self.assertEqual(
+                2, agent.agent_state['configurations'][
+                    'routers_processed_per_minute'])
+
+    def test_report_state_routers_processed_by_workers(self):
+        with mock.patch.object(agent_rpc.PluginReportStateAPI,
+                               'report_state'):
+            agent = l3_agent.L3NATAgentWithStateReport(host=HOSTNAME,
+                                                       conf=self.conf)
+            dispatcher = mock.Mock(routers_stats={_uuid(): [1, 2, 3],
+                                                  _uuid(): [0, 1, 0]})
+            agent.dispatch_router_updates(dispatcher)
+            agent._report_state()
+            configurations = agent.agent_state['configurations']
+            self.assertEqual(2, configurations['routers'])
+            self.assertEqual(1, configurations['ex_gw_ports'])
+            self.assertEqual(3, configurations['interfaces'])
+            self.assertEqual(3, configurations['floating_ips'])
+
+    def test_dispatch_router_updates(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        dispatcher = mock.Mock(routers_stats={})
+        agent.dispatch_router_updates(dispatcher)
+        router_id = _uuid()
+        agent.router_deleted(None, router_id)
+        self.assertEqual(router_id, dispatcher.add.call_args[0][0].id)
+        agent.enqueue_state_change(router_id, 'master')
+        dispatcher.ha_state_change.assert_called_once_with(router_id,
+                                                           'master')
+        with mock.patch.object(eventlet, 'spawn_n') as spawn_n:
+            agent.after_start()
+            spawn_n.assert_not_called()
+        dispatcher.start.assert_called_once_with()
+
+    def test_resize_process_pool_honours_configured_sizes(self):
+        self.conf.set_override('router_processing_pool_min_size', 2)
+        self.conf.set_override('router_processing_pool_max_size', 4)
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        self.assertEqual(2, agent._pool_size)
+        with mock.patch.object(agent._pool, 'resize') as resize:
+            agent.router_info = {_uuid(): None for _ in range(3)}
+            agent._resize_process_pool()
+            resize.assert_called_once_with(3)
+            resize.reset_mock()
+            agent.router_info = {_uuid(): None for _ in range(10)}
+            agent._resize_process_pool()
+            resize.assert_called_once_with(4)
+
     def test_periodic_sync_routers_task_call_clean_stale_namespaces(self):
         agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
         self.plugin_api.get_routers.return_value = []
@@ -3999,3 +4062,64 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
         agent.stop()
         self.assertTrue(router.delete.called)
         self.assertTrue(agent._exiting)
+
+
+class TestL3PluginApi(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestL3PluginApi, self).setUp()
+        self.plugin_api = l3_agent.L3PluginApi('fake_topic', HOSTNAME)
+        self.ctx = mock.Mock()
+        self.prepare = mock.patch.object(self.plugin_api.client,
+                                         'prepare').start()
+        self.call = self.prepare.return_value.call
+
+    def test_get_routers(self):
+        self.plugin_api.get_routers(self.ctx, ['r1'])
+        self.prepare.assert_called_once_with()
+        self.call.assert_called_once_with(
+            self.ctx, 'sync_routers', host=HOSTNAME, router_ids=['r1'])
+
+    def test_get_routers_with_known_routers_old_server(self):
+        known_routers = {'r1': {'id': 'r1',
+                                n_const.ROUTER_SYNC_REVISION: 'a:b'}}
+        with mock.patch.object(self.plugin_api.client, 'can_send_version',
+                               return_value=False):
+            self.plugin_api.get_routers(self.ctx, ['r1'],
+                                        known_routers=known_routers)
+        self.prepare.assert_called_once_with()
+        self.call.assert_called_once_with(
+            self.ctx, 'sync_routers', host=HOSTNAME, router_ids=['r1'])
+
+    def test_get_routers_with_known_routers(self):
+        fip = {'id': 'fip1'}
+        known_routers = {
+            'r1': {'id': 'r1', 'name': 'r1',
+                   n_const.ROUTER_SYNC_REVISION: 'a:b',
+                   lib_constants.FLOATINGIP_KEY: []},
+            'r2': {'id': 'r2', 'name': 'r2',
+                   n_const.ROUTER_SYNC_REVISION: 'c:d',
+                   lib_constants.FLOATINGIP_KEY: []}}
+        self.call.return_value = [
+            {'id': 'r1', n_const.ROUTER_SYNC_REVISION: 'a:b',
+             n_const.ROUTER_SYNC_DELTA: n_const.ROUTER_SYNC_UNCHANGED},
+            {'id': 'r2', n_const.ROUTER_SYNC_REVISION: 'c:e',
+             n_const.ROUTER_SYNC_DELTA: n_const.ROUTER_SYNC_FLOATINGIPS,
+             lib_constants.FLOATINGIP_KEY: [fip]},
+            {'id': 'r3', n_const.ROUTER_SYNC_REVISION: 'f:g'}]
+        with mock.patch.object(self.plugin_api.client, 'can_send_version',
+                               return_value=True):
+            routers = self.plugin_api.get_routers(
+                self.ctx, ['r1', 'r2', 'r3'], known_routers=known_routers)
+        self.prepare.assert_called_once_with(version='1.14')
+        self.call.assert_called_once_with(
+            self.ctx, 'sync_routers', host=HOSTNAME,
+            router_ids=['r1', 'r2', 'r3'],
+            router_revisions={'r1': 'a:b', 'r2': 'c:d'})
+        self.assertEqual(
+            [known_routers['r1'],
+             {'id': 'r2', 'name': 'r2',
+              n_const.ROUTER_SYNC_REVISION: 'c:e',
+              lib_constants.FLOATINGIP_KEY: [fip]},
+             {'id': 'r3', n_const.ROUTER_SYNC_REVISION: 'f:g'}],
+            routers)
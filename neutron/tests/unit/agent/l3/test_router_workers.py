@@ -0,0 +1,188 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from neutron_lib import constants as lib_constants
+from oslo_utils import timeutils
+from oslo_utils import uuidutils
+
+from neutron.agent.common import resource_processing_queue as queue
+from neutron.agent.l3 import router_workers
+from neutron.tests import base
+from neutron.tests.unit.agent.l3 import test_agent
+
+_uuid = uuidutils.generate_uuid
+
+
+def _get_router_id(index, workers):
+    while True:
+        router_id = _uuid()
+        if router_workers.get_worker_index(router_id, workers) == index:
+            return router_id
+
+
+class TestRouterWorkerChannel(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRouterWorkerChannel, self).setUp()
+        self.channel = router_workers.RouterWorkerChannel()
+        self.addCleanup(self.channel.agent._sock.close)
+        self.addCleanup(self.channel.worker._sock.close)
+
+    def test_send_receive(self):
+        self.channel.agent.send('ha_state_change', router_id='fake_id',
+                                state='master')
+        self.assertEqual(
+            {'op': 'ha_state_change', 'router_id': 'fake_id',
+             'state': 'master'},
+            next(self.channel.worker.receive()))
+
+    def test_send_update(self):
+        timestamp = timeutils.utcnow()
+        update = queue.ResourceUpdate('fake_id', 1, action=2,
+                                      resource={'id': 'fake_id'},
+                                      timestamp=timestamp, tries=3)
+        self.channel.worker.send_update(update)
+        received = router_workers.update_from_message(
+            next(self.channel.agent.receive()))
+        self.assertEqual('fake_id', received.id)
+        self.assertEqual(1, received.priority)
+        self.assertEqual(2, received.action)
+        self.assertEqual({'id': 'fake_id'}, received.resource)
+        self.assertEqual(timestamp, received.timestamp)
+        self.assertEqual(3, received.tries)
+
+    def test_receive_skips_malformed_message(self):
+        self.channel.agent._sock.sendall(b'{"op": \n')
+        self.channel.agent.send('started')
+        self.assertEqual({'op': 'started'},
+                         next(self.channel.worker.receive()))
+
+
+class TestRouterUpdateDispatcher(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRouterUpdateDispatcher, self).setUp()
+        self.agent = mock.Mock(fullsync=False)
+        self.channels = [mock.Mock(), mock.Mock()]
+        self.dispatcher = router_workers.RouterUpdateDispatcher(
+            self.agent, self.channels)
+
+    def test_add_sends_update_to_router_worker(self):
+        router_id = _get_router_id(1, 2)
+        update = queue.ResourceUpdate(router_id, 1)
+        self.dispatcher.add(update)
+        self.channels[1].agent.send_update.assert_called_once_with(update)
+        self.channels[0].agent.send_update.assert_not_called()
+
+    def test_add_sends_update_without_router_to_all_workers(self):
+        update = queue.ResourceUpdate(None, 1)
+        self.dispatcher.add(update)
+        for channel in self.channels:
+            channel.agent.send_update.assert_called_once_with(update)
+
+    def test_ha_state_change(self):
+        router_id = _get_router_id(0, 2)
+        self.dispatcher.ha_state_change(router_id, 'backup')
+        self.channels[0].agent.send.assert_called_once_with(
+            'ha_state_change', router_id=router_id, state='backup')
+        self.channels[1].agent.send.assert_not_called()
+
+    def test_handle_started(self):
+        self.dispatcher._handle_message({'op': 'started'})
+        self.assertTrue(self.agent.fullsync)
+
+    def test_handle_router(self):
+        router_id = _uuid()
+        self.dispatcher._handle_message(
+            {'op': 'router', 'router_id': router_id, 'stats': [1, 2, 0],
+             'processed': True})
+        self.assertEqual({router_id: [1, 2, 0]},
+                         self.dispatcher.routers_stats)
+        self.agent._router_processed.assert_called_once_with(router_id)
+
+        self.agent._router_processed.reset_mock()
+        self.dispatcher._handle_message(
+            {'op': 'router', 'router_id': router_id, 'stats': None,
+             'processed': False})
+        self.assertEqual({}, self.dispatcher.routers_stats)
+        self.agent._router_processed.assert_not_called()
+
+    def test_handle_update(self):
+        router_id = _get_router_id(0, 2)
+        message = {'op': 'update', 'id': router_id, 'priority': 1,
+                   'action': None, 'resource': None, 'tries': 5,
+                   'timestamp': timeutils.utcnow().strftime(
+                       timeutils.PERFECT_TIME_FORMAT)}
+        self.dispatcher._handle_message(message)
+        update = self.channels[0].agent.send_update.call_args[0][0]
+        self.assertEqual(router_id, update.id)
+
+
+class TestRouterWorkerQueue(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRouterWorkerQueue, self).setUp()
+        self.endpoint = mock.Mock()
+        self.queue = router_workers.RouterWorkerQueue(self.endpoint, 0, 2)
+
+    def test_add_router_of_worker(self):
+        update = queue.ResourceUpdate(_get_router_id(0, 2), 1)
+        self.queue.add(update)
+        self.assertEqual(4, update.tries)
+        self.endpoint.send_update.assert_not_called()
+
+    def test_add_router_of_other_worker(self):
+        update = queue.ResourceUpdate(_get_router_id(1, 2), 1)
+        self.queue.add(update)
+        self.assertEqual(5, update.tries)
+        self.endpoint.send_update.assert_called_once_with(update)
+
+
+class TestRouterProcessingAgent(test_agent.BasicRouterOperationsFramework):
+
+    def setUp(self):
+        super(TestRouterProcessingAgent, self).setUp()
+        self.endpoint = mock.Mock()
+        self.agent = router_workers.RouterProcessingAgent(
+            test_agent.HOSTNAME, self.conf, self.endpoint, 0, 2)
+
+    def test_router_processed_sends_stats(self):
+        router_id = _uuid()
+        ri = mock.Mock(router={lib_constants.INTERFACE_KEY: [{}, {}]})
+        ri.get_ex_gw_port.return_value = {}
+        self.agent.router_info[router_id] = ri
+        self.agent._router_processed(router_id)
+        self.endpoint.send.assert_called_once_with(
+            'router', router_id=router_id, stats=(0, 2, 0), processed=True)
+        self.assertEqual(1, len(self.agent._routers_processed))
+
+    def test_router_removed_sends_no_stats(self):
+        router_id = _uuid()
+        with mock.patch.object(self.agent, '_router_removed'):
+            self.agent._safe_router_removed(router_id)
+        self.endpoint.send.assert_called_once_with(
+            'router', router_id=router_id, stats=None, processed=False)
+
+    def test_queue_forwards_other_worker_routers(self):
+        update = queue.ResourceUpdate(_get_router_id(1, 2), 1)
+        self.agent._queue.add(update)
+        self.endpoint.send_update.assert_called_once_with(update)
+
+
+class TestLaunch(base.BaseTestCase):
+
+    def test_launch_not_legacy_agent_mode(self):
+        conf = mock.Mock(agent_mode=lib_constants.L3_AGENT_MODE_DVR,
+                         router_processing_workers=2)
+        self.assertRaises(SystemExit, router_workers.launch, conf,
+                          'fake_manager')
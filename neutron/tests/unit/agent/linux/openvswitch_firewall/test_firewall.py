@@ -318,7 +318,7 @@ class TestConjIPFlowManager(base.BaseTestCase):
                              constants.INGRESS_DIRECTION, constants.IPv4, 0)
             self.manager.update_flows_for_vlan(self.vlan_tag)
         self.assertFalse(remote_group.get_ethertype_filtered_addresses.called)
-        self.assertFalse(self.driver._add_flow.called)
+        self.assertFalse(self.driver._add_flows.called)
 
     def test_update_flows_for_vlan_no_ports_but_members(self):
         remote_group = self.driver.sg_port_map.get_sg.return_value
@@ -333,7 +333,7 @@ class TestConjIPFlowManager(base.BaseTestCase):
                              constants.INGRESS_DIRECTION, constants.IPv4, 0)
             self.manager.update_flows_for_vlan(self.vlan_tag)
         self.assertTrue(remote_group.get_ethertype_filtered_addresses.called)
-        self.assertTrue(self.driver._add_flow.called)
+        self.assertTrue(self.driver._add_flows.called)
 
     def test_update_flows_for_vlan(self):
         remote_group = self.driver.sg_port_map.get_sg.return_value
@@ -347,19 +347,62 @@ class TestConjIPFlowManager(base.BaseTestCase):
             self.manager.add(self.vlan_tag, 'sg', 'remote_id',
                              constants.INGRESS_DIRECTION, constants.IPv4, 3)
             self.manager.update_flows_for_vlan(self.vlan_tag)
-        self.assertEqual(self.driver._add_flow.call_args_list,
-            [mock.call(actions='conjunction(16,1/2)', ct_state='+est-rel-rpl',
-                       dl_type=2048, nw_src='10.22.3.4/32', priority=70,
-                       reg_net=self.vlan_tag, table=82),
-             mock.call(actions='conjunction(17,1/2)', ct_state='+new-est',
-                       dl_type=2048, nw_src='10.22.3.4/32', priority=70,
-                       reg_net=self.vlan_tag, table=82),
-             mock.call(actions='conjunction(22,1/2)', ct_state='+est-rel-rpl',
-                       dl_type=2048, nw_src='10.22.3.4/32', priority=73,
-                       reg_net=self.vlan_tag, table=82),
-             mock.call(actions='conjunction(23,1/2)', ct_state='+new-est',
-                       dl_type=2048, nw_src='10.22.3.4/32', priority=73,
-                       reg_net=self.vlan_tag, table=82)])
+        self.driver._add_flows.assert_called_once_with([
+            dict(actions='conjunction(16,1/2)', ct_state='+est-rel-rpl',
+                 dl_type=2048, nw_src='10.22.3.4/32', priority=70,
+                 reg_net=self.vlan_tag, table=82),
+            dict(actions='conjunction(17,1/2)', ct_state='+new-est',
+                 dl_type=2048, nw_src='10.22.3.4/32', priority=70,
+                 reg_net=self.vlan_tag, table=82),
+            dict(actions='conjunction(22,1/2)', ct_state='+est-rel-rpl',
+                 dl_type=2048, nw_src='10.22.3.4/32', priority=73,
+                 reg_net=self.vlan_tag, table=82),
+            dict(actions='conjunction(23,1/2)', ct_state='+new-est',
+                 dl_type=2048, nw_src='10.22.3.4/32', priority=73,
+                 reg_net=self.vlan_tag, table=82)])
+
+    def test_update_flows_for_vlan_merges_addresses(self):
+        remote_group = self.driver.sg_port_map.get_sg.return_value
+        remote_group.get_ethertype_filtered_addresses.return_value = [
+            '10.22.3.4', '10.22.3.5', '10.22.3.6', '10.22.3.7']
+        with mock.patch.object(self.manager.conj_id_map,
+                               'get_conj_id') as get_conj_id_mock:
+            get_conj_id_mock.return_value = self.conj_id
+            self.manager.add(self.vlan_tag, 'sg', 'remote_id',
+                             constants.INGRESS_DIRECTION, constants.IPv4, 0)
+            self.manager.update_flows_for_vlan(self.vlan_tag)
+        self.driver._add_flows.assert_called_once_with([
+            dict(actions='conjunction(16,1/2)', ct_state='+est-rel-rpl',
+                 dl_type=2048, nw_src='10.22.3.4/30', priority=70,
+                 reg_net=self.vlan_tag, table=82),
+            dict(actions='conjunction(17,1/2)', ct_state='+new-est',
+                 dl_type=2048, nw_src='10.22.3.4/30', priority=70,
+                 reg_net=self.vlan_tag, table=82)])
+        self.assertEqual(
+            {'10.22.3.4/30': [self.conj_id]},
+            self.manager.flow_state[self.vlan_tag][(
+                constants.INGRESS_DIRECTION, constants.IPv4)])
+
+    def test_update_flows_for_vlan_readds_contained_prefixes(self):
+        remote_group = self.driver.sg_port_map.get_sg.return_value
+        remote_group.get_ethertype_filtered_addresses.return_value = [
+            '10.22.3.5']
+        self.manager.flow_state[self.vlan_tag][(
+            constants.INGRESS_DIRECTION, constants.IPv4)] = {
+                '10.22.3.4/30': [self.conj_id],
+                '10.22.3.5/32': [self.conj_id]}
+        with mock.patch.object(self.manager.conj_id_map,
+                               'get_conj_id') as get_conj_id_mock:
+            get_conj_id_mock.return_value = self.conj_id
+            self.manager.add(self.vlan_tag, 'sg', 'remote_id',
+                             constants.INGRESS_DIRECTION, constants.IPv4, 0)
+            self.manager.update_flows_for_vlan(self.vlan_tag)
+        self.driver.delete_flows_for_ip_addresses.assert_called_once_with(
+            {'10.22.3.4/30'}, constants.INGRESS_DIRECTION, constants.IPv4,
+            self.vlan_tag)
+        flows = self.driver._add_flows.call_args[0][0]
+        self.assertEqual(['10.22.3.5/32'] * 2,
+                         [f['nw_src'] for f in flows])
 
     def test_sg_removed(self):
         with mock.patch.object(self.manager.conj_id_map,
@@ -375,7 +418,7 @@ class TestConjIPFlowManager(base.BaseTestCase):
                     '10.22.3.4': [self.conj_id]}
 
             self.manager.sg_removed('sg')
-        self.driver._add_flow.assert_not_called()
+        self.driver._add_flows.assert_not_called()
         self.driver.delete_flows_for_ip_addresses.assert_called_once_with(
             {'10.22.3.4'}, constants.INGRESS_DIRECTION, constants.IPv4,
             self.vlan_tag)
@@ -452,6 +495,23 @@ class TestOVSFirewallDriver(base.BaseTestCase):
         self.mock_bridge.br.add_flow.assert_called_once_with(
             **expected_calls)
 
+    def test__add_flows_sent_in_one_bundle(self):
+        self.firewall._add_flows([{'dl_type': 0x0800, 'reg_net': 2},
+                                  {'dl_type': 0x86dd, 'reg_net': 2}])
+        self.mock_bridge.br.do_action_flows.assert_called_once_with(
+            'add',
+            [{'dl_type': '0x0800', 'reg{:d}'.format(ovsfw_consts.REG_NET): 2},
+             {'dl_type': '0x86dd', 'reg{:d}'.format(ovsfw_consts.REG_NET): 2}],
+            use_bundle=True)
+        self.mock_bridge.add_flow.assert_not_called()
+
+    def test__add_flows_deferred(self):
+        self.firewall._deferred = True
+        self.firewall._add_flows([{'in_port': 1}, {'in_port': 2}])
+        self.mock_bridge.add_flow.assert_has_calls(
+            [mock.call(in_port=1), mock.call(in_port=2)])
+        self.mock_bridge.br.do_action_flows.assert_not_called()
+
     def test__drop_all_unmatched_flows(self):
         self.firewall._drop_all_unmatched_flows()
         expected_calls = [
@@ -366,6 +366,51 @@ class TestCreateFlowsForIpAddress(base.BaseTestCase):
             self.assertEqual(expected_template, f)
 
 
+class TestCreateFlowsForIpAddresses(base.BaseTestCase):
+    def test_merge_ip_addresses_by_conj_ids(self):
+        addr_to_conj = {
+            '192.168.0.0': [12, 20],
+            '192.168.0.1': [20, 12],
+            '192.168.0.2': [12],
+            '192.168.0.3/32': [12],
+            '10.0.0.0/24': [12],
+            '10.0.0.5': [14],
+        }
+        self.assertEqual(
+            {'192.168.0.0/31': [12, 20],
+             '192.168.0.2/31': [12],
+             '10.0.0.0/24': [12],
+             '10.0.0.5/32': [14]},
+            rules.merge_ip_addresses_by_conj_ids(addr_to_conj))
+
+    def test_create_flows_for_ip_addresses_matches_single_address(self):
+        prefix_to_conj = {
+            '192.168.0.0/31': [12, 20, 38],
+            '192.168.0.5/32': [12],
+            '10.0.0.0/24': [12, 20, 38],
+        }
+        expected = []
+        for ip_prefix, conj_ids in prefix_to_conj.items():
+            expected.extend(rules.create_flows_for_ip_address(
+                ip_prefix, constants.INGRESS_DIRECTION, constants.IPv4,
+                0x123, conj_ids))
+        self.assertEqual(
+            expected,
+            rules.create_flows_for_ip_addresses(
+                prefix_to_conj, constants.INGRESS_DIRECTION,
+                constants.IPv4, 0x123))
+
+    def test_create_flows_for_ip_addresses_ipv6_egress(self):
+        flows = rules.create_flows_for_ip_addresses(
+            {'2001:db8::/127': [12]}, constants.EGRESS_DIRECTION,
+            constants.IPv6, 0x123)
+        self.assertEqual(2, len(flows))
+        for f in flows:
+            self.assertEqual('2001:db8::/127', f['ipv6_dst'])
+            self.assertEqual(ovs_consts.RULES_EGRESS_TABLE, f['table'])
+            self.assertEqual(constants.ETHERTYPE_IPV6, f['dl_type'])
+
+
 class TestCreateConjFlows(base.BaseTestCase):
     def test_create_conj_flows(self):
         ovs_port = mock.Mock(ofport=1, vif_mac='00:00:00:00:00:00')
@@ -2744,6 +2744,49 @@ class TestDnsmasq(TestBase):
         self.safe.assert_has_calls([mock.call(exp_host_name,
                                               exp_host_data)])
 
+    def test_output_hosts_file_renders_only_changed_ports(self):
+        network = FakeV4Network()
+        network.ports.append(FakePort2())
+        get_port_hosts_entries = dhcp.Dnsmasq._get_port_hosts_entries
+        with mock.patch.object(
+                dhcp.Dnsmasq, '_get_port_hosts_entries', autospec=True,
+                side_effect=get_port_hosts_entries) as get_entries:
+            self._get_dnsmasq(network)._output_hosts_file()
+            self.assertEqual(2, get_entries.call_count)
+            get_entries.reset_mock()
+
+            # A new driver is used for every reload, only the updated port
+            # is rendered again
+            port = FakePort2()
+            port.mac_address = '00:00:f3:aa:bb:dd'
+            network.ports[1] = port
+            dm = self._get_dnsmasq(network)
+            dm._output_hosts_file()
+            get_entries.assert_called_once_with(dm, port, mock.ANY, mock.ANY)
+
+        exp_host_name = '/dhcp/aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa/host'
+        exp_host_data = ('00:00:80:aa:bb:cc,host-192-168-0-2.openstacklocal.,'
+                         '192.168.0.2\n'
+                         '00:00:f3:aa:bb:dd,host-192-168-0-3.openstacklocal.,'
+                         '192.168.0.3\n')
+        self.safe.assert_called_with(exp_host_name, exp_host_data)
+
+        del network.ports[1]
+        dm._output_hosts_file()
+        self.assertEqual(1, len(network._dnsmasq_host_table))
+
+    def test_output_addn_hosts_file_only_when_changed(self):
+        network = FakeV4Network()
+        dm = self._get_dnsmasq(network)
+        with mock.patch.object(os.path, 'exists', return_value=True):
+            dm._output_addn_hosts_file()
+            dm._output_addn_hosts_file()
+            self.assertEqual(1, self.safe.call_count)
+
+            network.ports.append(FakePort2())
+            dm._output_addn_hosts_file()
+            self.assertEqual(2, self.safe.call_count)
+
     def test_only_populates_dhcp_client_id(self):
         exp_host_name = '/dhcp/aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa/host'
         exp_host_data = (
@@ -163,3 +163,65 @@ class IpsetManagerTestCase(BaseIpsetManagerTest):
         self.expect_destroy()
         self.ipset.destroy(TEST_SET_ID, ETHERTYPE)
         self.verify_mock_calls()
+
+
+class IpsetManagerDeferApplyTestCase(BaseIpsetManagerTest):
+
+    def setUp(self):
+        super(IpsetManagerDeferApplyTestCase, self).setUp()
+        self.expected_calls = []
+
+    def expect_restore(self, lines):
+        self.expected_calls.append(
+            mock.call(['ipset', 'restore', '-exist'],
+                      process_input='\n'.join(lines),
+                      run_as_root=True,
+                      check_exit_code=True))
+
+    def test_defer_apply_new_set(self):
+        self.expect_restore(
+            ['create %s hash:net family inet' % TEST_SET_NAME,
+             'create %s hash:net family inet' % TEST_SET_NAME_NEW,
+             'flush %s' % TEST_SET_NAME_NEW,
+             'add %s %s' % (TEST_SET_NAME_NEW, FAKE_IPS[0] + '/32'),
+             'swap %s %s' % (TEST_SET_NAME_NEW, TEST_SET_NAME),
+             'destroy %s' % TEST_SET_NAME_NEW])
+        with self.ipset.defer_apply():
+            self.ipset.set_members(TEST_SET_ID, ETHERTYPE, [FAKE_IPS[0]])
+            self.assertTrue(self.ipset.set_name_exists(TEST_SET_NAME))
+            self.execute.assert_not_called()
+        self.verify_mock_calls()
+        self.assertEqual(1, self.execute.call_count)
+
+    def test_defer_apply_single_restore_for_all_sets(self):
+        other_set_name = self.ipset.get_name('other_sgid', ETHERTYPE)
+        self.ipset.set_members(TEST_SET_ID, ETHERTYPE, FAKE_IPS[0:2])
+        self.ipset.set_members('other_sgid', ETHERTYPE, FAKE_IPS[0:2])
+        self.execute.reset_mock()
+        self.expect_restore(
+            ['add %s %s' % (TEST_SET_NAME, FAKE_IPS[2] + '/32'),
+             'del %s %s' % (other_set_name, FAKE_IPS[1] + '/32')])
+        with self.ipset.defer_apply():
+            self.ipset.set_members(TEST_SET_ID, ETHERTYPE, FAKE_IPS[0:3])
+            self.ipset.set_members('other_sgid', ETHERTYPE, FAKE_IPS[0:1])
+        self.verify_mock_calls()
+        self.assertEqual(1, self.execute.call_count)
+
+    def test_defer_apply_add_and_del_cancel_out(self):
+        self.ipset.set_members(TEST_SET_ID, ETHERTYPE, FAKE_IPS[0:2])
+        self.execute.reset_mock()
+        with self.ipset.defer_apply():
+            add_ips, del_ips = self.ipset.set_members(
+                TEST_SET_ID, ETHERTYPE, FAKE_IPS[0:3])
+            self.assertEqual([FAKE_IPS[2] + '/32'], add_ips)
+            add_ips, del_ips = self.ipset.set_members(
+                TEST_SET_ID, ETHERTYPE, FAKE_IPS[0:2])
+            self.assertEqual([FAKE_IPS[2] + '/32'], del_ips)
+        self.execute.assert_not_called()
+
+    def test_defer_apply_failure_forgets_sets(self):
+        self.execute.side_effect = RuntimeError
+        self.ipset.defer_apply_on()
+        self.ipset.set_members(TEST_SET_ID, ETHERTYPE, FAKE_IPS[0:2])
+        self.assertRaises(RuntimeError, self.ipset.defer_apply_off)
+        self.assertFalse(self.ipset.set_name_exists(TEST_SET_NAME))
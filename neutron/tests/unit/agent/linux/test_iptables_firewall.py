@@ -2303,6 +2303,19 @@ class IptablesFirewallEnhancedIpsetTestCase(BaseIptablesFirewallTestCase):
 
         self.firewall.ipset.assert_has_calls(calls, True)
 
+    def test_filter_defer_apply_batches_ipset_updates(self):
+        self.firewall.ipset.attach_mock(self.firewall.iptables, 'iptables')
+        self.firewall.filter_defer_apply_on()
+        self.firewall.update_security_group_members(
+            FAKE_SGID, self._fake_sg_members()[FAKE_SGID])
+        self.firewall.filter_defer_apply_off()
+        method_calls = [c[0] for c in self.firewall.ipset.method_calls]
+        self.assertEqual(['iptables.defer_apply_on', 'defer_apply_on',
+                          'set_members', 'set_members', 'defer_apply_off',
+                          'iptables.defer_apply_off'],
+                         [c for c in method_calls
+                          if 'defer_apply' in c or c == 'set_members'])
+
     def test_sg_rule_expansion_with_remote_ips(self):
         other_ips = ['10.0.0.2', '10.0.0.3', '10.0.0.4']
         self.firewall.sg_members = {'fake_sgid': {
@@ -1316,6 +1316,117 @@ class IptablesManagerStateFulTestCaseEmptyCustomBinaryNameIPv6(
     use_ipv6 = True
 
 
+class IptablesManagerIncrementalTestCase(IptablesManagerBaseTestCase):
+
+    def setUp(self):
+        super(IptablesManagerIncrementalTestCase, self).setUp()
+        cfg.CONF.set_override('iptables_incremental_apply', True, 'AGENT')
+        self.iptables = iptables_manager.IptablesManager()
+        self.execute.return_value = ''
+
+    def _get_calls(self, cmd):
+        return [c for c in self.execute.call_args_list if c[0][0] == [cmd]]
+
+    def _get_restore_inputs(self):
+        return [c[1]['process_input'] for c in self.execute.call_args_list
+                if c[0][0] == ['iptables-restore', '-n']]
+
+    def test_apply_uses_shadow_state(self):
+        self.iptables.apply()
+        self.iptables.ipv4['filter'].add_chain('filter')
+        self.iptables.ipv4['filter'].add_rule('filter', '-j DROP')
+        self.iptables.apply()
+
+        self.assertEqual(1, len(self._get_calls('iptables-save')))
+        restore_inputs = self._get_restore_inputs()
+        self.assertEqual(2, len(restore_inputs))
+        self.assertEqual(
+            '# Generated by iptables_manager\n'
+            '*filter\n'
+            ':%(bn)s-filter - [0:0]\n'
+            '-I %(bn)s-filter 1 -j DROP\n'
+            'COMMIT\n'
+            '# Completed by iptables_manager\n' % IPTABLES_ARG,
+            restore_inputs[1])
+
+    def test_apply_without_changes_is_noop(self):
+        self.iptables.apply()
+        self.execute.reset_mock()
+        self.assertEqual([], self.iptables.apply())
+        self.execute.assert_not_called()
+
+    def test_apply_resync_on_restore_failure(self):
+        self.iptables.apply()
+        self.iptables.ipv4['filter'].add_chain('filter')
+
+        def restore_failer(*args, **kwargs):
+            if args[0] == ['iptables-restore', '-n']:
+                restore_failer.calls += 1
+                if restore_failer.calls == 1:
+                    raise RuntimeError()
+            return ''
+        restore_failer.calls = 0
+        self.execute.reset_mock()
+        self.execute.side_effect = restore_failer
+        self.iptables.apply()
+
+        self.assertEqual(1, len(self._get_calls('iptables-save')))
+        restore_inputs = self._get_restore_inputs()
+        self.assertEqual(2, len(restore_inputs))
+        # after the resync, the whole state is restored again
+        self.assertEqual(FILTER_WITH_RULES_TEMPLATE % IPTABLES_ARG +
+                         MANGLE_DUMP + NAT_DUMP + RAW_DUMP,
+                         restore_inputs[1])
+
+    def test_apply_keeps_changes_made_during_restore(self):
+        self.iptables.apply()
+        self.iptables.ipv4['filter'].add_chain('filter')
+
+        def restore_adding_rule(*args, **kwargs):
+            if args[0] == ['iptables-restore', '-n']:
+                self.iptables.ipv4['filter'].add_rule('filter', '-j DROP')
+            return ''
+        self.execute.side_effect = restore_adding_rule
+        self.iptables.apply()
+
+        self.assertTrue(self.iptables.ipv4['filter'].dirty)
+        self.execute.side_effect = None
+        self.iptables.apply()
+        self.assertIn('-I %(bn)s-filter 1 -j DROP\n' % IPTABLES_ARG,
+                      self._get_restore_inputs()[-1])
+
+    def test_apply_restore_failure_keeps_tables_dirty(self):
+        self.iptables.apply()
+        self.iptables.ipv4['filter'].add_chain('filter')
+
+        def restore_failer(*args, **kwargs):
+            if args[0] == ['iptables-restore', '-n']:
+                raise RuntimeError()
+            return ''
+        self.execute.side_effect = restore_failer
+        self.assertRaises(RuntimeError, self.iptables.apply)
+        self.assertTrue(self.iptables.ipv4['filter'].dirty)
+        self.assertFalse(self.iptables.ipv4['nat'].dirty)
+
+    def test_apply_periodic_full_sync(self):
+        cfg.CONF.set_override('iptables_full_sync_interval', 60, 'AGENT')
+        with mock.patch.object(iptables_manager.time, 'time',
+                               return_value=1000):
+            self.iptables.apply()
+            self.iptables.apply()
+        self.assertEqual(1, len(self._get_calls('iptables-save')))
+        with mock.patch.object(iptables_manager.time, 'time',
+                               return_value=1061):
+            self.iptables.apply()
+        self.assertEqual(2, len(self._get_calls('iptables-save')))
+
+    def test_incremental_apply_disabled(self):
+        cfg.CONF.set_override('iptables_incremental_apply', False, 'AGENT')
+        self.iptables.apply()
+        self.iptables.apply()
+        self.assertEqual(2, len(self._get_calls('iptables-save')))
+
+
 class IptablesManagerStateLessTestCase(base.BaseTestCase):
 
     def setUp(self):
@@ -54,6 +54,20 @@ class RemoteResourceCacheTestCase(base.BaseTestCase):
                          self.rcache.get_resource_by_id('goose', 1))
         self.assertIsNone(self.rcache.get_resource_by_id('goose', 2))
 
+    def test_get_resources_by_ids(self):
+        self.rcache.record_resource_update(self.ctx, 'goose', self.goose)
+        self.rcache.record_resource_update(self.ctx, 'goose',
+                                           OVOLikeThing(3))
+        self.rcache.record_resource_delete(self.ctx, 'goose', 3)
+        self._pullmock.bulk_pull.return_value = [OVOLikeThing(66)]
+        result = self.rcache.get_resources_by_ids('goose', [1, 3, 66, 67])
+        self.assertEqual({1: self.goose, 3: None, 67: None},
+                         {k: v for k, v in result.items() if k != 66})
+        self.assertEqual(66, result[66].id)
+        # the missing resources are fetched with a single query
+        self._pullmock.bulk_pull.assert_called_once_with(
+            mock.ANY, 'goose', filter_kwargs={'id': (66, 67)})
+
     def test__flood_cache_for_query_pulls_once(self):
         resources = [OVOLikeThing(66), OVOLikeThing(67)]
         received_kw = []
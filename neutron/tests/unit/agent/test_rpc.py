@@ -26,6 +26,7 @@ from oslo_context import context as oslo_context
 from oslo_utils import uuidutils
 
 from neutron.agent import rpc
+from neutron.api.rpc.callbacks import resources as rpc_resources
 from neutron.objects import network
 from neutron.objects import ports
 from neutron.tests import base
@@ -316,6 +317,23 @@ class TestCacheBackedPluginApi(base.BaseTestCase):
         self.assertNotIn('network_id', entry)
         self.assertIn(constants.NO_ACTIVE_BINDING, entry)
 
+    def test_get_devices_details_list_and_failed_devices_prefetch(self):
+        rcache = self._api.remote_resource_cache
+        rcache.get_resources_by_ids.side_effect = [
+            {self._port_id: self._port, 'missing': None},
+            {self._network_id: self._network}]
+        rcache.get_resource_by_id.side_effect = [
+            self._port, self._network, None]
+        result = self._api.get_devices_details_list_and_failed_devices(
+            mock.ANY, [self._port_id, 'missing'], mock.ANY, 'host1')
+        self.assertEqual(
+            [mock.call(rpc_resources.PORT, [self._port_id, 'missing'], False),
+             mock.call(rpc_resources.NETWORK, {self._network_id})],
+            rcache.get_resources_by_ids.call_args_list)
+        self.assertEqual([self._port_id, 'missing'],
+                         [d['device'] for d in result['devices']])
+        self.assertEqual([], result['failed_devices'])
+
     @mock.patch('neutron.agent.resource_cache.RemoteResourceCache')
     def test_initialization_with_default_resources(self, rcache_class):
         rcache_obj = mock.MagicMock()
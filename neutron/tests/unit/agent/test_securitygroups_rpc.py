@@ -36,6 +36,7 @@ from neutron.agent import securitygroups_rpc as sg_rpc
 from neutron.api.rpc.handlers import securitygroups_rpc
 from neutron.db import securitygroups_rpc_base as sg_db_rpc
 from neutron.extensions import securitygroup as ext_sg
+from neutron.services.revisions import revision_plugin
 from neutron.tests import base
 from neutron.tests.unit.extensions import test_securitygroup as test_sg
 
@@ -271,6 +272,74 @@ class SGServerRpcCallBackTestCase(test_sg.SecurityGroupDBTestCase):
             self.assertEqual(expected, sg_info['security_groups'])
             self._delete('ports', port_id)
 
+    def test_security_group_info_for_ports_sharing_a_group(self):
+        with self.network() as n,\
+                self.subnet(n),\
+                self.security_group() as sg:
+            sg_id = sg['security_group']['id']
+            ports = [self.deserialize(self.fmt, self._create_port(
+                self.fmt, n['network']['id'], security_groups=[sg_id]))
+                for _i in range(2)]
+            devices = [port['port']['id'] for port in ports]
+            ctx = context.get_admin_context()
+            with mock.patch.object(
+                    directory.get_plugin(), '_is_security_group_stateful',
+                    return_value=True) as is_stateful:
+                sg_info = self.rpc.security_group_info_for_devices(
+                    ctx, devices=devices)
+            is_stateful.assert_called_once_with(mock.ANY, sg_id)
+            expected = [{'direction': 'egress', 'ethertype': const.IPv4,
+                         'stateful': True},
+                        {'direction': 'egress', 'ethertype': const.IPv6,
+                         'stateful': True}]
+            self.assertEqual(
+                expected,
+                sorted(sg_info['security_groups'][sg_id],
+                       key=lambda rule: rule['ethertype']))
+            for port in ports:
+                self._delete('ports', port['port']['id'])
+
+    def test_security_group_info_for_ports_cached_rules(self):
+        plugin = directory.get_plugin()
+        # the cached rules are validated with the revision numbers bumped by
+        # the revision plugin
+        directory.add_plugin('revision_plugin',
+                             revision_plugin.RevisionPlugin())
+        with self.network() as n,\
+                self.subnet(n),\
+                self.security_group() as sg:
+            sg_id = sg['security_group']['id']
+            port = self.deserialize(self.fmt, self._create_port(
+                self.fmt, n['network']['id'], security_groups=[sg_id]))
+            port_id = port['port']['id']
+            ctx = context.get_admin_context()
+
+            def get_sg_info():
+                ports = {port_id: {
+                    'fixed_ips': [ip['ip_address']
+                                  for ip in port['port']['fixed_ips']],
+                    'security_group_rules': [],
+                    'security_group_source_groups': []}}
+                return plugin.security_group_info_for_ports(ctx, ports)
+
+            get_sg_info()
+            cached = plugin._sg_rules_cache[sg_id]
+            # the rules are reused while the group is unchanged
+            get_sg_info()
+            self.assertIs(cached[2], plugin._sg_rules_cache[sg_id][2])
+            # adding a rule bumps the revision number of the group
+            rule = self._build_security_group_rule(
+                sg_id, 'ingress', const.PROTO_NAME_TCP, '22', '22')
+            self._create_security_group_rule(self.fmt, rule)
+            sg_info = get_sg_info()
+            self.assertGreater(plugin._sg_rules_cache[sg_id][0], cached[0])
+            self.assertIn(
+                {'direction': 'ingress', 'ethertype': const.IPv4,
+                 'protocol': const.PROTO_NAME_TCP, 'port_range_min': 22,
+                 'port_range_max': 22, 'stateful': True},
+                sg_info['security_groups'][sg_id])
+            self._delete('ports', port_id)
+
     @contextlib.contextmanager
     def _port_with_addr_pairs_and_security_group(self):
         plugin_obj = directory.get_plugin()
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import netaddr
 from neutron_lib import constants
 from neutron_lib import context
@@ -20,6 +21,7 @@ from neutron_lib.plugins import directory
 from oslo_config import cfg
 
 from neutron.api.rpc.handlers import l3_rpc
+from neutron.common import _constants as n_const
 from neutron.tests.unit.db import test_db_base_plugin_v2
 from neutron.tests.unit import testlib_api
 
@@ -66,3 +68,36 @@ class TestL3RpcCallback(testlib_api.SqlTestCase):
         updated_subnet = res[0]
         self.assertEqual(str(data[subnet['id']]), updated_subnet['cidr'])
         self.assertEqual(updated_subnet['allocation_pools'], allocation_pools)
+
+    def test_get_router_sync_delta(self):
+        router = {'id': 'r1', 'name': 'r1',
+                  constants.FLOATINGIP_KEY: [{'id': 'fip1'}]}
+        full = self.callbacks._get_router_sync_delta(dict(router), {})
+        revision = full[n_const.ROUTER_SYNC_REVISION]
+        self.assertEqual(
+            dict(router, **{n_const.ROUTER_SYNC_REVISION: revision}), full)
+
+        unchanged = self.callbacks._get_router_sync_delta(
+            dict(router), {'r1': revision})
+        self.assertEqual(
+            {'id': 'r1', n_const.ROUTER_SYNC_REVISION: revision,
+             n_const.ROUTER_SYNC_DELTA: n_const.ROUTER_SYNC_UNCHANGED},
+            unchanged)
+
+        fips = [{'id': 'fip1'}, {'id': 'fip2'}]
+        fips_changed = self.callbacks._get_router_sync_delta(
+            dict(router, **{constants.FLOATINGIP_KEY: fips}),
+            {'r1': revision})
+        self.assertEqual(
+            {'id': 'r1',
+             n_const.ROUTER_SYNC_REVISION: mock.ANY,
+             n_const.ROUTER_SYNC_DELTA: n_const.ROUTER_SYNC_FLOATINGIPS,
+             constants.FLOATINGIP_KEY: fips},
+            fips_changed)
+        self.assertNotEqual(revision,
+                            fips_changed[n_const.ROUTER_SYNC_REVISION])
+
+        changed = self.callbacks._get_router_sync_delta(
+            dict(router, name='new'), {'r1': revision})
+        self.assertEqual('new', changed['name'])
+        self.assertNotIn(n_const.ROUTER_SYNC_DELTA, changed)
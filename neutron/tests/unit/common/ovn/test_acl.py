@@ -606,6 +606,82 @@ class TestACLs(base.BaseTestCase):
     def test_update_acls_for_security_group_no_cache(self):
         self._test_update_acls_for_security_group(use_cache=False)
 
+    def _test_update_acls_for_security_group_rules_port_group(
+            self, is_add_acl=True):
+        self.driver._nb_ovn.is_port_groups_supported.return_value = True
+        sg = fakes.FakeSecurityGroup.create_one_security_group().info()
+        sg_rules = [
+            fakes.FakeSecurityGroupRule.create_one_security_group_rule({
+                'security_group_id': sg['id'], 'port_range_min': port,
+                'port_range_max': port, 'protocol': 'tcp'}).info()
+            for port in (22, 80)]
+        pg_name = ovn_utils.ovn_port_group_name(sg['id'])
+        expected_acls = [
+            ovn_acl._add_sg_rule_acl_for_port_group(
+                pg_name, sg_rule, self.driver._nb_ovn)
+            for sg_rule in sg_rules]
+
+        ovn_acl.update_acls_for_security_group_rules(
+            self.plugin, self.admin_context, self.driver._nb_ovn, sg['id'],
+            sg_rules, is_add_acl=is_add_acl)
+        if is_add_acl:
+            self.driver._nb_ovn.update_port_group_acls.assert_called_once_with(
+                pg_name, acls_add=expected_acls, if_exists=False)
+        else:
+            self.driver._nb_ovn.update_port_group_acls.assert_called_once_with(
+                pg_name, acls_del=expected_acls, if_exists=False)
+        self.driver._nb_ovn.update_port_group_acls.return_value.\
+            execute.assert_called_once_with(check_error=True)
+        self.driver._nb_ovn.pg_acl_add.assert_not_called()
+
+    def test_update_acls_for_security_group_rules_port_group_add(self):
+        self._test_update_acls_for_security_group_rules_port_group()
+
+    def test_update_acls_for_security_group_rules_port_group_del(self):
+        self._test_update_acls_for_security_group_rules_port_group(
+            is_add_acl=False)
+
+    def test_update_acls_for_security_group_rules(self):
+        sg = fakes.FakeSecurityGroup.create_one_security_group().info()
+        sg_rules = [
+            fakes.FakeSecurityGroupRule.create_one_security_group_rule({
+                'security_group_id': sg['id']}).info()
+            for _ in range(2)]
+        port = fakes.FakePort.create_one_port({
+            'security_groups': [sg['id']]
+        }).info()
+        self.plugin.get_ports.return_value = [port]
+        sg_ports_cache = {sg['id']: [{'port_id': port['id']}]}
+
+        ovn_acl.update_acls_for_security_group_rules(
+            self.plugin, self.admin_context, self.driver._nb_ovn, sg['id'],
+            sg_rules, sg_ports_cache=sg_ports_cache)
+        # The ports of the security group are only looked up once and the
+        # ACLs of the rules are updated in a single transaction
+        self.plugin.get_ports.assert_called_once_with(
+            self.admin_context, filters={'id': [port['id']]})
+        self.assertEqual(2, self.driver._nb_ovn.update_acls.call_count)
+        self.driver._nb_ovn.transaction.assert_called_once_with(
+            check_error=True)
+
+    def test_add_acls_for_sg_port_group(self):
+        sg = fakes.FakeSecurityGroup.create_one_security_group().info()
+        sg['security_group_rules'] = [
+            fakes.FakeSecurityGroupRule.create_one_security_group_rule({
+                'security_group_id': sg['id']}).info()
+            for _ in range(3)]
+        pg_name = ovn_utils.ovn_port_group_name(sg['id'])
+        txn = mock.Mock()
+
+        ovn_acl.add_acls_for_sg_port_group(self.driver._nb_ovn, sg, txn)
+        self.driver._nb_ovn.update_port_group_acls.assert_called_once_with(
+            pg_name, acls_add=[
+                ovn_acl._add_sg_rule_acl_for_port_group(
+                    pg_name, sg_rule, self.driver._nb_ovn)
+                for sg_rule in sg['security_group_rules']])
+        txn.add.assert_called_once_with(
+            self.driver._nb_ovn.update_port_group_acls.return_value)
+
     def test_acl_port_ips(self):
         port4 = fakes.FakePort.create_one_port({
             'fixed_ips': [{'subnet_id': 'subnet-ipv4',
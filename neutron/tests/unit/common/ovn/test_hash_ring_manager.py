@@ -109,6 +109,41 @@ class TestHashRingManager(testlib_api.SqlTestCaseLight):
         # The ring should re-balance and as it was before
         self._verify_hashes(hash_dict_before)
 
+    def test_get_node_generation(self):
+        node_1_uuid = db_hash_ring.add_node(
+            self.admin_ctx, HASH_RING_TEST_GROUP, 'node-1')
+        self.assertEqual(node_1_uuid,
+                         self.hash_ring_manager.get_node('fake-uuid'))
+        # Let the startup and the cache time out
+        self.hash_ring_manager._cache_startup_timeout = False
+        self.hash_ring_manager._last_time_loaded = (
+            timeutils.utcnow() - datetime.timedelta(
+                seconds=constants.HASH_RING_CACHE_TIMEOUT))
+
+        # The nodes are not reloaded while the generation is the same
+        with mock.patch.object(hash_ring_manager.db_hash_ring,
+                               'get_active_nodes') as get_nodes_mock:
+            self.hash_ring_manager.get_node('fake-uuid')
+            self.assertFalse(get_nodes_mock.called)
+
+        # Adding a node bumps the generation and the ring is rebuilt
+        node_2_uuid = db_hash_ring.add_node(
+            self.admin_ctx, HASH_RING_TEST_GROUP, 'node-2')
+        self.hash_ring_manager._last_time_loaded = (
+            timeutils.utcnow() - datetime.timedelta(
+                seconds=constants.HASH_RING_CACHE_TIMEOUT))
+        self._verify_hashes({'fake-uuid': node_1_uuid,
+                             'fake-uuid-0': node_2_uuid})
+
+        stats = self.hash_ring_manager.get_stats()
+        self.assertEqual(2, stats['generation'])
+        self.assertEqual(2, stats['nodes'])
+        self.assertEqual(2, stats['loads'])
+        self.assertEqual(2, stats['generation_checks'])
+        self.assertEqual({node_1_uuid: 3, node_2_uuid: 1},
+                         stats['distribution'])
+        self.assertEqual(1.5, stats['imbalance'])
+
     def test__wait_startup_before_caching(self):
         db_hash_ring.add_node(self.admin_ctx, HASH_RING_TEST_GROUP, 'node-1')
         db_hash_ring.add_node(self.admin_ctx, HASH_RING_TEST_GROUP, 'node-2')
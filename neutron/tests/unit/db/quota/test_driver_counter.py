@@ -0,0 +1,117 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+from neutron_lib import context
+from neutron_lib import exceptions
+
+from neutron.db.quota import api as quota_api
+from neutron.db.quota import driver_counter
+from neutron.quota import resource
+from neutron.tests.unit.db.quota import test_driver
+from neutron.tests.unit import quota as test_quota
+from neutron.tests.unit import testlib_api
+from neutron import worker as neutron_worker
+
+PROJECT = test_driver.PROJECT
+RESOURCE = test_driver.RESOURCE
+
+
+class TestCountedResource(resource.CountedResource):
+    """Describes a test counted resource for quota checking"""
+    def __init__(self, name, model_class, flag=None):
+        super(TestCountedResource, self).__init__(
+            name, model_class, flag=flag)
+
+    @property
+    def default(self):
+        return self.flag
+
+
+class TestDbQuotaCounterDriver(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(TestDbQuotaCounterDriver, self).setUp()
+        self.setup_coreplugin(core_plugin=test_driver.DB_PLUGIN_KLASS)
+        self.context = context.get_admin_context()
+        self.quota_driver = driver_counter.DbQuotaCounterDriver()
+        self.resources = {
+            RESOURCE: TestCountedResource(RESOURCE, test_quota.MehModel, 3)}
+
+    def test_make_reservation_reads_usage(self):
+        quota_api.set_quota_usage(self.context, RESOURCE, PROJECT, 1)
+        with mock.patch.object(quota_api.quota_obj.QuotaUsage,
+                               'get_object_dirty_protected') as locked_get:
+            reservation = self.quota_driver.make_reservation(
+                self.context, PROJECT, self.resources, {RESOURCE: 1}, None)
+            locked_get.assert_not_called()
+        self.assertEqual({RESOURCE: 1}, reservation.deltas)
+        # 1 used and 1 reserved
+        self.quota_driver.make_reservation(
+            self.context, PROJECT, self.resources, {RESOURCE: 1}, None)
+        self.assertRaises(exceptions.OverQuota,
+                          self.quota_driver.make_reservation,
+                          self.context, PROJECT, self.resources,
+                          {RESOURCE: 1}, None)
+
+    def test_make_reservation_unlimited(self):
+        self.resources[RESOURCE].flag = -1
+        quota_api.set_quota_usage(self.context, RESOURCE, PROJECT, 10)
+        self.quota_driver.make_reservation(
+            self.context, PROJECT, self.resources, {RESOURCE: 1}, None)
+
+    def test_cancel_reservation_does_not_set_usage_dirty(self):
+        quota_api.set_quota_usage(self.context, RESOURCE, PROJECT, 1)
+        reservation = self.quota_driver.make_reservation(
+            self.context, PROJECT, self.resources, {RESOURCE: 1}, None)
+        self.quota_driver.cancel_reservation(self.context,
+                                             reservation.reservation_id)
+        self.assertIsNone(quota_api.get_reservation(
+            self.context, reservation.reservation_id))
+        self.assertFalse(quota_api.get_quota_usage_by_resource_and_tenant(
+            self.context, RESOURCE, PROJECT).dirty)
+
+    def test_get_workers(self):
+        workers = self.quota_driver.get_workers()
+        self.assertEqual(1, len(workers))
+        self.assertIsInstance(workers[0], neutron_worker.PeriodicWorker)
+        self.config(quota_usage_reconcile_interval=0, group='QUOTAS')
+        self.assertEqual([], self.quota_driver.get_workers())
+
+    def test_reconcile(self):
+        quota_api.set_quota_usage(self.context, RESOURCE, PROJECT, 2)
+        quota_api.create_reservation(
+            self.context, PROJECT, {RESOURCE: 1},
+            expiration=datetime.datetime(2000, 1, 1))
+        with mock.patch.object(driver_counter.resource_registry,
+                               'get_all_resources',
+                               return_value=self.resources):
+            self.quota_driver._reconcile()
+            self.assertEqual({}, quota_api.get_reservations_for_resources(
+                self.context, PROJECT, [RESOURCE], expired=True))
+            # The usage is only fixed once found out of sync twice
+            self.assertEqual(2, quota_api.get_quota_usage_by_resource(
+                self.context, RESOURCE)[0].used)
+            self.quota_driver._reconcile()
+            self.assertEqual(0, quota_api.get_quota_usage_by_resource(
+                self.context, RESOURCE)[0].used)
+
+    def test_reconcile_failure_is_logged(self):
+        with mock.patch.object(quota_api, 'remove_expired_reservations',
+                               side_effect=RuntimeError), \
+                mock.patch.object(driver_counter.LOG,
+                                  'exception') as log_exception:
+            self.quota_driver._reconcile()
+        log_exception.assert_called_once_with(
+            "Failed to reconcile the quota usages")
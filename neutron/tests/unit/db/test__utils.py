@@ -15,8 +15,11 @@
 
 import mock
 from neutron_lib import context
+from neutron_lib.db import api as db_api
+from neutron_lib import exceptions as n_exc
 
 from neutron.db import _utils as db_utils
+from neutron.db import models_v2
 from neutron.tests.unit import testlib_api
 
 
@@ -46,3 +49,32 @@ class TestCommonHelpFunctions(testlib_api.SqlTestCase):
                           self.admin_ctx, create_fn, delete_fn,
                           create_bindings)
         delete_fn.assert_called_once_with(1234)
+
+    def _create_network(self, name):
+        with db_api.CONTEXT_WRITER.using(self.admin_ctx):
+            network = models_v2.Network(name=name)
+            self.admin_ctx.session.add(network)
+        return network
+
+    def test_get_marker_obj_loads_keyset_values(self):
+        network = self._create_network('net1')
+        plugin = mock.Mock()
+        marker_obj = db_utils.get_marker_obj(
+            plugin, self.admin_ctx, 'network', models_v2.Network,
+            [('name', True)], 10, network.id)
+        self.assertEqual('net1', marker_obj.name)
+        self.assertFalse(plugin._get_network.called)
+
+    def test_get_marker_obj_not_found(self):
+        plugin = mock.Mock()
+        plugin._get_network.side_effect = n_exc.NetworkNotFound(
+            net_id='fake-id')
+        self.assertRaises(n_exc.NetworkNotFound, db_utils.get_marker_obj,
+                          plugin, self.admin_ctx, 'network',
+                          models_v2.Network, [('name', True)], 10,
+                          'fake-id')
+
+    def test_get_marker_obj_without_limit(self):
+        self.assertIsNone(db_utils.get_marker_obj(
+            mock.Mock(), self.admin_ctx, 'network', models_v2.Network,
+            [('name', True)], None, 'fake-id'))
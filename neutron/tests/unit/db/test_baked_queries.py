@@ -0,0 +1,114 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from neutron_lib import context
+from neutron_lib.db import model_query
+from oslo_utils import uuidutils
+import sqlalchemy as sa
+
+from neutron.db import baked_queries
+from neutron.db import models_v2
+from neutron.objects import network as network_obj
+from neutron.tests.unit import testlib_api
+
+
+class BakedQueriesTestCase(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(BakedQueriesTestCase, self).setUp()
+        self.ctx = context.get_admin_context()
+        self.networks = []
+        for name in ('net1', 'net2', 'net3'):
+            network = network_obj.Network(self.ctx, name=name,
+                                          project_id='project')
+            network.create()
+            self.networks.append(network)
+
+    def _new_query(self):
+        name = uuidutils.generate_uuid()
+        query = baked_queries.BakedQuery(
+            name, lambda s: s.query(models_v2.Network.id).filter(
+                models_v2.Network.name == sa.bindparam('name')))
+        self.addCleanup(baked_queries._baked_queries.pop, name)
+        return query
+
+    def test_baked_query_stats(self):
+        query = self._new_query()
+        query(self.ctx.session).params(name='net1').all()
+        hits, misses = query.hits, query.misses
+        self.assertGreater(misses, 0)
+        for name in ('net2', 'net4'):
+            query(self.ctx.session).params(name=name).all()
+        self.assertEqual(misses, query.misses)
+        self.assertGreater(query.hits, hits)
+        self.assertEqual(
+            {'hits': query.hits, 'misses': misses,
+             'hit_ratio': float(query.hits) / (query.hits + misses)},
+            baked_queries.get_stats()[query.name])
+
+    def test_baked_query_disabled(self):
+        self.config(enable_baked_queries=False)
+        query = self._new_query()
+        self.assertIsNone(query(self.ctx.session))
+        self.assertEqual(0, query.hits + query.misses)
+        self.assertIsNone(baked_queries.get_collection_query(
+            self.ctx, 'test_get_networks', models_v2.Network,
+            {'name': ['net1']}))
+        with mock.patch.object(model_query, 'get_by_id') as get_by_id:
+            baked_queries.get_by_id(self.ctx, models_v2.Network,
+                                    self.networks[1].id)
+            get_by_id.assert_called_once_with(self.ctx, models_v2.Network,
+                                              self.networks[1].id)
+
+    def test_get_by_id(self):
+        network = baked_queries.get_by_id(self.ctx, models_v2.Network,
+                                          self.networks[1].id)
+        self.assertEqual(self.networks[1].id, network.id)
+        self.assertRaises(sa.orm.exc.NoResultFound,
+                          baked_queries.get_by_id, self.ctx,
+                          models_v2.Network, uuidutils.generate_uuid())
+
+    def test_get_by_id_project_scoped(self):
+        ctx = context.Context('', 'project')
+        with mock.patch.object(model_query, 'get_by_id') as get_by_id:
+            baked_queries.get_by_id(ctx, models_v2.Network,
+                                    self.networks[1].id)
+            get_by_id.assert_called_once_with(ctx, models_v2.Network,
+                                              self.networks[1].id)
+
+    def test_get_collection_query(self):
+        query = baked_queries.get_collection_query(
+            self.ctx, 'test_get_networks', models_v2.Network,
+            {'name': ['net1', 'net3'], 'project_id': ['project']})
+        self.addCleanup(baked_queries._baked_queries.pop,
+                        'test_get_networks')
+        self.assertEqual({self.networks[0].id, self.networks[2].id},
+                         {network.id for network in query})
+        query = baked_queries.get_collection_query(
+            self.ctx, 'test_get_networks', models_v2.Network,
+            {'name': ['net2']})
+        self.assertEqual([self.networks[1].id],
+                         [network.id for network in query])
+        self.assertEqual(1, query.count())
+
+    def test_get_collection_query_not_baked(self):
+        for filters in ({'shared': [True]}, {'name': []}, {'name': [None]},
+                        {'name': 'net1'}):
+            self.assertIsNone(baked_queries.get_collection_query(
+                self.ctx, 'test_get_networks', models_v2.Network, filters))
+        self.assertIsNone(baked_queries.get_collection_query(
+            self.ctx, 'test_get_networks', models_v2.Network,
+            {'name': ['net1']}, custom_filters=('name',)))
+        self.assertIsNone(baked_queries.get_collection_query(
+            context.Context('', 'project'), 'test_get_networks',
+            models_v2.Network, {'name': ['net1']}))
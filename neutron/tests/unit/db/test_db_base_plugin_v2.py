@@ -1251,6 +1251,16 @@ fixed_ips=ip_address%%3D%s&fixed_ips=ip_address%%3D%s&fixed_ips=subnet_id%%3D%s
     def test_list_ports_filtered_by_fixed_ip_with_limit(self):
         self._test_list_ports_filtered_by_fixed_ip(limit=500)
 
+    def test_list_ports_filtered_by_mac_address_case_insensitive(self):
+        plugin = directory.get_plugin()
+        ctx = context.get_admin_context()
+        with self.port(mac_address='00:00:00:00:00:ab') as port, self.port():
+            filters = {'mac_address': ['00:00:00:00:00:AB']}
+            self.assertEqual(
+                [port['port']['id']],
+                [p['id'] for p in plugin.get_ports(ctx, filters=filters)])
+            self.assertEqual(1, plugin.get_ports_count(ctx, filters=filters))
+
     def test_list_ports_public_network(self):
         with self.network(shared=True) as network:
             with self.subnet(network) as subnet:
@@ -229,3 +229,25 @@ class TestHashRing(testlib_api.SqlTestCaseLight):
         for node in group2:
             node_db = self._get_node_row(node)
             self.assertEqual(node_db.created_at, node_db.updated_at)
+
+    def test_generation(self):
+        self.assertEqual(0, ovn_hash_ring_db.get_generation(
+            self.admin_ctx, HASH_RING_TEST_GROUP))
+
+        # Adding and removing nodes bumps the generation of their group
+        self._add_nodes_and_assert_exists(count=2)
+        self.assertEqual(2, ovn_hash_ring_db.get_generation(
+            self.admin_ctx, HASH_RING_TEST_GROUP))
+        ovn_hash_ring_db.remove_nodes_from_host(self.admin_ctx,
+                                                HASH_RING_TEST_GROUP)
+        self.assertEqual(3, ovn_hash_ring_db.get_generation(
+            self.admin_ctx, HASH_RING_TEST_GROUP))
+        self.assertEqual(0, ovn_hash_ring_db.get_generation(
+            self.admin_ctx, 'another_test_group'))
+
+        # Touching the nodes doesn't
+        self._add_nodes_and_assert_exists()
+        ovn_hash_ring_db.touch_nodes_from_host(self.admin_ctx,
+                                               HASH_RING_TEST_GROUP)
+        self.assertEqual(4, ovn_hash_ring_db.get_generation(
+            self.admin_ctx, HASH_RING_TEST_GROUP))
@@ -13,12 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import mock
+import datetime
 
+import mock
 from neutron_lib import constants as n_const
 from neutron_lib import context
 from neutron_lib.db import api as db_api
 from oslo_db import exception as db_exc
+from oslo_utils import timeutils
 
 from neutron.api import extensions
 from neutron.common import config
@@ -66,6 +68,12 @@ class TestRevisionNumber(test_db_base_plugin_v2.NeutronDbPluginV2TestCase):
                                 ovn_rn_db.TYPE_NETWORKS)
         row = ovn_rn_db.get_revision_row(self.ctx, self.net['id'])
         self.assertEqual(123, row.revision_number)
+        self.assertFalse(row.pending)
+
+    def test_create_initial_revision_pending(self):
+        self._create_initial_revision(self.net['id'], ovn_rn_db.TYPE_NETWORKS)
+        row = ovn_rn_db.get_revision_row(self.ctx, self.net['id'])
+        self.assertTrue(row.pending)
 
     def test_bump_older_revision(self):
         self._create_initial_revision(self.net['id'], ovn_rn_db.TYPE_NETWORKS,
@@ -190,6 +198,53 @@ class TestRevisionNumberMaintenance(test_securitygroup.SecurityGroupsTestCase,
         # Assert nothing is inconsistent
         self.assertEqual([], res)
 
+    def _clear_pending(self, resource_uuid):
+        with db_api.CONTEXT_WRITER.using(self.ctx):
+            self.ctx.session.query(ovn_models.OVNRevisionNumbers).filter_by(
+                resource_uuid=resource_uuid).update({'pending': False})
+
+    def test_get_inconsistent_resources_updated_since_pending(self):
+        self._create_initial_revision(
+            self.net['id'], ovn_rn_db.TYPE_NETWORKS, revision_number=-1)
+        res = ovn_rn_db.get_inconsistent_resources(
+            self.ctx, updated_since=timeutils.utcnow())
+        self.assertEqual(1, len(res))
+        self.assertEqual(self.net['id'], res[0].resource_uuid)
+
+    def test_get_inconsistent_resources_updated_since(self):
+        self._create_initial_revision(
+            self.net['id'], ovn_rn_db.TYPE_NETWORKS, revision_number=-1)
+        self._clear_pending(self.net['id'])
+        since = timeutils.utcnow().replace(microsecond=0)
+
+        # Neither pending nor updated since then
+        res = ovn_rn_db.get_inconsistent_resources(
+            self.ctx, updated_since=since)
+        self.assertEqual([], res)
+        # The full scan still finds it
+        res = ovn_rn_db.get_inconsistent_resources(self.ctx)
+        self.assertEqual(1, len(res))
+
+        self._update('networks', self.net['id'],
+                     {'network': {'name': 'net2'}})
+        res = ovn_rn_db.get_inconsistent_resources(
+            self.ctx, updated_since=since)
+        self.assertEqual(1, len(res))
+        self.assertEqual(self.net['id'], res[0].resource_uuid)
+        res = ovn_rn_db.get_inconsistent_resources(
+            self.ctx, updated_since=since + datetime.timedelta(hours=1))
+        self.assertEqual([], res)
+
+    def test_mark_pending(self):
+        self._create_initial_revision(
+            self.net['id'], ovn_rn_db.TYPE_NETWORKS, revision_number=-1)
+        self._clear_pending(self.net['id'])
+        rows = ovn_rn_db.get_inconsistent_resources(self.ctx)
+        ovn_rn_db.mark_pending(self.ctx, rows)
+        self.ctx.session.expire_all()
+        row = ovn_rn_db.get_revision_row(self.ctx, self.net['id'])
+        self.assertTrue(row.pending)
+
     def test_get_deleted_resources(self):
         self._create_initial_revision(
             self.net['id'], ovn_rn_db.TYPE_NETWORKS, revision_number=0)
@@ -239,6 +294,13 @@ class TestRevisionNumberMaintenance(test_securitygroup.SecurityGroupsTestCase,
         actual_order = tuple(r.resource_type for r in res)
         self.assertEqual(ovn_rn_db._TYPES_PRIORITY_ORDER, actual_order)
 
+    def test_get_inconsistent_resources_updated_since_order(self):
+        self._prepare_resources_for_ordering_test()
+        res = ovn_rn_db.get_inconsistent_resources(
+            self.ctx, updated_since=timeutils.utcnow())
+        actual_order = tuple(r.resource_type for r in res)
+        self.assertEqual(ovn_rn_db._TYPES_PRIORITY_ORDER, actual_order)
+
     def test_get_deleted_resources_order(self):
         self._prepare_resources_for_ordering_test(delete=True)
         res = ovn_rn_db.get_deleted_resources(self.ctx)
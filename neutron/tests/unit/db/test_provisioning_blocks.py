@@ -116,6 +116,26 @@ class TestStatusBarriers(testlib_api.SqlTestCase):
         self.assertFalse(pb.is_object_blocked(self.ctx, self.port.id,
                                               resources.PORT))
 
+    def test_provisioning_complete_bulk(self):
+        port2 = self._make_port()
+        port3 = self._make_port()
+        for port in (self.port, port2, port3):
+            pb.add_provisioning_component(self.ctx, port.id, resources.PORT,
+                                          'entity1')
+        pb.add_provisioning_component(self.ctx, port3.id, resources.PORT,
+                                      'entity2')
+        completed = pb.provisioning_complete_bulk(
+            self.ctx, [self.port.id, port2.id, port3.id, 'someid'],
+            resources.PORT, 'entity1')
+        self.assertEqual({self.port.id, port2.id}, set(completed))
+        self.assertEqual(2, self.provisioned.call_count)
+        for call in self.provisioned.mock_calls:
+            payload = call[2]['payload']
+            self.assertIn(payload.resource_id, completed)
+            self.assertEqual(completed, payload.metadata['batch'])
+        self.assertEqual({port3.id}, pb.get_blocked_object_ids(
+            self.ctx, [self.port.id, port2.id, port3.id], resources.PORT))
+
     def test_remove_provisioning_component(self):
         pb.add_provisioning_component(self.ctx, self.port.id, resources.PORT,
                                       'e1')
@@ -22,6 +22,7 @@ from oslo_utils import uuidutils
 import testtools
 
 from neutron.db.db_base_plugin_v2 import NeutronDbPluginV2 as db_plugin_v2
+from neutron.db import rbac_db_mixin
 from neutron.db import rbac_db_models
 from neutron.extensions import rbac as ext_rbac
 from neutron.objects import network as network_obj
@@ -260,6 +261,132 @@ class NetworkRbacTestcase(test_plugin.NeutronDbPluginV2TestCase):
                 payload=payload)
             self.assertEqual(0, ensure.call_count)
 
+    def _get_rbac_visibility(self, object_id):
+        return {(entry.object_type, entry.target_tenant) for entry in
+                self.context.session.query(
+                    rbac_db_models.RBACVisibility).filter_by(
+                        object_id=object_id)}
+
+    def test_rbac_visibility_follows_rbac_policies(self):
+        with self.network() as net:
+            net_id = net['network']['id']
+            self.assertEqual(set(), self._get_rbac_visibility(net_id))
+            # only the shared policies are indexed
+            external = self.plugin.create_rbac_policy(
+                self.context, self._make_networkrbac(
+                    net, 'tenant-1', rbac_db_models.ACCESS_EXTERNAL))
+            self.assertEqual(set(), self._get_rbac_visibility(net_id))
+            shared = self.plugin.create_rbac_policy(
+                self.context, self._make_networkrbac(net, 'tenant-1'))
+            self.assertEqual({('network', 'tenant-1')},
+                             self._get_rbac_visibility(net_id))
+            self.plugin.update_rbac_policy(
+                self.context, shared['id'],
+                {'rbac_policy': {'target_tenant': 'tenant-2'}})
+            self.assertEqual({('network', 'tenant-2')},
+                             self._get_rbac_visibility(net_id))
+            self.plugin.delete_rbac_policy(self.context, external['id'])
+            self.assertEqual({('network', 'tenant-2')},
+                             self._get_rbac_visibility(net_id))
+            self.plugin.delete_rbac_policy(self.context, shared['id'])
+            self.assertEqual(set(), self._get_rbac_visibility(net_id))
+            self.plugin.create_rbac_policy(
+                self.context, self._make_networkrbac(net, 'tenant-1'))
+            self.plugin.delete_network(self.context, net_id)
+            self.assertEqual(set(), self._get_rbac_visibility(net_id))
+
+    def test_rbac_visibility_shared_network(self):
+        with self.network(shared=True) as net:
+            net_id = net['network']['id']
+            self.assertEqual({('network', '*')},
+                             self._get_rbac_visibility(net_id))
+            self.plugin.update_network(self.context, net_id,
+                                       {'network': {'shared': False}})
+            self.assertEqual(set(), self._get_rbac_visibility(net_id))
+
+    def test_rbac_visibility_maintenance_is_idempotent(self):
+        with self.network() as net:
+            net_id = net['network']['id']
+            self.plugin.create_rbac_policy(
+                self.context, self._make_networkrbac(net, 'tenant-1'))
+            connection = self.context.session.connection()
+            # a row inserted concurrently for another entry is ignored
+            rbac_db_mixin._add_visibility(connection, 'network', net_id,
+                                          'tenant-1')
+            self.assertEqual({('network', 'tenant-1')},
+                             self._get_rbac_visibility(net_id))
+            # the row is recomputed from the entries, which still target
+            # the tenant
+            rbac_db_mixin._remove_visibility(
+                connection, rbac_db_models.NetworkRBAC, net_id, 'tenant-1')
+            self.assertEqual({('network', 'tenant-1')},
+                             self._get_rbac_visibility(net_id))
+            rbac_db_mixin._remove_visibility(
+                connection, rbac_db_models.NetworkRBAC, net_id, 'tenant-2')
+            self.assertEqual({('network', 'tenant-1')},
+                             self._get_rbac_visibility(net_id))
+
+    def test_rebuild_rbac_visibility(self):
+        with self.network() as net:
+            net_id = net['network']['id']
+            self.plugin.create_rbac_policy(
+                self.context, self._make_networkrbac(net, 'tenant-1'))
+            self.assertEqual((0, 0), rbac_db_mixin.rebuild_rbac_visibility(
+                self.context))
+            visibility = rbac_db_models.RBACVisibility.__table__
+            connection = self.context.session.connection()
+            connection.execute(visibility.delete())
+            connection.execute(visibility.insert().values(
+                object_type='network', target_tenant='tenant-2',
+                object_id=net_id))
+            self.assertEqual((1, 1), rbac_db_mixin.rebuild_rbac_visibility(
+                self.context))
+            self.assertEqual({('network', 'tenant-1')},
+                             self._get_rbac_visibility(net_id))
+
+    def test_list_with_rbac_visibility_index(self):
+        self.config(rbac_visibility_index=True)
+        net_ids = {}
+        for name, kwargs in (('owned', {'tenant_id': 'tenant-1'}),
+                             ('private', {}),
+                             ('shared', {'shared': True}),
+                             ('rbac', {}),
+                             ('external', {})):
+            kwargs.setdefault('tenant_id', 'tenant-2')
+            net_ids[name] = self._make_network(
+                self.fmt, name, True, **kwargs)['network']['id']
+        self.plugin.create_rbac_policy(self.context, self._make_networkrbac(
+            {'network': {'id': net_ids['rbac'], 'project_id': 'tenant-2'}},
+            'tenant-1'))
+        self.plugin.create_rbac_policy(self.context, self._make_networkrbac(
+            {'network': {'id': net_ids['external'],
+                         'project_id': 'tenant-2'}},
+            'tenant-1', rbac_db_models.ACCESS_EXTERNAL))
+        subnets = {
+            name: self._make_subnet(
+                self.fmt, {'network': {'id': net_ids[name]}},
+                '10.0.%d.1' % i, '10.0.%d.0/24' % i,
+                tenant_id='tenant-2')['subnet']['id']
+            for i, name in enumerate(('private', 'rbac', 'external'))}
+        ctx = context.Context('', 'tenant-1')
+
+        def get_ids(resources):
+            return {resource['id'] for resource in resources}
+
+        self.assertEqual(
+            {net_ids[name] for name in ('owned', 'shared', 'rbac',
+                                        'external')},
+            get_ids(self.plugin.get_networks(ctx)))
+        self.assertEqual(
+            {net_ids['shared'], net_ids['rbac']},
+            get_ids(self.plugin.get_networks(
+                ctx, filters={'shared': [True]})))
+        self.assertEqual(4, self.plugin.get_networks_count(ctx))
+        # the subnets of the networks only made external to the tenant are
+        # not visible
+        self.assertEqual({subnets['rbac']},
+                         get_ids(self.plugin.get_subnets(ctx)))
+
     def _create_rbac_obj(self, _class):
         return _class(id=uuidutils.generate_uuid(),
                       project_id='project_id',
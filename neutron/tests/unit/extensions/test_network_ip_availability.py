@@ -13,12 +13,17 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import mock
 import netaddr
 from neutron_lib import constants
+from neutron_lib import context
+from neutron_lib.db import api as db_api
 
 import neutron.api.extensions as api_ext
 import neutron.common.config as config
 import neutron.extensions
+from neutron.ipam.drivers.neutrondb_ipam import db_api as ipam_db_api
+from neutron.ipam.drivers.neutrondb_ipam import db_models as ipam_models
 import neutron.services.network_ip_availability.plugin as plugin_module
 import neutron.tests.unit.db.test_db_base_plugin_v2 as test_db_base_plugin_v2
 
@@ -195,6 +200,46 @@ class TestNetworkIPAvailabilityAPI(
                     self._validate_from_availabilities(response[IP_AVAILS_KEY],
                                                        net, 2)
 
+    def test_usages_read_from_ipam_counters(self):
+        with self.network() as net:
+            with self.subnet(network=net) as subnet:
+                request = self.new_list_request(API_RESOURCE)
+                with self.port(subnet=subnet), self.port(subnet=subnet), \
+                        mock.patch.object(
+                            self.plugin,
+                            '_generate_subnet_total_ips_dict') as total_ips, \
+                        mock.patch.object(
+                            self.plugin,
+                            '_build_network_used_ip_query') as used_ips:
+                    # the allocations are read from the deltas until they
+                    # are folded into the counters
+                    for fold in (False, True):
+                        if fold:
+                            ipam_db_api.fold_counter_deltas(
+                                context.get_admin_context())
+                        response = self.deserialize(self.fmt,
+                                                    request.get_response(
+                                                        self.ext_api))
+                        self._validate_from_availabilities(
+                            response[IP_AVAILS_KEY], net, 2)
+                    total_ips.assert_not_called()
+                    used_ips.assert_not_called()
+
+    def test_usages_without_ipam_counters(self):
+        with self.network() as net:
+            with self.subnet(network=net) as subnet:
+                request = self.new_list_request(API_RESOURCE)
+                with self.port(subnet=subnet), self.port(subnet=subnet):
+                    ctx = context.get_admin_context()
+                    with db_api.CONTEXT_WRITER.using(ctx):
+                        ctx.session.query(
+                            ipam_models.IpamSubnetCounter).delete()
+                    response = self.deserialize(self.fmt,
+                                                request.get_response(
+                                                    self.ext_api))
+                    self._validate_from_availabilities(response[IP_AVAILS_KEY],
+                                                       net, 2)
+
     def test_usages_query_ip_version_v4(self):
         with self.network() as net:
             with self.subnet(network=net):
@@ -128,6 +128,7 @@ class FakeOvsdbNbOvnIdl(object):
         self.get_address_set.return_value = None
         self.pg_acl_add = mock.Mock()
         self.pg_acl_del = mock.Mock()
+        self.update_port_group_acls = mock.Mock()
         self.pg_del = mock.Mock()
         self.pg_add = mock.Mock()
         self.get_port_group = mock.Mock()
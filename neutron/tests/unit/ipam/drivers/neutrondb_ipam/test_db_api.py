@@ -13,10 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import netaddr
 from neutron_lib import context
 from oslo_utils import uuidutils
 
 from neutron.ipam.drivers.neutrondb_ipam import db_api
+from neutron.ipam.drivers.neutrondb_ipam import db_models
 from neutron.objects import ipam as ipam_obj
 from neutron.tests.unit import testlib_api
 
@@ -92,6 +94,14 @@ class TestIpamSubnetManager(testlib_api.SqlTestCase):
         for allocation in allocs:
             self.assertIn(str(allocation.ip_address), ips)
 
+    def test_list_allocated_ips(self):
+        ips = ['1.2.3.4', '1.2.3.6', '1.2.3.7']
+        for ip in ips:
+            self.subnet_manager.create_allocation(self.ctx, ip)
+        self.assertEqual(
+            sorted(ips),
+            sorted(self.subnet_manager.list_allocated_ips(self.ctx)))
+
     def _test_create_allocation(self):
         self.subnet_manager.create_allocation(self.ctx,
                                               self.subnet_ip)
@@ -112,3 +122,38 @@ class TestIpamSubnetManager(testlib_api.SqlTestCase):
         alloc_exists = ipam_obj.IpamAllocation.objects_exist(
             self.ctx, ipam_subnet_id=self.ipam_subnet_id)
         self.assertFalse(alloc_exists)
+
+    def _get_counters(self):
+        self.ctx.session.expire_all()
+        counter = self.ctx.session.query(
+            db_models.IpamSubnetCounter).filter_by(
+            ipam_subnet_id=self.ipam_subnet_id).one()
+        return counter.used_ips, counter.total_ips
+
+    def test_update_counters(self):
+        self.subnet_manager.create_counters(self.ctx, 2 ** 64)
+        self.ctx.session.flush()
+        self.assertEqual((0, str(2 ** 64)), self._get_counters())
+        self.subnet_manager.add_used_ips(self.ctx, 3)
+        self.subnet_manager.add_used_ips(self.ctx, -1)
+        self.subnet_manager.update_total_ips(self.ctx, 7)
+        self.ctx.session.flush()
+        self.assertEqual((0, '7'), self._get_counters())
+        self.assertEqual(2, db_api.fold_counter_deltas(self.ctx))
+        self.assertEqual((2, '7'), self._get_counters())
+
+    def test_fold_counter_deltas_without_counters(self):
+        self.subnet_manager.add_used_ips(self.ctx, 1)
+        self.ctx.session.flush()
+        self.assertEqual(1, db_api.fold_counter_deltas(self.ctx))
+        self.assertFalse(self.ctx.session.query(
+            db_models.IpamSubnetCounterDelta).count())
+
+    def test_get_total_ips(self):
+        pools = [netaddr.IPRange(*pool) for pool in self.multi_pool]
+        self.assertEqual(21, db_api.get_total_ips(pools, '1.2.3.0/24'))
+        self.assertEqual(2 ** 64, db_api.get_total_ips([], 'fd00::/64'))
+
+    def test_reconcile_counters_skips_subnets_being_deleted(self):
+        # the IPAM subnet of setUp has no neutron subnet
+        self.assertEqual([], db_api.reconcile_counters(self.ctx))
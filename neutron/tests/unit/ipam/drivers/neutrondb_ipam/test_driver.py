@@ -21,10 +21,12 @@ from neutron_lib import exceptions as n_exc
 from neutron_lib.plugins import directory
 from oslo_utils import uuidutils
 
+from neutron.ipam.drivers.neutrondb_ipam import db_api as ipam_db_api
 from neutron.ipam.drivers.neutrondb_ipam import driver
 from neutron.ipam import exceptions as ipam_exc
 from neutron.ipam import requests as ipam_req
 from neutron.objects import ipam as ipam_obj
+from neutron.tests import base
 from neutron.tests.unit.db import test_db_base_plugin_v2 as test_db_plugin
 from neutron.tests.unit import testlib_api
 
@@ -62,6 +64,17 @@ class TestNeutronDbIpamMixin(object):
         return plugin.create_subnet(ctx, subnet)
 
 
+class TestCandidateWindows(base.BaseTestCase):
+
+    def test_next(self):
+        windows = driver._CandidateWindows()
+        with mock.patch('os.getpid', return_value=1):
+            first = windows.next(4)
+            self.assertEqual((first + 1) % 4, windows.next(4))
+        with mock.patch('os.getpid', return_value=2):
+            self.assertEqual((first + 1) % 4, windows.next(4))
+
+
 class TestNeutronDbIpamPool(testlib_api.SqlTestCase,
                             TestNeutronDbIpamMixin):
     """Test case for the Neutron's DB IPAM driver subnet pool interface."""
@@ -397,6 +410,21 @@ class TestNeutronDbIpamSubnet(testlib_api.SqlTestCase,
                           ipam_subnet.bulk_allocate,
                           ipam_req.BulkAddressRequest(2))
 
+    def test_allocate_from_candidate_window(self):
+        self.config(ipam_allocation_windows=4)
+        ipam_subnet = self._create_and_allocate_ipam_subnet(
+            '192.168.0.0/28', ip_version=constants.IP_VERSION_4)[0]
+        with mock.patch.object(driver._candidate_windows, 'next',
+                               return_value=1):
+            # 13 free addresses from .2, the window holds the 4th to the 6th
+            ip_address = ipam_subnet.allocate(ipam_req.AnyAddressRequest)
+            self.assertIn(ip_address,
+                          ['192.168.0.5', '192.168.0.6', '192.168.0.7'])
+            # the window is too small, any free address is picked
+            ip_addresses = ipam_subnet.bulk_allocate(
+                ipam_req.BulkAddressRequest(5))
+            self.assertEqual(5, len(ip_addresses))
+
     def test_prefernext_allocate_multiple_address_pools(self):
         ipam_subnet = self._create_and_allocate_ipam_subnet(
             '192.168.0.0/30', ip_version=constants.IP_VERSION_4)[0]
@@ -416,6 +444,55 @@ class TestNeutronDbIpamSubnet(testlib_api.SqlTestCase,
     def test_deallocate_v4_address(self):
         self._test_deallocate_address('10.0.0.0/24', 4)
 
+    def _get_counters(self, ipam_subnet):
+        self.ctx.session.expire_all()
+        counter = ipam_subnet.subnet_manager._counters_query(self.ctx).one()
+        return counter.used_ips, counter.total_ips
+
+    def test_allocate_and_deallocate_update_counters(self):
+        ipam_subnet = self._create_and_allocate_ipam_subnet(
+            '192.168.0.0/28', ip_version=constants.IP_VERSION_4)[0]
+        self.assertEqual((0, '13'), self._get_counters(ipam_subnet))
+        # the allocations do not write to the counters
+        with mock.patch.object(ipam_subnet.subnet_manager,
+                               '_counters_query') as counters_query:
+            ip_address = ipam_subnet.allocate(ipam_req.AnyAddressRequest)
+            ipam_subnet.bulk_allocate(ipam_req.BulkAddressRequest(3))
+            ipam_subnet.deallocate(ip_address)
+            counters_query.assert_not_called()
+        self.assertEqual((0, '13'), self._get_counters(ipam_subnet))
+        self.assertEqual(3, ipam_db_api.fold_counter_deltas(self.ctx))
+        self.assertEqual((3, '13'), self._get_counters(ipam_subnet))
+        self.assertEqual(0, ipam_db_api.fold_counter_deltas(self.ctx))
+        ipam_subnet.update_allocation_pools(
+            [netaddr.IPRange('192.168.0.2', '192.168.0.5')],
+            netaddr.IPNetwork('192.168.0.0/28'))
+        self.assertEqual((3, '4'), self._get_counters(ipam_subnet))
+
+    def test_reconcile_counters(self):
+        ipam_subnet = self._create_and_allocate_ipam_subnet(
+            '192.168.0.0/28', ip_version=constants.IP_VERSION_4)[0]
+        ipam_subnet.subnet_manager._counters_query(self.ctx).delete()
+        ipam_subnet_id = ipam_subnet.subnet_manager._ipam_subnet_id
+        fixed = ipam_db_api.reconcile_counters(self.ctx, dry_run=True)
+        self.assertIn((ipam_subnet_id, None, (0, '13')), fixed)
+        fixed = ipam_db_api.reconcile_counters(self.ctx)
+        self.assertIn((ipam_subnet_id, None, (0, '13')), fixed)
+        self.assertEqual((0, '13'), self._get_counters(ipam_subnet))
+        self.assertEqual([], ipam_db_api.reconcile_counters(self.ctx))
+
+    def test_reconcile_counters_drops_deltas(self):
+        ipam_subnet = self._create_and_allocate_ipam_subnet(
+            '192.168.0.0/28', ip_version=constants.IP_VERSION_4)[0]
+        # the address is not allocated to a port, the IP allocations of the
+        # ports are counted
+        ipam_subnet.allocate(ipam_req.AnyAddressRequest)
+        ipam_subnet_id = ipam_subnet.subnet_manager._ipam_subnet_id
+        fixed = ipam_db_api.reconcile_counters(self.ctx)
+        self.assertIn((ipam_subnet_id, (1, '13'), (0, '13')), fixed)
+        self.assertEqual(0, ipam_db_api.fold_counter_deltas(self.ctx))
+        self.assertEqual((0, '13'), self._get_counters(ipam_subnet))
+
     def test_deallocate_v6_address(self):
         # This test does not really exercise any different code path wrt
         # test_deallocate_v4_address. It is provided for completeness and for
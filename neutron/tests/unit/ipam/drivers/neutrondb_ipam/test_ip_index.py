@@ -0,0 +1,83 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import netaddr
+from neutron_lib import constants
+
+from neutron.ipam.drivers.neutrondb_ipam import ip_index
+from neutron.tests import base
+
+
+class TestFreeIpIndex(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestFreeIpIndex, self).setUp()
+        self.pools = [netaddr.IPRange('10.0.0.20', '10.0.0.29'),
+                      netaddr.IPRange('10.0.0.2', '10.0.0.9')]
+        # 10.0.0.1 is out of the pools
+        self.allocated = ['10.0.0.1', '10.0.0.2', '10.0.0.5', '10.0.0.6',
+                          '10.0.0.29']
+        self.index = ip_index.FreeIpIndex(self.pools, self.allocated,
+                                          constants.IP_VERSION_4)
+
+    def _free_ips(self):
+        pools = netaddr.IPSet(self.pools)
+        return sorted(pools - netaddr.IPSet(self.allocated))
+
+    def test_size(self):
+        self.assertEqual(14, self.index.size)
+
+    def test_getitem(self):
+        self.assertEqual(
+            [str(ip) for ip in self._free_ips()],
+            [self.index[i] for i in range(self.index.size)])
+        self.assertRaises(IndexError, self.index.__getitem__, 14)
+
+    def test_pick_prefer_next(self):
+        self.assertEqual(['10.0.0.3', '10.0.0.4', '10.0.0.7'],
+                         self.index.pick(3, prefer_next=True))
+
+    def test_pick_random(self):
+        ips = self.index.pick(10)
+        self.assertEqual(10, len(set(ips)))
+        self.assertTrue(set(ips) <= {str(ip) for ip in self._free_ips()})
+
+    def test_pick_in_window(self):
+        self.assertEqual(['10.0.0.21', '10.0.0.22'],
+                         self.index.pick(2, prefer_next=True, start=6,
+                                         stop=9))
+        ips = self.index.pick(3, start=6, stop=9)
+        self.assertEqual({'10.0.0.21', '10.0.0.22', '10.0.0.23'}, set(ips))
+        self.assertEqual(['10.0.0.28'], self.index.pick(3, start=13,
+                                                        stop=20))
+
+    def test_pick_more_than_free(self):
+        self.assertEqual(14, len(self.index.pick(20)))
+
+    def test_full_pools(self):
+        index = ip_index.FreeIpIndex(
+            [netaddr.IPRange('10.0.0.2', '10.0.0.3')],
+            ['10.0.0.2', '10.0.0.3'], constants.IP_VERSION_4)
+        self.assertEqual(0, index.size)
+        self.assertEqual([], index.pick(1))
+
+    def test_pick_ipv6(self):
+        index = ip_index.FreeIpIndex(
+            [netaddr.IPRange('fd00::1', 'fd00::ffff:ffff:ffff:ffff')],
+            ['fd00::1'], constants.IP_VERSION_6)
+        self.assertEqual(2 ** 64 - 2, index.size)
+        self.assertEqual(['fd00::2'], index.pick(1, prefer_next=True))
+        ips = index.pick(5)
+        self.assertEqual(5, len(set(ips)))
+        for ip in ips:
+            self.assertIn(netaddr.IPAddress(ip),
+                          netaddr.IPNetwork('fd00::/64'))
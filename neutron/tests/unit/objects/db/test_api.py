@@ -44,14 +44,15 @@ class GetObjectsTestCase(test_base.BaseTestCase):
 
         with mock.patch.object(
                 model_query, 'get_collection') as get_collection:
-            with mock.patch.object(api, 'get_object') as get_object:
+            with mock.patch.object(
+                    api, 'get_keyset_marker') as get_keyset_marker:
                 api.get_objects(FakeObj, ctxt, _pager=pager)
-        get_object.assert_called_with(FakeObj, ctxt, id=marker)
+        get_keyset_marker.assert_called_with(FakeObj, ctxt, None, marker)
         get_collection.assert_called_with(
             ctxt, FakeObj.db_model, dict_func=None,
             filters={},
             limit=limit,
-            marker_obj=get_object.return_value)
+            marker_obj=get_keyset_marker.return_value)
 
 
 class GetValuesTestCase(test_base.BaseTestCase):
@@ -150,6 +151,26 @@ class CRUDScenarioTestCase(testlib_api.SqlTestCase):
         self.assertIn(obj2, objs)
         self.assertNotIn(obj3, objs)
 
+    def test_get_objects_with_marker_pages_by_sort_keys(self):
+        objs = [api.create_object(self.obj_cls, self.ctxt, {'name': name})
+                for name in ('obj_c', 'obj_a', 'obj_b', 'obj_d')]
+        objs.sort(key=lambda obj: obj.name)
+        pager = base.Pager(sorts=[('name', True)], limit=2,
+                           marker=objs[1].id)
+
+        page = api.get_objects(self.obj_cls, self.ctxt, _pager=pager)
+        self.assertEqual(objs[2:], page)
+
+    def test_get_keyset_marker_loads_sort_keys_only(self):
+        obj = api.create_object(self.obj_cls, self.ctxt, {'name': 'foo'})
+
+        marker = api.get_keyset_marker(
+            self.obj_cls, self.ctxt, [('name', False)], obj.id)
+        self.assertEqual('foo', marker.name)
+        self.assertRaises(AttributeError, getattr, marker, 'status')
+        self.assertIsNone(api.get_keyset_marker(
+            self.obj_cls, self.ctxt, [('name', False)], 'fake-id'))
+
     def test_get_values_with_None_value_in_filters(self):
         api.create_object(self.obj_cls, self.ctxt, {'name': 'foo'})
         values = api.get_values(
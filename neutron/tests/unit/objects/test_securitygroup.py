@@ -14,7 +14,9 @@ import collections
 import itertools
 import random
 
+from neutron_lib import context
 from oslo_utils import uuidutils
+import sqlalchemy
 
 from neutron.objects import securitygroup
 from neutron.tests.unit.objects import test_base
@@ -188,6 +190,34 @@ class SecurityGroupDbObjTestCase(test_base.BaseDbObjectTestCase,
         self.assertEqual(len(sg_obj.rules), 0)
         self.assertIsNone(listed_objs[0].rules)
 
+    def test_get_objects_loads_requested_columns_only(self):
+        sg_obj = self._create_test_security_group()
+
+        # use a new session, the created row is in the one of self.context
+        listed_objs = securitygroup.SecurityGroup.get_objects(
+            context.get_admin_context(), fields=['id', 'name'], id=sg_obj.id)
+        self.assertEqual(1, len(listed_objs))
+        listed_obj = listed_objs[0]
+        self.assertEqual(sg_obj.name, listed_obj.name)
+        self.assertEqual(sg_obj.project_id, listed_obj.project_id)
+        self.assertFalse(listed_obj.obj_attr_is_set('stateful'))
+        unloaded = sqlalchemy.inspect(listed_obj.db_obj).unloaded
+        self.assertIn('stateful', unloaded)
+        self.assertIn('rbac_entries', unloaded)
+        self.assertNotIn('standard_attr', unloaded)
+
+        # the fields which were not requested are loaded on first access
+        self.assertEqual(sg_obj.stateful, listed_obj.stateful)
+        self.assertEqual(sg_obj.description, listed_obj.description)
+        self.assertFalse(listed_obj.obj_what_changed())
+
+    def test_get_objects_with_synthetic_field_loads_whole_rows(self):
+        sg_obj = self._create_test_security_group()
+
+        listed_objs = securitygroup.SecurityGroup.get_objects(
+            self.context, fields=['id', 'rules'], id=sg_obj.id)
+        self.assertTrue(listed_objs[0].obj_attr_is_set('stateful'))
+
 
 class DefaultSecurityGroupIfaceObjTestCase(test_base.BaseObjectIfaceTestCase):
 
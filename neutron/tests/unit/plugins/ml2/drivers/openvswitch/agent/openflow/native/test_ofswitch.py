@@ -104,3 +104,123 @@ class TestBundledOpenFlowBridge(base.BaseTestCase):
         args, kwargs = self.br.br._send_msg.call_args_list[1]
         self.assertEqual(ofproto_v1_3.ONF_BCT_COMMIT_REQUEST,
                          args[0].type)
+
+
+class FakeSwitch(ofswitch.OpenFlowSwitchMixin):
+    br_name = 'br-fake'
+    of_tables = (0, 1)
+
+    def __init__(self):
+        super(FakeSwitch, self).__init__(os_ken_app=mock.Mock())
+        self.dp = mock.Mock()
+        self.ovsdb = mock.Mock()
+        self._reserved_cookies = set()
+        self.flows = []
+        self._send_msg = mock.Mock(side_effect=self._fake_send_msg)
+
+    @property
+    def reserved_cookies(self):
+        return set(self._reserved_cookies)
+
+    def _get_dp(self):
+        return self.dp, ofproto_v1_3, ofproto_v1_3_parser
+
+    def _fake_send_msg(self, msg, reply_cls=None, reply_multi=False,
+                       active_bundle=None):
+        if isinstance(msg, ofproto_v1_3_parser.ONFBundleCtrlMsg):
+            return FakeReply(msg.type + 1)
+
+    def dump_flows(self, table_id=None):
+        return [f for f in self.flows if f.table_id == table_id]
+
+    def sent_flow_mods(self):
+        return [args[0] for args, kwargs in self._send_msg.call_args_list
+                if isinstance(args[0], ofproto_v1_3_parser.OFPFlowMod)]
+
+
+class TestFlowReconcile(base.BaseTestCase):
+    def setUp(self):
+        super(TestFlowReconcile, self).setUp()
+        self.br = FakeSwitch()
+        self.cookie = 0x1234
+        self.br.ovsdb.br_get_external_id.return_value.execute.return_value = (
+            str(self.cookie))
+
+    def _installed_flow(self, table_id, priority, cookie, match,
+                        instructions=None):
+        return ofproto_v1_3_parser.OFPFlowStats(
+            table_id=table_id, priority=priority, idle_timeout=0,
+            hard_timeout=0, cookie=cookie,
+            match=ofproto_v1_3_parser.OFPMatch(**match),
+            instructions=instructions or [])
+
+    def test_setup_flow_reconcile_persists_new_cookie(self):
+        self.br.ovsdb.br_get_external_id.return_value.execute.return_value = (
+            None)
+        self.br.setup_flow_reconcile()
+        self.assertFalse(self.br._is_recording_flows())
+        self.br.ovsdb.br_set_external_id.assert_called_once_with(
+            'br-fake', ofswitch.FLOW_COOKIE_EXTERNAL_ID,
+            str(self.br.default_cookie))
+        self.assertIn(self.br.default_cookie, self.br.reserved_cookies)
+
+    def test_recorded_flows_not_sent(self):
+        self.br.setup_flow_reconcile()
+        self.assertEqual(self.cookie, self.br.default_cookie)
+        self.br.install_drop(table_id=0, priority=2, in_port=1)
+        self.br.uninstall_flows(in_port=2)
+        self.br._send_msg.assert_not_called()
+
+    def test_uninstall_flows_removes_recorded_flows(self):
+        self.br.setup_flow_reconcile()
+        self.br.install_drop(table_id=0, priority=2, in_port=1)
+        self.br.install_drop(table_id=0, priority=3, in_port=1,
+                             eth_src='fa:16:3e:00:00:01')
+        self.br.install_drop(table_id=1, priority=2, in_port=1)
+        self.br.install_drop(table_id=0, priority=2, in_port=2)
+        self.br.uninstall_flows(table_id=0, in_port=1)
+        self.assertEqual(
+            [(0, 2, (('in_port', 2),)), (1, 2, (('in_port', 1),))],
+            sorted(self.br._flow_recorder.flows))
+        self.br.uninstall_flows(cookie=0x999, cookie_mask=(1 << 64) - 1)
+        self.assertEqual(2, len(self.br._flow_recorder.flows))
+        self.br.uninstall_flows(table_id=1, strict=True, priority=2,
+                                in_port=1)
+        self.assertEqual([(0, 2, (('in_port', 2),))],
+                         list(self.br._flow_recorder.flows))
+
+    def test_cleanup_flows_applies_difference(self):
+        self.br.setup_flow_reconcile()
+        self.br.install_drop(table_id=0, priority=2, in_port=1)
+        self.br.install_drop(table_id=0, priority=2, in_port=2)
+        self.br.install_goto(table_id=0, dest_table_id=1, priority=1)
+        self.br._reserved_cookies.add(0x42)
+        self.br.flows = [
+            # unchanged
+            self._installed_flow(0, 2, self.cookie, {'in_port': 1}),
+            # different instructions
+            self._installed_flow(0, 1, self.cookie, {}),
+            # stale flows of the previous run
+            self._installed_flow(0, 2, self.cookie, {'in_port': 3}),
+            self._installed_flow(1, 0, 0x999, {}),
+            # installed by other means during this run
+            self._installed_flow(1, 5, 0x42, {'in_port': 3}),
+        ]
+        self.br.cleanup_flows()
+
+        flow_mods = self.br.sent_flow_mods()
+        deleted = [(m.table_id, m.priority, m.cookie) for m in flow_mods
+                   if m.command == ofproto_v1_3.OFPFC_DELETE_STRICT]
+        added = [(m.table_id, m.priority, m.match.get('in_port'))
+                 for m in flow_mods if m.command == ofproto_v1_3.OFPFC_ADD]
+        self.assertEqual([(0, 2, self.cookie), (1, 0, 0x999)], deleted)
+        self.assertEqual([(0, 2, 2), (0, 1, None)], added)
+        # Deletions are sent before additions.
+        self.assertEqual(ofproto_v1_3.OFPFC_DELETE_STRICT,
+                         flow_mods[0].command)
+        self.assertFalse(self.br._is_recording_flows())
+
+        # Flows are sent right away once reconciled.
+        self.br.install_drop(table_id=0, priority=2, in_port=5)
+        self.assertEqual(len(flow_mods) + 1,
+                         len(self.br.sent_flow_mods()))
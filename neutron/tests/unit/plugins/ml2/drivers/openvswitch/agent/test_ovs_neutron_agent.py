@@ -36,6 +36,7 @@ from neutron.agent.common import ovs_lib
 from neutron.agent.common import polling
 from neutron.agent.common import utils
 from neutron.agent.linux import ip_lib
+from neutron.common import _constants as common_constants
 from neutron.objects.ports import Port
 from neutron.objects.ports import PortBinding
 from neutron.plugins.ml2.drivers.l2pop import rpc as l2pop_rpc
@@ -969,6 +970,32 @@ class TestOvsNeutronAgent(object):
                 self.agent.context, {'port_id': 'the_skipped_one'})
             treat_vif_port.assert_not_called()
 
+    def test_treat_devices_added_updated_in_chunks(self):
+        devices = ['dev%d' % i for i in range(5)]
+
+        def fake_details(context, devices, agent_id, host, agent_restarted):
+            return {'devices': [{'device': d} for d in devices],
+                    'failed_devices': devices[:1]}
+
+        with mock.patch.object(common_constants,
+                               'AGENT_RES_PROCESSING_STEP', new=2),\
+                mock.patch.object(
+                    self.agent.plugin_rpc,
+                    'get_devices_details_list_and_failed_devices',
+                    side_effect=fake_details) as get_details,\
+                mock.patch.object(self.agent.int_br, 'get_vifs_by_ids',
+                                  return_value={}) as get_vifs:
+            skip_devs, _, _, failed_devices = (
+                self.agent.treat_devices_added_or_updated(
+                    devices, False, set()))
+        self.assertEqual(3, get_details.call_count)
+        self.assertEqual([mock.call(['dev0', 'dev1']),
+                          mock.call(['dev2', 'dev3']),
+                          mock.call(['dev4'])],
+                         get_vifs.call_args_list)
+        self.assertEqual(devices, skip_devs)
+        self.assertEqual({'dev0', 'dev2', 'dev4'}, failed_devices)
+
     def test_treat_devices_added_failed_devices(self):
         dev_mock = 'the_failed_one'
         with mock.patch.object(self.agent.plugin_rpc,
@@ -2712,6 +2739,26 @@ class TestOvsNeutronAgentOSKen(TestOvsNeutronAgent,
             self.assertEqual(len(constants.INT_BR_ALL_TABLES) * len(expected),
                              len(uninstall_flows.mock_calls))
 
+    def test_reconcile_flows_until_stale_flows_cleaned(self):
+        cfg.CONF.set_override('reconcile_flows_on_start', True, 'AGENT')
+        self.agent.reconcile_flows = True
+        br = mock.Mock()
+        self.agent._setup_flow_reconcile(br)
+        br.setup_flow_reconcile.assert_called_once_with(record=True)
+        with mock.patch.object(self.agent.int_br, 'cleanup_flows'):
+            self.agent.cleanup_stale_flows()
+        self.assertFalse(self.agent.reconcile_flows)
+        br.reset_mock()
+        self.agent._setup_flow_reconcile(br)
+        br.setup_flow_reconcile.assert_called_once_with(record=False)
+
+    def test_reconcile_flows_disabled_by_drop_flows_on_start(self):
+        cfg.CONF.set_override('reconcile_flows_on_start', True, 'AGENT')
+        cfg.CONF.set_override('drop_flows_on_start', True, 'AGENT')
+        br = mock.Mock()
+        self.agent._setup_flow_reconcile(br)
+        br.setup_flow_reconcile.assert_not_called()
+
 
 class AncillaryBridgesTest(object):
 
@@ -854,6 +854,62 @@ class TestUpdateACLsCommand(TestBaseCommand):
             fake_lswitch.delvalue.assert_called_with('acls', mock.ANY)
 
 
+class TestUpdatePortGroupACLsCommand(TestBaseCommand):
+
+    def _test_pg_no_exist(self, if_exists=True):
+        with mock.patch.object(idlutils, 'row_by_value',
+                               side_effect=idlutils.RowNotFound):
+            cmd = commands.UpdatePortGroupACLsCommand(
+                self.ovn_api, 'fake-pg', acls_add=[], acls_del=[],
+                if_exists=if_exists)
+            if if_exists:
+                cmd.run_idl(self.transaction)
+            else:
+                self.assertRaises(RuntimeError, cmd.run_idl, self.transaction)
+
+    def test_pg_no_exist_ignore(self):
+        self._test_pg_no_exist(if_exists=True)
+
+    def test_pg_no_exist_fail(self):
+        self._test_pg_no_exist(if_exists=False)
+
+    def _get_acl(self, pg_name, match):
+        sg_rule = \
+            fakes.FakeSecurityGroupRule.create_one_security_group_rule().info()
+        return ovn_acl.add_sg_rule_acl_for_port_group(pg_name, sg_rule, match)
+
+    def test_pg_acls_update(self):
+        fake_pg = fakes.FakeOvsdbRow.create_one_ovsdb_row()
+        acl_keep = self._get_acl(fake_pg.name, 'keep')
+        acl_del = self._get_acl(fake_pg.name, 'del')
+        acl_add = self._get_acl(fake_pg.name, 'add')
+        fake_pg.acls = [
+            fakes.FakeOvsdbRow.create_one_ovsdb_row(attrs={
+                'direction': acl['direction'], 'priority': acl['priority'],
+                'match': acl['match']}) for acl in (acl_keep, acl_del)]
+        fake_acl = fakes.FakeOvsdbRow.create_one_ovsdb_row()
+        self.transaction.insert.return_value = fake_acl
+        with mock.patch.object(idlutils, 'row_by_value',
+                               return_value=fake_pg):
+            cmd = commands.UpdatePortGroupACLsCommand(
+                self.ovn_api, fake_pg.name,
+                acls_add=[acl_keep, acl_add], acls_del=[acl_del],
+                if_exists=False)
+            cmd.run_idl(self.transaction)
+        # Only the ACL which is not in the port group yet is added
+        self.transaction.insert.assert_called_once_with(
+            self.ovn_api._tables['ACL'])
+        self.assertEqual('add', fake_acl.match)
+        self.assertEqual(
+            {ovn_const.OVN_SG_RULE_EXT_ID_KEY:
+             acl_add[ovn_const.OVN_SG_RULE_EXT_ID_KEY]},
+            fake_acl.external_ids)
+        fake_pg.addvalue.assert_called_once_with('acls', fake_acl.uuid)
+        fake_pg.delvalue.assert_called_once_with('acls', fake_pg.acls[1])
+        fake_pg.acls[1].delete.assert_called_once_with()
+        fake_pg.acls[0].delete.assert_not_called()
+
+
 class TestAddStaticRouteCommand(TestBaseCommand):
 
     def test_lrouter_not_found(self):
@@ -771,3 +771,21 @@ class TestSBImplIdlOvn(TestDBImplIdlOvn):
         mock_get_probe_interval.return_value = 5000
         inst = impl_idl_ovn.OvsdbSbOvnIdl(mock.Mock())
         inst.idl._session.reconnect.set_probe_interval.assert_called_with(5000)
+
+    def test_get_replica_size(self):
+        self._load_sb_db()
+        self.chassis_table.columns = {'name': mock.Mock(),
+                                      'hostname': mock.Mock()}
+        self.assertEqual({'Chassis': {'rows': 3, 'columns': 2}},
+                         self.sb_ovn_idl.get_replica_size())
+
+    def test_get_replica_stats(self):
+        self._load_sb_db()
+        # The backends sharing an IDL are reported once
+        with mock.patch.object(impl_idl_ovn, '_backends',
+                               [self.sb_ovn_idl, self.sb_ovn_idl]):
+            stats = impl_idl_ovn.get_replica_stats()
+        self.assertEqual(
+            {'OVN_Southbound-0': {
+                'rows': 3, 'tables': {'Chassis': {'rows': 3, 'columns': 0}}}},
+            stats)
@@ -22,6 +22,7 @@ from oslo_config import cfg
 from neutron.common.ovn import constants
 from neutron.common.ovn import utils
 from neutron.conf.plugins.ml2.drivers.ovn import ovn_conf
+from neutron.db import ovn_hash_ring_db as hash_ring_db
 from neutron.db import ovn_revision_numbers_db
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import maintenance
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovn_db_sync
@@ -50,11 +51,57 @@ class TestDBInconsistenciesPeriodics(testlib_api.SqlTestCaseLight,
                        '_fix_create_update')
     @mock.patch.object(ovn_revision_numbers_db, 'get_inconsistent_resources')
     def test_check_for_inconsistencies(self, mock_get_incon_res, mock_fix_net):
-        fake_row = mock.Mock(resource_type=constants.TYPE_NETWORKS)
+        fake_row = mock.Mock(resource_type=constants.TYPE_NETWORKS,
+                             resource_uuid=self.net['id'])
         mock_get_incon_res.return_value = [fake_row, ]
         self.periodic.check_for_inconsistencies()
         mock_fix_net.assert_called_once_with(mock.ANY, fake_row)
 
+    @mock.patch.object(maintenance.DBInconsistenciesPeriodics,
+                       '_fix_create_update')
+    @mock.patch.object(ovn_revision_numbers_db, 'mark_pending')
+    @mock.patch.object(ovn_revision_numbers_db, 'get_inconsistent_resources')
+    def test_check_for_inconsistencies_incremental(
+            self, mock_get_incon_res, mock_mark_pending, mock_fix):
+        fake_row = mock.Mock(resource_type=constants.TYPE_NETWORKS)
+        mock_get_incon_res.return_value = [fake_row]
+        self.periodic.check_for_inconsistencies()
+        # The first run scans the whole table
+        mock_get_incon_res.assert_called_once_with(
+            mock.ANY, updated_since=None)
+        mock_mark_pending.assert_called_once_with(mock.ANY, [fake_row])
+
+        mock_get_incon_res.reset_mock()
+        mock_get_incon_res.return_value = []
+        self.periodic.check_for_inconsistencies()
+        updated_since = mock_get_incon_res.call_args[1]['updated_since']
+        self.assertIsNotNone(updated_since)
+        self.assertLess(updated_since, self.periodic._last_scan_at)
+
+        stats = self.periodic.get_stats()
+        self.assertEqual(2, stats['runs'])
+        self.assertEqual(1, stats['full_scans'])
+        self.assertEqual(1, stats['fixed'])
+        self.assertEqual(0, stats['failed'])
+        self.assertEqual(0, stats['create_update_backlog'])
+
+    @mock.patch.object(maintenance.DBInconsistenciesPeriodics,
+                       '_fix_create_update')
+    @mock.patch.object(ovn_revision_numbers_db, 'get_inconsistent_resources',
+                       return_value=[])
+    def test_check_for_inconsistencies_lock_lost(self, mock_get_incon_res,
+                                                 mock_fix):
+        self.periodic.check_for_inconsistencies()
+        with mock.patch.object(maintenance.DBInconsistenciesPeriodics,
+                               'has_lock', mock.PropertyMock(
+                                   return_value=False)):
+            self.periodic.check_for_inconsistencies()
+        mock_get_incon_res.reset_mock()
+        # A full scan is done again once the lock is taken back
+        self.periodic.check_for_inconsistencies()
+        mock_get_incon_res.assert_called_once_with(
+            mock.ANY, updated_since=None)
+
     def _test_migrate_to_port_groups_helper(self, pg_supported, a_sets,
                                             migration_expected, never_again):
         self.fake_ovn_client._nb_idl.is_port_groups_supported.return_value = (
@@ -307,3 +354,32 @@ class TestDBInconsistenciesPeriodics(testlib_api.SqlTestCaseLight,
                            constants.MCAST_FLOOD_UNREGISTERED: 'true'})),
         ]
         nb_idl.db_set.assert_has_calls(expected_calls)
+
+
+class TestHashRingHealthCheckPeriodics(testlib_api.SqlTestCaseLight):
+
+    def setUp(self):
+        super(TestHashRingHealthCheckPeriodics, self).setUp()
+        self.periodic = maintenance.HashRingHealthCheckPeriodics(
+            constants.HASH_RING_ML2_GROUP)
+
+    @mock.patch.object(hash_ring_db, 'bump_generation')
+    def test_touch_hash_ring_nodes(self, mock_bump):
+        node = hash_ring_db.add_node(
+            self.periodic.ctx, constants.HASH_RING_ML2_GROUP)
+        mock_bump.reset_mock()
+        self.periodic.touch_hash_ring_nodes()
+        mock_bump.assert_called_once_with(
+            mock.ANY, constants.HASH_RING_ML2_GROUP)
+
+        # The generation is only bumped when the active nodes change
+        mock_bump.reset_mock()
+        self.periodic.touch_hash_ring_nodes()
+        mock_bump.assert_not_called()
+
+        # A node expired or came back
+        self.periodic._active_nodes = set()
+        self.periodic.touch_hash_ring_nodes()
+        mock_bump.assert_called_once_with(
+            mock.ANY, constants.HASH_RING_ML2_GROUP)
+        self.assertEqual({node}, self.periodic._active_nodes)
@@ -13,16 +13,20 @@
 #    under the License.
 
 import collections
+import os
 
 import mock
 from neutron_lib import constants as const
+from oslo_serialization import jsonutils
 
 from neutron.common.ovn import acl
 from neutron.common.ovn import constants as ovn_const
+from neutron.conf.plugins.ml2.drivers.ovn import ovn_conf
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import impl_idl_ovn
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovn_client
 from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import ovn_db_sync
 from neutron.services.ovn_l3 import plugin as ovn_plugin
+from neutron.tests import base
 from neutron.tests.unit.plugins.ml2.drivers.ovn.mech_driver import \
     test_mech_driver
 
@@ -943,6 +947,14 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
                                       del_port_groups_list,
                                       port_groups_supported)
 
+        # Nothing is changed in log mode but the differences are counted
+        self.assertEqual({'add': 1, 'remove': 1, 'update': 0},
+                         ovn_nb_synchronizer.diff_counts['networks'])
+        self.assertEqual({'add': 3, 'remove': 1, 'update': 0},
+                         ovn_nb_synchronizer.diff_counts['ports'])
+        self.assertEqual({'add': 1, 'remove': 1, 'update': 0},
+                         ovn_nb_synchronizer.diff_counts['routers'])
+
     def test_ovn_nb_sync_mode_log_pgs(self):
         self._test_ovn_nb_sync_mode_log_helper(port_groups_supported=True)
 
@@ -950,6 +962,112 @@ class TestOvnNbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
         self._test_ovn_nb_sync_mode_log_helper(port_groups_supported=False)
 
 
+class TestOvnNbSyncCheckpoint(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestOvnNbSyncCheckpoint, self).setUp()
+        self.checkpoint_file = self.get_temp_file_path('ovn-sync.json')
+        ovn_conf.cfg.CONF.set_override('neutron_sync_checkpoint_file',
+                                       self.checkpoint_file, group='ovn')
+        self.synchronizer = ovn_db_sync.OvnNbSynchronizer(
+            mock.Mock(), mock.Mock(), mock.Mock(), 'repair', mock.Mock())
+        self.sync_methods = {}
+        for method in ('sync_address_sets', 'sync_port_groups',
+                       'sync_networks_ports_and_dhcp_opts',
+                       'sync_port_dns_records', 'sync_acls',
+                       'sync_routers_and_rports'):
+            self.sync_methods[method] = mock.patch.object(
+                self.synchronizer, method).start()
+
+    def _write_checkpoint(self, mode='repair', stages=None, markers=None):
+        with open(self.checkpoint_file, 'w') as f:
+            f.write(jsonutils.dumps(
+                {'mode': mode, 'stages': stages or [],
+                 'markers': markers or {},
+                 'diff_counts': {'networks': {'add': 1, 'remove': 0,
+                                              'update': 0}}}))
+
+    def test_do_sync_clears_checkpoint(self):
+        self._write_checkpoint()
+        self.synchronizer.do_sync()
+        for method in self.sync_methods.values():
+            method.assert_called_once_with(mock.ANY)
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    def test_do_sync_resumes_checkpoint(self):
+        self._write_checkpoint(
+            stages=[ovn_db_sync.SYNC_STAGE_SECURITY_GROUPS,
+                    ovn_db_sync.SYNC_STAGE_NETWORKS_AND_PORTS])
+        self.synchronizer.do_sync()
+        self.sync_methods['sync_address_sets'].assert_not_called()
+        self.sync_methods['sync_port_groups'].assert_not_called()
+        self.sync_methods[
+            'sync_networks_ports_and_dhcp_opts'].assert_not_called()
+        self.sync_methods['sync_acls'].assert_called_once_with(mock.ANY)
+        self.sync_methods['sync_routers_and_rports'].assert_called_once_with(
+            mock.ANY)
+        # The differences found before the interruption are kept
+        self.assertEqual({'add': 1, 'remove': 0, 'update': 0},
+                         self.synchronizer.diff_counts['networks'])
+
+    def test_do_sync_ignores_checkpoint_of_other_mode(self):
+        self._write_checkpoint(
+            mode='log', stages=[ovn_db_sync.SYNC_STAGE_SECURITY_GROUPS])
+        self.synchronizer.do_sync()
+        self.sync_methods['sync_address_sets'].assert_called_once_with(
+            mock.ANY)
+        self.assertNotIn('networks', self.synchronizer.diff_counts)
+
+    def test_do_sync_failure_saves_checkpoint(self):
+        self.sync_methods[
+            'sync_networks_ports_and_dhcp_opts'].side_effect = RuntimeError
+        self.assertRaises(RuntimeError, self.synchronizer.do_sync)
+        self.sync_methods['sync_acls'].assert_not_called()
+        with open(self.checkpoint_file) as f:
+            checkpoint = jsonutils.loads(f.read())
+        self.assertEqual([ovn_db_sync.SYNC_STAGE_SECURITY_GROUPS],
+                         checkpoint['stages'])
+
+    def test__get_ports_in_chunks(self):
+        ovn_conf.cfg.CONF.set_override('neutron_sync_chunk_size', 2,
+                                       group='ovn')
+        ports = [{'id': 'p%d' % i} for i in range(5)]
+        get_ports = self.synchronizer.core_plugin.get_ports
+        get_ports.side_effect = [ports[:2], ports[2:4], ports[4:]]
+
+        chunks = list(self.synchronizer._get_ports_in_chunks(mock.ANY))
+
+        self.assertEqual([ports[:2], ports[2:4], ports[4:]], chunks)
+        get_ports.assert_has_calls([
+            mock.call(mock.ANY, sorts=[('id', True)], limit=2, marker=None),
+            mock.call(mock.ANY, sorts=[('id', True)], limit=2, marker='p1'),
+            mock.call(mock.ANY, sorts=[('id', True)], limit=2, marker='p3')])
+
+    def test__delete_stale_lports(self):
+        ovn_api = self.synchronizer.ovn_api = mock.MagicMock()
+        ovn_lports = {'p1': 'ls1', 'p5': 'ls1'}
+        ovn_all_dhcp_options = {
+            'ports_v4': {'p1': {'uuid': 'd1'},
+                         'p2': {'uuid': 'd2',
+                                'external_ids': {'subnet_id': 's1'}},
+                         'p5': {'uuid': 'd5'}},
+            'ports_v6': {}}
+
+        self.synchronizer._delete_stale_lports(
+            mock.ANY, ovn_lports, ovn_all_dhcp_options, 'p3')
+
+        # The ports after the last port of the chunk are kept for later
+        self.assertEqual({'p5': 'ls1'}, ovn_lports)
+        self.assertEqual({'ports_v4': {'p5': {'uuid': 'd5'}}, 'ports_v6': {}},
+                         ovn_all_dhcp_options)
+        ovn_api.delete_lswitch_port.assert_called_once_with(
+            lport_name='p1', lswitch_name='ls1')
+        ovn_api.delete_dhcp_options.assert_has_calls(
+            [mock.call('d1'), mock.call('d2')])
+        self.assertEqual(2, ovn_api.delete_dhcp_options.call_count)
+        self.assertEqual(1, self.synchronizer.diff_counts['ports']['remove'])
+
+
 class TestOvnSbSyncML2(test_mech_driver.OVNMechanismDriverTestCase):
 
     def test_ovn_sb_sync(self):
@@ -188,6 +188,30 @@ class TestOvnConnection(base.BaseTestCase):
         self._test_connection_start(idl_class=ovsdb_monitor.OvnSbIdl,
                                     schema='OVN_Southbound')
 
+    @mock.patch.object(idlutils, 'get_schema_helper')
+    def _test_sb_monitored_columns(self, mock_gsh, monitor_all=False):
+        ovn_conf.cfg.CONF.set_override('ovn_sb_monitor_all_columns',
+                                       monitor_all, 'ovn')
+        mock_gsh.return_value = ovs_idl.SchemaHelper(
+            location=schema_files['OVN_Southbound'])
+        return ovsdb_monitor.OvnSbIdl.from_server(
+            'punix:/tmp/fake', 'OVN_Southbound', mock.Mock()).tables
+
+    def test_sb_monitored_columns(self):
+        tables = self._test_sb_monitored_columns()
+        self.assertEqual(set(ovsdb_monitor.OVN_SB_MONITORED_COLUMNS),
+                         set(tables))
+        for name, table in tables.items():
+            # The columns missing in the schema are skipped
+            self.assertTrue(set(table.columns).issubset(
+                ovsdb_monitor.OVN_SB_MONITORED_COLUMNS[name]))
+        self.assertIn('logical_port', tables['Port_Binding'].columns)
+
+    def test_sb_monitored_columns_all(self):
+        tables = self._test_sb_monitored_columns(monitor_all=True)
+        self.assertIn('Encap', tables)
+        self.assertIn('tunnel_key', tables['Port_Binding'].columns)
+
 
 class TestOvnIdlDistributedLock(base.BaseTestCase):
 
@@ -150,6 +150,25 @@ class TestOVNMechanismDriver(test_plugin.Ml2PluginV2TestCase):
             mock_bump.assert_called_once_with(
                 mock.ANY, rule, ovn_const.TYPE_SECURITY_GROUP_RULES)
 
+    @mock.patch.object(ovn_revision_numbers_db, 'bump_revision')
+    def test__process_sg_rule_notifications_sgr_create_bulk(self, mock_bump):
+        with mock.patch.object(ovn_acl,
+                               'update_acls_for_security_group_rules') \
+                as ovn_acl_up:
+            rules = [{'id': 'sgr_id%d' % i, 'security_group_id': 'sg_id'}
+                     for i in range(3)]
+            for rule in rules:
+                self.mech_driver._process_sg_rule_notification(
+                    resources.SECURITY_GROUP_RULE, events.AFTER_CREATE, {},
+                    security_group_rule=rule, security_group_rules=rules)
+            ovn_acl_up.assert_called_once_with(
+                mock.ANY, mock.ANY, mock.ANY, 'sg_id', rules)
+            mock_bump.assert_has_calls(
+                [mock.call(mock.ANY, rule,
+                           ovn_const.TYPE_SECURITY_GROUP_RULES)
+                 for rule in rules])
+            self.assertEqual(3, mock_bump.call_count)
+
     @mock.patch.object(ovn_revision_numbers_db, 'delete_revision')
     def test_process_sg_rule_notifications_sgr_delete(self, mock_delrev):
         rule = {'id': 'sgr_id', 'security_group_id': 'sg_id'}
@@ -1020,6 +1020,31 @@ class TestMl2PortsV2(test_plugin.TestPortsV2, Ml2PluginV2TestCase):
                     context, resource_id=port['port']['id']))
         self.assertFalse(ups.called)
 
+    def test__port_provisioned_batch(self):
+        plugin = directory.get_plugin()
+        ups = mock.patch.object(plugin, 'update_port_statuses').start()
+        batch = ['port1', 'port2', 'port3', 'port4']
+        binding = mock.MagicMock(vif_type=portbindings.VIF_TYPE_OVS)
+        binding.__getitem__.return_value = constants.ACTIVE
+        ports = {port_id: mock.Mock(id=port_id, admin_state_up=True,
+                                    port_bindings=[binding])
+                 for port_id in batch[:3]}
+        ports['port2'].admin_state_up = False
+        ports['port4'] = None
+        with mock.patch.object(ml2_db, 'get_port_db_objects',
+                               return_value=ports),\
+                mock.patch.object(provisioning_blocks,
+                                  'get_blocked_object_ids',
+                                  return_value={'port3'}):
+            for port_id in batch:
+                plugin._port_provisioned(
+                    'port', 'evt', 'trigger',
+                    payload=events.DBEventPayload(
+                        self.context, resource_id=port_id,
+                        metadata={'batch': batch}))
+        ups.assert_called_once_with(
+            self.context, {'port1': constants.PORT_STATUS_ACTIVE})
+
     def test__port_provisioned_no_binding(self):
         device_id = uuidutils.generate_uuid()
         plugin = directory.get_plugin()
@@ -1161,6 +1186,62 @@ class TestMl2PortsV2(test_plugin.TestPortsV2, Ml2PluginV2TestCase):
                 plugin.update_port_status(ctx, short_id, 'UP')
                 mock_gbl.assert_called_once_with(mock.ANY, port_id, mock.ANY)
 
+    def test_update_port_statuses_in_one_transaction(self):
+        ctx = context.get_admin_context()
+        plugin = directory.get_plugin()
+        updated_ports = []
+        receiver = lambda *a, **k: updated_ports.append(k['port']['id'])
+        host_arg = {portbindings.HOST_ID: HOST}
+        with self.port(arg_list=(portbindings.HOST_ID,), **host_arg) as p1,\
+                self.port(arg_list=(portbindings.HOST_ID,),
+                          **host_arg) as p2,\
+                mock.patch.object(
+                    plugin, '_update_individual_port_db_status') as upd:
+            registry.subscribe(receiver, resources.PORT, events.AFTER_UPDATE)
+            port_ids = [p1['port']['id'], p2['port']['id']]
+            result = plugin.update_port_statuses(
+                ctx, {port_id: constants.PORT_STATUS_ACTIVE
+                      for port_id in port_ids}, HOST)
+            self.assertEqual({port_id: port_id for port_id in port_ids},
+                             result)
+            self.assertFalse(upd.called)
+            self.assertEqual(sorted(port_ids), sorted(updated_ports))
+            for port_id in port_ids:
+                self.assertEqual(constants.PORT_STATUS_ACTIVE,
+                                 plugin.get_port(ctx, port_id)['status'])
+
+    def test_update_port_statuses_falls_back_to_individual_updates(self):
+        ctx = context.get_admin_context()
+        plugin = directory.get_plugin()
+        host_arg = {portbindings.HOST_ID: HOST}
+        with self.port(arg_list=(portbindings.HOST_ID,), **host_arg) as p1,\
+                self.port(arg_list=(portbindings.HOST_ID,),
+                          **host_arg) as p2,\
+                mock.patch.object(plugin, '_update_ports_db_status',
+                                  side_effect=db_exc.DBError):
+            port_ids = [p1['port']['id'], p2['port']['id']]
+            result = plugin.update_port_statuses(
+                ctx, {port_id: constants.PORT_STATUS_ACTIVE
+                      for port_id in port_ids}, HOST)
+            self.assertEqual({port_id: port_id for port_id in port_ids},
+                             result)
+            for port_id in port_ids:
+                self.assertEqual(constants.PORT_STATUS_ACTIVE,
+                                 plugin.get_port(ctx, port_id)['status'])
+
+    def test_get_ports_bound_to_host(self):
+        ctx = context.get_admin_context()
+        plugin = directory.get_plugin()
+        with self.port(arg_list=(portbindings.HOST_ID,),
+                       **{portbindings.HOST_ID: HOST}) as p1,\
+                self.port(arg_list=(portbindings.HOST_ID,),
+                          **{portbindings.HOST_ID: 'other'}) as p2:
+            short_id = p1['port']['id'][:11]
+            ports = plugin.get_ports_bound_to_host(
+                ctx, [short_id, p2['port']['id'], 'unknown'], HOST)
+            self.assertEqual([short_id], list(ports))
+            self.assertEqual(p1['port']['id'], ports[short_id]['id'])
+
     def test_update_port_with_empty_data(self):
         ctx = context.get_admin_context()
         plugin = directory.get_plugin()
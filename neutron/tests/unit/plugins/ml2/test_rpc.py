@@ -339,6 +339,75 @@ class RpcCallbacksTestCase(base.BaseTestCase):
             'fake_context', devices_up=[], devices_down=[], **kwargs)
         self.assertEqual(expected, res)
 
+    def _test_update_device_list_bulk(self, devices_up, devices_down):
+        ports = {
+            'dev1': {'id': 'dev1', 'device_owner': 'compute:nova'},
+            'dev2': {'id': 'dev2',
+                     'device_owner': constants.DEVICE_OWNER_DVR_INTERFACE}}
+        self.plugin._device_to_port_id.side_effect = lambda ctx, dev: dev
+        self.plugin.get_ports_bound_to_host.side_effect = (
+            lambda ctx, port_ids, host: {port_id: ports[port_id]
+                                         for port_id in port_ids
+                                         if port_id in ports})
+        self.plugin.update_port_statuses.return_value = {'dev1': 'dev1'}
+        with mock.patch.object(self.callbacks, 'update_device_up') as f_up,\
+                mock.patch.object(self.callbacks, 'update_device_down',
+                                  side_effect=lambda ctx, device, **kw: {
+                                      'device': device,
+                                      'exists': True}) as f_down,\
+                mock.patch.object(self.callbacks,
+                                  'notify_l2pop_port_wiring') as l2pop,\
+                mock.patch('neutron.db.provisioning_blocks.'
+                           'provisioning_complete_bulk') as pc:
+            res = self.callbacks.update_device_list(
+                'fake_context', devices_up=devices_up,
+                devices_down=devices_down, host='fake_host',
+                agent_id='fake_agent_id')
+        return res, f_up, f_down, l2pop, pc
+
+    def test_update_device_list_bulk_up(self):
+        res, f_up, f_down, l2pop, pc = self._test_update_device_list_bulk(
+            ['dev1', 'dev2', 'dev3'], [])
+        self.assertEqual(['dev1', 'dev2', 'dev3'], res['devices_up'])
+        self.assertEqual([], res['failed_devices_up'])
+        pc.assert_called_once_with('fake_context', ['dev1'], resources.PORT,
+                                   provisioning_blocks.L2_AGENT_ENTITY)
+        l2pop.assert_called_once_with('dev1', 'fake_context',
+                                      constants.PORT_STATUS_ACTIVE,
+                                      'fake_host', False)
+        # DVR ports and ports not bound to the host are updated one by one
+        self.assertEqual(
+            [mock.call('fake_context', device=dev, host='fake_host',
+                       agent_id='fake_agent_id', devices_up=mock.ANY,
+                       devices_down=mock.ANY)
+             for dev in ('dev2', 'dev3')],
+            f_up.call_args_list)
+        self.assertFalse(f_down.called)
+
+    def test_update_device_list_bulk_down(self):
+        res, f_up, f_down, l2pop, pc = self._test_update_device_list_bulk(
+            [], ['dev1', 'dev3'])
+        self.assertEqual([{'device': 'dev1', 'exists': True},
+                          {'device': 'dev3', 'exists': True}],
+                         res['devices_down'])
+        self.plugin.update_port_statuses.assert_called_once_with(
+            'fake_context', {'dev1': constants.PORT_STATUS_DOWN},
+            'fake_host')
+        l2pop.assert_called_once_with('dev1', 'fake_context',
+                                      constants.PORT_STATUS_DOWN,
+                                      'fake_host')
+        self.assertEqual(1, f_down.call_count)
+        self.assertFalse(pc.called)
+
+    def test_update_device_list_bulk_failure_falls_back(self):
+        self.plugin.get_ports_bound_to_host.side_effect = Exception
+        with mock.patch.object(self.callbacks, 'update_device_up') as f_up:
+            res = self.callbacks.update_device_list(
+                'fake_context', devices_up=['dev1', 'dev2'],
+                host='fake_host', agent_id='fake_agent_id')
+        self.assertEqual(['dev1', 'dev2'], res['devices_up'])
+        self.assertEqual(2, f_up.call_count)
+
 
 class RpcApiTestCase(base.BaseTestCase):
 
@@ -329,6 +329,77 @@ class TestTrackedResource(testlib_api.SqlTestCase):
                 self.context, self.resource, self.tenant_id, in_use=2)
 
 
+class TestCountedResource(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(TestCountedResource, self).setUp()
+        self.setup_coreplugin(DB_PLUGIN_KLASS)
+        self.resource = 'meh'
+        self.tenant_id = 'meh'
+        self.context = context.Context(
+            user_id='', tenant_id=self.tenant_id, is_admin=False)
+
+    _add_data = TestTrackedResource._add_data
+    _delete_data = TestTrackedResource._delete_data
+
+    def _create_resource(self):
+        res = resource.CountedResource(
+            self.resource, test_quota.MehModel, meh_quota_flag)
+        res.register_events()
+        return res
+
+    def _get_in_use(self):
+        return quota_api.get_quota_usage_by_resource_and_tenant(
+            self.context, self.resource, self.tenant_id, lock=False).used
+
+    def test_add_delete_data_updates_usage(self):
+        res = self._create_resource()
+        quota_api.set_quota_usage(
+            self.context, self.resource, self.tenant_id, in_use=0)
+        self._add_data()
+        self._add_data('someone_else')
+        self.assertEqual(2, self._get_in_use())
+        # The tenant without usage is counted by the next quota check
+        self.assertEqual({'someone_else'}, res._dirty_tenants)
+        self._delete_data()
+        self.assertEqual(0, self._get_in_use())
+
+    def test_rollback_does_not_update_usage(self):
+        self._create_resource()
+        quota_api.set_quota_usage(
+            self.context, self.resource, self.tenant_id, in_use=0)
+        session = db_api.get_writer_session()
+        with testtools.ExpectedException(ValueError):
+            with session.begin():
+                session.add(test_quota.MehModel(meh='meh_1',
+                                                tenant_id=self.tenant_id))
+                session.flush()
+                raise ValueError()
+        self.assertEqual(0, self._get_in_use())
+
+    def test_count_used_does_not_lock_usage(self):
+        res = self._create_resource()
+        quota_api.set_quota_usage(
+            self.context, self.resource, self.tenant_id, in_use=0)
+        self._add_data()
+        with mock.patch.object(quota_api.quota_obj.QuotaUsage,
+                               'get_object_dirty_protected') as locked_get:
+            self.assertEqual(2, res.count_used(self.context, self.tenant_id))
+            locked_get.assert_not_called()
+
+    def test_get_out_of_sync_usages(self):
+        res = self._create_resource()
+        admin_ctx = context.get_admin_context()
+        quota_api.set_quota_usage(
+            admin_ctx, self.resource, self.tenant_id, in_use=5)
+        quota_api.set_quota_usage(
+            admin_ctx, self.resource, 'someone_else', in_use=0)
+        self._add_data()
+        self._add_data('someone_else')
+        self.assertEqual([(self.tenant_id, 7, 2)],
+                         res.get_out_of_sync_usages(admin_ctx))
+
+
 class Test_CountResource(base.BaseTestCase):
 
     def test_all_plugins_checked(self):
@@ -17,6 +17,7 @@ from neutron_lib import context
 from oslo_config import cfg
 import testtools
 
+from neutron.conf import quota as quota_conf
 from neutron.quota import resource
 from neutron.quota import resource_registry
 from neutron.tests import base
@@ -62,6 +63,15 @@ class TestResourceRegistry(base.DietTestCase):
         self.test_set_tracked_resource_new_resource()
         self._test_register_resource_by_name('meh', resource.TrackedResource)
 
+    def test_register_resource_by_name_counted(self):
+        cfg.CONF.set_override('quota_driver',
+                              quota_conf.QUOTA_DB_COUNTER_DRIVER,
+                              group='QUOTAS')
+        # DietTestCase does not automatically cleans configuration overrides
+        self.addCleanup(cfg.CONF.reset)
+        self.test_set_tracked_resource_new_resource()
+        self._test_register_resource_by_name('meh', resource.CountedResource)
+
     def test_register_resource_by_name_not_tracked(self):
         self._test_register_resource_by_name('meh', resource.CountableResource)
 
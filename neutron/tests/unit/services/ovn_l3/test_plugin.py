@@ -30,6 +30,7 @@ from oslo_utils import uuidutils
 from neutron.common.ovn import constants as ovn_const
 from neutron.common.ovn import utils
 from neutron.conf.plugins.ml2.drivers.ovn import ovn_conf as config
+from neutron.plugins.ml2.drivers.ovn.mech_driver.ovsdb import impl_idl_ovn
 from neutron.services.revisions import revision_plugin
 from neutron.tests.unit.api import test_extensions
 from neutron.tests.unit.extensions import test_extraroute
@@ -286,6 +287,16 @@ class TestOVNL3RouterPlugin(test_mech_driver.Ml2PluginV2TestCase):
             return_value=False)
         self.mock_is_lb_member_fip.start()
 
+    def test__get_mech_driver_idl(self):
+        nb_idl = mock.Mock(spec=impl_idl_ovn.OvsdbNbOvnIdl)
+        driver = mock.Mock(obj=mock.Mock(_nb_ovn=nb_idl, _sb_ovn=None))
+        with mock.patch.object(self.l3_inst._plugin.mechanism_manager,
+                               'ordered_mech_drivers', [driver]):
+            self.assertEqual(
+                nb_idl, self.l3_inst._get_mech_driver_idl('_nb_ovn'))
+            # No IDL to share yet, the plugin will connect on its own
+            self.assertIsNone(self.l3_inst._get_mech_driver_idl('_sb_ovn'))
+
     @mock.patch('neutron.db.l3_db.L3_NAT_dbonly_mixin.add_router_interface')
     def test_add_router_interface(self, func):
         router_id = 'router-id'
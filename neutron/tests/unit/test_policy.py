@@ -502,6 +502,40 @@ class NeutronPolicyTestCase(base.BaseTestCase):
         result = policy.enforce(self.context, action, target)
         self.assertTrue(result)
 
+    def test_request_policy_checker_matches_check(self):
+        targets = [{'tenant_id': 'fake'},
+                   {'tenant_id': 'other'},
+                   {'tenant_id': 'other', 'shared': True},
+                   {'tenant_id': 'other', 'router:external': True}]
+        for ctx in (self.context,
+                    context.Context('user', 'other', roles=['user']),
+                    context.Context('advsvc', 'other', roles=['advsvc']),
+                    context.get_admin_context()):
+            checker = policy.RequestPolicyChecker(ctx, pluralized='networks')
+            for target in targets:
+                self.assertEqual(
+                    policy.check(ctx, 'get_network', target),
+                    checker.check('get_network', target))
+            self.assertTrue(checker.check('get_network:unknown_attr', {},
+                                          might_not_exist=True))
+
+    def test_request_policy_checker_compiles_rules_once(self):
+        checker = policy.RequestPolicyChecker(self.context)
+        with mock.patch.object(policy, '_compile_check',
+                               wraps=policy._compile_check) as compile_check:
+            results = [checker.check('get_port', {'tenant_id': tenant_id})
+                       for tenant_id in ('fake', 'other') * 5]
+        self.assertEqual([True, False] * 5, results)
+        # The rule is compiled for the first port only
+        self.assertEqual(1, len([call for call in compile_check.mock_calls
+                                 if len(call[1]) == 3]))
+        # Only the ownership check is left to evaluate for every port
+        self.assertIsInstance(checker._compile('get_port'), policy.OwnerCheck)
+
+        advsvc_checker = policy.RequestPolicyChecker(
+            context.Context('advsvc', 'other', roles=['advsvc']))
+        self.assertIs(True, advsvc_checker._compile('get_port'))
+
     def test_enforce_tenant_id_check_parent_resource(self):
 
         def fakegetnetwork(*args, **kwargs):
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark the contention of concurrent IP allocations on a subnet
+
+A burst of ports is created on a subnet by concurrent API workers. In every
+round, each worker with a port left to create reads the same allocations,
+builds the index of the free addresses and draws a candidate address, the
+way the reference IPAM driver does. When several workers draw the same
+address, one of them creates its allocation and the others hit the unique
+constraint and retry in the next round. The burst is run with all the
+workers drawing from all the free addresses, then with the free addresses
+split into candidate windows, and the number of retries per port and the
+number of rounds are reported.
+
+Usage: benchmark_ipam_contention.py [--ports 200] [--workers 16]
+                                    [--cidr 10.0.0.0/16] [--used 0.9]
+                                    [--windows 16]
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import random
+import time
+
+import netaddr
+
+from neutron.ipam.drivers.neutrondb_ipam import ip_index
+
+
+def _allocated_ips(pool, used):
+    count = int(pool.size * used)
+    return {str(netaddr.IPAddress(value, pool.version)) for value in
+            random.sample(range(pool.first, pool.last + 1), count)}
+
+
+def _burst(pool, allocated, ports, workers, num_windows):
+    allocated = set(allocated)
+    pending = collections.deque(range(ports))
+    retries = rounds = 0
+    window = random.randrange(num_windows)
+    while pending:
+        rounds += 1
+        free_ips = ip_index.FreeIpIndex([pool], allocated, pool.version)
+        candidates = collections.defaultdict(list)
+        for _ in range(min(workers, len(pending))):
+            port = pending.popleft()
+            # every allocation moves its worker to its next window
+            window = (window + 1) % num_windows
+            start = free_ips.size * window // num_windows
+            stop = free_ips.size * (window + 1) // num_windows
+            if stop == start:
+                start, stop = 0, free_ips.size
+            candidates[free_ips.pick(1, start=start, stop=stop)[0]].append(
+                port)
+        for ip_address, ports_ in candidates.items():
+            allocated.add(ip_address)
+            # the other ports hit the unique constraint
+            retries += len(ports_) - 1
+            pending.extend(ports_[1:])
+    return retries, rounds
+
+
+def _bench(name, pool, allocated, args, num_windows):
+    start = time.time()
+    retries, rounds = _burst(pool, allocated, args.ports, args.workers,
+                             num_windows)
+    elapsed = time.time() - start
+    print('%-8s ports=%-5d workers=%-4d windows=%-4d retries=%-6d '
+          'retries/port=%.3f rounds=%-5d time=%.3fs' % (
+              name, args.ports, args.workers, num_windows, retries,
+              retries / float(args.ports), rounds, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--ports', type=int, default=200,
+                        help='Number of ports of the burst')
+    parser.add_argument('--workers', type=int, default=16,
+                        help='Number of concurrent API workers')
+    parser.add_argument('--cidr', default='10.0.0.0/16',
+                        help='CIDR of the subnet')
+    parser.add_argument('--used', type=float, default=0.9,
+                        help='Ratio of the addresses already allocated')
+    parser.add_argument('--windows', type=int, default=16,
+                        help='Number of candidate windows')
+    args = parser.parse_args()
+
+    network = netaddr.IPNetwork(args.cidr)
+    pool = netaddr.IPRange(network[2], network[-2])
+    allocated = _allocated_ips(pool, args.used)
+    _bench('shared', pool, allocated, args, 1)
+    _bench('windows', pool, allocated, args, args.windows)
+
+
+if __name__ == '__main__':
+    main()
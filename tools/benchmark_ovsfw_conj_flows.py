@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark the compilation of the OVS firewall remote group conjunction flows
+
+For every remote group size, the flows are compiled both one address at a
+time and with the batched compiler used by the ConjIPFlowManager, and the
+total compile time, the number of flows compiled per second and the number
+of members processed per second are reported.
+
+Usage: benchmark_ovsfw_conj_flows.py [--sizes 1000,10000] [--sparse]
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import time
+
+import netaddr
+from neutron_lib import constants
+
+from neutron.agent.linux.openvswitch_firewall import rules
+
+VLAN_TAG = 0x123
+# Two remote groups referenced with two priority offsets each.
+CONJ_IDS = [16, 22, 38]
+
+
+def _member_addresses(size, sparse):
+    network = netaddr.IPNetwork('10.0.0.0/8')
+    if sparse:
+        indexes = random.sample(range(1, network.size - 1), size)
+    else:
+        indexes = range(1, size + 1)
+    return [str(network[i]) for i in indexes]
+
+
+def _bench(name, size, func):
+    start = time.time()
+    flows = func()
+    elapsed = time.time() - start
+    # Merging reduces the number of flows, so report the rate of members
+    # processed as well as the rate of flows produced.
+    print('%-8s members=%-7d flows=%-7d compile=%.3fs flows/s=%d '
+          'members/s=%d' % (
+              name, size, len(flows), elapsed,
+              len(flows) / elapsed if elapsed else 0,
+              size / elapsed if elapsed else 0))
+
+
+def _per_address(addr_to_conj):
+    flows = []
+    for addr, conj_ids in addr_to_conj.items():
+        flows.extend(rules.create_flows_for_ip_address(
+            addr, constants.INGRESS_DIRECTION, constants.IPv4, VLAN_TAG,
+            sorted(conj_ids)))
+    return flows
+
+
+def _batched(addr_to_conj):
+    return rules.create_flows_for_ip_addresses(
+        rules.merge_ip_addresses_by_conj_ids(addr_to_conj),
+        constants.INGRESS_DIRECTION, constants.IPv4, VLAN_TAG)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='Comma separated remote group sizes')
+    parser.add_argument('--sparse', action='store_true',
+                        help='Use random, mostly not mergeable, addresses')
+    args = parser.parse_args()
+
+    for size in [int(s) for s in args.sizes.split(',')]:
+        addr_to_conj = {addr: list(CONJ_IDS)
+                        for addr in _member_addresses(size, args.sparse)}
+        _bench('single', size, lambda: _per_address(addr_to_conj))
+        _bench('batched', size, lambda: _batched(addr_to_conj))
+
+
+if __name__ == '__main__':
+    main()
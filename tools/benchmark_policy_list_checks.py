@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark the policy checks of the items of a list response
+
+For every list size, the ports are filtered the way the API filters the
+items of a GET request, that is the visibility of every port and of every
+of its attributes is checked, both with one policy engine call per check and
+with the rules compiled once per request. The total time and the number of
+ports processed per second are reported.
+
+Usage: benchmark_policy_list_checks.py [--sizes 1000,10000] [--admin]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from neutron_lib import context
+from oslo_config import cfg
+from oslo_utils import uuidutils
+
+from neutron import policy
+
+PROJECT_ID = uuidutils.generate_uuid()
+ACTION = 'get_port'
+COLLECTION = 'ports'
+NETWORK_OWNER = 'network:tenant_id'
+
+
+def _ports(size):
+    # Half of the ports are owned by another project
+    project_ids = [PROJECT_ID, uuidutils.generate_uuid()]
+    return [{'id': uuidutils.generate_uuid(),
+             'name': 'port-%d' % i,
+             'network_id': uuidutils.generate_uuid(),
+             'tenant_id': project_ids[i % 2],
+             'project_id': project_ids[i % 2],
+             'mac_address': 'fa:16:3e:00:00:00',
+             'admin_state_up': True,
+             'status': 'ACTIVE',
+             'device_id': uuidutils.generate_uuid(),
+             'device_owner': 'compute:nova',
+             'fixed_ips': [],
+             'binding:host_id': 'compute-1',
+             'binding:vif_type': 'ovs',
+             'binding:vif_details': {},
+             'binding:profile': {},
+             # The owner of the network of the port, as set by the
+             # ownership check once it fetched the network from the plugin
+             NETWORK_OWNER: project_ids[i % 2]}
+            for i in range(size)]
+
+
+def _filter(ports, check):
+    visible = []
+    for port in ports:
+        if not check(ACTION, port):
+            continue
+        visible.append({
+            attr: value for attr, value in port.items()
+            if attr != NETWORK_OWNER and
+            check('%s:%s' % (ACTION, attr), port, might_not_exist=True)})
+    return visible
+
+
+def _per_check(ctx, ports):
+    def check(action, target, might_not_exist=False):
+        return policy.check(ctx, action, target,
+                            might_not_exist=might_not_exist,
+                            pluralized=COLLECTION)
+    return _filter(ports, check)
+
+
+def _compiled(ctx, ports):
+    checker = policy.RequestPolicyChecker(ctx, pluralized=COLLECTION)
+    return _filter(ports, checker.check)
+
+
+def _bench(name, size, func):
+    start = time.time()
+    visible = func()
+    elapsed = time.time() - start
+    print('%-9s ports=%-7d visible=%-7d time=%.3fs ports/s=%d' % (
+        name, size, len(visible), elapsed,
+        size / elapsed if elapsed else 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='Comma separated list sizes')
+    parser.add_argument('--admin', action='store_true',
+                        help='Check the policies with the "advsvc" role '
+                             'instead of a regular member')
+    args = parser.parse_args()
+
+    cfg.CONF([], project='neutron')
+    policy.init()
+    roles = ['advsvc'] if args.admin else ['member']
+    ctx = context.Context('user', PROJECT_ID, roles=roles)
+    for size in [int(s) for s in args.sizes.split(',')]:
+        ports = _ports(size)
+        _bench('per-check', size, lambda: _per_check(ctx, ports))
+        _bench('compiled', size, lambda: _compiled(ctx, ports))
+
+
+if __name__ == '__main__':
+    main()